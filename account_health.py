@@ -0,0 +1,173 @@
+"""
+Account Health - score accounts by how likely their next post is to succeed.
+
+Claims used to take the first matching row, so an account that failed its
+last five posts was tried as eagerly as one that never fails. Each account
+now has a health record, updated by ProgressTracker.update_job_status:
+
+- Exponentially decayed success rate (half-life ACCOUNT_HEALTH_HALF_LIFE_HOURS)
+  with a mild prior, so new accounts start reasonably healthy. Failures are
+  weighted by category: account problems count fully, infrastructure
+  failures only a little (not the account's fault), content failures not at
+  all (the video's fault).
+- Recent error categories: every account-category error in the last 24h
+  halves the score.
+- Time since last success: an account that has only failed since its last
+  success slowly loses up to half its score over a week.
+
+Scores below ACCOUNT_HEALTH_FLAKY_SCORE mark an account as flaky. Claims
+prefer healthy accounts; flaky ones are deferred to the off-peak windows
+(ACCOUNT_HEALTH_OFF_PEAK_WINDOWS) while a healthy account can be claimed right
+now, and used otherwise rather than idling the worker.
+
+Health lives in <progress_file>.health.json, next to the progress CSV, and is
+read/written under the tracker's lock. It survives --reset-day on purpose.
+"""
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from posting_planner import parse_window
+
+# How much a failure of each category counts against the account (1.0 = full failure)
+FAILURE_WEIGHTS = {
+    'account': 1.0,
+    'infrastructure': 0.25,
+    'unknown': 0.5,
+    'content': 0.0,
+}
+
+# Prior: a new account behaves as if it had 2 successes in 3 attempts
+PRIOR_SUCCESSES = 2.0
+PRIOR_ATTEMPTS = 3.0
+
+RECENT_ERRORS_KEPT = 10
+ACCOUNT_ERROR_WINDOW = timedelta(hours=24)
+STALE_AFTER = timedelta(days=7)
+
+
+@dataclass
+class AccountHealth:
+    """Decayed outcome counters for one account."""
+    account: str
+    successes: float = 0.0           # Decayed success count
+    attempts: float = 0.0            # Decayed weighted attempt count
+    updated_at: str = ""             # When the counters were last decayed
+    last_success: str = ""
+    last_failure: str = ""
+    recent_errors: List[List[str]] = field(default_factory=list)  # [timestamp, category, error_type], newest last
+
+    def _decayed(self, now: datetime, half_life_hours: float):
+        """(successes, attempts) decayed to `now`."""
+        if not self.updated_at:
+            return self.successes, self.attempts
+        hours = max(0.0, (now - datetime.fromisoformat(self.updated_at)).total_seconds() / 3600)
+        factor = 0.5 ** (hours / half_life_hours)
+        return self.successes * factor, self.attempts * factor
+
+    def record(self, success: bool, category: str, error_type: str,
+               now: datetime, half_life_hours: float) -> None:
+        """Fold one attempt into the counters."""
+        self.successes, self.attempts = self._decayed(now, half_life_hours)
+        self.updated_at = now.isoformat()
+
+        if success:
+            self.successes += 1.0
+            self.attempts += 1.0
+            self.last_success = now.isoformat()
+            return
+
+        category = category or 'unknown'
+        self.attempts += FAILURE_WEIGHTS.get(category, FAILURE_WEIGHTS['unknown'])
+        self.last_failure = now.isoformat()
+        self.recent_errors.append([now.isoformat(), category, error_type or ''])
+        del self.recent_errors[:-RECENT_ERRORS_KEPT]
+
+    def score(self, now: datetime, half_life_hours: float) -> float:
+        """Expected success chance in [0, 1] (higher = healthier)."""
+        successes, attempts = self._decayed(now, half_life_hours)
+        rate = (successes + PRIOR_SUCCESSES) / (attempts + PRIOR_ATTEMPTS)
+
+        recent_account_errors = sum(
+            1 for ts, category, _ in self.recent_errors
+            if category == 'account' and now - datetime.fromisoformat(ts) < ACCOUNT_ERROR_WINDOW
+        )
+        penalty = 0.5 ** recent_account_errors
+
+        staleness = 1.0
+        if self.last_failure and self.last_failure > self.last_success:
+            # Never succeeded: count from the oldest failure we still remember
+            since = self.last_success or (self.recent_errors[0][0] if self.recent_errors else self.last_failure)
+            elapsed = now - datetime.fromisoformat(since)
+            staleness = max(0.5, 1.0 - 0.5 * (elapsed / STALE_AFTER))
+
+        return rate * penalty * staleness
+
+
+class AccountHealthStore:
+    """JSON-backed health records. Callers hold the progress lock around load/save."""
+
+    def __init__(
+        self,
+        path: str,
+        half_life_hours: float = None,
+        flaky_score: float = None,
+        off_peak_windows: Iterable[str] = None,
+    ):
+        self.path = path
+        self.half_life_hours = half_life_hours or Config.ACCOUNT_HEALTH_HALF_LIFE_HOURS
+        self.flaky_score = flaky_score if flaky_score is not None else Config.ACCOUNT_HEALTH_FLAKY_SCORE
+        if off_peak_windows is None:
+            off_peak_windows = Config.ACCOUNT_HEALTH_OFF_PEAK_WINDOWS
+        self.off_peak = [parse_window(w) for w in off_peak_windows]
+
+    def load(self) -> Dict[str, AccountHealth]:
+        """Read all records (empty if the file is missing or unreadable)."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {name: AccountHealth(**rec) for name, rec in data.items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def save(self, records: Dict[str, AccountHealth]) -> None:
+        """Write all records atomically."""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({name: asdict(rec) for name, rec in records.items()}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def record_outcome(self, account: str, success: bool, category: str = '',
+                       error_type: str = '', now: datetime = None) -> float:
+        """Record one attempt and return the account's new score."""
+        now = now or datetime.now()
+        records = self.load()
+        health = records.setdefault(account, AccountHealth(account=account))
+        health.record(success, category, error_type, now, self.half_life_hours)
+        self.save(records)
+        return health.score(now, self.half_life_hours)
+
+    def scores(self, accounts: Iterable[str] = None, now: datetime = None) -> Dict[str, float]:
+        """Scores for the given accounts (all known ones if None); unknown accounts get the prior."""
+        now = now or datetime.now()
+        records = self.load()
+        names = records.keys() if accounts is None else accounts
+        return {
+            name: (records[name].score(now, self.half_life_hours) if name in records
+                   else PRIOR_SUCCESSES / PRIOR_ATTEMPTS)
+            for name in names
+        }
+
+    def is_flaky(self, score: float) -> bool:
+        return score < self.flaky_score
+
+    def is_off_peak(self, now: Optional[datetime] = None) -> bool:
+        """True if `now` falls in an off-peak window (flaky accounts may post)."""
+        now = now or datetime.now()
+        minute = now.hour * 60 + now.minute
+        return any(start <= minute < end for start, end in self.off_peak)
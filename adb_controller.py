@@ -6,6 +6,7 @@ import time
 import os
 
 from config import Config
+from adb_shell_pool import pooled_shell, close_device_shell
 
 # ADB executable path - use centralized config for consistency
 ADB_PATH = Config.ADB_PATH
@@ -81,6 +82,7 @@ class ADBController:
 
     def disconnect(self):
         """Disconnect from device"""
+        close_device_shell(self.device)
         subprocess.run([ADB_PATH, "disconnect", self.device], capture_output=True)
         self.connected = False
 
@@ -89,11 +91,7 @@ class ADBController:
         if not self.connected:
             raise Exception("Not connected to device")
 
-        result = subprocess.run(
-            [ADB_PATH, "-s", self.device, "shell", command],
-            capture_output=True, text=True, timeout=timeout
-        )
-        return result.stdout.strip()
+        return pooled_shell(self.device, command, timeout=timeout)[1]
 
     def tap(self, x, y):
         """Tap at coordinates"""
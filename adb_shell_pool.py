@@ -0,0 +1,302 @@
+"""
+ADB Shell Pool - persistent `adb shell` sessions multiplexed per device.
+
+Every `adb -s <device> shell <cmd>` spawns a new adb client process, opens a
+new transport stream and forks a new shell on the device. Commands that run
+several times per step (screenshot cleanup, media scanner broadcasts,
+keyboard checks) pay that cost every time.
+
+This module keeps one long-lived `adb shell` process per device and writes
+commands to its stdin. Each command is followed by a unique sentinel line
+carrying the exit code, so output is delimited without closing the stream:
+
+    ( <cmd> ) </dev/null 2>/dev/null; echo "__ADBPOOL_<id>_<n>__ $?"
+
+Semantics match the subprocess helpers it replaces: stdout is returned,
+stderr is discarded, stdin is empty. A command that exceeds its timeout kills
+the session (raising subprocess.TimeoutExpired like subprocess.run does); the
+next command transparently opens a fresh session. If the session cannot be
+used at all, AdbShellError is raised so callers can fall back to a one-shot
+subprocess.
+
+Usage:
+    from adb_shell_pool import get_shell_pool
+
+    pool = get_shell_pool()
+    output = pool.shell("192.168.1.100:5555", "rm -f /sdcard/screen.png")
+    result = pool.run("32271FDH2006RW", "am get-current-user")  # (returncode, stdout)
+    pool.close("192.168.1.100:5555")  # on disconnect / phone stop
+"""
+import atexit
+import logging
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class AdbShellError(Exception):
+    """Raised when a persistent shell session cannot run a command."""
+    pass
+
+
+class AdbShellSession:
+    """
+    One long-lived `adb -s <device> shell` process.
+
+    Commands are serialized by a lock; a background reader thread moves stdout
+    lines into a queue so each command can wait with a timeout on any platform
+    (select() does not work on pipes on Windows).
+    """
+
+    def __init__(self, device: str, adb_path: str = None):
+        self.device = device
+        self.adb_path = adb_path or Config.ADB_PATH
+        self.process: Optional[subprocess.Popen] = None
+        self._lines: Optional[queue.Queue] = None
+        self._reader: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._marker = f"__ADBPOOL_{uuid.uuid4().hex[:12]}"
+        self._counter = 0
+        self.commands_run = 0
+        self.restarts = 0
+
+    @property
+    def alive(self) -> bool:
+        """True if the adb shell process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def _start(self) -> None:
+        """Spawn the adb shell process and its reader thread."""
+        creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+        self.process = subprocess.Popen(
+            [self.adb_path, '-s', self.device, 'shell'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            creationflags=creationflags,
+        )
+        self._lines = queue.Queue()
+        self._reader = threading.Thread(
+            target=self._read_loop,
+            args=(self.process, self._lines),
+            name=f"adb-shell-{self.device}",
+            daemon=True,
+        )
+        self._reader.start()
+        logger.debug(f"[ADB POOL] Opened shell session for {self.device} (PID {self.process.pid})")
+
+    @staticmethod
+    def _read_loop(process: subprocess.Popen, lines: queue.Queue) -> None:
+        """Forward stdout lines to the queue; None marks EOF."""
+        try:
+            for raw in iter(process.stdout.readline, b''):
+                lines.put(raw.decode('utf-8', errors='replace'))
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def close(self) -> None:
+        """Terminate the shell process (safe to call repeatedly)."""
+        proc, self.process = self.process, None
+        if proc is None:
+            return
+        try:
+            if proc.poll() is None:
+                try:
+                    proc.stdin.write(b"exit\n")
+                    proc.stdin.flush()
+                except (OSError, ValueError):
+                    pass
+                try:
+                    proc.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait(timeout=5)
+        except Exception as e:
+            logger.debug(f"[ADB POOL] Error closing session for {self.device}: {e}")
+        finally:
+            for stream in (proc.stdin, proc.stdout):
+                try:
+                    stream.close()
+                except Exception:
+                    pass
+
+    def run(self, command: str, timeout: float = 30) -> Tuple[int, str]:
+        """
+        Run a shell command on the device through the persistent session.
+
+        Args:
+            command: Shell command line (same string you would pass to `adb shell`)
+            timeout: Seconds to wait for the command to finish
+
+        Returns:
+            (returncode, stdout) with trailing whitespace stripped from stdout
+
+        Raises:
+            subprocess.TimeoutExpired: If the command exceeds timeout (session is reset)
+            AdbShellError: If the session could not be started or died mid-command
+        """
+        with self._lock:
+            if not self.alive:
+                if self.process is not None:
+                    self.restarts += 1
+                    logger.info(f"[ADB POOL] Session for {self.device} died, reconnecting")
+                self.close()
+                try:
+                    self._start()
+                except OSError as e:
+                    raise AdbShellError(f"Could not start adb shell for {self.device}: {e}")
+
+            self._counter += 1
+            sentinel = f"{self._marker}_{self._counter}__"
+            script = f'( {command}\n) </dev/null 2>/dev/null; echo "{sentinel} $?"\n'
+
+            try:
+                self.process.stdin.write(script.encode('utf-8'))
+                self.process.stdin.flush()
+            except (OSError, ValueError) as e:
+                self.close()
+                raise AdbShellError(f"adb shell for {self.device} rejected command: {e}")
+
+            deadline = time.time() + timeout
+            output = []
+            while True:
+                remaining = deadline - time.time()
+                try:
+                    if remaining <= 0:
+                        raise queue.Empty
+                    line = self._lines.get(timeout=remaining)
+                except queue.Empty:
+                    self.close()
+                    raise subprocess.TimeoutExpired(
+                        [self.adb_path, '-s', self.device, 'shell', command], timeout
+                    )
+
+                if line is None:
+                    self.close()
+                    raise AdbShellError(f"adb shell for {self.device} closed during: {command}")
+
+                pos = line.find(sentinel)
+                if pos < 0:
+                    output.append(line)
+                    continue
+
+                # Output without a trailing newline ends up in front of the sentinel
+                output.append(line[:pos])
+                try:
+                    returncode = int(line[pos + len(sentinel):].strip())
+                except ValueError:
+                    returncode = -1
+                self.commands_run += 1
+                return returncode, ''.join(output).replace('\r\n', '\n').strip()
+
+
+class AdbShellPool:
+    """
+    Process-wide registry of persistent shell sessions, one per device.
+
+    Sessions are created lazily on first use and reused by every caller in
+    the process (ADBController, DeviceConnectionManager, GrapheneOS manager,
+    setup scripts).
+    """
+
+    def __init__(self, adb_path: str = None):
+        self.adb_path = adb_path or Config.ADB_PATH
+        self._sessions: Dict[str, AdbShellSession] = {}
+        self._lock = threading.Lock()
+
+    def _session(self, device: str) -> AdbShellSession:
+        with self._lock:
+            session = self._sessions.get(device)
+            if session is None:
+                session = AdbShellSession(device, self.adb_path)
+                self._sessions[device] = session
+            return session
+
+    def run(self, device: str, command: str, timeout: float = 30) -> Tuple[int, str]:
+        """Run command on device; returns (returncode, stdout). See AdbShellSession.run."""
+        return self._session(device).run(command, timeout=timeout)
+
+    def shell(self, device: str, command: str, timeout: float = 30) -> str:
+        """Run command on device and return stripped stdout."""
+        return self.run(device, command, timeout=timeout)[1]
+
+    def close(self, device: str) -> None:
+        """Close the session for a device (call when the device disconnects)."""
+        with self._lock:
+            session = self._sessions.pop(device, None)
+        if session:
+            session.close()
+
+    def close_all(self) -> None:
+        """Close every open session."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-device session counters (for debugging/monitoring)."""
+        with self._lock:
+            return {
+                device: {
+                    'alive': s.alive,
+                    'commands_run': s.commands_run,
+                    'restarts': s.restarts,
+                }
+                for device, s in self._sessions.items()
+            }
+
+
+_pool: Optional[AdbShellPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_shell_pool() -> AdbShellPool:
+    """Get the process-wide AdbShellPool (created on first use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = AdbShellPool()
+            atexit.register(_pool.close_all)
+        return _pool
+
+
+def pooled_shell(device: str, command: str, timeout: float = 30) -> Tuple[int, str]:
+    """
+    Run a shell command via the pool, falling back to a one-shot subprocess.
+
+    This is the drop-in used by the existing ADB helpers: the pool is used when
+    Config.USE_ADB_SHELL_POOL is set, and any AdbShellError (session could not
+    start, device dropped mid-command) retries once as `adb -s <device> shell`.
+    Timeouts are NOT retried - they propagate as subprocess.TimeoutExpired.
+
+    Returns:
+        (returncode, stdout) with stdout stripped
+    """
+    if Config.USE_ADB_SHELL_POOL:
+        try:
+            return get_shell_pool().run(device, command, timeout=timeout)
+        except AdbShellError as e:
+            logger.warning(f"[ADB POOL] {e} - falling back to one-shot adb")
+
+    result = subprocess.run(
+        [Config.ADB_PATH, "-s", device, "shell", command],
+        capture_output=True, timeout=timeout,
+        encoding='utf-8', errors='replace'
+    )
+    return result.returncode, result.stdout.strip() if result.stdout else ""
+
+
+def close_device_shell(device: str) -> None:
+    """Drop the pooled session for a device, if the pool has been created."""
+    if _pool is not None:
+        _pool.close(device)
@@ -343,10 +343,13 @@ def cleanup_all_appium_servers(config: ParallelConfig) -> int:
     Returns:
         Number of servers killed
     """
+    from port_prober import probe_worker_ports
+
     killed = 0
+    table = probe_worker_ports(config, resolve_processes=False)
     for worker in config.workers:
-        manager = AppiumServerManager(worker, config)
-        if manager.is_healthy(timeout=2):
+        if table[worker.worker_id].healthy:
+            manager = AppiumServerManager(worker, config)
             logger.info(f"Found running Appium on port {worker.appium_port}, killing...")
             manager._kill_existing_on_port()
             killed += 1
@@ -363,12 +366,15 @@ def check_all_appium_servers(config: ParallelConfig) -> dict:
     Returns:
         Dict mapping worker_id to health status
     """
+    from port_prober import probe_worker_ports
+
+    # Probe all ports concurrently instead of one /status call per worker
+    table = probe_worker_ports(config, http_timeout=2, resolve_processes=False)
     status = {}
     for worker in config.workers:
-        manager = AppiumServerManager(worker, config)
         status[worker.worker_id] = {
             'port': worker.appium_port,
-            'healthy': manager.is_healthy(timeout=2),
+            'healthy': table[worker.worker_id].healthy,
             'url': worker.appium_url
         }
     return status
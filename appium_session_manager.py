@@ -0,0 +1,173 @@
+"""
+Appium Session Manager - reuse UiAutomator2 sessions across jobs on the same device.
+
+Creating a UiAutomator2 session installs/starts the UiAutomator2 server on the
+device and takes many seconds. When consecutive jobs on a worker hit the same
+device (always the case on GrapheneOS, where one Pixel serves many profiles),
+the previous session is still perfectly usable.
+
+The manager keeps at most one live session per (appium_url, udid). Before
+handing a session out again it runs one cheap validation command; only if that
+fails (UiAutomator2 crashed, Appium restarted, device rebooted) is a new
+session created.
+
+Usage:
+    session_manager = AppiumSessionManager()
+
+    driver = session_manager.get_session(appium_url, options)   # create or reuse
+    ...
+    session_manager.release(driver)   # job done, keep session alive
+    session_manager.discard(driver)   # session is broken / device going away
+    session_manager.discard_device(udid)   # device stopped, no driver at hand
+    session_manager.close_all()       # worker shutting down
+"""
+import logging
+from typing import Dict, Optional, Set, Tuple
+
+from appium import webdriver
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    """A cached session plus the capabilities it was created with."""
+
+    def __init__(self, driver: webdriver.Remote, caps_key: Tuple):
+        self.driver = driver
+        self.caps_key = caps_key
+        self.uses = 1
+
+
+class AppiumSessionManager:
+    """
+    Caches Appium sessions per (appium_url, udid) within one worker process.
+
+    Not thread-safe by design: each worker process runs one job at a time.
+    """
+
+    # Capabilities that must match for a cached session to be reusable
+    _IDENTITY_CAPS = (
+        'appium:udid', 'udid',
+        'appium:systemPort', 'systemPort',
+        'appium:automationName', 'automationName',
+    )
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: If False, behaves like plain webdriver.Remote/quit (no reuse).
+        """
+        self.enabled = enabled
+        self._sessions: Dict[Tuple[str, str], _Entry] = {}
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def _udid(options) -> str:
+        caps = options.to_capabilities()
+        return caps.get('appium:udid') or caps.get('udid') or ''
+
+    @classmethod
+    def _caps_key(cls, options) -> Tuple:
+        caps = options.to_capabilities()
+        return tuple((name, str(caps.get(name))) for name in cls._IDENTITY_CAPS)
+
+    @staticmethod
+    def is_alive(driver: webdriver.Remote) -> bool:
+        """
+        Cheap validation: one round trip to the UiAutomator2 server.
+
+        current_package is answered by UiAutomator2 from the active window,
+        so it fails if the Appium session, the UiAutomator2 server or the
+        device connection is gone.
+        """
+        try:
+            return driver.session_id is not None and driver.current_package is not None
+        except Exception as e:
+            logger.debug(f"Session validation failed: {e}")
+            return False
+
+    def _quit(self, driver: webdriver.Remote) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass  # Session may already be dead
+
+    def get_session(self, appium_url: str, options) -> webdriver.Remote:
+        """
+        Return a live session for the device in options, reusing a cached one if healthy.
+
+        Args:
+            appium_url: Appium server URL
+            options: UiAutomator2Options (udid must be set)
+
+        Returns:
+            Connected webdriver.Remote
+
+        Raises:
+            Exception: If a new session cannot be created (same as webdriver.Remote)
+        """
+        key = (appium_url, self._udid(options))
+        caps_key = self._caps_key(options)
+
+        if self.enabled:
+            entry = self._sessions.get(key)
+            if entry is not None:
+                if entry.caps_key == caps_key and self.is_alive(entry.driver):
+                    entry.uses += 1
+                    self.reused += 1
+                    print(f"  Reusing Appium session {entry.driver.session_id[:8]} "
+                          f"(use #{entry.uses} on {key[1]})")
+                    return entry.driver
+                print(f"  Cached Appium session for {key[1]} is stale, recreating...")
+                self._sessions.pop(key, None)
+                self._quit(entry.driver)
+
+        driver = webdriver.Remote(command_executor=appium_url, options=options)
+        self.created += 1
+        if self.enabled:
+            self._sessions[key] = _Entry(driver, caps_key)
+        return driver
+
+    def _find(self, driver: webdriver.Remote) -> Optional[Tuple[str, str]]:
+        for key, entry in self._sessions.items():
+            if entry.driver is driver:
+                return key
+        return None
+
+    def release(self, driver: Optional[webdriver.Remote]) -> None:
+        """Job finished with this session; keep it for the next job (or quit if unmanaged)."""
+        if driver is None:
+            return
+        if not self.enabled or self._find(driver) is None:
+            self._quit(driver)
+
+    def discard(self, driver: Optional[webdriver.Remote]) -> None:
+        """Quit a session and forget it (crash recovery, phone shutting down)."""
+        if driver is None:
+            return
+        key = self._find(driver)
+        if key is not None:
+            self._sessions.pop(key, None)
+        self._quit(driver)
+
+    def discard_device(self, udid: str) -> int:
+        """Quit and forget every cached session on a device (phone stopped). Returns how many."""
+        keys = [key for key in self._sessions if key[1] == udid]
+        for key in keys:
+            self._quit(self._sessions.pop(key).driver)
+        return len(keys)
+
+    def session_ids(self) -> Set[str]:
+        """Session IDs currently cached (so orphan cleanup can skip them)."""
+        return {e.driver.session_id for e in self._sessions.values() if e.driver.session_id}
+
+    def close_all(self) -> None:
+        """Quit every cached session (worker shutdown)."""
+        for entry in list(self._sessions.values()):
+            self._quit(entry.driver)
+        self._sessions.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for worker summary logs."""
+        return {'created': self.created, 'reused': self.reused, 'cached': len(self._sessions)}
@@ -0,0 +1,201 @@
+"""
+Black Box - bounded in-memory recorder for the navigation loop.
+
+FlowLogger writes every step of every post to disk, and ErrorDebugger only
+sees the moment of failure. The black box sits in between: it keeps the last
+capacity steps of a job in a ring buffer (UI elements, detected screen,
+action, timings, posting state and optionally a screenshot) and writes them
+out only when post() fails or runs out of steps. A successful post does no
+debug I/O at all; the buffer is simply dropped.
+
+Flushed recordings go to <BLACK_BOX_DIR>/<account>_<timestamp>_<job>.json,
+with screenshots (downscaled to BLACK_BOX_SCREENSHOT_WIDTH when Pillow is
+installed) saved next to them as <same name>_step_NNN.png.
+
+Usage:
+    box = BlackBoxRecorder(account="phone1", job_id="video123")
+    entry = box.record(step, elements, screen_type="VIDEO_EDITING", action=action,
+                       timings={"dump_ui": 0.8, "navigate": 0.01})
+    entry["timings"]["action"] = 1.2           # fill in once the action ran
+    ...
+    box.flush("max_steps", final_elements)     # on failure only
+"""
+import io
+import json
+import os
+import re
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from flow_logger import compute_screen_signature, format_elements_full
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+
+class BlackBoxRecorder:
+    """Ring buffer of the last navigation steps of one job."""
+
+    def __init__(
+        self,
+        account: str,
+        job_id: str,
+        capacity: int = None,
+        screenshots: bool = None,
+        output_dir: str = None
+    ):
+        """
+        Args:
+            account: Account/phone name
+            job_id: Job identifier (used in the flush file name)
+            capacity: Steps kept (default: Config.BLACK_BOX_STEPS)
+            screenshots: Also keep a screenshot per step (default: Config.BLACK_BOX_SCREENSHOTS)
+            output_dir: Where flushes go (default: Config.BLACK_BOX_DIR)
+        """
+        self.account = account
+        self.job_id = str(job_id)
+        self.capacity = max(1, capacity or Config.BLACK_BOX_STEPS)
+        self.screenshots = Config.BLACK_BOX_SCREENSHOTS if screenshots is None else screenshots
+        self.output_dir = output_dir or Config.BLACK_BOX_DIR
+        self.started = time.time()
+        self.steps_seen = 0
+        self._steps = deque(maxlen=self.capacity)
+
+    def record(
+        self,
+        step: int,
+        elements: List[Dict],
+        screen_type: str = None,
+        confidence: float = None,
+        used_ai: bool = False,
+        action: Dict[str, Any] = None,
+        state: Dict[str, Any] = None,
+        timings: Dict[str, float] = None,
+        driver=None,
+        note: str = None
+    ) -> Dict[str, Any]:
+        """
+        Add one step, evicting the oldest once the buffer is full.
+
+        Elements are kept by reference and only formatted on flush.
+
+        Returns:
+            The stored entry, so the caller can add timings after the action ran
+        """
+        self.steps_seen += 1
+        entry = {
+            "step": step,
+            "timestamp": datetime.now().isoformat(),
+            "elements": elements or [],
+            "screen_type": screen_type,
+            "confidence": confidence,
+            "used_ai": used_ai,
+            "action": dict(action) if action else None,
+            "state": dict(state) if state else {},
+            "timings": dict(timings) if timings else {},
+        }
+        if note:
+            entry["note"] = note
+        if self.screenshots and driver is not None:
+            try:
+                entry["screenshot_png"] = driver.get_screenshot_as_png()
+            except Exception:
+                pass
+        self._steps.append(entry)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def clear(self):
+        """Drop the buffer (e.g. after a successful post)."""
+        self._steps.clear()
+
+    @staticmethod
+    def _downscale(png: bytes) -> bytes:
+        """Shrink a screenshot to BLACK_BOX_SCREENSHOT_WIDTH (unchanged without Pillow)."""
+        if not HAS_PIL:
+            return png
+        try:
+            image = Image.open(io.BytesIO(png))
+            width = Config.BLACK_BOX_SCREENSHOT_WIDTH
+            if image.width > width:
+                image = image.resize((width, max(1, image.height * width // image.width)))
+            out = io.BytesIO()
+            image.save(out, format="PNG", optimize=True)
+            return out.getvalue()
+        except Exception:
+            return png
+
+    def flush(self, reason: str, final_elements: List[Dict] = None,
+              context: Dict[str, Any] = None) -> Optional[str]:
+        """
+        Write the buffered steps to disk and clear the buffer.
+
+        Args:
+            reason: Why the job failed (error type, "max_steps", ...)
+            final_elements: UI elements at the time of failure, if known
+            context: Extra fields stored with the recording
+
+        Returns:
+            Path of the recording, or None if nothing was written
+        """
+        if not self._steps and not final_elements:
+            return None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_job = re.sub(r'[^A-Za-z0-9_.-]', '_', self.job_id)[:60]
+        base = os.path.join(
+            self.output_dir,
+            f"{self.account}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{safe_job}"
+        )
+
+        steps = []
+        for entry in self._steps:
+            entry = dict(entry)
+            elements = entry.pop("elements")
+            entry["screen_signature"] = compute_screen_signature(elements)
+            entry["elements_count"] = len(elements)
+            entry["ui_elements"] = format_elements_full(elements)
+            png = entry.pop("screenshot_png", None)
+            if png:
+                screenshot_file = f"{base}_step_{entry['step']:03d}.png"
+                try:
+                    with open(screenshot_file, "wb") as f:
+                        f.write(self._downscale(png))
+                    entry["screenshot"] = screenshot_file
+                except OSError:
+                    pass
+            steps.append(entry)
+
+        recording = {
+            "account": self.account,
+            "job_id": self.job_id,
+            "reason": reason,
+            "flushed_at": datetime.now().isoformat(),
+            "duration_seconds": round(time.time() - self.started, 2),
+            "steps_seen": self.steps_seen,
+            "steps_kept": len(steps),
+            "context": context or {},
+            "steps": steps,
+            "final_ui_elements": format_elements_full(final_elements) if final_elements else None,
+        }
+
+        path = f"{base}.json"
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(recording, f, indent=2, ensure_ascii=False, default=str)
+        except OSError as e:
+            print(f"  [BLACK BOX] Failed to write recording: {e}")
+            return None
+        finally:
+            self._steps.clear()
+
+        print(f"  [BLACK BOX] Last {len(steps)} step(s) saved: {path}")
+        return path
@@ -0,0 +1,356 @@
+"""
+Multi-Campaign Scheduler - one worker pool shared by several campaigns.
+
+Each campaign keeps its own progress.csv (its own daily ledger), but workers
+no longer belong to a campaign. Every time a worker needs a job it asks the
+scheduler, which picks the campaign by weighted fair queuing:
+
+- Each campaign has a virtual time. Dispatching a job advances it by
+  1 / weight, so a weight-2 campaign receives twice the jobs of a weight-1
+  campaign while both have work.
+- The campaign with the lowest virtual time goes first. If it has nothing
+  claimable right now (all accounts busy, at daily limit, retries not due),
+  the next one is tried, so idle capacity flows to the other campaigns.
+- A campaign that was passed over because it had nothing claimable is
+  raised to the virtual time of the campaign served instead, so it re-enters
+  at the current virtual time rather than cashing in credit it accumulated
+  while it had no work.
+- An optional per-campaign quota caps how many jobs it may dispatch per run.
+
+Scheduler state (virtual times, dispatch counts) lives in a small JSON file
+guarded by a file lock, because workers are separate processes.
+
+Usage:
+    shares = [CampaignShare.from_campaign(viral, weight=2),
+              CampaignShare.from_campaign(podcast, weight=1, quota=50)]
+    scheduler = MultiCampaignScheduler(shares, state_file="logs/multi_campaign_state.json")
+    scheduler.reset()
+    scheduler.save_spec("logs/multi_campaign_spec.json")   # passed to workers
+
+    # In a worker
+    scheduler = MultiCampaignScheduler.load_spec("logs/multi_campaign_spec.json")
+    job, tracker, is_retry = scheduler.claim_job(worker_id=0)
+"""
+
+import os
+import json
+import logging
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from progress_tracker import ProgressTracker
+
+# Cross-platform file locking (same strategy as ProgressTracker)
+try:
+    import portalocker
+    HAS_PORTALOCKER = True
+except ImportError:
+    HAS_PORTALOCKER = False
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CampaignShare:
+    """One campaign's slot in the shared pool."""
+    name: str
+    progress_file: str
+    weight: float = 1.0
+    quota: Optional[int] = None            # Max jobs dispatched per run (None = unlimited)
+    max_posts_per_account_per_day: int = 1
+
+    @classmethod
+    def from_campaign(cls, campaign, weight: float = 1.0, quota: int = None) -> 'CampaignShare':
+        """Build a share from a CampaignConfig."""
+        return cls(
+            name=campaign.name,
+            progress_file=campaign.progress_file,
+            weight=weight,
+            quota=quota,
+            max_posts_per_account_per_day=campaign.max_posts_per_account_per_day,
+        )
+
+
+class MultiCampaignScheduler:
+    """
+    Weighted fair queuing over several campaign progress files.
+
+    Exposes the queue-level calls the worker loop needs (get_stats,
+    release_stale_claims, get_retry_jobs) aggregated over all campaigns, plus
+    claim_job() which returns the claimed job together with the tracker of the
+    campaign it came from.
+    """
+
+    def __init__(self, shares: List[CampaignShare], state_file: str):
+        if not shares:
+            raise ValueError("MultiCampaignScheduler needs at least one campaign")
+        names = [s.name for s in shares]
+        if len(names) != len(set(names)):
+            raise ValueError(f"Duplicate campaign names: {names}")
+        for share in shares:
+            if share.weight <= 0:
+                raise ValueError(f"Campaign {share.name}: weight must be > 0, got {share.weight}")
+
+        self.shares = shares
+        self.state_file = state_file
+        self.lock_file = state_file + '.lock'
+        self.trackers: Dict[str, ProgressTracker] = {
+            s.name: ProgressTracker(s.progress_file) for s in shares
+        }
+
+    # ==================== SPEC / STATE FILES ====================
+
+    def save_spec(self, spec_file: str) -> None:
+        """Write the campaign list so worker processes can rebuild the scheduler."""
+        os.makedirs(os.path.dirname(spec_file) or '.', exist_ok=True)
+        with open(spec_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'state_file': self.state_file,
+                'campaigns': [asdict(s) for s in self.shares],
+            }, f, indent=2)
+
+    @classmethod
+    def load_spec(cls, spec_file: str) -> 'MultiCampaignScheduler':
+        """Rebuild a scheduler from a spec written by save_spec()."""
+        with open(spec_file, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        shares = [CampaignShare(**c) for c in spec['campaigns']]
+        return cls(shares, state_file=spec['state_file'])
+
+    def _acquire_lock(self, file_handle) -> None:
+        if HAS_PORTALOCKER:
+            portalocker.lock(file_handle, portalocker.LOCK_EX)
+        else:
+            msvcrt.locking(file_handle.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _release_lock(self, file_handle) -> None:
+        if HAS_PORTALOCKER:
+            portalocker.unlock(file_handle)
+        else:
+            try:
+                file_handle.seek(0)
+                msvcrt.locking(file_handle.fileno(), msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+
+    def _read_state(self) -> Dict[str, Dict[str, float]]:
+        state = {}
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Scheduler state unreadable ({e}), starting fresh")
+                state = {}
+        for share in self.shares:
+            state.setdefault(share.name, {'virtual_time': 0.0, 'dispatched': 0})
+        return state
+
+    def _write_state(self, state: Dict) -> None:
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def _locked_state(self, operation):
+        """Run operation(state) -> (state or None, result) under the scheduler lock."""
+        os.makedirs(os.path.dirname(self.lock_file) or '.', exist_ok=True)
+        with open(self.lock_file, 'w') as lock_handle:
+            self._acquire_lock(lock_handle)
+            try:
+                state = self._read_state()
+                state, result = operation(state)
+                if state is not None:
+                    self._write_state(state)
+                return result
+            finally:
+                self._release_lock(lock_handle)
+
+    def reset(self) -> None:
+        """Start a new run: zero virtual times and dispatch counts."""
+        self._locked_state(lambda state: (
+            {s.name: {'virtual_time': 0.0, 'dispatched': 0} for s in self.shares}, None
+        ))
+
+    # ==================== DISPATCH ====================
+
+    def _has_quota(self, share: CampaignShare, state: Dict) -> bool:
+        return share.quota is None or state[share.name]['dispatched'] < share.quota
+
+    @staticmethod
+    def _elsewhere(activity: Dict[str, Tuple[set, Dict[tuple, int]]], name: str
+                   ) -> Tuple[set, Dict[tuple, int]]:
+        """Claimed accounts and success counts of every campaign except `name`."""
+        busy = set()
+        posts: Dict[tuple, int] = {}
+        for other, (claimed, counts) in activity.items():
+            if other == name:
+                continue
+            busy |= claimed
+            for key, count in counts.items():
+                posts[key] = posts.get(key, 0) + count
+        return busy, posts
+
+    def claim_job(self, worker_id: int, only_accounts: Optional[set] = None
+                  ) -> Tuple[Optional[Dict[str, Any]], Optional[ProgressTracker], bool]:
+        """
+        Claim the next job from the campaign whose turn it is.
+
+        Retry jobs that are due are preferred within a campaign, exactly like
+        the single-campaign worker loop. only_accounts restricts the claim to
+        those accounts (see ProgressTracker.claim_next_job).
+
+        Campaigns may share accounts, so each campaign's claim also sees the
+        accounts claimed in the other campaigns and their successful posts:
+        one phone never runs two jobs, and daily limits count every campaign.
+
+        Returns:
+            (job, tracker, is_retry). job and tracker are None if no campaign
+            has a claimable job. job['campaign'] names the source campaign.
+        """
+        def _claim(state):
+            eligible = [s for s in self.shares if self._has_quota(s, state)]
+            # Lowest virtual time first; heavier campaigns win ties
+            eligible.sort(key=lambda s: (state[s.name]['virtual_time'], -s.weight))
+            if not eligible:
+                return None, (None, None, False)
+
+            # Read under the scheduler lock, so no other scheduler claim races these
+            activity = {share.name: self.trackers[share.name].get_account_activity()
+                        for share in self.shares}
+
+            skipped = []
+            for share in eligible:
+                tracker = self.trackers[share.name]
+                limit = share.max_posts_per_account_per_day
+                busy_elsewhere, posts_elsewhere = self._elsewhere(activity, share.name)
+
+                job = tracker.claim_retry_job(worker_id, max_posts_per_account_per_day=limit,
+                                              only_accounts=only_accounts,
+                                              exclude_accounts=busy_elsewhere,
+                                              extra_success_counts=posts_elsewhere)
+                is_retry = job is not None
+                if job is None:
+                    job = tracker.claim_next_job(worker_id, max_posts_per_account_per_day=limit,
+                                                 only_accounts=only_accounts,
+                                                 exclude_accounts=busy_elsewhere,
+                                                 extra_success_counts=posts_elsewhere)
+                if job is None:
+                    skipped.append(share)
+                    continue
+
+                entry = state[share.name]
+                start = entry['virtual_time']
+                # Campaigns with nothing claimable don't bank credit while idle
+                for idle in skipped:
+                    state[idle.name]['virtual_time'] = max(state[idle.name]['virtual_time'], start)
+                entry['virtual_time'] = start + 1.0 / share.weight
+                entry['dispatched'] += 1
+                job['campaign'] = share.name
+                logger.info(f"Worker {worker_id} dispatched from campaign {share.name} "
+                            f"(job {job['job_id']}, #{entry['dispatched']}"
+                            f"{'/' + str(share.quota) if share.quota is not None else ''})")
+                return state, (job, tracker, is_retry)
+
+            return None, (None, None, False)
+
+        return self._locked_state(_claim)
+
+    # ==================== AGGREGATED QUEUE VIEW ====================
+
+    def _quota_reached(self) -> Dict[str, bool]:
+        state = self._read_state()
+        return {s.name: not self._has_quota(s, state) for s in self.shares}
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Summed job counts over all campaigns.
+
+        Pending/retrying jobs of campaigns that used up their quota are
+        reported as skipped, so workers stop waiting for them.
+        """
+        quota_reached = self._quota_reached()
+        totals: Dict[str, int] = {}
+        for share in self.shares:
+            stats = self.trackers[share.name].get_stats()
+            if quota_reached[share.name]:
+                stats['skipped'] = stats.get('skipped', 0) + stats['pending'] + stats.get('retrying', 0)
+                stats['pending'] = stats['retrying'] = 0
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def get_campaign_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-campaign job counts plus dispatch share for status logs."""
+        state = self._read_state()
+        result = {}
+        for share in self.shares:
+            stats = self.trackers[share.name].get_stats()
+            stats['dispatched'] = state[share.name]['dispatched']
+            stats['weight'] = share.weight
+            stats['quota'] = share.quota
+            result[share.name] = stats
+        return result
+
+    def release_stale_claims(self, max_age_seconds: int = 600) -> int:
+        """Release stale claims in every campaign."""
+        return sum(t.release_stale_claims(max_age_seconds=max_age_seconds) for t in self.trackers.values())
+
+    def get_retry_jobs(self) -> List[Dict[str, Any]]:
+        """Due retry jobs across campaigns that still have quota."""
+        quota_reached = self._quota_reached()
+        jobs = []
+        for share in self.shares:
+            if not quota_reached[share.name]:
+                jobs.extend(self.trackers[share.name].get_retry_jobs())
+        return jobs
+
+    def get_open_jobs(self) -> List[Dict[str, Any]]:
+        """Pending and retrying jobs across campaigns that still have quota."""
+        quota_reached = self._quota_reached()
+        jobs = []
+        for share in self.shares:
+            if not quota_reached[share.name]:
+                jobs.extend(self.trackers[share.name].get_open_jobs())
+        return jobs
+
+    def get_recent_outcomes(self, window_minutes: float = 15) -> Dict[str, Any]:
+        """Recent attempt outcomes summed over all campaigns (see ProgressTracker)."""
+        totals: Dict[str, Any] = {'total': 0, 'success': 0, 'by_category': {}, 'by_type': {}}
+        for tracker in self.trackers.values():
+            outcomes = tracker.get_recent_outcomes(window_minutes)
+            totals['total'] += outcomes['total']
+            totals['success'] += outcomes['success']
+            for key in ('by_category', 'by_type'):
+                for name, count in outcomes[key].items():
+                    totals[key][name] = totals[key].get(name, 0) + count
+        return totals
+
+    def has_claimable_job(self, max_posts_per_account_per_day: int = None,
+                          only_accounts: Optional[set] = None) -> bool:
+        """True if claim_job would hand out a job right now (read-only, same checks)."""
+        quota_reached = self._quota_reached()
+        activity = {s.name: self.trackers[s.name].get_account_activity() for s in self.shares}
+        for share in self.shares:
+            if quota_reached[share.name]:
+                continue
+            busy_elsewhere, posts_elsewhere = self._elsewhere(activity, share.name)
+            if self.trackers[share.name].has_claimable_job(
+                share.max_posts_per_account_per_day, only_accounts,
+                exclude_accounts=busy_elsewhere, extra_success_counts=posts_elsewhere
+            ):
+                return True
+        return False
+
+    def next_retry_at(self, max_posts_per_account_per_day: int = None,
+                      only_accounts: Optional[set] = None) -> Optional[datetime]:
+        """Earliest claimable retry across campaigns that still have quota (each uses its own daily limit)."""
+        quota_reached = self._quota_reached()
+        times = [
+            self.trackers[s.name].next_retry_at(s.max_posts_per_account_per_day, only_accounts)
+            for s in self.shares if not quota_reached[s.name]
+        ]
+        times = [t for t in times if t is not None]
+        return min(times) if times else None
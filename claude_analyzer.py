@@ -12,6 +12,8 @@ from typing import List, Dict, Any, Optional
 
 import anthropic
 
+from metrics import metrics
+
 
 class ClaudeUIAnalyzer:
     """Analyzes UI elements using Claude AI to decide next actions."""
@@ -287,11 +289,12 @@ Only output JSON."""
 
         for attempt in range(retries):
             try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    messages=[{"role": "user", "content": prompt}]
-                )
+                with metrics.timer('geelark_ai_call_seconds', caller='navigation'):
+                    response = self.client.messages.create(
+                        model=self.model,
+                        max_tokens=self.max_tokens,
+                        messages=[{"role": "user", "content": prompt}]
+                    )
 
                 # Check for empty response
                 if not response.content:
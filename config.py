@@ -36,7 +36,8 @@ class Config:
     ANDROID_SDK_PATH: str = r"C:\Users\asus\Downloads\android-sdk"
 
     # ADB executable path - derived from SDK path for consistency
-    ADB_PATH: str = os.path.join(ANDROID_SDK_PATH, "platform-tools", "adb.exe")
+    # (ADB_PATH env var overrides it, e.g. the device simulator's fake adb)
+    ADB_PATH: str = os.environ.get("ADB_PATH") or os.path.join(ANDROID_SDK_PATH, "platform-tools", "adb.exe")
 
     # Project root directory
     PROJECT_ROOT: str = os.path.dirname(os.path.abspath(__file__))
@@ -63,6 +64,27 @@ class Config:
     SYSTEM_PORT_BASE: int = 8200
     SYSTEM_PORT_RANGE: int = 10  # Ports per worker
 
+    # ==================== AUTOSCALING ====================
+    # Used by worker_autoscaler.py when the orchestrator runs with --autoscale
+
+    # Never drop below this many workers while jobs remain
+    AUTOSCALE_MIN_WORKERS: int = 1
+
+    # Grow while backlog (pending + retrying) exceeds this many jobs per worker
+    AUTOSCALE_JOBS_PER_WORKER: int = 5
+
+    # Shrink when this fraction of recent attempts failed on ADB/Appium/Geelark
+    AUTOSCALE_INFRA_ERROR_RATE: float = 0.3
+    AUTOSCALE_MIN_SAMPLES: int = 5
+    AUTOSCALE_ERROR_WINDOW_MINUTES: int = 15
+
+    # Host limits (percent) - shrink above, never grow at or above
+    AUTOSCALE_CPU_PERCENT: float = 85.0
+    AUTOSCALE_MEMORY_PERCENT: float = 85.0
+
+    # Minimum seconds between scaling steps (>= the 60s worker start stagger)
+    AUTOSCALE_COOLDOWN_SECONDS: int = 120
+
     # ==================== JOB EXECUTION ====================
 
     # Maximum posts per account per day (prevents account bans)
@@ -77,6 +99,38 @@ class Config:
     # Shutdown timeout in seconds
     SHUTDOWN_TIMEOUT: int = 60
 
+    # Daily posting windows for PostingScheduler ("HH:MM-HH:MM", local time).
+    # Each account's posts are spread across them; empty = post as soon as possible
+    POSTING_WINDOWS: tuple = ()
+
+    # Minimum minutes between two posts of the same account (only applied with POSTING_WINDOWS)
+    MIN_ACCOUNT_SPACING_MINUTES: int = 120
+
+    # Open Instagram's reel composer with an ACTION_SEND intent for the uploaded
+    # video instead of navigating the gallery picker (regular flow stays the fallback)
+    SHARE_INTENT_POSTING: bool = False
+
+    # Instagram activity that receives shared videos as a reel
+    INSTAGRAM_REEL_SHARE_ACTIVITY: str = "com.instagram.android/com.instagram.share.handleractivity.ReelShareHandlerActivity"
+
+    # Screen checks (2s apart) for the composer to show up after the share intent
+    SHARE_INTENT_CHECKS: int = 4
+
+    # ==================== VIDEO PREFLIGHT ====================
+
+    # Probe campaign videos (MP4 atoms + ffprobe) when seeding; invalid videos get no job
+    VIDEO_PREFLIGHT: bool = True
+
+    # Processes probing videos in parallel
+    VIDEO_PREFLIGHT_WORKERS: int = 4
+
+    # Probe results by path, reused while the file's size and mtime are unchanged
+    VIDEO_PREFLIGHT_CACHE: str = "video_preflight_cache.json"
+
+    # Remux videos whose moov atom comes after the media data to faststart MP4
+    # (in place, stream copy, needs ffmpeg)
+    VIDEO_FASTSTART_REMUX: bool = False
+
     # ==================== RETRY SETTINGS ====================
 
     # Maximum retry attempts for failed jobs
@@ -85,11 +139,100 @@ class Config:
     # Delay between retries in minutes
     RETRY_DELAY_MINUTES: int = 5
 
+    # Continuous retry mode (--continuous-retry): per-job exponential backoff
+    # base * 2^(retry-1), capped, times a random factor in [1-jitter, 1+jitter]
+    RETRY_BACKOFF_BASE_SECONDS: float = 60.0
+    RETRY_BACKOFF_MAX_SECONDS: float = 1800.0
+    RETRY_BACKOFF_JITTER: float = 0.5
+
     # Non-retryable error types
     NON_RETRYABLE_ERRORS: frozenset = frozenset({
         'suspended', 'captcha', 'loggedout', 'actionblocked', 'banned'
     })
 
+    # ==================== ACCOUNT HEALTH ====================
+    # Used by account_health.py to order claims by expected success
+
+    # Half-life of the decayed success rate
+    ACCOUNT_HEALTH_HALF_LIFE_HOURS: float = 48.0
+
+    # Accounts scoring below this are flaky and deferred to off-peak windows
+    ACCOUNT_HEALTH_FLAKY_SCORE: float = 0.35
+
+    # When flaky accounts may post ("HH:MM-HH:MM", local time)
+    ACCOUNT_HEALTH_OFF_PEAK_WINDOWS: tuple = ("00:00-07:00",)
+
+    # ==================== METRICS ====================
+
+    # Default port for parallel_orchestrator.py --metrics-port (served on 127.0.0.1 only)
+    METRICS_PORT: int = 9108
+
+    # Workers flush their metrics here (one JSON file per process) for the orchestrator to merge
+    METRICS_DIR: str = "metrics"
+
+    # How often a process writes its metrics file
+    METRICS_FLUSH_SECONDS: float = 5.0
+
+    # Window for the jobs-per-minute gauge
+    METRICS_JOBS_WINDOW_MINUTES: int = 5
+
+    # ==================== DEVICE FLEET ====================
+
+    # GrapheneOS fleet: consecutive failed attachment checks before a device's
+    # worker stops (its jobs stay pending until the device is back)
+    FLEET_MAX_DEVICE_MISSES: int = 3
+
+    # Seconds a fleet worker waits between attachment checks while its device is missing
+    FLEET_RECHECK_SECONDS: float = 30.0
+
+    # ==================== DEBUG CAPTURE ====================
+
+    # Per-step screenshots taken by ErrorDebugger.log_step (on a background thread):
+    #   "errors" - none; only capture_error takes a screenshot
+    #   "every_n" - every STEP_SCREENSHOT_EVERY-th step, written to disk
+    #   "ring"   - every step kept in memory, last STEP_SCREENSHOT_RING_SIZE written on failure
+    #   "all"    - every step written to disk
+    STEP_SCREENSHOT_MODE: str = "ring"
+
+    # Step interval for "every_n"
+    STEP_SCREENSHOT_EVERY: int = 5
+
+    # Frames kept for "ring"
+    STEP_SCREENSHOT_RING_SIZE: int = 5
+
+    # Navigation steps kept in memory per job by the black box recorder,
+    # written to BLACK_BOX_DIR only when a post fails or hits max_steps
+    BLACK_BOX_STEPS: int = 15
+
+    # Also keep a screenshot per black box step (one extra round trip per step)
+    BLACK_BOX_SCREENSHOTS: bool = False
+
+    # Width black box screenshots are downscaled to when written (needs Pillow)
+    BLACK_BOX_SCREENSHOT_WIDTH: int = 360
+
+    # Directory for black box recordings
+    BLACK_BOX_DIR: str = "black_box"
+
+    # Write FlowLogger's full per-step log (flow_analysis/) for every post.
+    # Off = only the black box records steps, so successful posts do no debug I/O
+    FLOW_LOGGING: bool = True
+
+    # ==================== FOLLOWING ====================
+    # Used by follow_worker.py / follow_single.py
+
+    # Targets claimed per session (one account, one phone boot); 1 = old one-follow-per-boot behaviour
+    FOLLOW_BUNDLE_SIZE: int = 5
+
+    # Random pause between two follows of one session, in seconds
+    FOLLOW_PAUSE_MIN_SECONDS: float = 20.0
+    FOLLOW_PAUSE_MAX_SECONDS: float = 60.0
+
+    # Open target profiles with a deep link (VIEW intent) before falling back to search
+    FOLLOW_DEEP_LINK: bool = True
+
+    # Screen checks (2s apart) for the deep-linked profile to show up
+    FOLLOW_DEEP_LINK_CHECKS: int = 3
+
     # ==================== FILES ====================
 
     # Progress file for parallel workers
@@ -98,6 +241,12 @@ class Config:
     # Scheduler state file
     STATE_FILE: str = "scheduler_state.json"
 
+    # Scheduler state is saved as deltas (<STATE_FILE>.wal); fold them into a snapshot every N saves
+    STATE_SNAPSHOT_EVERY: int = 100
+
+    # Persistent duplicate-detection index over batch_results_*.csv (rebuilt if missing)
+    DEDUPE_INDEX_FILE: str = "scheduler_dedupe_index.json"
+
     # Logs directory
     LOGS_DIR: str = "logs"
 
@@ -117,6 +266,17 @@ class Config:
     CAMPAIGN_PROGRESS_FILE: str = "progress.csv"
     CAMPAIGN_STATE_FILE: str = "scheduler_state.json"
 
+    # Platforms the parallel pipeline posts to (campaign.json "platform")
+    PLATFORMS: tuple = ("instagram", "tiktok")
+
+    # Platform for campaigns/jobs that do not name one
+    DEFAULT_PLATFORM: str = "instagram"
+
+    # Per-platform daily post limit per account as (platform, limit) pairs,
+    # e.g. (("tiktok", 2),). Counted separately per platform; unlisted
+    # platforms use the campaign/CLI limit
+    PLATFORM_MAX_POSTS_PER_DAY: tuple = ()
+
     # ==================== TIMEOUTS ====================
 
     # ADB command timeout
@@ -125,6 +285,10 @@ class Config:
     # ADB device readiness timeout
     ADB_READY_TIMEOUT: int = 90
 
+    # Route `adb shell` commands through persistent per-device sessions
+    # (adb_shell_pool.py) instead of spawning one adb process per command
+    USE_ADB_SHELL_POOL: bool = True
+
     # Appium connection timeout
     APPIUM_CONNECT_TIMEOUT: int = 60
 
@@ -194,6 +358,7 @@ class CampaignConfig:
     captions_file: str                     # Path to captions CSV
     max_posts_per_account_per_day: int = 1 # Daily limit per account
     enabled: bool = True                   # Whether campaign is active
+    platform: str = Config.DEFAULT_PLATFORM  # instagram or tiktok
 
     # CSV format configuration
     caption_column: str = "post_caption"   # Column name for caption text
@@ -270,6 +435,10 @@ class CampaignConfig:
         if videos_dir is None:
             raise ValueError(f"Campaign missing videos folder in: {base_dir}")
 
+        platform = settings.get('platform', Config.DEFAULT_PLATFORM).lower()
+        if platform not in Config.PLATFORMS:
+            raise ValueError(f"Campaign platform must be one of {Config.PLATFORMS}, got '{platform}'")
+
         # Detect CSV format by reading header
         caption_column = "post_caption"
         filename_column = "filename"
@@ -294,6 +463,7 @@ class CampaignConfig:
             captions_file=captions_file,
             max_posts_per_account_per_day=settings.get('max_posts_per_account_per_day', 1),
             enabled=settings.get('enabled', True),
+            platform=platform,
             caption_column=caption_column,
             filename_column=filename_column,
         )
@@ -2,13 +2,18 @@
 Real-time Dashboard for Geelark Instagram Automation
 Run: python dashboard.py  |  Open: http://localhost:5000
 """
-import os, json
+import os, json, time, heapq, threading
 from datetime import datetime
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, render_template_string, jsonify, request, Response, stream_with_context
+from state_journal import read_state, WAL_SUFFIX
 
 app = Flask(__name__)
 STATE_FILE = "scheduler_state.json"
 LOG_FILE = "scheduler_live.log"
+LOG_TAIL_BYTES = 64 * 1024      # First fetch starts this far from the end of the log
+LOG_MAX_READ = 256 * 1024       # Max bytes read per request/stream tick
+STREAM_INTERVAL = 1.0           # Seconds between file checks in /api/stream
+STREAM_KEEPALIVE = 15.0         # Seconds between keep-alive comments (detects closed tabs)
 
 HTML = """
 <!DOCTYPE html><html><head><meta charset="UTF-8"><title>Dashboard</title>
@@ -69,7 +74,7 @@ h1{font-size:2em;color:#00d4ff}
 <div id="log-container"></div>
 </div>
 </div></div>
-<div id="refresh">Auto-refresh: 2s</div>
+<div id="refresh">Connecting...</div>
 <script>
 var lastLogLine=0;
 var autoScroll=true;
@@ -81,15 +86,13 @@ function toggleScroll(){
 
 function clearLogs(){
   document.getElementById('log-container').innerHTML='';
-  lastLogLine=0;
 }
 
 function escapeHtml(t){
   return t.replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;');
 }
 
-function updateStatus(){
-  fetch('/api/status').then(r=>r.json()).then(d=>{
+function renderStatus(d){
     document.getElementById('s-ok').textContent=d.stats.success;
     document.getElementById('s-act').textContent=d.stats.in_progress;
     document.getElementById('s-pend').textContent=d.stats.pending;
@@ -102,11 +105,9 @@ function updateStatus(){
     var af=document.getElementById('activity');
     af.innerHTML=d.recent_activity.map(a=>'<div class="act"><span class="time">'+a.time+'</span> <b>'+a.account+'</b>: '+a.status+(a.video?' ('+a.video+')':'')+'</div>').join('');
     document.getElementById('last').textContent='Updated: '+new Date().toLocaleTimeString();
-  });
 }
 
-function updateLogs(){
-  fetch('/api/logs?since='+lastLogLine).then(r=>r.json()).then(d=>{
+function appendLogs(d){
     if(d.lines && d.lines.length>0){
       var container=document.getElementById('log-container');
       d.lines.forEach(function(line){
@@ -124,23 +125,45 @@ function updateLogs(){
         }
         container.appendChild(div);
       });
-      lastLogLine=d.last_line;
       if(autoScroll) container.scrollTop=container.scrollHeight;
     }
-  });
+    lastLogLine=d.last_line;
+}
+
+function updateStatus(){
+  fetch('/api/status').then(r=>r.json()).then(renderStatus);
+}
+
+function updateLogs(){
+  fetch('/api/logs?since='+lastLogLine).then(r=>r.json()).then(appendLogs);
+}
+
+// Push updates over server-sent events; fall back to polling if unsupported/closed
+var timers=[];
+function startPolling(){
+  if(timers.length) return;
+  updateStatus();
+  updateLogs();
+  timers=[setInterval(updateStatus,3000),setInterval(updateLogs,1500)];
+  document.getElementById('refresh').textContent='Auto-refresh: polling';
 }
 
-updateStatus();
-updateLogs();
-setInterval(updateStatus,3000);
-setInterval(updateLogs,1500);
+if(window.EventSource){
+  var es=new EventSource('/api/stream');
+  es.addEventListener('status',function(e){renderStatus(JSON.parse(e.data));});
+  es.addEventListener('logs',function(e){appendLogs(JSON.parse(e.data));});
+  es.onerror=function(){if(es.readyState===EventSource.CLOSED) startPolling();};
+  document.getElementById('refresh').textContent='Live';
+}else{
+  startPolling();
+}
 </script></body></html>
 """
 
 def load_state():
-    if not os.path.exists(STATE_FILE): return {"jobs":[],"accounts":{}}
-    try:
-        with open(STATE_FILE,'r',encoding='utf-8') as f: return json.load(f)
+    # Snapshot + the scheduler's delta log (bounded by STATE_SNAPSHOT_EVERY)
+    if not os.path.exists(STATE_FILE) and not os.path.exists(STATE_FILE+WAL_SUFFIX): return {"jobs":[],"accounts":{}}
+    try: return read_state(STATE_FILE)
     except: return {"jobs":[],"accounts":{}}
 
 def get_stats(jobs):
@@ -167,7 +190,8 @@ def get_accounts(jobs, accts):
     return list(acc.values())
 
 def get_activity(jobs,limit=20):
-    sj=sorted([j for j in jobs if j.get('last_attempt')or j.get('completed_at')],key=lambda x:x.get('completed_at')or x.get('last_attempt')or'',reverse=True)[:limit]
+    # Top-N instead of sorting every job
+    sj=heapq.nlargest(limit,[j for j in jobs if j.get('last_attempt')or j.get('completed_at')],key=lambda x:x.get('completed_at')or x.get('last_attempt')or'')
     act=[]
     for j in sj:
         t=j.get('completed_at')or j.get('last_attempt')or''
@@ -182,28 +206,72 @@ def get_current(jobs):
         if j.get('status')=='in_progress': return j
     return None
 
+class StateView:
+    """Dashboard view of the scheduler state, rebuilt only when the snapshot or delta log changes.
+    Shared by all polling tabs and streams, so N viewers cost one rebuild per state change."""
+    def __init__(self):
+        self.sig=None; self.view=None; self.version=0
+        self.lock=threading.Lock()
+
+    @staticmethod
+    def _signature():
+        sig=[]
+        for path in (STATE_FILE, STATE_FILE+WAL_SUFFIX):
+            try:
+                st=os.stat(path); sig.append((st.st_mtime_ns, st.st_size))
+            except OSError: sig.append(None)
+        return tuple(sig)
+
+    def get(self):
+        """(version, view); version changes whenever the view was rebuilt"""
+        sig=self._signature()
+        with self.lock:
+            if self.view is None or sig!=self.sig:
+                st=load_state()
+                jobs=st.get('jobs',[])
+                accts=st.get('accounts',{})
+                self.view={"stats":get_stats(jobs),"accounts":get_accounts(jobs,accts),"recent_activity":get_activity(jobs),"current_job":get_current(jobs)}
+                self.sig=sig; self.version+=1
+            return self.version, self.view
+
+state_view=StateView()
+
 def get_log_lines(since=0, limit=500):
-    """Read log lines from file starting at line number 'since'"""
-    if not os.path.exists(LOG_FILE):
-        return [], 0
+    """Read complete log lines starting at byte offset 'since'. Returns (lines, next_offset).
+    Only the new bytes are read (seek); offset 0 starts near the end of the log, and an offset past
+    the end (log was rotated/truncated) restarts from the beginning."""
     try:
-        with open(LOG_FILE, 'r', encoding='utf-8', errors='replace') as f:
-            lines = f.readlines()
-        # Return lines after 'since' index
-        new_lines = [l.rstrip() for l in lines[since:since+limit] if l.strip()]
-        return new_lines, len(lines)
-    except:
+        size=os.path.getsize(LOG_FILE)
+    except OSError:
         return [], 0
+    if since>size: since=0
+    try:
+        with open(LOG_FILE, 'rb') as f:
+            if since==0 and size>LOG_TAIL_BYTES:
+                f.seek(size-LOG_TAIL_BYTES); f.readline()  # Skip the partial first line
+                since=f.tell()
+            f.seek(since)
+            chunk=f.read(min(size-since, LOG_MAX_READ))
+    except OSError:
+        return [], since
+    lines=chunk.split(b'\n')[:-1]  # Last piece is incomplete (or empty)
+    lines=lines[:limit]
+    next_offset=since+sum(len(l)+1 for l in lines)
+    if not lines and len(chunk)>=LOG_MAX_READ: next_offset=since+len(chunk)  # Skip a huge unterminated line
+    new_lines=[l.decode('utf-8',errors='replace').rstrip() for l in lines if l.strip()]
+    return new_lines, next_offset
+
+def sse(event, data, event_id=None):
+    msg=f"event: {event}\n"
+    if event_id is not None: msg+=f"id: {event_id}\n"
+    return msg+f"data: {json.dumps(data)}\n\n"
 
 @app.route('/')
 def index(): return render_template_string(HTML)
 
 @app.route('/api/status')
 def api_status():
-    st=load_state()
-    jobs=st.get('jobs',[])
-    accts=st.get('accounts',{})
-    return jsonify({"stats":get_stats(jobs),"accounts":get_accounts(jobs,accts),"recent_activity":get_activity(jobs),"current_job":get_current(jobs)})
+    return jsonify(state_view.get()[1])
 
 @app.route('/api/logs')
 def api_logs():
@@ -211,10 +279,31 @@ def api_logs():
     lines, total = get_log_lines(since)
     return jsonify({"lines": lines, "last_line": total, "since": since})
 
+@app.route('/api/stream')
+def api_stream():
+    """Server-sent events: 'status' when the state view changes, 'logs' with only the new lines.
+    A reconnecting browser sends Last-Event-ID (the log offset) and resumes where it left off."""
+    offset=request.headers.get('Last-Event-ID', 0, type=int)
+    def generate(offset):
+        sent_version=None; last_send=time.time()
+        while True:
+            version, view=state_view.get()
+            if version!=sent_version:
+                yield sse('status', view); sent_version=version; last_send=time.time()
+            lines, new_offset=get_log_lines(offset)
+            if new_offset!=offset:
+                offset=new_offset
+                yield sse('logs', {"lines": lines, "last_line": offset}, event_id=offset); last_send=time.time()
+            if time.time()-last_send>=STREAM_KEEPALIVE:
+                yield ": keep-alive\n\n"; last_send=time.time()
+            time.sleep(STREAM_INTERVAL)
+    return Response(stream_with_context(generate(offset)), mimetype='text/event-stream',
+                    headers={'Cache-Control':'no-cache','X-Accel-Buffering':'no'})
+
 if __name__=='__main__':
     print("\n"+"="*50)
     print("  Instagram Automation Dashboard")
     print("="*50)
     print("\n  Open: http://localhost:5000")
     print("  Ctrl+C to stop\n")
-    app.run(host='0.0.0.0',port=5000,debug=False)
+    app.run(host='0.0.0.0',port=5000,debug=False,threaded=True)  # One thread per open stream
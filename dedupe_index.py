@@ -0,0 +1,255 @@
+"""
+Dedupe Index - in-memory view of what PostingScheduler has already posted.
+
+get_already_posted_from_csv() and get_accounts_posted_today() used to glob
+and re-parse every batch_results_*.csv (plus scheduler_state.json) on each
+call, and get_next_job() calls the latter for every job - so the scheduler
+loop got slower with every day of history. The index keeps the answers in
+memory and only ingests what changed:
+
+- Per results CSV it remembers the byte offset it has parsed up to and the
+  file's mtime. New rows appended since are parsed from that offset; an
+  unchanged file costs one stat. A file that shrank or was rewritten in
+  place (same size, new mtime) triggers a full rebuild.
+- Success shortcodes and per-day accounts (day taken from the file name,
+  batch_results_YYYYMMDD*.csv) are kept as sets.
+- scheduler_state.json and its .wal delta log are re-read together
+  (state_journal.read_state) only when either file's mtime/size changes,
+  so successes still in the log count before the next snapshot.
+- Offsets and sets are persisted to Config.DEDUPE_INDEX_FILE (at most every
+  PERSIST_INTERVAL_SECONDS), so a restarted scheduler resumes from the saved
+  offsets instead of re-reading the whole history. Offsets and sets are
+  saved together, so a stale index file is never wrong - just behind.
+
+Only complete lines are ingested; a row still being written is picked up on
+the next call.
+"""
+import csv
+import glob
+import io
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Set
+
+from config import Config
+from state_journal import WAL_SUFFIX, read_state
+
+logger = logging.getLogger(__name__)
+
+RESULTS_PREFIX = "batch_results_"
+PERSIST_INTERVAL_SECONDS = 60
+INDEX_VERSION = 1
+
+
+class DedupeIndex:
+    """Incrementally maintained success shortcodes and per-day posting accounts."""
+
+    def __init__(self, results_glob: str = RESULTS_PREFIX + "*.csv",
+                 state_file: str = None, index_file: str = None):
+        self.results_glob = results_glob
+        self.state_file = state_file or Config.STATE_FILE
+        self.index_file = index_file or Config.DEDUPE_INDEX_FILE
+
+        # path -> {'offset', 'mtime', 'fieldnames'}
+        self.files: Dict[str, Dict] = {}
+        self.shortcodes: Set[str] = set()
+        self.accounts_by_day: Dict[str, Set[str]] = {}
+
+        # scheduler_state.json contributions (replaced whenever the file changes)
+        self._state_sig = None
+        self.state_shortcodes: Set[str] = set()
+        self.state_accounts: Set[str] = set()
+
+        self._dirty = False
+        self._last_persist = 0.0
+        self._load()
+
+    # ==================== PERSISTENCE ====================
+
+    def _load(self):
+        """Resume from the persisted index (start empty if missing or unreadable)."""
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                return
+            self.files = data.get('files', {})
+            self.shortcodes = set(data.get('shortcodes', []))
+            self.accounts_by_day = {day: set(accounts) for day, accounts in data.get('accounts_by_day', {}).items()}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Could not read {self.index_file}, rebuilding: {e}")
+            self._reset()
+
+    def save(self, force: bool = False):
+        """Write the index atomically if it changed (throttled unless force)."""
+        if not self._dirty:
+            return
+        if not force and time.time() - self._last_persist < PERSIST_INTERVAL_SECONDS:
+            return
+        data = {
+            'version': INDEX_VERSION,
+            'files': self.files,
+            'shortcodes': sorted(self.shortcodes),
+            'accounts_by_day': {day: sorted(accounts) for day, accounts in self.accounts_by_day.items()},
+        }
+        tmp_path = self.index_file + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_file)
+            self._dirty = False
+            self._last_persist = time.time()
+        except OSError as e:
+            logger.warning(f"Could not write {self.index_file}: {e}")
+
+    def _reset(self):
+        self.files = {}
+        self.shortcodes = set()
+        self.accounts_by_day = {}
+        self._dirty = True
+
+    # ==================== INGESTION ====================
+
+    @staticmethod
+    def _day_of(path: str) -> str:
+        """YYYYMMDD from batch_results_YYYYMMDD*.csv ('' if the name has no date)."""
+        name = os.path.basename(path)
+        day = name[len(RESULTS_PREFIX):len(RESULTS_PREFIX) + 8]
+        return day if day.isdigit() and len(day) == 8 else ''
+
+    def _ingest_rows(self, path: str, rows: List[List[str]], fieldnames: List[str]):
+        day = self._day_of(path)
+        for values in rows:
+            if not values:
+                continue
+            row = dict(zip(fieldnames, values))
+            if row.get('status') != 'success':
+                continue
+            # Handle both 'shortcode' column and first column as shortcode
+            shortcode = row.get('shortcode') or values[0]
+            if shortcode:
+                self.shortcodes.add(shortcode)
+            # Handle both 'phone' and 'account' column names
+            account = row.get('phone') or row.get('account')
+            if account and day:
+                self.accounts_by_day.setdefault(day, set()).add(account)
+
+    def _ingest_file(self, path: str, st: os.stat_result) -> bool:
+        """
+        Parse the complete lines appended since the recorded offset.
+
+        Returns:
+            False if the file was truncated/rewritten and the index must be rebuilt
+        """
+        meta = self.files.get(path)
+        if meta is not None:
+            if st.st_size < meta['offset']:
+                return False
+            if st.st_size == meta['offset']:
+                if st.st_mtime != meta['mtime']:
+                    return False  # Rewritten in place
+                return True
+
+        offset = meta['offset'] if meta else 0
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read(st.st_size - offset)
+        end = chunk.rfind(b'\n')
+        if end < 0:
+            return True  # Nothing complete yet
+
+        rows = list(csv.reader(io.StringIO(chunk[:end + 1].decode('utf-8', errors='replace'), newline='')))
+        if meta is None:
+            if not rows:
+                return True
+            meta = {'offset': 0, 'mtime': 0.0, 'fieldnames': rows[0]}
+            rows = rows[1:]
+
+        self._ingest_rows(path, rows, meta['fieldnames'])
+        meta['offset'] = offset + end + 1
+        meta['mtime'] = st.st_mtime
+        self.files[path] = meta
+        self._dirty = True
+        return True
+
+    def _refresh_results(self):
+        paths = glob.glob(self.results_glob)
+        for path in paths:
+            try:
+                st = os.stat(path)
+                if not self._ingest_file(path, st):
+                    logger.info(f"{path} changed underneath the dedupe index, rebuilding")
+                    self._reset()
+                    return self._refresh_results()
+            except OSError as e:
+                logger.warning(f"Could not read {path}: {e}")
+
+        # Forget files that were deleted (their rows stay: a post is a post)
+        for path in set(self.files) - set(paths):
+            del self.files[path]
+            self._dirty = True
+
+    def _refresh_state(self):
+        """Re-read scheduler state successes (snapshot + WAL) if either file changed."""
+        sig = tuple(self._file_sig(path) for path in (self.state_file, self.state_file + WAL_SUFFIX))
+        if sig == (None, None):
+            self._state_sig = None
+            self.state_shortcodes, self.state_accounts = set(), set()
+            return
+        if sig == self._state_sig:
+            return
+        try:
+            data = read_state(self.state_file)
+            successes = [job for job in data.get('jobs', []) if job.get('status') == 'success']
+            self.state_shortcodes = {job.get('id') for job in successes if job.get('id')}
+            self.state_accounts = {job.get('account') for job in successes if job.get('account')}
+            self._state_sig = sig
+        except Exception as e:
+            logger.warning(f"Could not read {self.state_file}: {e}")
+
+    @staticmethod
+    def _file_sig(path: str):
+        """(mtime, size) of a file, or None if it does not exist."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime, st.st_size)
+
+    def refresh(self):
+        """Ingest anything new from the results CSVs and the state file."""
+        self._refresh_results()
+        self._refresh_state()
+        self.save()
+
+    # ==================== QUERIES ====================
+
+    def posted_shortcodes(self) -> Set[str]:
+        """All shortcodes ever posted successfully."""
+        self.refresh()
+        return self.shortcodes | self.state_shortcodes
+
+    def is_posted(self, shortcode: str) -> bool:
+        """O(1) check for one shortcode (no set copies)."""
+        self.refresh()
+        return shortcode in self.shortcodes or shortcode in self.state_shortcodes
+
+    def accounts_posted_on(self, day: str) -> Set[str]:
+        """Accounts with a success in that day's results (plus state-file successes)."""
+        self.refresh()
+        return self.accounts_by_day.get(day, set()) | self.state_accounts
+
+
+_index: Optional[DedupeIndex] = None
+
+
+def get_dedupe_index() -> DedupeIndex:
+    """Process-wide index (loaded on first use)."""
+    global _index
+    if _index is None:
+        _index = DedupeIndex()
+    return _index
@@ -13,7 +13,7 @@ Implements the DeviceManager interface for Geelark cloud phones.
 """
 import subprocess
 import time
-from typing import Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
@@ -21,6 +21,11 @@ from appium.options.android import UiAutomator2Options
 from config import Config
 from device_manager_base import DeviceManager
 from geelark_client import GeelarkClient
+from adb_shell_pool import pooled_shell, close_device_shell
+from metrics import metrics
+
+if TYPE_CHECKING:
+    from appium_session_manager import AppiumSessionManager
 
 
 ADB_PATH = Config.ADB_PATH
@@ -107,7 +112,8 @@ def reconnect_adb_device(device_id: str, logger=None) -> bool:
         True if reconnect successful, False otherwise
     """
     try:
-        # First disconnect
+        # First disconnect (and drop any pooled shell on the old transport)
+        close_device_shell(device_id)
         subprocess.run([ADB_PATH, "disconnect", device_id],
                       capture_output=True, timeout=10)
 
@@ -141,7 +147,8 @@ class DeviceConnectionManager(DeviceManager):
         phone_name: str,
         system_port: int = 8200,
         appium_url: str = None,
-        geelark_client: GeelarkClient = None
+        geelark_client: GeelarkClient = None,
+        session_manager: 'AppiumSessionManager' = None
     ):
         """
         Initialize the connection manager.
@@ -151,6 +158,7 @@ class DeviceConnectionManager(DeviceManager):
             system_port: Port for UiAutomator2 server (unique per worker)
             appium_url: Appium server URL (default: from Config)
             geelark_client: Optional GeelarkClient instance (for dependency injection)
+            session_manager: Optional AppiumSessionManager to reuse sessions across jobs
         """
         self.client = geelark_client or GeelarkClient()
         self.phone_name = phone_name
@@ -159,11 +167,45 @@ class DeviceConnectionManager(DeviceManager):
         self.system_port = system_port
         self.appium_url = appium_url or Config.DEFAULT_APPIUM_URL
         self.appium_driver: Optional[webdriver.Remote] = None
+        self.session_manager = session_manager
+
+    def create_appium_session(self, options) -> webdriver.Remote:
+        """Create (or reuse, via session_manager) an Appium session."""
+        if self.session_manager:
+            return self.session_manager.get_session(self.appium_url, options)
+        return webdriver.Remote(command_executor=self.appium_url, options=options)
+
+    def release_appium(self) -> None:
+        """Done with the driver for this job: keep it cached if managed, else quit."""
+        driver, self.appium_driver = self.appium_driver, None
+        if driver is None:
+            return
+        if self.session_manager:
+            self.session_manager.release(driver)
+        else:
+            driver.quit()
+        print("  Appium driver released")
+
+    def discard_appium(self) -> None:
+        """Quit the driver and drop it from the session cache."""
+        driver, self.appium_driver = self.appium_driver, None
+        if driver is None:
+            return
+        if self.session_manager:
+            self.session_manager.discard(driver)
+        else:
+            driver.quit()
 
-    def adb_command(self, cmd: str, timeout: int = 30) -> str:
-        """Run ADB shell command on the connected device."""
+    def adb_command(self, cmd: str, timeout: int = 30, pooled: bool = True) -> str:
+        """Run ADB shell command on the connected device.
+
+        Commands go through the persistent per-device shell (adb_shell_pool)
+        unless pooled=False, which forces a one-shot `adb shell` process.
+        """
         if not self.device:
             raise Exception("No device connected - call connect() first")
+        if pooled:
+            return pooled_shell(self.device, cmd, timeout=timeout)[1]
         result = subprocess.run(
             [ADB_PATH, "-s", self.device, "shell", cmd],
             capture_output=True, timeout=timeout,
@@ -331,8 +373,11 @@ class DeviceConnectionManager(DeviceManager):
         """Authenticate with Geelark glogin command."""
         print("Authenticating with glogin...")
 
+        # glogin authorizes the ADB connection - run it one-shot and drop any
+        # pooled shell opened before authentication
+        close_device_shell(self.device)
         for glogin_attempt in range(3):
-            login_result = self.adb_command(f"glogin {password}")
+            login_result = self.adb_command(f"glogin {password}", pooled=False)
             if login_result and "error" not in login_result.lower():
                 print(f"  glogin: {login_result}")
                 return
@@ -366,6 +411,7 @@ class DeviceConnectionManager(DeviceManager):
             print(f"  [ADB RECONNECT] Failed to get ADB info: {e}")
             return False
 
+        close_device_shell(self.device)
         subprocess.run([ADB_PATH, "disconnect", self.device], capture_output=True)
         time.sleep(1)
 
@@ -379,7 +425,7 @@ class DeviceConnectionManager(DeviceManager):
             time.sleep(2)
             if self.verify_adb_connection():
                 print(f"  [ADB RECONNECT] Device ready after {attempt + 1} attempts")
-                login_result = self.adb_command(f"glogin {password}")
+                login_result = self.adb_command(f"glogin {password}", pooled=False)
                 print(f"  [ADB RECONNECT] glogin: {login_result}")
                 return True
             print(f"  [ADB RECONNECT] Waiting... ({attempt + 1}/10)")
@@ -428,10 +474,7 @@ class DeviceConnectionManager(DeviceManager):
                 print(f"  [ATTEMPT {attempt + 1}] ADB reconnected, proceeding with Appium")
 
             try:
-                self.appium_driver = webdriver.Remote(
-                    command_executor=self.appium_url,
-                    options=options
-                )
+                self.appium_driver = self.create_appium_session(options)
 
                 platform_ver = self.appium_driver.capabilities.get('platformVersion', 'unknown')
                 print(f"  Appium connected! (Android {platform_ver})")
@@ -450,8 +493,7 @@ class DeviceConnectionManager(DeviceManager):
         """Reconnect Appium driver after UiAutomator2 crash."""
         print("  [RECOVERY] Reconnecting Appium driver...")
         try:
-            if self.appium_driver:
-                self.appium_driver.quit()
+            self.discard_appium()
         except Exception:
             pass  # Ignore errors when quitting - driver may already be dead
         self.appium_driver = None
@@ -470,22 +512,32 @@ class DeviceConnectionManager(DeviceManager):
         phone = self.find_phone()
         self.phone_id = phone["id"]
 
-        self.start_phone_if_needed(phone)
+        with metrics.timer('geelark_phase_seconds', phase='phone_boot'):
+            self.start_phone_if_needed(phone)
 
-        adb_info = self.enable_adb_with_retry()
+        with metrics.timer('geelark_phase_seconds', phase='adb_connect'):
+            adb_info = self.enable_adb_with_retry()
+            self.connect_adb(adb_info)
 
-        self.connect_adb(adb_info)
-
-        self.connect_appium()
+        with metrics.timer('geelark_phase_seconds', phase='appium_session'):
+            self.connect_appium()
 
         return True
 
     def disconnect(self) -> None:
         """Disconnect and cleanup."""
+        if self.device:
+            close_device_shell(self.device)
+
+        # Phone is being stopped - a cached session would be dead next job
         try:
             if self.appium_driver:
-                self.appium_driver.quit()
+                self.discard_appium()
                 print("  Appium driver closed")
+            if self.session_manager and self.device:
+                # Also drops a session released earlier (cached without appium_driver)
+                if self.session_manager.discard_device(self.device):
+                    print("  Cached Appium session closed")
         except Exception:
             pass  # Ignore errors - cleanup should not fail
 
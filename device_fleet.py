@@ -0,0 +1,142 @@
+"""
+Device Fleet - several GrapheneOS Pixels, one worker per device.
+
+The physical-device path used to be a single phone (DEVICE_SERIAL with
+PROFILE_MAPPING). The fleet is a registry of serial -> {account: profile},
+read from DEVICE_FLEET in grapheneos_config.py (falling back to the single
+device when that is empty):
+
+- Routing: every account lives on exactly one device; a worker bound to a
+  serial only claims jobs for the accounts on that device.
+- Health: attachment is checked with check_device_attached (one `adb devices`
+  for the whole fleet). A device that is missing for max_misses checks in a
+  row is reported unhealthy; its worker stops and its jobs stay pending until
+  the device is back.
+
+The orchestrator starts one worker per attached device, so adding a Pixel
+adds a worker.
+
+Usage:
+    fleet = DeviceFleet.from_config()
+    fleet.check_health()
+    for serial in fleet.healthy_serials(): ...start a worker for serial...
+
+    serial = fleet.device_for_account("my_instagram_account")
+    accounts = fleet.accounts_on(serial)
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from config import Config
+from grapheneos_device_manager import check_device_attached, NoDeviceAttachedError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeviceHealth:
+    """Attachment history of one device."""
+    serial: str
+    attached: bool = False
+    consecutive_misses: int = 0
+    last_seen: str = ""
+    last_checked: str = ""
+
+
+class DeviceFleet:
+    """Registry of GrapheneOS devices and the accounts on each."""
+
+    def __init__(self, devices: Dict[str, Dict[str, int]], adb_path: str = None,
+                 max_misses: int = None):
+        """
+        Args:
+            devices: serial -> {account: Android user id}
+            adb_path: ADB executable (default: Config.ADB_PATH)
+            max_misses: Consecutive failed checks before a device is unhealthy
+                        (default: Config.FLEET_MAX_DEVICE_MISSES)
+
+        Raises:
+            ValueError: If the fleet is empty or an account is on two devices
+        """
+        if not devices:
+            raise ValueError("Device fleet is empty")
+
+        self.devices = {serial: dict(mapping) for serial, mapping in devices.items()}
+        self.adb_path = adb_path or Config.ADB_PATH
+        self.max_misses = max_misses or Config.FLEET_MAX_DEVICE_MISSES
+        self.health = {serial: DeviceHealth(serial) for serial in self.devices}
+
+        self._account_device: Dict[str, str] = {}
+        for serial, mapping in self.devices.items():
+            for account in mapping:
+                other = self._account_device.get(account)
+                if other is not None:
+                    raise ValueError(f"Account '{account}' is mapped on two devices: {other} and {serial}")
+                self._account_device[account] = serial
+
+    @classmethod
+    def from_config(cls, **kwargs) -> "DeviceFleet":
+        """Fleet from grapheneos_config (DEVICE_FLEET, or the single DEVICE_SERIAL)."""
+        from grapheneos_config import get_fleet_mapping
+        return cls(get_fleet_mapping(), **kwargs)
+
+    # ==================== ROUTING ====================
+
+    @property
+    def serials(self) -> List[str]:
+        return list(self.devices)
+
+    def device_for_account(self, account: str) -> Optional[str]:
+        """Serial of the device hosting the account's profile, or None if unmapped."""
+        return self._account_device.get(account)
+
+    def accounts_on(self, serial: str) -> Set[str]:
+        """Accounts whose profiles live on this device."""
+        return set(self.devices.get(serial, {}))
+
+    def profile_mapping(self, serial: str) -> Dict[str, int]:
+        """account -> Android user id for one device."""
+        return dict(self.devices.get(serial, {}))
+
+    # ==================== HEALTH ====================
+
+    def attached_serials(self) -> List[str]:
+        """Serials `adb devices` currently lists (empty if none or adb fails)."""
+        try:
+            _, attached = check_device_attached(self.adb_path)
+        except NoDeviceAttachedError:
+            return []
+        return attached
+
+    def check_health(self, serials: List[str] = None) -> Dict[str, bool]:
+        """
+        Check devices once (all by default) and update their health records.
+
+        Returns:
+            serial -> healthy, for the checked devices
+        """
+        attached = set(self.attached_serials())
+        now = datetime.now().isoformat()
+        checked = {serial: self.health[serial] for serial in (serials or self.health) if serial in self.health}
+        for serial, health in checked.items():
+            health.last_checked = now
+            health.attached = serial in attached
+            if health.attached:
+                health.consecutive_misses = 0
+                health.last_seen = now
+            else:
+                health.consecutive_misses += 1
+                logger.warning(f"Device {serial} not attached "
+                               f"({health.consecutive_misses}/{self.max_misses} checks)")
+        return {serial: self.is_healthy(serial) for serial in checked}
+
+    def is_healthy(self, serial: str) -> bool:
+        """False once the device has been missing for max_misses checks in a row."""
+        health = self.health.get(serial)
+        return health is not None and health.consecutive_misses < self.max_misses
+
+    def healthy_serials(self) -> List[str]:
+        """Devices that were attached at the last check."""
+        return [serial for serial, health in self.health.items() if health.attached]
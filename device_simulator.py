@@ -0,0 +1,1142 @@
+"""
+Device Simulator - local Geelark API, Appium and ADB fakes for load testing.
+
+Runs the real orchestrator/worker code against simulated cloud phones so
+throughput, lock contention and scheduling can be measured with 50+ workers
+on one Linux box, without Geelark credits, phones or Appium installs.
+
+Three fakes share one in-process state:
+
+1. Geelark API - the /open/v1 endpoints GeelarkClient calls (phone list/status/
+   start/stop, ADB enable/info, file upload, screenshot, root). Phones boot,
+   uploads complete and ADB becomes available after configurable delays.
+2. Appium - one W3C WebDriver endpoint per worker port. page_source replays a
+   recorded session from flow_analysis/*.jsonl; the recording advances to its
+   next screen when the worker performs the input that was recorded (tap,
+   typing, back, swipe).
+3. ADB - a tiny `adb` stand-in (this file, called through a generated wrapper
+   script) that forwards connect/devices/shell to the simulator, including the
+   persistent `adb shell` protocol used by adb_shell_pool.
+
+Latency and failure rates are injected per subsystem (see SimConfig).
+
+Redirection (set automatically by `loadtest`; print them with `serve`):
+    GEELARK_API_BASE   -> simulator URL (read by geelark_client.API_BASE)
+    GEELARK_TOKEN      -> any value
+    ADB_PATH           -> generated fake adb wrapper (read by Config.ADB_PATH)
+    POSTED_LEDGER_PATH -> scratch ledger so the real one is never touched
+
+Usage:
+    # Full load test: simulator + 50 real parallel_worker.py processes
+    python device_simulator.py loadtest --workers 50 --jobs 300
+
+    # Inject infrastructure trouble
+    python device_simulator.py loadtest --workers 20 --jobs 100 \\
+        --api-error-rate 0.05 --adb-drop-rate 0.01 --source-failure-rate 0.01
+
+    # Only run the fakes (point your own orchestrator run at them)
+    python device_simulator.py serve --workers 10 --accounts 40
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.request import Request, urlopen
+from xml.sax.saxutils import quoteattr
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_API_PORT = 8790
+SCREEN_WIDTH = 720
+SCREEN_HEIGHT = 1280
+INSTAGRAM_PACKAGE = "com.instagram.android"
+
+# Geelark phone status codes (see geelark_api_docs.txt)
+PHONE_STARTED = 0
+PHONE_STARTING = 1
+PHONE_STOPPED = 2
+
+# W3C element reference key
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# 1x1 transparent PNG for screenshot endpoints
+_PNG_1X1 = base64.b64encode(bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082"
+)).decode()
+
+# Recorded action -> input kind that advances the replay past that screen.
+# Screens whose action is not listed (wait, done, open_instagram, ...) advance
+# on the next page_source request after they were shown.
+_ADVANCE_ON = {
+    'tap': 'tap',
+    'tap_coordinate': 'tap',
+    'tap_and_type': 'type',
+    'back': 'key',
+    'home': 'key',
+    'scroll_up': 'swipe',
+    'scroll_down': 'swipe',
+}
+
+# After this many non-matching inputs on one screen the replay moves on anyway
+_MAX_MISMATCHED_INPUTS = 3
+
+
+@dataclass
+class SimConfig:
+    """Latency (min, max seconds) and failure injection settings."""
+    api_latency: Tuple[float, float] = (0.05, 0.3)
+    api_error_rate: float = 0.0           # Geelark returns code != 0
+    boot_seconds: float = 5.0             # phone/start -> status Started
+    adb_ready_seconds: float = 1.0        # adb/setStatus -> adb/getData succeeds
+    upload_seconds: float = 2.0           # phone/uploadFile -> status success
+    adb_latency: Tuple[float, float] = (0.005, 0.03)
+    adb_drop_rate: float = 0.0            # shell command finds the device offline
+    appium_latency: Tuple[float, float] = (0.01, 0.05)
+    session_create_seconds: float = 2.0   # UiAutomator2 session startup
+    session_failure_rate: float = 0.0     # POST /session fails
+    source_latency: Tuple[float, float] = (0.3, 1.0)   # dump_ui cost
+    source_failure_rate: float = 0.0      # page_source reports a UiAutomator2 crash
+    seed: Optional[int] = None
+
+
+# ==================== RECORDED FLOWS ====================
+
+def load_recorded_flows(flow_dir: str = None, successful_only: bool = True) -> List[List[Dict]]:
+    """
+    Load recorded posting sessions from flow_analysis/*.jsonl.
+
+    Each session is the list of its step records (ui_elements + action).
+    Sessions without a final success event are skipped unless successful_only=False.
+    """
+    flow_dir = flow_dir or os.path.join(PROJECT_ROOT, "flow_analysis")
+    flows = []
+    if not os.path.isdir(flow_dir):
+        return flows
+
+    for name in sorted(os.listdir(flow_dir)):
+        if not name.endswith('.jsonl'):
+            continue
+        steps, succeeded = [], False
+        try:
+            with open(os.path.join(flow_dir, name), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get('event') == 'success':
+                        succeeded = True
+                    elif isinstance(record.get('ui_elements'), list) and isinstance(record.get('action'), dict):
+                        steps.append(record)
+        except OSError:
+            continue
+        if steps and (succeeded or not successful_only):
+            flows.append(steps)
+    return flows
+
+
+def _fallback_flow() -> List[Dict]:
+    """Single 'Done posting' screen used when no recordings are available."""
+    return [{
+        'ui_elements': [{
+            'text': 'Done posting. Want to send it directly to friends?', 'desc': '',
+            'bounds': '[107,1186][588,1242]', 'clickable': False, 'id': 'status_text',
+        }],
+        'action': {'action': 'done'},
+    }]
+
+
+def _element_class(element: Dict) -> str:
+    res_id = (element.get('id') or '').lower()
+    if any(key in res_id for key in ('caption', 'edit', 'search_bar', 'text_input')):
+        return 'android.widget.EditText'
+    if element.get('clickable'):
+        return 'android.widget.Button'
+    return 'android.widget.TextView'
+
+
+def render_page_source(elements: List[Dict]) -> str:
+    """Render recorded ui_elements as UiAutomator2-style page_source XML."""
+    nodes = []
+    for index, element in enumerate(elements):
+        res_id = element.get('id') or ''
+        if res_id and '/' not in res_id:
+            res_id = f"{INSTAGRAM_PACKAGE}:id/{res_id}"
+        clickable = 'true' if element.get('clickable') else 'false'
+        nodes.append(
+            f"    <{_element_class(element)} index=\"{index}\" package=\"{INSTAGRAM_PACKAGE}\""
+            f" text={quoteattr(element.get('text') or '')}"
+            f" content-desc={quoteattr(element.get('desc') or '')}"
+            f" resource-id={quoteattr(res_id)}"
+            f" clickable=\"{clickable}\" enabled=\"true\""
+            f" bounds={quoteattr(element.get('bounds') or '[0,0][0,0]')} />"
+        )
+    return (
+        "<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>\n"
+        f"<hierarchy index=\"0\" class=\"hierarchy\" rotation=\"0\" width=\"{SCREEN_WIDTH}\" height=\"{SCREEN_HEIGHT}\">\n"
+        f"  <android.widget.FrameLayout index=\"0\" package=\"{INSTAGRAM_PACKAGE}\" text=\"\" content-desc=\"\""
+        f" clickable=\"false\" enabled=\"true\" bounds=\"[0,0][{SCREEN_WIDTH},{SCREEN_HEIGHT}]\">\n"
+        + "\n".join(nodes) +
+        "\n  </android.widget.FrameLayout>\n</hierarchy>"
+    )
+
+
+class FlowReplay:
+    """Replays one recorded session on one simulated device."""
+
+    def __init__(self, steps: List[Dict]):
+        self.steps = steps
+        self.index = 0
+        self.mismatches = 0
+        self.shown = False
+
+    @property
+    def current(self) -> Dict:
+        return self.steps[min(self.index, len(self.steps) - 1)]
+
+    def _advance(self) -> None:
+        if self.index < len(self.steps) - 1:
+            self.index += 1
+        self.mismatches = 0
+        self.shown = False
+
+    def page_source(self) -> str:
+        """Current screen; auto-advancing screens move on once they were seen."""
+        expected = _ADVANCE_ON.get(self.current.get('action', {}).get('action'))
+        if expected is None and self.shown:
+            self._advance()
+        self.shown = True
+        return render_page_source(self.current.get('ui_elements', []))
+
+    def on_input(self, kind: str) -> None:
+        """Register a tap/type/key/swipe; advance when it matches the recording."""
+        expected = _ADVANCE_ON.get(self.current.get('action', {}).get('action'))
+        if expected == kind or expected is None:
+            self._advance()
+            return
+        self.mismatches += 1
+        if self.mismatches >= _MAX_MISMATCHED_INPUTS:
+            self._advance()
+
+
+# ==================== SIMULATED FLEET ====================
+
+@dataclass
+class SimPhone:
+    """One simulated Geelark cloud phone."""
+    id: str
+    serial_name: str
+    address: str                          # "ip:port" used as the ADB serial
+    status: int = PHONE_STOPPED
+    ready_at: float = 0.0
+    adb_open: bool = False
+    adb_ready_at: float = 0.0
+    adb_connected: bool = False
+    password: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    replay: Optional[FlowReplay] = None
+    jobs_started: int = 0
+
+    def refresh(self, now: float) -> None:
+        if self.status == PHONE_STARTING and now >= self.ready_at:
+            self.status = PHONE_STARTED
+
+
+class SimState:
+    """Shared state behind the Geelark, Appium and ADB fakes."""
+
+    def __init__(self, accounts: List[str], config: SimConfig = None, flows: List[List[Dict]] = None):
+        self.config = config or SimConfig()
+        self.random = random.Random(self.config.seed)
+        self.flows = flows if flows is not None else load_recorded_flows()
+        if not self.flows:
+            self.flows = [_fallback_flow()]
+        self.lock = threading.RLock()
+
+        self.phones: Dict[str, SimPhone] = {}
+        self.by_name: Dict[str, SimPhone] = {}
+        self.by_address: Dict[str, SimPhone] = {}
+        for i, name in enumerate(accounts):
+            phone = SimPhone(
+                id=f"sim{i:06d}",
+                serial_name=name,
+                address=f"10.{100 + i // 65000}.{(i // 250) % 260}.{i % 250 + 1}:5555",
+            )
+            self.phones[phone.id] = phone
+            self.by_name[name] = phone
+            self.by_address[phone.address] = phone
+
+        self.uploads: Dict[str, Tuple[float, bool]] = {}   # task_id -> (done_at, ok)
+        self.sessions: Dict[str, Dict] = {}                  # session_id -> {udid, port, caps}
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.base_url = ""
+
+    # ---------- helpers ----------
+
+    def delay(self, span: Tuple[float, float]) -> None:
+        low, high = span
+        if high > 0:
+            time.sleep(self.random.uniform(low, high))
+
+    def chance(self, rate: float) -> bool:
+        return rate > 0 and self.random.random() < rate
+
+    def record(self, route: str, elapsed: float, failed: bool = False) -> None:
+        with self.lock:
+            entry = self.stats.setdefault(route, {'count': 0, 'failed': 0, 'total_s': 0.0, 'max_s': 0.0})
+            entry['count'] += 1
+            entry['failed'] += int(failed)
+            entry['total_s'] += elapsed
+            entry['max_s'] = max(entry['max_s'], elapsed)
+
+    def new_replay(self) -> FlowReplay:
+        return FlowReplay(self.random.choice(self.flows))
+
+    def phone_for_device(self, device: str) -> Optional[SimPhone]:
+        return self.by_address.get(device)
+
+    # ---------- Geelark API ----------
+
+    def geelark(self, endpoint: str, data: Dict) -> Tuple[int, Dict]:
+        """Handle one Geelark API call; returns (code, data)."""
+        now = time.time()
+        ids = data.get('ids') or ([data['id']] if data.get('id') else [])
+        with self.lock:
+            for phone in self.phones.values():
+                phone.refresh(now)
+            phones = [self.phones[i] for i in ids if i in self.phones]
+
+            if endpoint == '/open/v1/phone/list':
+                page, size = int(data.get('page', 1)), int(data.get('pageSize', 100))
+                items = list(self.phones.values())
+                chunk = items[(page - 1) * size: page * size]
+                return 0, {
+                    'total': len(items), 'page': page, 'pageSize': size,
+                    'items': [{'id': p.id, 'serialName': p.serial_name, 'serialNo': str(n),
+                               'status': p.status, 'remark': 'simulated'}
+                              for n, p in enumerate(chunk, start=(page - 1) * size + 1)],
+                }
+
+            if endpoint == '/open/v1/phone/status':
+                details = [{'id': p.id, 'serialName': p.serial_name, 'status': p.status} for p in phones]
+                return 0, {'totalAmount': len(ids), 'successAmount': len(details),
+                           'failAmount': len(ids) - len(details), 'successDetails': details, 'failDetails': []}
+
+            if endpoint == '/open/v1/phone/start':
+                for p in phones:
+                    if p.status == PHONE_STOPPED:
+                        p.status = PHONE_STARTING
+                        p.ready_at = now + self.config.boot_seconds
+                        p.replay = self.new_replay()
+                        p.jobs_started += 1
+                return 0, {'totalAmount': len(ids), 'successAmount': len(phones),
+                           'failAmount': len(ids) - len(phones),
+                           'successDetails': [{'id': p.id, 'url': f"sim://{p.id}"} for p in phones],
+                           'failDetails': [{'id': i, 'code': 42001, 'msg': 'env not found'}
+                                           for i in ids if i not in self.phones]}
+
+            if endpoint == '/open/v1/phone/stop':
+                for p in phones:
+                    p.status = PHONE_STOPPED
+                    p.adb_open = p.adb_connected = False
+                    p.replay = None
+                    for sid in [s for s, info in self.sessions.items() if info['udid'] == p.address]:
+                        self.sessions.pop(sid, None)
+                return 0, {'totalAmount': len(ids), 'successAmount': len(phones),
+                           'failAmount': len(ids) - len(phones), 'successDetails': [], 'failDetails': []}
+
+            if endpoint == '/open/v1/adb/setStatus':
+                for p in phones:
+                    p.adb_open = bool(data.get('open'))
+                    p.adb_ready_at = now + self.config.adb_ready_seconds
+                return 0, {}
+
+            if endpoint == '/open/v1/adb/getData':
+                items = []
+                for p in phones:
+                    if p.status != PHONE_STARTED:
+                        items.append({'id': p.id, 'code': 49001, 'msg': 'env not running'})
+                    elif not p.adb_open or now < p.adb_ready_at:
+                        items.append({'id': p.id, 'code': 49002, 'msg': 'adb not enabled'})
+                    else:
+                        ip, port = p.address.rsplit(':', 1)
+                        items.append({'id': p.id, 'code': 0, 'ip': ip, 'port': port, 'pwd': p.password})
+                return 0, {'items': items}
+
+            if endpoint == '/open/v1/upload/getUrl':
+                name = f"{uuid.uuid4().hex}.{data.get('fileType') or 'mp4'}"
+                return 0, {'uploadUrl': f"{self.base_url}/sim/upload/{name}",
+                           'resourceUrl': f"{self.base_url}/sim/files/{name}"}
+
+            if endpoint == '/open/v1/phone/uploadFile':
+                if not phones or phones[0].status != PHONE_STARTED:
+                    return 42002, {}
+                task_id = uuid.uuid4().hex
+                self.uploads[task_id] = (now + self.config.upload_seconds, True)
+                return 0, {'taskId': task_id}
+
+            if endpoint == '/open/v1/phone/uploadFile/result':
+                done_at, ok = self.uploads.get(data.get('taskId'), (0, False))
+                if not ok:
+                    return 0, {'status': 3, 'msg': 'unknown task'}
+                return 0, {'status': 2 if now >= done_at else 1}
+
+            if endpoint == '/open/v1/phone/screenShot':
+                return 0, {'taskId': uuid.uuid4().hex}
+
+            if endpoint == '/open/v1/phone/screenShot/result':
+                return 0, {'status': 2, 'downloadLink': f"{self.base_url}/sim/files/screenshot.png"}
+
+            if endpoint in ('/open/v1/root/setStatus', '/open/v2/phone/newOne'):
+                return 0, {}
+
+        return 40400, {}
+
+    # ---------- ADB ----------
+
+    def adb(self, args: List[str]) -> Tuple[int, str, str]:
+        """Handle one fake adb invocation; returns (returncode, stdout, stderr)."""
+        device = None
+        if len(args) >= 2 and args[0] == '-s':
+            device, args = args[1], args[2:]
+        command = args[0] if args else ''
+
+        with self.lock:
+            now = time.time()
+            for phone in self.phones.values():
+                phone.refresh(now)
+
+            if command == 'connect' and len(args) > 1:
+                phone = self.by_address.get(args[1])
+                if phone and phone.status == PHONE_STARTED and phone.adb_open:
+                    phone.adb_connected = True
+                    return 0, f"connected to {args[1]}\n", ''
+                return 1, f"failed to connect to '{args[1]}': Connection refused\n", ''
+
+            if command == 'disconnect':
+                targets = [self.by_address.get(args[1])] if len(args) > 1 else list(self.phones.values())
+                for phone in targets:
+                    if phone:
+                        phone.adb_connected = False
+                return 0, (f"disconnected {args[1]}\n" if len(args) > 1 else "disconnected everything\n"), ''
+
+            if command == 'devices':
+                lines = [f"{p.address}\tdevice" for p in self.phones.values()
+                         if p.adb_connected and p.status == PHONE_STARTED]
+                return 0, "List of devices attached\n" + "".join(line + "\n" for line in lines) + "\n", ''
+
+            if command in ('start-server', 'kill-server', 'reconnect', 'forward', 'reverse', 'version'):
+                return 0, '', ''
+
+            phone = self.by_address.get(device) if device else None
+            if phone is None or not phone.adb_connected or phone.status != PHONE_STARTED:
+                return 1, '', f"adb: device '{device}' not found\n"
+
+            if command == 'get-state':
+                return 0, "device\n", ''
+            if command in ('push', 'install', 'pull', 'wait-for-device'):
+                return 0, "1 file pushed.\n" if command == 'push' else '', ''
+            if command == 'shell':
+                shell_cmd = ' '.join(args[1:])
+                if self.chance(self.config.adb_drop_rate):
+                    phone.adb_connected = False
+                    return 1, '', "error: device offline\n"
+                return 0, self._shell(phone, shell_cmd), ''
+
+        return 1, '', f"adb: unknown command {command}\n"
+
+    def _shell(self, phone: SimPhone, command: str) -> str:
+        """Device-side shell command (caller holds the lock)."""
+        cmd = command.strip()
+        if cmd.startswith('glogin'):
+            return "success"
+        if cmd.startswith('input '):
+            kind = {'tap': 'tap', 'swipe': 'swipe', 'keyevent': 'key', 'text': 'type'}.get(
+                cmd.split()[1] if len(cmd.split()) > 1 else '', 'tap')
+            if phone.replay:
+                phone.replay.on_input(kind)
+            return ''
+        if 'am force-stop' in cmd and INSTAGRAM_PACKAGE in cmd:
+            phone.replay = self.new_replay()
+            return ''
+        if 'am get-current-user' in cmd:
+            return "0"
+        if 'input_method' in cmd:
+            return "  mInputShown=false"
+        if 'dumpsys window' in cmd:
+            return (f"  mCurrentFocus=Window{{1 u0 {INSTAGRAM_PACKAGE}/"
+                    f"com.instagram.mainactivity.MainActivity}}")
+        if cmd.startswith('getprop'):
+            return "1" if 'boot_completed' in cmd else ''
+        if cmd.startswith('echo '):
+            return cmd[5:].strip('"\'')
+        if cmd.startswith('pm list packages'):
+            return f"package:{INSTAGRAM_PACKAGE}"
+        return ''
+
+    # ---------- Appium ----------
+
+    def create_session(self, port: int, caps: Dict) -> Tuple[Optional[str], Optional[str]]:
+        """Create an Appium session; returns (session_id, error_message)."""
+        udid = caps.get('appium:udid') or caps.get('udid') or ''
+        time.sleep(self.config.session_create_seconds)
+        with self.lock:
+            phone = self.by_address.get(udid)
+            if phone is None or not phone.adb_connected or phone.status != PHONE_STARTED:
+                return None, f"Device {udid} was not in the list of connected devices"
+            if self.chance(self.config.session_failure_rate):
+                return None, "Could not start UiAutomator2 server: instrumentation process is not running"
+            if phone.replay is None:
+                phone.replay = self.new_replay()
+            session_id = str(uuid.uuid4())
+            self.sessions[session_id] = {'udid': udid, 'port': port, 'caps': caps}
+            return session_id, None
+
+    def session_phone(self, session_id: str) -> Optional[SimPhone]:
+        with self.lock:
+            info = self.sessions.get(session_id)
+            return self.by_address.get(info['udid']) if info else None
+
+    def summary(self) -> Dict:
+        with self.lock:
+            now = time.time()
+            for phone in self.phones.values():
+                phone.refresh(now)
+            return {
+                'phones_running': sum(1 for p in self.phones.values() if p.status == PHONE_STARTED),
+                'phones_starting': sum(1 for p in self.phones.values() if p.status == PHONE_STARTING),
+                'adb_connected': sum(1 for p in self.phones.values() if p.adb_connected),
+                'appium_sessions': len(self.sessions),
+                'routes': {k: dict(v) for k, v in self.stats.items()},
+            }
+
+
+# ==================== HTTP HANDLERS ====================
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    """Keep-alive JSON handler base (requests/urllib3 pool connections)."""
+    protocol_version = "HTTP/1.1"
+    sim: SimState = None
+
+    def log_message(self, format, *args):
+        pass  # Keep load test output readable
+
+    def _read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip() or b'0', 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b''.join(chunks)
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _json_body(self) -> Dict:
+        try:
+            return json.loads(self._read_body() or b'{}')
+        except json.JSONDecodeError:
+            return {}
+
+    def _send(self, status: int, payload, content_type: str = 'application/json') -> None:
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class GeelarkApiHandler(_JsonHandler):
+    """Fake Geelark open API plus the simulator's control routes (/sim/...)."""
+
+    def do_POST(self):
+        start = time.time()
+        sim = self.sim
+        path = self.path.split('?')[0]
+
+        if path == '/sim/adb':
+            sim.delay(sim.config.adb_latency)
+            rc, out, err = sim.adb(self._json_body().get('args', []))
+            self._send(200, {'rc': rc, 'stdout': out, 'stderr': err})
+            sim.record('adb', time.time() - start, failed=rc != 0)
+            return
+
+        data = self._json_body()
+        sim.delay(sim.config.api_latency)
+        if sim.chance(sim.config.api_error_rate):
+            self._send(200, {'traceId': uuid.uuid4().hex, 'code': 50001, 'msg': 'simulated API error', 'data': None})
+            sim.record(path, time.time() - start, failed=True)
+            return
+
+        code, result = sim.geelark(path, data)
+        msg = 'success' if code == 0 else 'simulated error'
+        self._send(200, {'traceId': uuid.uuid4().hex, 'code': code, 'msg': msg, 'data': result})
+        sim.record(path, time.time() - start, failed=code != 0)
+
+    def do_PUT(self):
+        start = time.time()
+        self._read_body()  # Discard the uploaded video
+        self.sim.delay(self.sim.config.api_latency)
+        self._send(200, {})
+        self.sim.record('upload PUT', time.time() - start)
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path == '/sim/stats':
+            self._send(200, self.sim.summary())
+        elif path.startswith('/sim/files/'):
+            self._send(200, base64.b64decode(_PNG_1X1), content_type='application/octet-stream')
+        else:
+            self._send(404, {'code': 40400, 'msg': 'not found'})
+
+
+class AppiumHandler(_JsonHandler):
+    """Fake Appium server (W3C WebDriver subset used by the posters)."""
+
+    _SESSION_PATH = re.compile(r'^/session/([^/]+)(/.*)?$')
+
+    def _value(self, value, status: int = 200):
+        self._send(status, {'value': value})
+
+    def _error(self, status: int, error: str, message: str):
+        self._value({'error': error, 'message': message, 'stacktrace': ''}, status)
+
+    def _dispatch(self, method: str):
+        start = time.time()
+        sim = self.sim
+        path = self.path.split('?')[0].rstrip('/')
+        if path.startswith('/wd/hub'):
+            path = path[len('/wd/hub'):]
+        body = self._json_body() if method in ('POST', 'DELETE') else {}
+        port = self.server.server_address[1]
+
+        if path == '/status':
+            return self._value({'ready': True, 'message': 'device_simulator Appium'})
+        if path in ('/sessions', '/appium/sessions'):
+            with sim.lock:
+                return self._value([{'id': sid, 'capabilities': info['caps']}
+                                    for sid, info in sim.sessions.items() if info['port'] == port])
+        if path == '/session' and method == 'POST':
+            caps = dict(body.get('capabilities', {}).get('alwaysMatch', {}))
+            for extra in body.get('capabilities', {}).get('firstMatch', []) or []:
+                caps.update(extra)
+            session_id, error = sim.create_session(port, caps)
+            sim.record('appium POST /session', time.time() - start, failed=error is not None)
+            if error:
+                return self._error(500, 'session not created', error)
+            return self._value({'sessionId': session_id, 'capabilities': dict(caps, platformName='Android')})
+
+        match = self._SESSION_PATH.match(path)
+        if not match:
+            return self._error(404, 'unknown command', f"Unknown route {method} {path}")
+        session_id, sub = match.group(1), match.group(2) or ''
+
+        if sub == '' and method == 'DELETE':
+            with sim.lock:
+                sim.sessions.pop(session_id, None)
+            return self._value(None)
+
+        phone = sim.session_phone(session_id)
+        if phone is None:
+            return self._error(404, 'invalid session id', f"Session {session_id} does not exist")
+
+        if sub == '/source':
+            sim.delay(sim.config.source_latency)
+            if sim.chance(sim.config.source_failure_rate):
+                sim.record('appium source', time.time() - start, failed=True)
+                return self._error(500, 'unknown error',
+                                   "'GET /source' cannot be proxied to UiAutomator2 server because "
+                                   "the instrumentation process is not running (probably crashed)")
+            with sim.lock:
+                source = phone.replay.page_source() if phone.replay else render_page_source([])
+            sim.record('appium source', time.time() - start)
+            return self._value(source)
+
+        sim.delay(sim.config.appium_latency)
+        kind = None
+        result = None
+        if sub == '/actions':
+            if method == 'POST':
+                moves = {(a.get('x'), a.get('y'))
+                         for seq in body.get('actions', []) for a in seq.get('actions', [])
+                         if a.get('type') == 'pointerMove'}
+                kind = 'swipe' if len(moves) > 1 else 'tap'
+        elif sub in ('/appium/device/press_keycode', '/appium/device/long_press_keycode', '/back'):
+            kind = 'key'
+        elif sub.endswith('/click'):
+            kind = 'tap'
+        elif sub.endswith('/value') or sub == '/keys':
+            kind = 'type'
+        elif sub in ('/element', '/elements'):
+            result = self._find(phone, body, many=sub == '/elements')
+            if result is None:
+                return self._error(404, 'no such element', 'An element could not be located')
+        elif sub == '/element/active':
+            result = {ELEMENT_KEY: f"{session_id[:8]}-active"}
+        elif sub == '/appium/device/current_package':
+            result = INSTAGRAM_PACKAGE
+        elif sub == '/appium/device/current_activity':
+            result = '.mainactivity.MainActivity'
+        elif sub == '/screenshot':
+            result = _PNG_1X1
+        elif sub == '/window/rect':
+            result = {'x': 0, 'y': 0, 'width': SCREEN_WIDTH, 'height': SCREEN_HEIGHT}
+        elif sub == '/appium/device/activate_app':
+            pass
+        elif sub == '/appium/device/terminate_app':
+            with sim.lock:
+                phone.replay = sim.new_replay()
+            result = True
+
+        if kind:
+            with sim.lock:
+                if phone.replay:
+                    phone.replay.on_input(kind)
+        sim.record(f"appium {kind or sub.split('/')[-1] or 'session'}", time.time() - start)
+        return self._value(result)
+
+    def _find(self, phone: SimPhone, body: Dict, many: bool):
+        using, value = body.get('using'), body.get('value', '')
+        with self.sim.lock:
+            elements = phone.replay.current.get('ui_elements', []) if phone.replay else []
+        found = []
+        for index, element in enumerate(elements):
+            if using == 'class name' and _element_class(element) == value:
+                found.append(index)
+            elif using == 'id' and (element.get('id') or '') == value.split('/')[-1]:
+                found.append(index)
+        refs = [{ELEMENT_KEY: f"{phone.id}-{i}"} for i in found]
+        if many:
+            return refs
+        return refs[0] if refs else None
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+
+# ==================== SIMULATOR ====================
+
+class DeviceSimulator:
+    """
+    Runs the fake Geelark API and one fake Appium server per worker port.
+
+    Usage:
+        sim = DeviceSimulator(accounts, appium_ports=[4723, 4725], config=SimConfig())
+        sim.start()
+        env = sim.environment(workdir)   # merge into worker subprocess env
+        ...
+        sim.stop()
+    """
+
+    def __init__(self, accounts: List[str], appium_ports: List[int],
+                 config: SimConfig = None, api_port: int = DEFAULT_API_PORT,
+                 flows: List[List[Dict]] = None):
+        self.state = SimState(accounts, config=config, flows=flows)
+        self.api_port = api_port
+        self.appium_ports = list(appium_ports)
+        self._servers: List[ThreadingHTTPServer] = []
+        self.state.base_url = f"http://127.0.0.1:{api_port}"
+
+    @property
+    def api_url(self) -> str:
+        return self.state.base_url
+
+    def _serve(self, handler_base, port: int) -> None:
+        handler = type(handler_base.__name__, (handler_base,), {'sim': self.state})
+        server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        server.daemon_threads = True
+        server.request_queue_size = 128
+        threading.Thread(target=server.serve_forever, name=f"sim-{port}", daemon=True).start()
+        self._servers.append(server)
+
+    def start(self) -> None:
+        """Bind the Geelark API port and every Appium port."""
+        self._serve(GeelarkApiHandler, self.api_port)
+        for port in self.appium_ports:
+            self._serve(AppiumHandler, port)
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+
+    def write_adb_wrapper(self, directory: str) -> str:
+        """Write an executable `adb` that forwards to this file's fake adb entry point."""
+        script = os.path.abspath(__file__)
+        if sys.platform == 'win32':
+            path = os.path.join(directory, 'adb.cmd')
+            with open(path, 'w') as f:
+                f.write(f'@echo off\r\n"{sys.executable}" "{script}" adb %*\r\n')
+        else:
+            path = os.path.join(directory, 'adb')
+            with open(path, 'w') as f:
+                f.write(f'#!/bin/sh\nexec "{sys.executable}" "{script}" adb "$@"\n')
+            os.chmod(path, 0o755)
+        return path
+
+    def environment(self, workdir: str) -> Dict[str, str]:
+        """Environment variables that point the real code at the simulator."""
+        return {
+            'GEELARK_API_BASE': self.api_url,
+            'GEELARK_TOKEN': 'simulator',
+            'GEELARK_SIM_URL': self.api_url,
+            'ADB_PATH': self.write_adb_wrapper(workdir),
+            'POSTED_LEDGER_PATH': os.path.join(workdir, 'all_posted_videos.txt'),
+            'ANTHROPIC_API_KEY': os.environ.get('ANTHROPIC_API_KEY', 'simulator'),
+        }
+
+
+# ==================== FAKE ADB CLIENT ====================
+
+def _adb_call(sim_url: str, args: List[str]) -> Tuple[int, str, str]:
+    req = Request(f"{sim_url}/sim/adb", data=json.dumps({'args': args}).encode(),
+                  headers={'Content-Type': 'application/json'}, method='POST')
+    with urlopen(req, timeout=60) as response:
+        result = json.loads(response.read().decode())
+    return result['rc'], result['stdout'], result['stderr']
+
+
+_POOL_SCRIPT = re.compile(r'^\(\s?(.*)\n\) </dev/null 2>/dev/null; echo "(\S+) \$\?"\s*$', re.S)
+
+
+def fake_adb_main(argv: List[str]) -> int:
+    """
+    `adb` replacement: forwards the invocation to the running simulator.
+
+    `adb -s <device> shell` without a command emulates an interactive shell,
+    including the sentinel protocol adb_shell_pool writes.
+    """
+    sim_url = os.environ.get('GEELARK_SIM_URL', f"http://127.0.0.1:{DEFAULT_API_PORT}")
+    interactive = len(argv) == 3 and argv[0] == '-s' and argv[2] == 'shell'
+
+    if not interactive:
+        try:
+            rc, out, err = _adb_call(sim_url, argv)
+        except OSError as e:
+            sys.stderr.write(f"adb: cannot reach device simulator at {sim_url}: {e}\n")
+            return 1
+        sys.stdout.write(out)
+        sys.stderr.write(err)
+        return rc
+
+    pending = ''
+    for line in sys.stdin:
+        pending += line
+        if pending.strip() == 'exit':
+            return 0
+        match = _POOL_SCRIPT.match(pending)
+        if match:
+            command, sentinel = match.groups()
+        elif pending.startswith('('):
+            continue  # Multi-line pooled command still arriving
+        else:
+            command, sentinel = pending.strip(), None
+        pending = ''
+        try:
+            rc, out, _ = _adb_call(sim_url, argv[:2] + ['shell', command])
+        except OSError:
+            return 255
+        if rc != 0 and sentinel is None:
+            return rc  # Device went away: the shell dies like a real one
+        sys.stdout.write(out + ('\n' if out and not out.endswith('\n') else ''))
+        if sentinel:
+            sys.stdout.write(f"{sentinel} {rc}\n")
+        sys.stdout.flush()
+    return 0
+
+
+# ==================== LOAD TEST ====================
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def _sample_lock(tracker) -> float:
+    """Round-trip time of one ProgressTracker lock + read (what every claim pays)."""
+    start = time.time()
+    tracker._locked_operation(lambda jobs: (None, None))
+    return time.time() - start
+
+
+def _worker_idle_gaps(jobs: List[Dict]) -> List[float]:
+    """Seconds each worker spent between finishing one job and claiming the next."""
+    by_worker: Dict[str, List[Tuple[datetime, datetime]]] = {}
+    for job in jobs:
+        try:
+            claimed = datetime.fromisoformat(job['claimed_at'])
+            completed = datetime.fromisoformat(job['completed_at'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        by_worker.setdefault(job.get('worker_id', ''), []).append((claimed, completed))
+    gaps = []
+    for spans in by_worker.values():
+        spans.sort()
+        for (_, prev_done), (next_claim, _) in zip(spans, spans[1:]):
+            gaps.append(max(0.0, (next_claim - prev_done).total_seconds()))
+    return gaps
+
+
+def run_load_test(
+    num_workers: int,
+    num_jobs: int,
+    num_accounts: int = None,
+    config: SimConfig = None,
+    api_port: int = DEFAULT_API_PORT,
+    workdir: str = None,
+    stagger: float = 0.5,
+    delay_between_jobs: int = 0,
+    time_limit: float = 3600,
+    report_interval: float = 15,
+    keep_workdir: bool = False,
+) -> Dict:
+    """
+    Run real parallel_worker.py processes against the simulator and report throughput.
+
+    Returns:
+        Report dict (also printed): jobs/hour, outcomes, error types, lock and
+        idle-gap percentiles, and per-route simulator timings.
+    """
+    from parallel_config import get_config
+    from progress_tracker import ProgressTracker
+
+    num_accounts = num_accounts or num_jobs
+    accounts = [f"simacct{i:04d}" for i in range(num_accounts)]
+    parallel_config = get_config(num_workers=num_workers)
+    ports = [w.appium_port for w in parallel_config.workers]
+
+    owns_workdir = workdir is None
+    workdir = os.path.abspath(workdir or tempfile.mkdtemp(prefix="device_sim_"))
+    os.makedirs(os.path.join(workdir, 'videos'), exist_ok=True)
+
+    sim = DeviceSimulator(accounts, ports, config=config, api_port=api_port)
+    print(f"Loaded {len(sim.state.flows)} recorded flows; {num_accounts} phones; "
+          f"Appium ports {ports[0]}-{ports[-1]}")
+    sim.start()
+
+    progress_file = os.path.join(workdir, 'parallel_progress.csv')
+    jobs = []
+    for i in range(num_jobs):
+        video = os.path.join(workdir, 'videos', f"simvideo{i:05d}.mp4")
+        with open(video, 'wb') as f:
+            f.write(os.urandom(64 * 1024))
+        jobs.append({'job_id': f"sim{i:05d}", 'account': accounts[i % num_accounts],
+                     'video_path': video, 'caption': f"Simulated caption {i}"})
+    tracker = ProgressTracker(progress_file)
+    tracker.seed_from_jobs(jobs)
+
+    env = os.environ.copy()
+    env.update(sim.environment(workdir))
+    processes = []
+    start = time.time()
+    lock_samples: List[float] = []
+    try:
+        for worker in parallel_config.workers:
+            cmd = [sys.executable, os.path.join(PROJECT_ROOT, 'parallel_worker.py'),
+                   '--worker-id', str(worker.worker_id), '--num-workers', str(num_workers),
+                   '--progress-file', progress_file, '--delay', str(delay_between_jobs)]
+            processes.append(subprocess.Popen(cmd, cwd=workdir, env=env,
+                                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+            if stagger > 0:
+                time.sleep(stagger)
+
+        last_report = 0.0
+        while time.time() - start < time_limit:
+            time.sleep(1)
+            lock_samples.append(_sample_lock(tracker))
+            if all(p.poll() is not None for p in processes):
+                break
+            if time.time() - last_report >= report_interval:
+                last_report = time.time()
+                stats = tracker.get_stats()
+                elapsed = time.time() - start
+                summary = sim.state.summary()
+                print(f"[{elapsed:6.0f}s] success={stats.get('success', 0)} failed={stats.get('failed', 0)} "
+                      f"claimed={stats.get('claimed', 0)} pending={stats.get('pending', 0)} "
+                      f"| phones running={summary['phones_running']} sessions={summary['appium_sessions']} "
+                      f"| lock p95={_percentile(lock_samples, 95) * 1000:.0f}ms")
+    finally:
+        for proc in processes:
+            if proc.poll() is None:
+                proc.terminate()
+        for proc in processes:
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        elapsed = time.time() - start
+        sim.stop()
+
+    final_jobs = tracker._read_all_jobs()
+    outcomes: Dict[str, int] = {}
+    error_types: Dict[str, int] = {}
+    durations = []
+    for job in final_jobs:
+        outcomes[job['status']] = outcomes.get(job['status'], 0) + 1
+        if job.get('error_type'):
+            key = f"{job.get('error_category') or 'unknown'}/{job['error_type']}"
+            error_types[key] = error_types.get(key, 0) + 1
+        try:
+            durations.append((datetime.fromisoformat(job['completed_at'])
+                              - datetime.fromisoformat(job['claimed_at'])).total_seconds())
+        except (KeyError, TypeError, ValueError):
+            pass
+    gaps = _worker_idle_gaps(final_jobs)
+
+    report = {
+        'workers': num_workers,
+        'jobs': num_jobs,
+        'elapsed_s': round(elapsed, 1),
+        'jobs_per_hour': round(outcomes.get('success', 0) / elapsed * 3600, 1) if elapsed else 0.0,
+        'outcomes': outcomes,
+        'error_types': error_types,
+        'job_seconds': {'p50': _percentile(durations, 50), 'p95': _percentile(durations, 95)},
+        'lock_ms': {'p50': _percentile(lock_samples, 50) * 1000, 'p95': _percentile(lock_samples, 95) * 1000,
+                    'max': max(lock_samples, default=0) * 1000},
+        'worker_idle_gap_s': {'p50': _percentile(gaps, 50), 'p95': _percentile(gaps, 95)},
+        'routes': sim.state.summary()['routes'],
+        'workdir': workdir,
+    }
+    print_report(report)
+
+    if owns_workdir and not keep_workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'='*70}")
+    print(f"LOAD TEST REPORT - {report['workers']} workers, {report['jobs']} jobs")
+    print(f"{'='*70}")
+    print(f"Elapsed: {report['elapsed_s']}s   Throughput: {report['jobs_per_hour']} successful jobs/hour")
+    print(f"Outcomes: {report['outcomes']}")
+    if report['error_types']:
+        print("Error types:")
+        for key, count in sorted(report['error_types'].items(), key=lambda kv: -kv[1]):
+            print(f"  {key}: {count}")
+    print(f"Job duration: p50={report['job_seconds']['p50']:.1f}s p95={report['job_seconds']['p95']:.1f}s")
+    print(f"Progress lock round-trip: p50={report['lock_ms']['p50']:.1f}ms "
+          f"p95={report['lock_ms']['p95']:.1f}ms max={report['lock_ms']['max']:.1f}ms")
+    print(f"Worker idle gap between jobs: p50={report['worker_idle_gap_s']['p50']:.1f}s "
+          f"p95={report['worker_idle_gap_s']['p95']:.1f}s")
+    print(f"\n{'Route':<40} {'Count':>7} {'Failed':>7} {'Avg ms':>8} {'Max ms':>8}")
+    print(f"{'-'*70}")
+    for route, entry in sorted(report['routes'].items(), key=lambda kv: -kv[1]['count']):
+        avg = entry['total_s'] / entry['count'] * 1000 if entry['count'] else 0
+        print(f"{route:<40} {entry['count']:>7} {entry['failed']:>7} {avg:>8.1f} {entry['max_s'] * 1000:>8.1f}")
+    print(f"{'='*70}\n")
+
+
+# ==================== CLI ====================
+
+def _add_sim_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--workers', type=int, default=10, help='Number of workers / Appium ports')
+    parser.add_argument('--accounts', type=int, default=None, help='Simulated phones (default: one per job)')
+    parser.add_argument('--api-port', type=int, default=DEFAULT_API_PORT, help='Fake Geelark API port')
+    parser.add_argument('--api-latency', type=float, nargs=2, default=[0.05, 0.3], metavar=('MIN', 'MAX'))
+    parser.add_argument('--api-error-rate', type=float, default=0.0)
+    parser.add_argument('--boot-seconds', type=float, default=5.0)
+    parser.add_argument('--upload-seconds', type=float, default=2.0)
+    parser.add_argument('--adb-drop-rate', type=float, default=0.0)
+    parser.add_argument('--session-seconds', type=float, default=2.0, help='Appium session creation time')
+    parser.add_argument('--session-failure-rate', type=float, default=0.0)
+    parser.add_argument('--source-latency', type=float, nargs=2, default=[0.3, 1.0], metavar=('MIN', 'MAX'))
+    parser.add_argument('--source-failure-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=None)
+
+
+def _sim_config(args) -> SimConfig:
+    return SimConfig(
+        api_latency=tuple(args.api_latency),
+        api_error_rate=args.api_error_rate,
+        boot_seconds=args.boot_seconds,
+        upload_seconds=args.upload_seconds,
+        adb_drop_rate=args.adb_drop_rate,
+        session_create_seconds=args.session_seconds,
+        session_failure_rate=args.session_failure_rate,
+        source_latency=tuple(args.source_latency),
+        source_failure_rate=args.source_failure_rate,
+        seed=args.seed,
+    )
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'adb':
+        sys.exit(fake_adb_main(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description='Local Geelark/Appium/ADB simulator for load testing')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve = sub.add_parser('serve', help='Run the fakes until Ctrl+C')
+    _add_sim_args(serve)
+    serve.add_argument('--workdir', default='.', help='Where to write the fake adb wrapper')
+
+    load = sub.add_parser('loadtest', help='Run parallel_worker.py processes against the fakes')
+    _add_sim_args(load)
+    load.add_argument('--jobs', type=int, default=100)
+    load.add_argument('--stagger', type=float, default=0.5, help='Seconds between worker starts')
+    load.add_argument('--delay', type=int, default=0, help='Worker delay between jobs')
+    load.add_argument('--time-limit', type=float, default=3600)
+    load.add_argument('--workdir', default=None, help='Keep run artifacts here (default: temp dir)')
+    load.add_argument('--json', default=None, help='Also write the report to this JSON file')
+
+    args = parser.parse_args()
+    config = _sim_config(args)
+
+    if args.command == 'serve':
+        from parallel_config import get_config
+        accounts = [f"simacct{i:04d}" for i in range(args.accounts or args.workers * 4)]
+        ports = [w.appium_port for w in get_config(num_workers=args.workers).workers]
+        sim = DeviceSimulator(accounts, ports, config=config, api_port=args.api_port)
+        sim.start()
+        print(f"Device simulator: {len(accounts)} phones, Geelark API {sim.api_url}, "
+              f"Appium ports {ports[0]}-{ports[-1]}")
+        print("Export before running the orchestrator:")
+        for key, value in sim.environment(os.path.abspath(args.workdir)).items():
+            print(f"  {key}={value}")
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            sim.stop()
+        return
+
+    report = run_load_test(
+        num_workers=args.workers, num_jobs=args.jobs, num_accounts=args.accounts,
+        config=config, api_port=args.api_port, workdir=args.workdir,
+        stagger=args.stagger, delay_between_jobs=args.delay,
+        time_limit=args.time_limit, keep_workdir=args.workdir is not None,
+    )
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
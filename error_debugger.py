@@ -10,15 +10,35 @@ Captures EVERYTHING when an error occurs:
 - All context needed for debugging
 
 All data saved to error_logs/ directory with unique timestamp.
+
+Per-step screenshots (log_step) are taken on a background thread so a step
+never waits on a screenshot round trip, and are sampled according to
+Config.STEP_SCREENSHOT_MODE:
+- "errors": no step screenshots (capture_error still takes one)
+- "every_n": every STEP_SCREENSHOT_EVERY-th step, written to disk
+- "ring": every step kept in memory; the last STEP_SCREENSHOT_RING_SIZE
+  frames are written only when capture_error runs (i.e. on failure)
+- "all": every step written to disk
+
+The session directory is created on the first write, so a post that never
+fails (with step_log off and screenshots in "errors"/"ring" mode) touches
+no files.
 """
 
 import os
 import json
+import threading
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Dict, List, Any
 import base64
 
+from config import Config
+
+STEP_SCREENSHOT_MODES = ("errors", "every_n", "ring", "all")
+
 
 class ErrorDebugger:
     """
@@ -38,7 +58,16 @@ class ErrorDebugger:
             )
     """
 
-    def __init__(self, account: str, job_id: str, output_dir: str = "error_logs"):
+    def __init__(
+        self,
+        account: str,
+        job_id: str,
+        output_dir: str = "error_logs",
+        screenshot_mode: str = None,
+        screenshot_every: int = None,
+        ring_size: int = None,
+        step_log: bool = True
+    ):
         """
         Initialize error debugger.
 
@@ -46,15 +75,19 @@ class ErrorDebugger:
             account: Instagram account name
             job_id: Job identifier
             output_dir: Directory to save error logs
+            screenshot_mode: Step screenshot sampling (default: Config.STEP_SCREENSHOT_MODE)
+            screenshot_every: Step interval for "every_n" (default: Config.STEP_SCREENSHOT_EVERY)
+            ring_size: Frames kept for "ring" (default: Config.STEP_SCREENSHOT_RING_SIZE)
+            step_log: Append every log_step() to steps.jsonl (off when the
+                black box is the step log)
         """
         self.account = account
         self.job_id = job_id
         self.output_dir = output_dir
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        # Create output directory
+        # Output directory (created on the first write)
         self.session_dir = os.path.join(output_dir, f"{account}_{self.session_id}")
-        os.makedirs(self.session_dir, exist_ok=True)
 
         # Error counter for this session
         self.error_count = 0
@@ -62,6 +95,19 @@ class ErrorDebugger:
         # Log file for this session
         self.log_file = os.path.join(self.session_dir, "errors.jsonl")
 
+        # Step timeline
+        self.step_count = 0
+        self.step_log_file = os.path.join(self.session_dir, "steps.jsonl")
+        self.step_log = step_log
+        self.screenshot_mode = screenshot_mode or Config.STEP_SCREENSHOT_MODE
+        if self.screenshot_mode not in STEP_SCREENSHOT_MODES:
+            raise ValueError(f"screenshot_mode must be one of {STEP_SCREENSHOT_MODES}, got '{self.screenshot_mode}'")
+        self.screenshot_every = max(1, screenshot_every or Config.STEP_SCREENSHOT_EVERY)
+        self._ring = deque(maxlen=max(1, ring_size or Config.STEP_SCREENSHOT_RING_SIZE))
+        self._ring_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None  # Started on the first step screenshot
+        self._pending = []
+
     def capture_error(
         self,
         error: Exception,
@@ -89,6 +135,11 @@ class ErrorDebugger:
         timestamp = datetime.now().isoformat()
         error_id = f"error_{self.error_count:03d}"
 
+        self._ensure_session_dir()
+
+        # Write out the frames leading up to the failure
+        step_frames = self.flush_step_frames()
+
         # Build comprehensive error record
         error_record = {
             "error_id": error_id,
@@ -114,6 +165,7 @@ class ErrorDebugger:
             # Screenshot info
             "screenshot_file": None,
             "screenshot_base64": None,
+            "step_screenshots": step_frames,
         }
 
         # Capture screenshot if driver available
@@ -184,6 +236,7 @@ class ErrorDebugger:
         Returns:
             Path to state file
         """
+        self._ensure_session_dir()
         timestamp = datetime.now().strftime("%H%M%S")
         state_id = f"{label}_{timestamp}"
 
@@ -226,32 +279,115 @@ class ErrorDebugger:
         """
         Log a step in the posting process.
 
-        Creates a timeline of what happened for debugging.
+        Creates a timeline of what happened for debugging. The screenshot (if
+        the sampling mode wants one for this step) is queued on a background
+        thread; in "ring" mode it stays in memory until flush_step_frames().
         """
-        step_log_file = os.path.join(self.session_dir, "steps.jsonl")
+        step_num = self.step_count
+        self.step_count += 1
 
         step_record = {
             "timestamp": datetime.now().isoformat(),
+            "step_num": step_num,
             "step": step_name,
             "success": success,
             "details": details or {},
         }
 
-        # Capture screenshot on every step for full timeline
-        if driver:
-            try:
-                step_num = sum(1 for _ in open(step_log_file)) if os.path.exists(step_log_file) else 0
-                screenshot_file = os.path.join(
-                    self.session_dir,
-                    f"step_{step_num:03d}_{step_name}.png"
-                )
-                driver.save_screenshot(screenshot_file)
+        if driver and self._wants_screenshot(step_num):
+            screenshot_file = os.path.join(
+                self.session_dir,
+                f"step_{step_num:03d}_{step_name}.png"
+            )
+            if self.screenshot_mode == "ring":
+                self._submit(self._grab_frame, driver, screenshot_file)
+            else:
+                self._ensure_session_dir()
+                self._submit(self._save_screenshot, driver, screenshot_file)
                 step_record["screenshot"] = screenshot_file
-            except:
+
+        if self.step_log:
+            self._ensure_session_dir()
+            with open(self.step_log_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(step_record, ensure_ascii=False) + "\n")
+
+    def _ensure_session_dir(self):
+        """Create the session directory before its first file is written."""
+        os.makedirs(self.session_dir, exist_ok=True)
+
+    def _wants_screenshot(self, step_num: int) -> bool:
+        """Whether the sampling mode takes a screenshot at this step."""
+        if self.screenshot_mode == "errors":
+            return False
+        if self.screenshot_mode == "every_n":
+            return step_num % self.screenshot_every == 0
+        return True
+
+    def _submit(self, fn, *args):
+        """Run fn(*args) on the screenshot thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="step-screenshot")
+        self._pending = [f for f in self._pending if not f.done()]
+        self._pending.append(self._executor.submit(fn, *args))
+
+    @staticmethod
+    def _save_screenshot(driver, screenshot_file: str):
+        try:
+            driver.save_screenshot(screenshot_file)
+        except Exception:
+            pass
+
+    def _grab_frame(self, driver, screenshot_file: str):
+        try:
+            png = driver.get_screenshot_as_png()
+        except Exception:
+            return
+        with self._ring_lock:
+            self._ring.append((screenshot_file, png))
+
+    def wait_for_screenshots(self):
+        """Block until every queued step screenshot has been taken."""
+        for future in self._pending:
+            try:
+                future.result()
+            except Exception:
+                pass
+        self._pending = []
+
+    def flush_step_frames(self) -> List[str]:
+        """
+        Write the ring buffer of recent step frames to disk and clear it.
+
+        Returns:
+            Paths written (empty outside "ring" mode)
+        """
+        if self.screenshot_mode != "ring":
+            return []
+        self.wait_for_screenshots()
+        with self._ring_lock:
+            frames = list(self._ring)
+            self._ring.clear()
+        if frames:
+            self._ensure_session_dir()
+
+        written = []
+        for screenshot_file, png in frames:
+            try:
+                with open(screenshot_file, "wb") as f:
+                    f.write(png)
+                written.append(screenshot_file)
+            except OSError:
                 pass
+        if written:
+            print(f"  [DEBUG] Saved {len(written)} recent step screenshot(s)")
+        return written
 
-        with open(step_log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(step_record, ensure_ascii=False) + "\n")
+    def close(self):
+        """Finish queued screenshots and stop the screenshot thread (frames in the ring are dropped)."""
+        self.wait_for_screenshots()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def get_summary(self) -> Dict[str, Any]:
         """Get summary of all errors in this session."""
@@ -261,6 +397,7 @@ class ErrorDebugger:
             "session_id": self.session_id,
             "session_dir": self.session_dir,
             "error_count": self.error_count,
+            "step_count": self.step_count,
             "log_file": self.log_file,
         }
 
@@ -79,17 +79,24 @@ def format_elements_full(elements: List[Dict]) -> List[Dict]:
 class FlowLogger:
     """Logs posting flow steps to JSONL files for analysis."""
 
-    def __init__(self, account_name: str, log_dir: str = "flow_logs"):
+    def __init__(self, account_name: str, log_dir: str = "flow_logs", enabled: bool = True):
         """Initialize logger for a posting session.
 
         Args:
             account_name: Instagram account name being posted to.
             log_dir: Directory to store log files.
+            enabled: If False, nothing is written (calls still count steps).
         """
         self.account_name = account_name
         self.log_dir = log_dir
         self.session_start = datetime.now()
         self.step_count = 0
+        self.enabled = enabled
+        self.log_file = None
+        self._file = None
+
+        if not enabled:
+            return
 
         # Create log directory if needed
         os.makedirs(log_dir, exist_ok=True)
@@ -128,6 +135,8 @@ class FlowLogger:
             result: Result of this step (success, failure, pending).
         """
         self.step_count += 1
+        if not self.enabled:
+            return
 
         entry = {
             'event': 'step',
@@ -153,6 +162,8 @@ class FlowLogger:
             error_message: Detailed error message.
             elements: UI elements when error occurred (if available).
         """
+        if not self.enabled:
+            return
         entry = {
             'event': 'error',
             'timestamp': datetime.now().isoformat(),
@@ -198,6 +209,8 @@ class FlowLogger:
         Args:
             entry: Dict to write as JSON line.
         """
+        if self._file is None:
+            return
         try:
             self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
             self._file.flush()  # Ensure data is written immediately
@@ -206,6 +219,8 @@ class FlowLogger:
 
     def close(self):
         """Close the log file."""
+        if self._file is None:
+            return
         try:
             self._file.close()
         except Exception:
@@ -27,8 +27,10 @@ setup_environment()
 from parallel_config import ParallelConfig, get_config
 # Import follow tracker
 from follow_tracker import FollowTracker
-# Import Geelark client for stopping phones
-from geelark_client import GeelarkClient
+# Import Geelark client for stopping phones (concurrent fan-out)
+from geelark_async_client import stop_running_phones
+# Concurrent port/Appium probing
+from port_prober import probe_worker_ports, PortStatus
 
 # Global flag for clean shutdown
 _shutdown_requested = False
@@ -88,21 +90,12 @@ def stop_all_phones():
     """Stop all running Geelark phones."""
     logger.info("Stopping all running phones...")
     try:
-        client = GeelarkClient()
-        stopped = 0
-        for page in range(1, 20):
-            result = client.list_phones(page=page, page_size=100)
-            for phone in result.get('items', []):
-                if phone.get('status') != 0:  # 0=stopped, 1=starting, 2=running  # Running
-                    try:
-                        client.stop_phone(phone['id'])
-                        stopped += 1
-                        logger.debug(f"Stopped: {phone.get('serialName')}")
-                    except Exception as e:
-                        logger.warning(f"Failed to stop {phone.get('serialName')}: {e}")
-            if len(result.get('items', [])) < 100:
-                break
-        logger.info(f"Stopped {stopped} phones")
+        result = stop_running_phones()
+        for name in result['stopped']:
+            logger.debug(f"Stopped: {name}")
+        for name, error in result['failed'].items():
+            logger.warning(f"Failed to stop {name}: {error}")
+        logger.info(f"Stopped {len(result['stopped'])} phones")
     except Exception as e:
         logger.error(f"Error stopping phones: {e}")
 
@@ -139,7 +132,8 @@ def spawn_worker(
     progress_file: str,
     followed_file: str,
     max_follows: int,
-    delay: int
+    delay: int,
+    bundle_size: int = Config.FOLLOW_BUNDLE_SIZE
 ) -> subprocess.Popen:
     """Spawn a worker subprocess.
 
@@ -150,7 +144,8 @@ def spawn_worker(
         progress_file: Path to follow_progress.csv
         followed_file: Path to all_followed_accounts.txt
         max_follows: Max follows per account per day
-        delay: Delay between jobs in seconds
+        delay: Delay between sessions in seconds
+        bundle_size: Targets followed per phone session
 
     Returns:
         Subprocess handle
@@ -165,6 +160,7 @@ def spawn_worker(
         '--followed-file', followed_file,
         '--max-follows', str(max_follows),
         '--delay', str(delay),
+        '--bundle-size', str(bundle_size),
     ]
 
     logger.info(f"Spawning worker {worker_id}: {' '.join(cmd)}")
@@ -260,7 +256,8 @@ def run_orchestrator(
     targets_file: str,
     progress_file: str,
     followed_file: str,
-    stagger_seconds: int = 60
+    stagger_seconds: int = 60,
+    bundle_size: int = Config.FOLLOW_BUNDLE_SIZE
 ):
     """
     Run the follow orchestrator.
@@ -274,6 +271,7 @@ def run_orchestrator(
         progress_file: Path to follow_progress.csv
         followed_file: Path to all_followed_accounts.txt
         stagger_seconds: Seconds between worker starts
+        bundle_size: Targets followed per phone session
     """
     global _shutdown_requested, _worker_processes
 
@@ -283,6 +281,7 @@ def run_orchestrator(
     logger.info(f"  Workers: {num_workers}")
     logger.info(f"  Max follows/account: {max_follows_per_account}")
     logger.info(f"  Delay between jobs: {delay_between_jobs}s")
+    logger.info(f"  Targets/session: {bundle_size}")
     logger.info(f"  Stagger between workers: {stagger_seconds}s")
     logger.info("=" * 60)
 
@@ -331,6 +330,15 @@ def run_orchestrator(
     # Create parallel config
     config = get_config(num_workers=num_workers)
 
+    # Probe all worker Appium ports in one concurrent pass
+    port_table = probe_worker_ports(config)
+    for worker_id in sorted(port_table):
+        state = port_table[worker_id]
+        if state.status in (PortStatus.BLOCKED, PortStatus.UNKNOWN):
+            logger.warning(f"  {state.describe()}")
+        else:
+            logger.info(f"  {state.describe()}")
+
     # Spawn workers with staggered start
     logger.info(f"Spawning {num_workers} workers...")
     for worker_id in range(num_workers):
@@ -344,7 +352,8 @@ def run_orchestrator(
             progress_file=progress_file,
             followed_file=followed_file,
             max_follows=max_follows_per_account,
-            delay=delay_between_jobs
+            delay=delay_between_jobs,
+            bundle_size=bundle_size
         )
         _worker_processes.append(proc)
         logger.info(f"Worker {worker_id} started (PID {proc.pid})")
@@ -409,6 +418,8 @@ def main():
                        help='Delay between jobs in seconds (default: 10)')
     parser.add_argument('--stagger', type=int, default=60,
                        help='Seconds between worker starts (default: 60)')
+    parser.add_argument('--bundle-size', type=int, default=Config.FOLLOW_BUNDLE_SIZE,
+                       help=f'Targets followed per phone session (default: {Config.FOLLOW_BUNDLE_SIZE})')
 
     # Action flags
     parser.add_argument('--run', action='store_true',
@@ -453,7 +464,8 @@ def main():
             targets_file=targets_file,
             progress_file=progress_file,
             followed_file=followed_file,
-            stagger_seconds=args.stagger
+            stagger_seconds=args.stagger,
+            bundle_size=args.bundle_size
         )
         return
 
@@ -167,6 +167,25 @@ class FollowScreenDetector:
                 return i
         return None
 
+    # IDs whose text holds the username on a profile page
+    PROFILE_USERNAME_IDS = ('action_bar_title', 'action_bar_username_container')
+
+    def profile_username(self, elements: List[Dict]) -> Optional[str]:
+        """Username shown in a profile's action bar (lowercase), or None."""
+        for element_id in self.PROFILE_USERNAME_IDS:
+            for e in elements:
+                if e.get('id', '') == element_id and e.get('text'):
+                    return e['text'].strip().lstrip('@').lower()
+        return None
+
+    def is_profile_of(self, elements: List[Dict], target_username: str) -> bool:
+        """True if the screen is the target's profile (follow button or already following)."""
+        username = self.profile_username(elements)
+        if username is None or username != target_username.lstrip('@').lower():
+            return False
+        screen_type = self.detect(elements, target_username).screen_type
+        return screen_type in (FollowScreenType.TARGET_PROFILE, FollowScreenType.FOLLOW_SUCCESS)
+
     # ==================== Detection Rules ====================
 
     def _detect_reels_screen(self, elements, texts, descs, ids, all_text, all_ids, target) -> Tuple:
@@ -702,3 +721,5 @@ if __name__ == "__main__":
     ]
     result = detector.detect(profile_elements, 'matt.s.trotter')
     print(f"Profile: {result.screen_type.name} (conf={result.confidence:.2f}), target_idx={result.target_element_index}")
+    print(f"Profile of target: {detector.is_profile_of(profile_elements, 'matt.s.trotter')}, "
+          f"of someone else: {detector.is_profile_of(profile_elements, 'other.user')}")
@@ -23,11 +23,12 @@ setup_environment()
 
 import re
 import time
+import random
 import json
 import hashlib
 import xml.etree.ElementTree as ET
 from collections import deque
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Callable
 
 import anthropic
 
@@ -56,6 +57,12 @@ APPIUM_SERVER = Config.DEFAULT_APPIUM_URL
 SCREEN_CENTER_X = Config.SCREEN_CENTER_X
 SCREEN_CENTER_Y = Config.SCREEN_CENTER_Y
 
+# Instagram usernames: letters, digits, periods and underscores (also keeps the adb command safe)
+INSTAGRAM_USERNAME_RE = re.compile(r'^[A-Za-z0-9._]{1,30}$')
+
+# Profile deep link opened with an Android VIEW intent
+PROFILE_DEEP_LINK = "https://www.instagram.com/{username}/"
+
 
 class SmartInstagramFollower:
     """Follow a target account using AI-driven navigation.
@@ -68,7 +75,8 @@ class SmartInstagramFollower:
         phone_name: str,
         system_port: int = 8200,
         appium_url: Optional[str] = None,
-        use_hybrid: bool = True
+        use_hybrid: bool = True,
+        use_deep_link: Optional[bool] = None
     ):
         """
         Initialize the follower.
@@ -78,8 +86,12 @@ class SmartInstagramFollower:
             system_port: Port for UiAutomator2 server
             appium_url: Appium server URL
             use_hybrid: Use hybrid navigator (rule-based with AI fallback)
+            use_deep_link: Open target profiles directly via deep link, falling back
+                           to the search flow (default: Config.FOLLOW_DEEP_LINK)
         """
         self.use_hybrid = use_hybrid
+        self.use_deep_link = Config.FOLLOW_DEEP_LINK if use_deep_link is None else use_deep_link
+        self._detector = FollowScreenDetector()
         # Use DeviceConnectionManager for all connection lifecycle
         self._conn = DeviceConnectionManager(
             phone_name=phone_name,
@@ -453,6 +465,43 @@ CRITICAL RULES:
             print(f"    AI error: {e}")
             return {"action": "wait", "reason": f"AI error: {e}"}
 
+    def open_profile_deep_link(self, target_username: str) -> bool:
+        """Open the target's profile with a VIEW intent and check it is the right one.
+
+        Instagram must be force-stopped first so the link opens a fresh activity.
+
+        Returns:
+            True if the target's profile is showing, False if the caller should
+            use the search flow instead
+        """
+        if not INSTAGRAM_USERNAME_RE.match(target_username):
+            print(f"  [DEEP LINK] Skipping, not a plain username: {target_username!r}")
+            return False
+
+        url = PROFILE_DEEP_LINK.format(username=target_username)
+        print(f"\nOpening profile via deep link: {url}")
+        self.adb(f"am start -W -a android.intent.action.VIEW -d {url} -p com.instagram.android")
+
+        for attempt in range(Config.FOLLOW_DEEP_LINK_CHECKS):
+            time.sleep(2)
+            try:
+                elements, _ = self.dump_ui()
+            except Exception as e:
+                print(f"  [DEEP LINK] UI dump error: {e}")
+                continue
+
+            if self._detector.is_profile_of(elements, target_username):
+                print(f"  [DEEP LINK] Profile of @{target_username} is showing")
+                return True
+
+            shown = self._detector.profile_username(elements)
+            if shown and shown != target_username.lower():
+                print(f"  [DEEP LINK] Wrong profile (@{shown}), using search")
+                return False
+
+        print("  [DEEP LINK] Profile not confirmed, using search")
+        return False
+
     def follow_account_hybrid(self, target_username: str, max_steps: int = 30) -> bool:
         """Hybrid follow loop - uses rule-based navigation with AI fallback.
 
@@ -480,12 +529,19 @@ CRITICAL RULES:
             logger=None
         )
 
-        # Open Instagram
+        # Open Instagram - straight on the target's profile if the deep link works
         print("\nOpening Instagram...")
         self.adb("am force-stop com.instagram.android")
         time.sleep(2)
-        self.adb("monkey -p com.instagram.android 1")
-        time.sleep(5)
+        if self.use_deep_link and self.open_profile_deep_link(target_username):
+            navigator.update_state(search_opened=True, username_typed=True, profile_opened=True)
+        else:
+            if self.use_deep_link:
+                # Start the search flow from the home feed, not whatever the link opened
+                self.adb("am force-stop com.instagram.android")
+                time.sleep(2)
+            self.adb("monkey -p com.instagram.android 1")
+            time.sleep(5)
 
         # Vision-action loop
         for step in range(max_steps):
@@ -772,6 +828,60 @@ CRITICAL RULES:
         flow_logger.close()
         return False
 
+    def _reset_follow_state(self) -> None:
+        """Clear per-target state before the next follow of a session."""
+        self.search_opened = False
+        self.username_typed = False
+        self.profile_opened = False
+        self.follow_clicked = False
+        self.screen_history.clear()
+        self.last_error_type = None
+        self.last_error_message = None
+
+    def follow_accounts(
+        self,
+        targets: List[str],
+        on_result: Optional[Callable[[str, bool], bool]] = None,
+        max_steps: int = 30,
+        pause_range: Optional[Tuple[float, float]] = None
+    ) -> Dict[str, bool]:
+        """Follow several targets back-to-back in one session.
+
+        The phone boot and Appium session are paid once; between follows we
+        wait a random, human-looking pause.
+
+        NOTE: connect() must be called before this method.
+
+        Args:
+            targets: Usernames to follow, in order
+            on_result: Called as on_result(target, success) after each follow
+                (last_error_* describe a failure); return False to end the session
+            max_steps: Maximum navigation steps per target
+            pause_range: (min, max) seconds between follows
+                (default: Config.FOLLOW_PAUSE_MIN_SECONDS/MAX_SECONDS)
+
+        Returns:
+            Dict of target -> success for the targets attempted
+        """
+        pause_min, pause_max = pause_range or (Config.FOLLOW_PAUSE_MIN_SECONDS,
+                                               Config.FOLLOW_PAUSE_MAX_SECONDS)
+        results: Dict[str, bool] = {}
+
+        for index, target in enumerate(targets):
+            if index > 0:
+                pause = random.uniform(pause_min, pause_max)
+                print(f"\nPausing {pause:.0f}s before next follow ({index + 1}/{len(targets)})...")
+                time.sleep(pause)
+
+            self._reset_follow_state()
+            success = self.follow_account(target, max_steps)
+            results[target] = success
+
+            if on_result is not None and on_result(target, success) is False:
+                break
+
+        return results
+
     def cleanup(self) -> None:
         """Cleanup after follow attempt - delegates to DeviceConnectionManager."""
         print("\nCleaning up...")
@@ -780,9 +890,10 @@ CRITICAL RULES:
 
 def main():
     if len(sys.argv) < 3:
-        print("Usage: python follow_single.py <phone_name> <target_username> [--ai-only]")
+        print("Usage: python follow_single.py <phone_name> <target_username> [--ai-only] [--no-deep-link]")
         print('Example: python follow_single.py talktrackhub someuser123')
         print('  --ai-only: Use AI-only mode (no rule-based navigation)')
+        print('  --no-deep-link: Always reach the profile through search')
         sys.exit(1)
 
     phone_name = sys.argv[1]
@@ -791,7 +902,9 @@ def main():
     # Check for --ai-only flag
     use_hybrid = '--ai-only' not in sys.argv
 
-    follower = SmartInstagramFollower(phone_name, use_hybrid=use_hybrid)
+    use_deep_link = False if '--no-deep-link' in sys.argv else None
+
+    follower = SmartInstagramFollower(phone_name, use_hybrid=use_hybrid, use_deep_link=use_deep_link)
 
     try:
         # Connect first (same pattern as posting)
@@ -292,6 +292,42 @@ class FollowTracker:
                 os.unlink(temp_path)
             raise
 
+    def _follows_today(self, jobs: List[Dict[str, Any]], today: str) -> Dict[str, int]:
+        """Count successful follows per account today."""
+        counts: Dict[str, int] = {}
+        for job in jobs:
+            if job.get('status') == 'success':
+                completed = job.get('completed_at', '')
+                if completed and completed.startswith(today):
+                    account = job.get('account', '')
+                    counts[account] = counts.get(account, 0) + 1
+        return counts
+
+    @staticmethod
+    def _is_claimable(job: Dict[str, Any], now: datetime) -> bool:
+        """True if the job is pending, or retrying and its retry time has come."""
+        status = job.get('status')
+        if status == 'pending':
+            return True
+        if status != 'retrying':
+            return False
+
+        retry_at = job.get('retry_at', '')
+        if retry_at:
+            try:
+                if now < datetime.fromisoformat(retry_at):
+                    return False  # Not time to retry yet
+            except ValueError:
+                pass  # Invalid timestamp, allow retry
+        return True
+
+    @staticmethod
+    def _claim(job: Dict[str, Any], worker_id: int, now: datetime) -> None:
+        job['status'] = 'claimed'
+        job['worker_id'] = str(worker_id)
+        job['claimed_at'] = now.isoformat()
+        job['attempts'] = str(int(job.get('attempts', 0)) + 1)
+
     def claim_next_job(
         self,
         worker_id: int,
@@ -307,55 +343,134 @@ class FollowTracker:
         Returns:
             Job dict if claimed, None if no jobs available
         """
+        bundle = self.claim_job_bundle(worker_id, 1, max_follows_per_account)
+        return bundle[0] if bundle else None
+
+    def claim_job_bundle(
+        self,
+        worker_id: int,
+        bundle_size: int,
+        max_follows_per_account: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Atomically claim up to bundle_size jobs of one account.
+
+        The worker follows them back-to-back in a single phone session.
+        Accounts that already have a claimed job are skipped (their phone is
+        in use by another worker), and the bundle never exceeds what the
+        account may still follow today.
+
+        Args:
+            worker_id: ID of the worker claiming the jobs
+            bundle_size: Max jobs to claim
+            max_follows_per_account: Max follows per account per day
+
+        Returns:
+            Claimed job dicts (all for the same account), empty if none available
+        """
         lock_file = self.progress_file + '.lock'
         now = datetime.now()
         today = now.date().isoformat()
 
         with portalocker.Lock(lock_file, timeout=self.lock_timeout):
             jobs = self._read_all_jobs()
+            account_follows_today = self._follows_today(jobs, today)
+            busy_accounts = {job.get('account', '') for job in jobs if job.get('status') == 'claimed'}
 
-            # Count successful follows per account today
-            account_follows_today = {}
+            bundle: List[Dict[str, Any]] = []
+            account = None
+            limit = 0
             for job in jobs:
-                if job.get('status') == 'success':
-                    completed = job.get('completed_at', '')
-                    if completed and completed.startswith(today):
-                        account = job.get('account', '')
-                        account_follows_today[account] = account_follows_today.get(account, 0) + 1
+                if not self._is_claimable(job, now):
+                    continue
 
-            # Find next claimable job
-            for job in jobs:
-                if job.get('status') not in ('pending', 'retrying'):
+                if account is None:
+                    candidate = job.get('account', '')
+                    if candidate in busy_accounts:
+                        continue  # Phone in use by another worker
+                    left_today = max_follows_per_account - account_follows_today.get(candidate, 0)
+                    if left_today <= 0:
+                        continue  # Account at daily limit
+                    account = candidate
+                    limit = min(bundle_size, left_today)
+                elif job.get('account', '') != account:
                     continue
 
-                # Check retry_at for retrying jobs
-                if job.get('status') == 'retrying':
-                    retry_at = job.get('retry_at', '')
-                    if retry_at:
-                        try:
-                            retry_time = datetime.fromisoformat(retry_at)
-                            if now < retry_time:
-                                continue  # Not time to retry yet
-                        except ValueError:
-                            pass  # Invalid timestamp, allow retry
-
-                # Check per-account daily limit
-                account = job.get('account', '')
-                if account_follows_today.get(account, 0) >= max_follows_per_account:
-                    continue  # Account at daily limit
-
-                # Claim this job
-                job['status'] = 'claimed'
-                job['worker_id'] = str(worker_id)
-                job['claimed_at'] = now.isoformat()
-                job['attempts'] = str(int(job.get('attempts', 0)) + 1)
+                self._claim(job, worker_id, now)
+                bundle.append(job)
+                if len(bundle) >= limit:
+                    break
 
+            if bundle:
                 self._write_all_jobs(jobs)
+                logger.debug(
+                    f"Worker {worker_id} claimed {len(bundle)} job(s) for {account}: "
+                    f"{', '.join(job['job_id'] for job in bundle)}"
+                )
+
+            return bundle
 
-                logger.debug(f"Worker {worker_id} claimed job: {job['job_id']}")
-                return job
+    def refresh_claims(self, job_ids: List[str], worker_id: int) -> int:
+        """
+        Bump claimed_at on jobs still waiting in a worker's session.
+
+        Keeps the later jobs of a long session from being released as stale.
+
+        Returns:
+            Number of jobs still claimed by this worker
+        """
+        if not job_ids:
+            return 0
 
-            return None  # No jobs available
+        lock_file = self.progress_file + '.lock'
+        now = datetime.now().isoformat()
+        wanted = set(job_ids)
+        refreshed = 0
+
+        with portalocker.Lock(lock_file, timeout=self.lock_timeout):
+            jobs = self._read_all_jobs()
+            for job in jobs:
+                if (job.get('job_id') in wanted and job.get('status') == 'claimed'
+                        and job.get('worker_id') == str(worker_id)):
+                    job['claimed_at'] = now
+                    refreshed += 1
+            if refreshed:
+                self._write_all_jobs(jobs)
+
+        return refreshed
+
+    def release_claims(self, job_ids: List[str], worker_id: int) -> int:
+        """
+        Hand unstarted jobs of a session back to the queue (e.g. on shutdown).
+
+        The claim does not count as an attempt.
+
+        Returns:
+            Number of jobs released
+        """
+        if not job_ids:
+            return 0
+
+        lock_file = self.progress_file + '.lock'
+        wanted = set(job_ids)
+        released = 0
+
+        with portalocker.Lock(lock_file, timeout=self.lock_timeout):
+            jobs = self._read_all_jobs()
+            for job in jobs:
+                if (job.get('job_id') in wanted and job.get('status') == 'claimed'
+                        and job.get('worker_id') == str(worker_id)):
+                    attempts = max(0, int(job.get('attempts', 0)) - 1)
+                    job['status'] = 'retrying' if attempts else 'pending'
+                    job['attempts'] = str(attempts)
+                    job['worker_id'] = ''
+                    job['claimed_at'] = ''
+                    released += 1
+            if released:
+                self._write_all_jobs(jobs)
+
+        logger.info(f"Worker {worker_id} released {released} unstarted job(s)")
+        return released
 
     def update_job_status(
         self,
@@ -5,8 +5,8 @@ Mirrors parallel_worker.py for posting.
 
 This module implements a single worker process that:
 1. Starts its own dedicated Appium server
-2. Claims and processes follow jobs from the shared progress tracker
-3. Uses SmartInstagramFollower for actual following
+2. Claims bundles of follow jobs (one account each) from the shared progress tracker
+3. Uses SmartInstagramFollower to follow a bundle back-to-back in one phone session
 4. Handles clean shutdown on signals
 
 Usage (typically called by follow_orchestrator):
@@ -22,7 +22,7 @@ import argparse
 import traceback
 import json
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from urllib.request import Request, urlopen
 
 # Import centralized config and set up environment FIRST
@@ -139,6 +139,29 @@ def stop_phone_by_name(phone_name: str, logger: logging.Logger) -> bool:
         return False
 
 
+def classify_follow_error(error: str, error_type: str = "unknown") -> Tuple[str, str]:
+    """Classify a follower error message.
+
+    Returns:
+        Tuple: (error_category, error_type)
+    """
+    error_lower = error.lower()
+    if any(x in error_lower for x in ['action blocked', 'try again later', 'temporarily blocked']):
+        return 'account', 'action_blocked'
+    elif any(x in error_lower for x in ['logged out', 'log in']):
+        return 'account', 'logged_out'
+    elif any(x in error_lower for x in ['captcha', 'confirm it']):
+        return 'account', 'captcha'
+    elif any(x in error_lower for x in ['suspended', 'disabled']):
+        return 'account', 'suspended'
+    elif any(x in error_lower for x in ['verification', 'verify']):
+        return 'account', 'verification'
+    elif any(x in error_lower for x in ['max steps', 'stuck']):
+        return 'infrastructure', 'claude_stuck'
+    else:
+        return 'infrastructure', error_type
+
+
 def execute_follow_job(
     job: dict,
     worker_config: WorkerConfig,
@@ -206,22 +229,8 @@ def execute_follow_job(
             error_type = follower.last_error_type or "unknown"
             logger.error(f"Failed to follow @{target}: {error}")
 
-            # Classify error
-            error_lower = error.lower()
-            if any(x in error_lower for x in ['action blocked', 'try again later', 'temporarily blocked']):
-                return False, error, 'account', 'action_blocked'
-            elif any(x in error_lower for x in ['logged out', 'log in']):
-                return False, error, 'account', 'logged_out'
-            elif any(x in error_lower for x in ['captcha', 'confirm it']):
-                return False, error, 'account', 'captcha'
-            elif any(x in error_lower for x in ['suspended', 'disabled']):
-                return False, error, 'account', 'suspended'
-            elif any(x in error_lower for x in ['verification', 'verify']):
-                return False, error, 'account', 'verification'
-            elif any(x in error_lower for x in ['max steps', 'stuck']):
-                return False, error, 'infrastructure', 'claude_stuck'
-            else:
-                return False, error, 'infrastructure', error_type
+            error_category, error_type = classify_follow_error(error, error_type)
+            return False, error, error_category, error_type
 
     except TimeoutError as e:
         error_msg = f"TimeoutError: {str(e)}"
@@ -246,6 +255,139 @@ def execute_follow_job(
         stop_phone_by_name(account, logger)
 
 
+def execute_follow_session(
+    jobs: List[dict],
+    worker_config: WorkerConfig,
+    config: ParallelConfig,
+    logger: logging.Logger,
+    tracker: FollowTracker,
+    worker_id: int
+) -> Tuple[int, int]:
+    """
+    Follow a bundle of targets for one account in a single phone session.
+
+    The phone is booted and the Appium session opened once; each target's
+    status is written to the tracker as soon as its follow finishes. An
+    account error (action blocked, logged out, ...) ends the session and
+    fails the remaining targets with the same error; a crash fails them as
+    infrastructure errors (retried later); a shutdown hands them back
+    unstarted.
+
+    Args:
+        jobs: Claimed jobs, all for the same account
+        worker_config: Worker configuration
+        config: Parallel configuration
+        logger: Logger instance
+        tracker: Tracker the jobs were claimed from
+        worker_id: Worker ID owning the claims
+
+    Returns:
+        Tuple: (follows_completed, follows_failed)
+    """
+    account = jobs[0]['account']
+    jobs_by_target = {job['target']: job for job in jobs}
+    remaining = [job['job_id'] for job in jobs]
+    counts = {'completed': 0, 'failed': 0}
+    session_error: Optional[str] = None
+
+    logger.info(f"Starting follow session: {account} -> {len(jobs)} target(s)")
+
+    # Kill any orphaned Appium sessions before starting
+    kill_appium_sessions(worker_config.appium_url, logger)
+
+    # Verify jobs are still ours (claims may have been released meanwhile)
+    targets = []
+    for job in jobs:
+        is_valid, error = tracker.verify_job_before_follow(job['job_id'], worker_id)
+        if is_valid:
+            targets.append(job['target'])
+        else:
+            logger.warning(f"Job verification failed for {job['job_id']}: {error}")
+            remaining.remove(job['job_id'])
+    if not targets:
+        return 0, 0
+
+    def on_result(target: str, success: bool) -> bool:
+        nonlocal session_error
+        job = jobs_by_target[target]
+        remaining.remove(job['job_id'])
+
+        if success:
+            tracker.update_job_status(job['job_id'], 'success', worker_id)
+            counts['completed'] += 1
+            logger.info(f"Successfully followed @{target}")
+        else:
+            error = follower.last_error_message or "Follow returned False"
+            error_category, error_type = classify_follow_error(
+                error, follower.last_error_type or "unknown"
+            )
+            tracker.update_job_status(
+                job['job_id'], 'failed', worker_id, error=error,
+                retry_delay_minutes=5
+            )
+            counts['failed'] += 1
+            logger.error(f"Failed to follow @{target}: {error_category}/{error_type}")
+            if error_category == 'account':
+                session_error = error
+                return False
+
+        if _shutdown_requested:
+            return False
+        # Keep the rest of the bundle from looking stale to other workers
+        if tracker.refresh_claims(remaining, worker_id) < len(remaining):
+            logger.warning("Lost claims on remaining session jobs, ending session")
+            return False
+        return True
+
+    follower = None
+    try:
+        # NOTE: use_hybrid=True enables rule-based navigation (see execute_follow_job)
+        follower = SmartInstagramFollower(
+            phone_name=account,
+            system_port=worker_config.system_port,
+            appium_url=worker_config.appium_url,
+            use_hybrid=True
+        )
+
+        logger.info(f"Connecting to device via {worker_config.appium_url}...")
+        follower.connect()
+
+        follower.follow_accounts(targets, on_result=on_result)
+
+    except Exception as e:
+        session_error = f"{type(e).__name__}: {str(e)}"
+        logger.error(f"Follow session exception: {session_error}")
+        logger.debug(traceback.format_exc())
+
+    finally:
+        try:
+            if follower:
+                follower.cleanup()
+        except Exception as e:
+            logger.warning(f"Cleanup error: {e}")
+
+        # Always stop the phone
+        stop_phone_by_name(account, logger)
+
+    # Targets the session never reached
+    if remaining:
+        if session_error:
+            for job_id in remaining:
+                tracker.update_job_status(
+                    job_id, 'failed', worker_id, error=session_error,
+                    retry_delay_minutes=5
+                )
+            counts['failed'] += len(remaining)
+        else:
+            tracker.release_claims(remaining, worker_id)
+
+    logger.info(
+        f"Follow session for {account} done: "
+        f"{counts['completed']} followed, {counts['failed']} failed"
+    )
+    return counts['completed'], counts['failed']
+
+
 def run_worker(
     worker_id: int,
     config: ParallelConfig,
@@ -253,7 +395,8 @@ def run_worker(
     progress_file: str,
     followed_file: str,
     max_follows_per_account: int = 1,
-    delay_between_jobs: int = 10
+    delay_between_jobs: int = 10,
+    bundle_size: int = Config.FOLLOW_BUNDLE_SIZE
 ) -> dict:
     """
     Main worker loop.
@@ -267,7 +410,8 @@ def run_worker(
         progress_file: Path to follow_progress.csv
         followed_file: Path to all_followed_accounts.txt
         max_follows_per_account: Max follows per account per day
-        delay_between_jobs: Seconds to wait between jobs
+        delay_between_jobs: Seconds to wait between sessions
+        bundle_size: Targets followed per phone session
 
     Returns:
         Dict with worker stats
@@ -284,6 +428,7 @@ def run_worker(
     logger.info(f"  System port: {worker_config.system_port}")
     logger.info(f"  Progress file: {progress_file}")
     logger.info(f"  Max follows/account: {max_follows_per_account}")
+    logger.info(f"  Targets/session: {bundle_size}")
     logger.info("=" * 60)
 
     # Stats tracking
@@ -338,10 +483,10 @@ def run_worker(
             if released > 0:
                 logger.info(f"Released {released} stale job claims")
 
-            # Claim a job
-            job = tracker.claim_next_job(worker_id, max_follows_per_account)
+            # Claim a bundle of targets for one account
+            jobs = tracker.claim_job_bundle(worker_id, bundle_size, max_follows_per_account)
 
-            if job is None:
+            if not jobs:
                 # No jobs available right now
                 if claimed > 0:
                     # Other workers have jobs, wait for them
@@ -354,40 +499,35 @@ def run_worker(
                     stats['exit_reason'] = "all_jobs_complete"
                     break
 
-            # Execute the job
-            job_id = job['job_id']
-            logger.info(f"Processing follow job: {job['account']} -> @{job['target']}")
+            # Execute the session
+            logger.info(
+                f"Processing follow session: {jobs[0]['account']} -> "
+                f"{', '.join('@' + job['target'] for job in jobs)}"
+            )
 
             try:
-                success, error, error_category, error_type = execute_follow_job(
-                    job, worker_config, config, logger,
+                completed, failed = execute_follow_session(
+                    jobs, worker_config, config, logger,
                     tracker=tracker, worker_id=worker_id
                 )
-
-                if success:
-                    tracker.update_job_status(job_id, 'success', worker_id)
-                    stats['follows_completed'] += 1
-                    logger.info(f"Job {job_id} completed successfully")
-                else:
-                    tracker.update_job_status(
-                        job_id, 'failed', worker_id, error=error,
-                        retry_delay_minutes=5
-                    )
-                    stats['follows_failed'] += 1
-                    logger.info(f"Job {job_id} failed: {error_category}/{error_type}")
+                stats['follows_completed'] += completed
+                stats['follows_failed'] += failed
 
             except Exception as e:
                 error_msg = f"{type(e).__name__}: {str(e)}"
                 logger.error(f"Unhandled exception: {error_msg}")
-                tracker.update_job_status(
-                    job_id, 'failed', worker_id, error=error_msg,
-                    retry_delay_minutes=5
-                )
-                stats['follows_failed'] += 1
+                for job in jobs:
+                    still_claimed, _ = tracker.verify_job_before_follow(job['job_id'], worker_id)
+                    if still_claimed:
+                        tracker.update_job_status(
+                            job['job_id'], 'failed', worker_id, error=error_msg,
+                            retry_delay_minutes=5
+                        )
+                        stats['follows_failed'] += 1
 
-            # Delay before next job
+            # Delay before next session
             if not _shutdown_requested and delay_between_jobs > 0:
-                logger.info(f"Waiting {delay_between_jobs}s before next job...")
+                logger.info(f"Waiting {delay_between_jobs}s before next session...")
                 time.sleep(delay_between_jobs)
 
         if _shutdown_requested:
@@ -431,7 +571,9 @@ def main():
     parser.add_argument('--max-follows', type=int, default=1,
                        help='Max follows per account per day')
     parser.add_argument('--delay', type=int, default=10,
-                       help='Delay between jobs in seconds')
+                       help='Delay between sessions in seconds')
+    parser.add_argument('--bundle-size', type=int, default=Config.FOLLOW_BUNDLE_SIZE,
+                       help='Targets followed per phone session')
 
     args = parser.parse_args()
 
@@ -449,7 +591,8 @@ def main():
         progress_file=args.progress_file,
         followed_file=args.followed_file,
         max_follows_per_account=args.max_follows,
-        delay_between_jobs=args.delay
+        delay_between_jobs=args.delay,
+        bundle_size=args.bundle_size
     )
 
     # Exit with appropriate code
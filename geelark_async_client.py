@@ -0,0 +1,267 @@
+"""
+Async Geelark API Client - concurrent fan-out for orchestrator-level bulk operations.
+
+GeelarkClient issues one blocking HTTP call at a time. Orchestrator operations
+like stopping every campaign phone or listing all pages of phones only need
+the results together, so this client runs the same endpoints concurrently
+with a bounded number of requests in flight.
+
+Every call is delegated to a GeelarkClient method running on a worker thread,
+so authentication, urllib3 retries, timeouts, response validation and the
+geelark_api.log format are identical to the synchronous client.
+
+Usage:
+    from geelark_async_client import AsyncGeelarkClient, run_async
+
+    async def stop_everything():
+        async with AsyncGeelarkClient(max_concurrency=8) as client:
+            phones = await client.list_all_phones()
+            running = [p['id'] for p in phones if p.get('status') != 0]
+            return await client.stop_phones(running)
+
+    results = run_async(stop_everything())
+"""
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from geelark_client import GeelarkClient
+
+api_logger = logging.getLogger("geelark_api")
+
+# Max Geelark requests in flight at once (also sizes the HTTP connection pool)
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class AsyncGeelarkClient:
+    """
+    asyncio sibling of GeelarkClient with bounded concurrency.
+
+    Single-endpoint coroutines mirror GeelarkClient's method names and return
+    values. Bulk helpers (list_all_phones, stop_phones, ...) fan out over many
+    phones and return once the slowest request finishes.
+    """
+
+    def __init__(
+        self,
+        token: str = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        client: GeelarkClient = None,
+    ):
+        """
+        Initialize the async client.
+
+        Args:
+            token: Optional token override (see GeelarkClient).
+            max_concurrency: Maximum number of requests in flight.
+            client: Optional existing GeelarkClient to share credentials/session.
+
+        Raises:
+            GeelarkCredentialError: If GEELARK_TOKEN is missing.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+
+        self.max_concurrency = max_concurrency
+        self.client = client or GeelarkClient(token=token, pool_maxsize=max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="geelark-async",
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """Shut down the worker threads (pending calls finish first)."""
+        self._executor.shutdown(wait=True)
+
+    async def _call(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking GeelarkClient method on the executor, bounded by the semaphore."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    # ==================== SINGLE ENDPOINTS ====================
+
+    async def _request(self, endpoint, data=None, timeout=None):
+        """Raw API request (same logging and error handling as GeelarkClient._request)."""
+        return await self._call(self.client._request, endpoint, data, timeout)
+
+    async def list_phones(self, page=1, page_size=100, group_name=None):
+        """List cloud phones"""
+        return await self._call(self.client.list_phones, page, page_size, group_name)
+
+    async def get_phone_status(self, phone_ids):
+        """Get status of specific phones"""
+        return await self._call(self.client.get_phone_status, phone_ids)
+
+    async def start_phone(self, phone_id):
+        """Start a cloud phone"""
+        return await self._call(self.client.start_phone, phone_id)
+
+    async def stop_phone(self, phone_id):
+        """Stop a cloud phone"""
+        return await self._call(self.client.stop_phone, phone_id)
+
+    async def enable_adb(self, phone_id):
+        """Enable ADB on a cloud phone"""
+        return await self._call(self.client.enable_adb, phone_id)
+
+    async def disable_adb(self, phone_id):
+        """Disable ADB on a cloud phone"""
+        return await self._call(self.client.disable_adb, phone_id)
+
+    async def get_adb_info(self, phone_id):
+        """Get ADB connection info (ip, port, password)"""
+        return await self._call(self.client.get_adb_info, phone_id)
+
+    async def screenshot(self, phone_id):
+        """Request a screenshot from cloud phone"""
+        return await self._call(self.client.screenshot, phone_id)
+
+    async def get_screenshot_result(self, task_id):
+        """Get screenshot result (download link)"""
+        return await self._call(self.client.get_screenshot_result, task_id)
+
+    async def upload_file_to_phone(self, phone_id, file_url):
+        """Upload a file from URL to cloud phone's Downloads folder"""
+        return await self._call(self.client.upload_file_to_phone, phone_id, file_url)
+
+    async def query_upload_status(self, task_id):
+        """Query the upload status of a file to cloud phone"""
+        return await self._call(self.client.query_upload_status, task_id)
+
+    async def set_root_status(self, phone_id, enable=True):
+        """Enable or disable root on cloud phone"""
+        return await self._call(self.client.set_root_status, phone_id, enable)
+
+    # ==================== BULK OPERATIONS ====================
+
+    async def list_all_phones(self, page_size: int = 100, max_pages: int = 20,
+                              group_name: str = None) -> List[Dict]:
+        """
+        List every cloud phone across all pages.
+
+        Fetches page 1 to learn the total, then requests the remaining pages
+        concurrently.
+
+        Returns:
+            List of phone dicts (same shape as list_phones()['items'])
+        """
+        first = await self.list_phones(page=1, page_size=page_size, group_name=group_name)
+        items = list(first.get('items', []))
+        total = first.get('total', len(items))
+
+        if len(items) < page_size or total <= page_size:
+            return items
+
+        last_page = min(max_pages, -(-total // page_size))
+        pages = await asyncio.gather(*[
+            self.list_phones(page=page, page_size=page_size, group_name=group_name)
+            for page in range(2, last_page + 1)
+        ])
+        for result in pages:
+            items.extend(result.get('items', []))
+        return items
+
+    async def _fan_out(self, func: Callable, phone_ids: List[str]) -> Dict[str, Any]:
+        """Call func(phone_id) for every id; map id -> result or raised Exception."""
+        results = await asyncio.gather(
+            *[func(phone_id) for phone_id in phone_ids],
+            return_exceptions=True,
+        )
+        outcome = {}
+        for phone_id, result in zip(phone_ids, results):
+            if isinstance(result, Exception):
+                api_logger.error(f"BULK ERROR: {func.__name__} phone={phone_id} error={result}")
+            outcome[phone_id] = result
+        return outcome
+
+    async def stop_phones(self, phone_ids: List[str]) -> Dict[str, Any]:
+        """
+        Stop many phones concurrently.
+
+        Returns:
+            Dict mapping phone_id to the API result, or the Exception raised
+            for that phone (one failure does not cancel the others).
+        """
+        return await self._fan_out(self.stop_phone, phone_ids)
+
+    async def start_phones(self, phone_ids: List[str]) -> Dict[str, Any]:
+        """Start many phones concurrently (see stop_phones for return shape)."""
+        return await self._fan_out(self.start_phone, phone_ids)
+
+    async def disable_adb_many(self, phone_ids: List[str]) -> Dict[str, Any]:
+        """Disable ADB on many phones concurrently (see stop_phones for return shape)."""
+        return await self._fan_out(self.disable_adb, phone_ids)
+
+
+def run_async(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    The orchestrators are synchronous scripts; this is the bridge into the
+    async client for one-off bulk operations.
+    """
+    return asyncio.run(coro)
+
+
+def stop_running_phones(account_filter: Optional[set] = None,
+                        max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> Dict[str, Any]:
+    """
+    Stop running phones concurrently, optionally only those in account_filter.
+
+    Synchronous convenience wrapper used by the orchestrators' cleanup paths.
+
+    Args:
+        account_filter: If given, only stop phones whose serialName is in this set.
+        max_concurrency: Maximum stop requests in flight.
+
+    Returns:
+        Dict with 'stopped' (list of names), 'failed' (name -> error message)
+        and 'skipped' (count of running phones outside account_filter).
+    """
+    async def _run():
+        async with AsyncGeelarkClient(max_concurrency=max_concurrency) as client:
+            phones = await client.list_all_phones()
+            running = [p for p in phones if p.get('status') != 0]  # 0=stopped, 1=starting, 2=running
+
+            targets = running
+            if account_filter is not None:
+                targets = [p for p in running if p.get('serialName', '') in account_filter]
+
+            results = await client.stop_phones([p['id'] for p in targets])
+
+            names = {p['id']: p.get('serialName', 'unknown') for p in targets}
+            stopped = [names[pid] for pid, r in results.items() if not isinstance(r, Exception)]
+            failed = {names[pid]: str(r) for pid, r in results.items() if isinstance(r, Exception)}
+            return {
+                'stopped': stopped,
+                'failed': failed,
+                'skipped': len(running) - len(targets),
+            }
+
+    return run_async(_run())
+
+
+if __name__ == "__main__":
+    async def _demo():
+        async with AsyncGeelarkClient() as client:
+            phones = await client.list_all_phones()
+            print(f"Total phones: {len(phones)}")
+            running = [p for p in phones if p.get('status') != 0]
+            print(f"Running: {len(running)}")
+
+    run_async(_demo())
@@ -11,9 +11,12 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+from metrics import metrics
+
 load_dotenv()
 
-API_BASE = "https://openapi.geelark.com"
+# GEELARK_API_BASE points the client at another server (e.g. device_simulator.py)
+API_BASE = os.getenv("GEELARK_API_BASE", "https://openapi.geelark.com").rstrip("/")
 
 # Default HTTP timeout in seconds (prevents hanging requests)
 DEFAULT_HTTP_TIMEOUT = 30
@@ -33,12 +36,13 @@ class GeelarkCredentialError(Exception):
 
 
 class GeelarkClient:
-    def __init__(self, token: str = None):
+    def __init__(self, token: str = None, pool_maxsize: int = 10):
         """
         Initialize GeelarkClient with credential validation and connection pooling.
 
         Args:
             token: Optional token override. If not provided, reads from GEELARK_TOKEN env var.
+            pool_maxsize: Max pooled connections (raise for concurrent callers).
 
         Raises:
             GeelarkCredentialError: If GEELARK_TOKEN is missing.
@@ -57,7 +61,7 @@ class GeelarkClient:
         self.session = requests.Session()
         adapter = HTTPAdapter(
             pool_connections=10,  # Number of connection pools
-            pool_maxsize=10,      # Max connections per pool
+            pool_maxsize=pool_maxsize,  # Max connections per pool
             max_retries=Retry(
                 total=3,
                 backoff_factor=0.5,
@@ -87,7 +91,8 @@ class GeelarkClient:
         api_logger.debug(f"REQUEST: {endpoint} data={data}")
 
         # Use session for connection pooling, add timeout to prevent hanging
-        resp = self.session.post(url, json=data or {}, headers=headers, timeout=timeout)
+        with metrics.timer('geelark_api_seconds', endpoint=endpoint):
+            resp = self.session.post(url, json=data or {}, headers=headers, timeout=timeout)
         elapsed = time.time() - start_time
 
         # Log full response info (for Geelark developer debugging)
@@ -68,6 +68,60 @@ PROFILE_MAPPING = {
     "alice.in.wonderlan31": 12,  # TikTok
 }
 
+# =============================================================================
+# DEVICE FLEET
+# =============================================================================
+# Several Pixels: map each device serial to the accounts on it (same format as
+# PROFILE_MAPPING). The orchestrator starts one worker per attached device and
+# routes each job to the device that hosts its account. An account must be on
+# exactly one device.
+#
+# Leave empty to use the single device above (DEVICE_SERIAL + PROFILE_MAPPING).
+
+DEVICE_FLEET = {
+    # "32271FDH2006RW": {
+    #     "darklichencoded": 0,
+    #     "alice.in.wonderlan31": 12,
+    # },
+    # "SECOND_PIXEL_SERIAL": {
+    #     "other_account": 0,
+    # },
+}
+
+# =============================================================================
+# PROFILE BATCHING
+# =============================================================================
+# A user switch on a physical Pixel takes several seconds. With batching on,
+# a worker keeps claiming jobs for the active profile until none are left,
+# so switches scale with the number of profiles instead of the number of jobs.
+
+PROFILE_BATCHING = True
+
+# While the active profile posts, push videos for the profile that comes next
+# into that profile's staging folder (invisible to the active profile).
+PRESTAGE_NEXT_PROFILE = True
+
+# Max videos pushed ahead for the next profile
+PRESTAGE_MAX_VIDEOS = 10
+
+# =============================================================================
+# MEDIA STAGING
+# =============================================================================
+# upload_video() scans only the pushed file and polls MediaStore until its row
+# shows up, instead of rescanning all of external storage and sleeping.
+
+# Max seconds to wait for the video's MediaStore row before a full volume scan
+MEDIA_SCAN_TIMEOUT = 10.0
+
+# Seconds between MediaStore queries while waiting
+MEDIA_SCAN_POLL_INTERVAL = 0.5
+
+# Pre-pushed videos wait in this folder (with a .nomedia marker, so the media
+# index never lists them) next to Download on each user's storage.
+# upload_video() moves a job's video into Download, which only ever holds the
+# current job's video: the gallery picker taps the first thumbnail.
+STAGING_DIR_NAME = ".staging"
+
 # =============================================================================
 # SCREEN COORDINATES
 # =============================================================================
@@ -134,6 +188,17 @@ def list_accounts_for_profile(profile_id: int) -> list:
     ]
 
 
+def get_fleet_mapping() -> dict:
+    """
+    Device serial -> {account: profile ID} for every configured device.
+
+    Returns DEVICE_FLEET, or {DEVICE_SERIAL: PROFILE_MAPPING} if no fleet is set.
+    """
+    if DEVICE_FLEET:
+        return DEVICE_FLEET
+    return {DEVICE_SERIAL: PROFILE_MAPPING}
+
+
 def validate_config() -> bool:
     """
     Validate the configuration is properly set up.
@@ -150,11 +215,18 @@ def validate_config() -> bool:
         )
 
     # Check all profile IDs are valid (non-negative integers)
-    for account, profile_id in PROFILE_MAPPING.items():
-        if not isinstance(profile_id, int) or profile_id < 0:
-            raise ValueError(
-                f"Invalid profile ID for account '{account}': {profile_id}. "
-                "Profile IDs must be non-negative integers (0, 10, 11, etc.)"
-            )
+    seen = {}
+    for serial, mapping in get_fleet_mapping().items():
+        for account, profile_id in mapping.items():
+            if not isinstance(profile_id, int) or profile_id < 0:
+                raise ValueError(
+                    f"Invalid profile ID for account '{account}': {profile_id}. "
+                    "Profile IDs must be non-negative integers (0, 10, 11, etc.)"
+                )
+            if account in seen and seen[account] != serial:
+                raise ValueError(
+                    f"Account '{account}' is mapped on two devices: {seen[account]} and {serial}"
+                )
+            seen[account] = serial
 
     return True
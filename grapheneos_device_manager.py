@@ -20,23 +20,38 @@ Usage:
     # Connect for a specific account (switches to correct profile)
     manager.ensure_connected("my_instagram_account")
 
-    # Upload video via adb push
+    # Upload video via adb push (skipped if the same file is already there)
     remote_path = manager.upload_video("local/video.mp4")
 
+    # Pre-push a day's videos, one adb push per profile
+    manager.stage_jobs(tracker.get_open_jobs())
+
     # Get Appium capabilities
     caps = manager.get_appium_caps()
+
+    # Keep claiming jobs for the active profile, pre-push the next profile's videos
+    batcher = ProfileBatcher(manager)
+    batcher.sync()
+    batcher.job_claimed("my_instagram_account")
+    batcher.prestage_next(tracker.get_open_jobs())
 """
 
 import subprocess
 import os
 import time
 import re
+import shlex
+import hashlib
 import logging
+import threading
+from collections import Counter
 import requests
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from device_manager_base import DeviceManager
 from config import Config
+from grapheneos_config import MEDIA_SCAN_TIMEOUT, MEDIA_SCAN_POLL_INTERVAL, STAGING_DIR_NAME
+from adb_shell_pool import get_shell_pool, AdbShellError
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +75,52 @@ class AppiumNotReachableError(Exception):
     pass
 
 
+# =============================================================================
+# Per-profile storage
+# =============================================================================
+
+def user_download_dir(user_id: Optional[int]) -> str:
+    """
+    Download folder of an Android user as seen from `adb shell`.
+
+    /sdcard is the owner's storage; a secondary user's files live under
+    /storage/emulated/<user_id> and are only visible to apps in that user.
+    """
+    if not user_id:
+        return "/sdcard/Download"
+    return f"/storage/emulated/{user_id}/Download"
+
+
+def user_staging_dir(user_id: Optional[int]) -> str:
+    """Staging folder for pre-pushed videos, on the same volume as user_download_dir()."""
+    if not user_id:
+        return f"/sdcard/{STAGING_DIR_NAME}"
+    return f"/storage/emulated/{user_id}/{STAGING_DIR_NAME}"
+
+
+# MD5 of local videos: (path, mtime, size) -> hex digest
+_local_md5_cache: Dict[Tuple[str, float, int], str] = {}
+_local_md5_lock = threading.Lock()
+
+
+def local_md5(path: str) -> str:
+    """MD5 of a local file, cached until its mtime or size changes."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+    with _local_md5_lock:
+        cached = _local_md5_cache.get(key)
+    if cached:
+        return cached
+
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    with _local_md5_lock:
+        _local_md5_cache[key] = digest.hexdigest()
+    return _local_md5_cache[key]
+
+
 # =============================================================================
 # Standalone Connectivity Check Functions
 # =============================================================================
@@ -304,12 +365,29 @@ class GrapheneOSDeviceManager(DeviceManager):
             *args: ADB command arguments (e.g., 'shell', 'am', 'get-current-user')
             timeout: Command timeout in seconds
 
+        Note:
+            Pooled shell commands return stdout only (stderr is empty).
+
         Returns:
             CompletedProcess with stdout, stderr, returncode
         """
         cmd = [self.adb_path, '-s', self.serial] + list(args)
         logger.debug(f"Running ADB: {' '.join(cmd)}")
 
+        # Shell commands reuse the persistent per-device session; push/pull/
+        # get-state and anything the pool can't serve use a one-shot process.
+        if Config.USE_ADB_SHELL_POOL and len(args) > 1 and args[0] == 'shell':
+            try:
+                returncode, stdout = get_shell_pool().run(
+                    self.serial, ' '.join(args[1:]), timeout=timeout
+                )
+                return subprocess.CompletedProcess(cmd, returncode, stdout, '')
+            except subprocess.TimeoutExpired:
+                logger.error(f"ADB command timed out after {timeout}s: {' '.join(cmd)}")
+                raise
+            except AdbShellError as e:
+                logger.warning(f"[ADB POOL] {e} - falling back to one-shot adb")
+
         try:
             result = subprocess.run(
                 cmd,
@@ -403,7 +481,10 @@ class GrapheneOSDeviceManager(DeviceManager):
         """
         result = self._adb('shell', 'am', 'switch-user', str(user_id))
         if result.returncode != 0:
-            raise Exception(f"Failed to switch user: {result.stderr.strip()}")
+            raise Exception(
+                f"Failed to switch user (exit {result.returncode}): "
+                f"{result.stderr.strip() or result.stdout.strip()}"
+            )
 
         # Wait for profile switch animation and initialization
         logger.info(f"Waiting for profile {user_id} to become active...")
@@ -423,7 +504,13 @@ class GrapheneOSDeviceManager(DeviceManager):
 
     def upload_video(self, local_path: str) -> str:
         """
-        Push video to device via ADB and trigger media scan.
+        Push video to device via ADB and make it visible in the gallery.
+
+        Download is first cleared of other videos, so the gallery shows only
+        this one. The push is skipped when the same file (size and MD5) is
+        already in Download, or moved there from the staging folder if
+        stage_videos() pre-pushed it. Only this file is media-scanned, and
+        MediaStore is polled until its row shows up.
 
         Args:
             local_path: Path to local video file
@@ -438,47 +525,198 @@ class GrapheneOSDeviceManager(DeviceManager):
             raise Exception(f"Video file not found: {local_path}")
 
         filename = os.path.basename(local_path)
-        remote_path = f"/sdcard/Download/{filename}"
-
-        logger.info(f"Pushing {local_path} to {remote_path}")
-        result = self._adb('push', local_path, remote_path, timeout=120)
+        download_dir = user_download_dir(self.current_profile)
+        remote_path = f"{download_dir}/{filename}"
+        staged_path = f"{user_staging_dir(self.current_profile)}/{filename}"
+
+        self._clear_download_dir(download_dir, keep=filename)
+
+        if self._is_on_device(local_path, remote_path):
+            logger.info(f"{remote_path} already on device, skipping adb push")
+            print(f"  [STAGED] {filename} already on device, skipping push")
+        elif self._is_on_device(local_path, staged_path):
+            logger.info(f"Moving staged {staged_path} to {remote_path}")
+            result = self._adb('shell', 'mv', staged_path, remote_path)
+            if result.returncode != 0 or self._remote_size(remote_path) != os.path.getsize(local_path):
+                raise Exception(
+                    f"Could not move staged video to {remote_path}: "
+                    f"{result.stderr.strip() or result.stdout.strip()}"
+                )
+            print(f"  [STAGED] {filename} moved from staging, skipping push")
+        else:
+            logger.info(f"Pushing {local_path} to {remote_path}")
+            result = self._adb('push', local_path, remote_path, timeout=120)
 
-        if result.returncode != 0:
-            raise Exception(
-                f"adb push failed: {result.stderr.strip() or result.stdout.strip()}"
-            )
+            if result.returncode != 0:
+                raise Exception(
+                    f"adb push failed: {result.stderr.strip() or result.stdout.strip()}"
+                )
 
-        # Verify file exists on device
-        check = self._adb('shell', 'ls', '-la', remote_path)
-        if result.returncode != 0:
-            raise Exception(f"File not found after push: {remote_path}")
+            # Verify file exists on device
+            if self._remote_size(remote_path) != os.path.getsize(local_path):
+                raise Exception(f"File not found after push: {remote_path}")
 
-        # CRITICAL: Trigger media scan so the video appears in gallery
+        # CRITICAL: Make the video visible in the gallery
         # Without this, TikTok won't see the uploaded video!
-        print(f"  [MEDIA SCAN] Triggering media scan for {remote_path}")
-        scan_result = self._adb(
-            'shell', 'am', 'broadcast',
+        start = time.time()
+        if self._scan_file(remote_path, os.path.getsize(local_path)):
+            print(f"  [MEDIA SCAN] Indexed in {time.time() - start:.1f}s")
+        else:
+            print(f"  [MEDIA SCAN] Video not indexed after {MEDIA_SCAN_TIMEOUT:.0f}s, scanning whole volume")
+            self._scan_volume()
+
+        return remote_path
+
+    def _user_args(self, user_id: Optional[int] = None) -> List[str]:
+        """`--user` arguments for am/content (secondary users have their own media store)."""
+        user_id = self.current_profile if user_id is None else user_id
+        return ['--user', str(user_id)] if user_id else []
+
+    def _scan_file(self, remote_path: str, size: int) -> bool:
+        """
+        Media-scan one file and wait for its MediaStore row.
+
+        Returns:
+            True once the row exists, False after MEDIA_SCAN_TIMEOUT
+        """
+        print(f"  [MEDIA SCAN] Scanning {remote_path}")
+        self._adb(
+            'shell', 'am', 'broadcast', *self._user_args(),
             '-a', 'android.intent.action.MEDIA_SCANNER_SCAN_FILE',
             '-d', f'file://{remote_path}'
         )
-        print(f"  [MEDIA SCAN] Broadcast result: {scan_result.stdout.strip()}")
 
-        # Also try the newer content provider method (for Android 10+)
-        print(f"  [MEDIA SCAN] Running content scan_volume...")
-        scan2_result = self._adb(
-            'shell', 'content', 'call',
+        name = os.path.basename(remote_path)
+        if "'" in name or '"' in name:
+            # Can't be quoted into the query; give the scanner a moment instead
+            time.sleep(MEDIA_SCAN_POLL_INTERVAL * 4)
+            return True
+
+        deadline = time.time() + MEDIA_SCAN_TIMEOUT
+        while True:
+            result = self._adb(
+                'shell', 'content', 'query', *self._user_args(),
+                '--uri', 'content://media/external/video/media',
+                '--projection', '_id',
+                '--where', f"\"_display_name='{name}' AND _size={size}\""
+            )
+            if re.search(r'_id=\d+', result.stdout):
+                return True
+            if time.time() >= deadline:
+                return False
+            time.sleep(MEDIA_SCAN_POLL_INTERVAL)
+
+    def _scan_volume(self) -> None:
+        """Rescan all of external storage (fallback when a single-file scan is not picked up)."""
+        result = self._adb(
+            'shell', 'content', 'call', *self._user_args(),
             '--method', 'scan_volume',
             '--uri', 'content://media',
-            '--arg', 'external_primary'
+            '--arg', 'external_primary',
+            timeout=120
         )
-        print(f"  [MEDIA SCAN] Content result: {scan2_result.stdout.strip()}")
+        print(f"  [MEDIA SCAN] Volume scan result: {result.stdout.strip()}")
 
-        # Wait for media scan to complete
-        print(f"  [MEDIA SCAN] Waiting 3s for scan to complete...")
-        time.sleep(3)
+    def _remote_size(self, remote_path: str) -> Optional[int]:
+        """Size of a file on the device, or None if it does not exist."""
+        result = self._adb('shell', 'stat', '-c', '%s', remote_path)
+        try:
+            return int(result.stdout.strip())
+        except ValueError:
+            return None
+
+    def _clear_download_dir(self, download_dir: str, keep: str) -> None:
+        """Delete every video in download_dir except `keep` (the current job's file)."""
+        result = self._adb('shell', 'ls', download_dir)
+        stale = [
+            shlex.quote(f"{download_dir}/{name}") for name in result.stdout.splitlines()
+            if name.lower().endswith('.mp4') and name != keep
+        ]
+        if stale:
+            logger.info(f"Removing {len(stale)} leftover video(s) from {download_dir}")
+            self._adb('shell', 'rm', '-f', *stale)
+
+    def _is_on_device(self, local_path: str, remote_path: str) -> bool:
+        """True if remote_path holds the same file (size first, then MD5)."""
+        if self._remote_size(remote_path) != os.path.getsize(local_path):
+            return False
+        result = self._adb('shell', 'md5sum', remote_path, timeout=60)
+        remote_md5 = result.stdout.split()[0] if result.stdout.strip() else ''
+        return remote_md5 == local_md5(local_path)
+
+    def stage_videos(self, local_paths: List[str], user_id: int) -> int:
+        """
+        Push videos into a profile's staging folder ahead of its jobs.
 
-        print(f"  [MEDIA SCAN] Done! Video should now appear in TikTok gallery")
-        return remote_path
+        The folder has a .nomedia marker, so staged videos never show up in
+        the gallery. Files already staged are left alone; the rest go in a
+        single `adb push`. upload_video() moves each one into Download when
+        its job runs, skipping the push.
+
+        Args:
+            local_paths: Local video files
+            user_id: Android user the videos are for
+
+        Returns:
+            Number of videos staged afterwards
+        """
+        staging_dir = user_staging_dir(user_id)
+        self._adb('shell', 'mkdir', '-p', staging_dir, '&&', 'touch', f"{staging_dir}/.nomedia")
+        present, to_push = 0, []
+        for local_path in dict.fromkeys(local_paths):
+            if not os.path.exists(local_path):
+                continue
+            if self._is_on_device(local_path, f"{staging_dir}/{os.path.basename(local_path)}"):
+                present += 1
+            else:
+                to_push.append(local_path)
+
+        pushed = 0
+        if to_push:
+            try:
+                result = self._adb('push', *to_push, f"{staging_dir}/", timeout=120 * len(to_push))
+                if result.returncode != 0:
+                    logger.warning(f"Pre-push to user {user_id} failed: "
+                                   f"{result.stderr.strip() or result.stdout.strip()}")
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Pre-push of {len(to_push)} video(s) to user {user_id} timed out")
+            # A batch push can fail part-way; count what actually arrived
+            pushed = sum(
+                1 for local_path in to_push
+                if self._remote_size(f"{staging_dir}/{os.path.basename(local_path)}")
+                == os.path.getsize(local_path)
+            )
+
+        logger.info(f"Pre-pushed {pushed}/{len(to_push)} video(s) for user {user_id} "
+                    f"({present} already on device)")
+        return present + pushed
+
+    def stage_jobs(self, jobs: List[Dict[str, Any]], max_per_profile: int = None) -> Dict[int, int]:
+        """
+        Pre-push the videos of many jobs (e.g. a whole day) grouped by profile.
+
+        Jobs for accounts not on this device are ignored.
+
+        Args:
+            jobs: Job dicts with 'account' and 'video_path'
+            max_per_profile: Cap per profile (default: no cap)
+
+        Returns:
+            user id -> videos staged for that profile
+        """
+        by_profile: Dict[int, List[str]] = {}
+        for job in jobs:
+            profile = self.profile_mapping.get(job.get('account'))
+            path = job.get('video_path', '')
+            if profile is None or not path:
+                continue
+            by_profile.setdefault(profile, []).append(path)
+
+        staged = {}
+        for profile, videos in sorted(by_profile.items()):
+            videos = list(dict.fromkeys(videos))[:max_per_profile]
+            staged[profile] = self.stage_videos(videos, profile)
+        return staged
 
     def get_appium_caps(self) -> Dict:
         """
@@ -584,3 +822,105 @@ class GrapheneOSDeviceManager(DeviceManager):
             f"profile={self.current_profile} "
             f"account={self._account_name}>"
         )
+
+
+class ProfileBatcher:
+    """
+    Orders a GrapheneOS worker's claims by Android user.
+
+    The worker first claims among preferred_accounts() (the accounts on the
+    active profile) and only falls back to any account when that profile has
+    nothing claimable, so the phone switches users once per profile rather
+    than once per job. While the active profile posts, prestage_next() pushes
+    the videos of the profile with the most open jobs in a background thread.
+    """
+
+    def __init__(self, manager: GrapheneOSDeviceManager, prestage_limit: int = 10):
+        """
+        Args:
+            manager: Device manager of the phone (used for adb, not for posting)
+            prestage_limit: Max videos pushed ahead for the next profile (0 = off)
+        """
+        self.manager = manager
+        self.profile_mapping = manager.profile_mapping
+        self.prestage_limit = prestage_limit
+        self.active_profile: Optional[int] = None
+        self.switches = 0
+        self._prestaged_profile: Optional[int] = None
+        self._prestage_thread: Optional[threading.Thread] = None
+
+    def sync(self) -> None:
+        """Read the active user from the device (left unknown if that fails)."""
+        try:
+            self.active_profile = self.manager._get_current_user()
+        except Exception as e:
+            logger.warning(f"Could not read current user: {e}")
+
+    def preferred_accounts(self) -> Optional[Set[str]]:
+        """Accounts on the active profile, or None if it is unknown."""
+        if self.active_profile is None:
+            return None
+        return {account for account, profile in self.profile_mapping.items()
+                if profile == self.active_profile}
+
+    def job_claimed(self, account: str) -> None:
+        """Note the profile the next job runs on (ensure_connected switches to it)."""
+        profile = self.profile_mapping.get(account)
+        if profile is None or profile == self.active_profile:
+            return
+        if self.active_profile is not None:
+            self.switches += 1
+            logger.info(f"Profile batch for user {self.active_profile} done, "
+                        f"switching to user {profile} (switch #{self.switches})")
+        self.active_profile = profile
+        if self._prestaged_profile == profile:
+            self._prestaged_profile = None
+
+    def next_profile(self, open_jobs: List[Dict[str, Any]]) -> Optional[int]:
+        """Inactive profile with the most open jobs."""
+        counts = Counter(
+            self.profile_mapping[job['account']] for job in open_jobs
+            if job.get('account') in self.profile_mapping
+            and self.profile_mapping[job['account']] != self.active_profile
+        )
+        if not counts:
+            return None
+        return counts.most_common(1)[0][0]
+
+    def prestage_next(self, open_jobs: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Push the next profile's videos in the background (once per profile).
+
+        Returns:
+            The profile being staged, or None if nothing was started
+        """
+        if self.prestage_limit <= 0:
+            return None
+        if self._prestage_thread is not None and self._prestage_thread.is_alive():
+            return None
+        profile = self.next_profile(open_jobs)
+        if profile is None or profile == self._prestaged_profile:
+            return None
+
+        videos = []
+        for job in open_jobs:
+            path = job.get('video_path', '')
+            if path and self.profile_mapping.get(job.get('account')) == profile and path not in videos:
+                videos.append(path)
+        videos = videos[:self.prestage_limit]
+        if not videos:
+            return None
+
+        self._prestaged_profile = profile
+        self._prestage_thread = threading.Thread(
+            target=self.manager.stage_videos, args=(videos, profile),
+            name=f"prestage-user-{profile}", daemon=True
+        )
+        self._prestage_thread.start()
+        logger.info(f"Pre-pushing {len(videos)} video(s) for user {profile} in the background")
+        return profile
+
+    def wait(self, timeout: float = None) -> None:
+        """Wait for a running pre-push to finish."""
+        if self._prestage_thread is not None:
+            self._prestage_thread.join(timeout)
@@ -0,0 +1,262 @@
+"""
+Metrics - Prometheus-style counters and latency histograms for workers and the orchestrator.
+
+The only throughput signal used to be the 30-second status line in
+monitor_workers(). Code now records into a process-local registry:
+
+    from metrics import metrics
+    metrics.inc('geelark_jobs_total', outcome='success')
+    with metrics.timer('geelark_phase_seconds', phase='upload'):
+        ...
+
+    @metrics.timed('geelark_dump_ui_seconds', platform='instagram')
+    def dump_ui(self): ...
+
+Workers are separate processes, so each one periodically (every
+METRICS_FLUSH_SECONDS, and at exit) writes its registry to
+<GEELARK_METRICS_DIR>/<pid>.json. Nothing is written unless that
+environment variable is set; the orchestrator sets it when started with
+--metrics-port, and its HTTP server merges all files (plus its own
+registry) on every scrape of http://127.0.0.1:<port>/metrics.
+
+Recorded metrics (see METRIC_HELP): jobs by outcome, per-phase durations,
+dump_ui latency, AI call latency (histogram _count = number of calls),
+Geelark API latency per endpoint and ProgressTracker lock wait. Jobs per
+minute by outcome is a gauge computed at scrape time from the progress files.
+"""
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+
+METRICS_DIR_ENV = "GEELARK_METRICS_DIR"
+
+# Upper bounds (seconds) for latency histograms
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+METRIC_HELP = {
+    'geelark_jobs_total': ('counter', 'Finished posting jobs by outcome (success or error category) and platform'),
+    'geelark_jobs_per_minute': ('gauge', 'Jobs finished per minute over the recent window, by outcome'),
+    'geelark_phase_seconds': ('histogram', 'Duration of posting phases (phone_boot, adb_connect, appium_session, upload, navigation, share)'),
+    'geelark_dump_ui_seconds': ('histogram', 'UI hierarchy dump latency'),
+    'geelark_ai_call_seconds': ('histogram', 'Claude API call latency (_count is the number of calls)'),
+    'geelark_api_seconds': ('histogram', 'Geelark API request latency by endpoint'),
+    'geelark_progress_lock_wait_seconds': ('histogram', 'Time spent waiting for the progress file lock'),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _key(name: str, labels: Dict[str, object]) -> Tuple[str, LabelKey]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms for one process."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        # key -> [per-bucket counts (non-cumulative, last = +Inf), sum, count]
+        self._histograms: Dict[Tuple[str, LabelKey], list] = {}
+        self._last_flush = 0.0
+
+    # ==================== RECORDING ====================
+
+    def inc(self, name: str, amount: float = 1.0, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+        self.maybe_flush()
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            index = len(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    index = i
+                    break
+            hist[0][index] += 1
+            hist[1] += value
+            hist[2] += 1
+        self.maybe_flush()
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the duration of the block (also when it raises)."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.observe(name, time.time() - start, **labels)
+
+    def timed(self, name: str, **labels) -> Callable:
+        """Decorator form of timer()."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # ==================== SHARING ====================
+
+    def snapshot(self) -> dict:
+        """JSON-serialisable copy of everything recorded so far."""
+        with self._lock:
+            return {
+                'buckets': list(self.buckets),
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, list(labels), list(h[0]), h[1], h[2]]
+                               for (name, labels), h in self._histograms.items()],
+            }
+
+    def flush(self) -> None:
+        """Write the snapshot to <GEELARK_METRICS_DIR>/<pid>.json (no-op if the variable is unset)."""
+        metrics_dir = os.environ.get(METRICS_DIR_ENV)
+        self._last_flush = time.time()
+        if not metrics_dir:
+            return
+        try:
+            os.makedirs(metrics_dir, exist_ok=True)
+            path = os.path.join(metrics_dir, f"{os.getpid()}.json")
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # Metrics must never break a job
+
+    def maybe_flush(self) -> None:
+        if time.time() - self._last_flush >= Config.METRICS_FLUSH_SECONDS:
+            self.flush()
+
+
+def merge_snapshots(snapshots: Iterable[dict]) -> dict:
+    """Sum counters and histograms with the same name and labels."""
+    counters: Dict[tuple, float] = {}
+    histograms: Dict[tuple, list] = {}
+    buckets: List[float] = list(DEFAULT_BUCKETS)
+    for snap in snapshots:
+        if snap.get('buckets') != buckets:
+            continue  # Written with different buckets - can't be summed
+        for name, labels, value in snap.get('counters', []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, counts, total, count in snap.get('histograms', []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            hist = histograms.setdefault(key, [[0] * len(counts), 0.0, 0])
+            hist[0] = [a + b for a, b in zip(hist[0], counts)]
+            hist[1] += total
+            hist[2] += count
+    return {'buckets': buckets, 'counters': counters, 'histograms': histograms}
+
+
+def collect(metrics_dir: Optional[str] = None) -> dict:
+    """Merged metrics of this process and every process that flushed into metrics_dir."""
+    snapshots = [metrics.snapshot()]
+    metrics_dir = metrics_dir or os.environ.get(METRICS_DIR_ENV)
+    if metrics_dir:
+        own = os.path.join(metrics_dir, f"{os.getpid()}.json")
+        for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+            if path == own:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    return merge_snapshots(snapshots)
+
+
+def _format_labels(labels: LabelKey, extra: Tuple[str, str] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = [(k, v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in pairs]
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+
+def render_prometheus(merged: dict, gauges: Dict[Tuple[str, LabelKey], float] = None) -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    by_name: Dict[str, List[str]] = {}
+    for (name, labels), value in sorted(merged['counters'].items()):
+        by_name.setdefault(name, []).append(f"{name}{_format_labels(labels)} {value:g}")
+    for (name, labels), value in sorted((gauges or {}).items()):
+        by_name.setdefault(name, []).append(f"{name}{_format_labels(labels)} {value:g}")
+    for (name, labels), (counts, total, count) in sorted(merged['histograms'].items()):
+        lines = by_name.setdefault(name, [])
+        cumulative = 0
+        for bound, bucket_count in zip(list(merged['buckets']) + ['+Inf'], counts):
+            cumulative += bucket_count
+            le = bound if bound == '+Inf' else f"{bound:g}"
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total:g}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+    out = []
+    for name, lines in by_name.items():
+        kind, help_text = METRIC_HELP.get(name, ('untyped', name))
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(lines)
+    return '\n'.join(out) + '\n'
+
+
+def start_metrics_server(
+    port: int,
+    metrics_dir: str,
+    gauges: Callable[[], Dict[Tuple[str, LabelKey], float]] = None,
+    host: str = '127.0.0.1',
+) -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics on a daemon thread.
+
+    Args:
+        port: Port to listen on (local only by default)
+        metrics_dir: Directory the workers flush into
+        gauges: Optional callable returning extra gauge values at scrape time
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            extra = {}
+            if gauges:
+                try:
+                    extra = gauges()
+                except Exception:
+                    extra = {}
+            body = render_prometheus(collect(metrics_dir), extra).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes would flood the orchestrator log
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name='metrics-server').start()
+    return server
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
+atexit.register(metrics.flush)
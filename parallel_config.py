@@ -90,6 +90,12 @@ class ParallelConfig:
     ai_fallback: bool = True      # Allow AI fallback when rules fail (False = rules-only testing mode)
     # Device type: 'geelark' for cloud phones, 'grapheneos' for physical Pixel
     device_type: str = "geelark"
+    # GrapheneOS fleet: worker N drives device_serials[N] (see device_fleet.py)
+    device_serials: List[str] = field(default_factory=list)
+    # Multi-campaign mode: spec file passed to workers (see campaign_scheduler.py)
+    campaign_spec: Optional[str] = None
+    # Continuous retry: per-job backoff, workers wait for queued retries (see retry_manager.py)
+    continuous_retry: bool = False
 
     def __post_init__(self):
         """Generate worker configs if not provided."""
@@ -105,23 +111,36 @@ class ParallelConfig:
             - Appium: 4723, 4725, 4727, ... (odd ports starting from 4723)
             - systemPort: 8200-8209, 8210-8219, 8220-8229, ...
         """
-        configs = []
-        base_appium_port = Config.APPIUM_BASE_PORT
-        base_system_port = Config.SYSTEM_PORT_BASE
-        system_port_range = Config.SYSTEM_PORT_RANGE
-
-        for i in range(n):
-            worker = WorkerConfig(
-                worker_id=i,
-                appium_port=base_appium_port + (i * 2),  # 4723, 4725, 4727...
-                system_port_start=base_system_port + (i * system_port_range),
-                system_port_end=base_system_port + (i * system_port_range) + system_port_range - 1,
-                log_file=os.path.join(self.logs_dir, f"worker_{i}.log"),
-                appium_log_file=os.path.join(self.logs_dir, f"appium_{i}.log"),
-            )
-            configs.append(worker)
-
-        return configs
+        return [self._make_worker_config(i) for i in range(n)]
+
+    def _make_worker_config(self, worker_id: int) -> WorkerConfig:
+        """Port slot for one worker, from the central Config allocation."""
+        system_port_start, system_port_end = Config.get_worker_system_port_range(worker_id)
+        return WorkerConfig(
+            worker_id=worker_id,
+            appium_port=Config.get_worker_appium_port(worker_id),  # 4723, 4725, 4727...
+            system_port_start=system_port_start,
+            system_port_end=system_port_end,
+            log_file=os.path.join(self.logs_dir, f"worker_{worker_id}.log"),
+            appium_log_file=os.path.join(self.logs_dir, f"appium_{worker_id}.log"),
+        )
+
+    def ensure_worker(self, worker_id: int) -> WorkerConfig:
+        """
+        Return the config for worker_id, allocating its port slot if needed.
+
+        Used by the autoscaler to add workers beyond the initial num_workers.
+        num_workers grows to cover the new id, so worker processes started
+        with --num-workers regenerate the same slot.
+        """
+        for w in self.workers:
+            if w.worker_id == worker_id:
+                return w
+        worker = self._make_worker_config(worker_id)
+        self.workers.append(worker)
+        self.num_workers = max(self.num_workers, worker_id + 1)
+        self._validate()
+        return worker
 
     def _validate(self) -> None:
         """Validate the entire configuration for conflicts."""
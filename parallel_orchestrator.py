@@ -50,8 +50,12 @@ setup_environment()
 from parallel_config import ParallelConfig, get_config, print_config
 from progress_tracker import ProgressTracker
 from appium_server_manager import cleanup_all_appium_servers, check_all_appium_servers
-from geelark_client import GeelarkClient
-from retry_manager import RetryPassManager, RetryConfig, PassResult
+from port_prober import probe_ports, probe_worker_ports, PortStatus
+from geelark_async_client import AsyncGeelarkClient, run_async, stop_running_phones
+from retry_manager import RetryPassManager, ContinuousRetryManager, RetryConfig, PassResult
+from campaign_scheduler import CampaignShare, MultiCampaignScheduler
+from worker_autoscaler import AutoscalePolicy, WorkerAutoscaler, host_load
+from metrics import METRICS_DIR_ENV, start_metrics_server
 
 
 # Setup logging
@@ -68,7 +72,7 @@ _active_config: Optional[ParallelConfig] = None
 _active_campaign_accounts: Optional[List[str]] = None  # For campaign-specific cleanup
 
 
-def check_for_running_orchestrators(campaign_name: str = None) -> Tuple[bool, List[str]]:
+def check_for_running_orchestrators(campaign_name=None) -> Tuple[bool, List[str]]:
     """
     Check if other orchestrator processes are running.
 
@@ -82,7 +86,8 @@ def check_for_running_orchestrators(campaign_name: str = None) -> Tuple[bool, Li
     Args:
         campaign_name: If specified, only conflict with orchestrators running
                       the same campaign. If None, conflict with any non-campaign
-                      orchestrator.
+                      orchestrator. A list of names (multi-campaign mode)
+                      conflicts with any orchestrator running one of them.
 
     Returns:
         (has_conflicts: bool, list of conflicting process descriptions)
@@ -91,20 +96,31 @@ def check_for_running_orchestrators(campaign_name: str = None) -> Tuple[bool, Li
     current_pid = os.getpid()
     conflicts = []
 
+    if campaign_name is None:
+        our_campaigns = None
+    elif isinstance(campaign_name, str):
+        our_campaigns = {campaign_name}
+    else:
+        our_campaigns = set(campaign_name)
+
     def extract_campaign_from_cmdline(cmdline: str) -> Optional[str]:
-        """Extract campaign name from command line if present."""
+        """Extract campaign name(s) from command line if present."""
+        # Match --campaigns A,B (multi-campaign mode)
+        match = re.search(r'--campaigns\s+(\S+)', cmdline)
+        if match:
+            return match.group(1)
         # Match --campaign NAME or -c NAME
         match = re.search(r'(?:--campaign|-c)\s+(\S+)', cmdline)
         return match.group(1) if match else None
 
     def is_conflict(other_campaign: Optional[str]) -> bool:
         """Check if the other orchestrator conflicts with us."""
-        if campaign_name is None:
+        if our_campaigns is None:
             # We're non-campaign, conflict with other non-campaign
             return other_campaign is None
         else:
-            # We're a campaign, only conflict with same campaign
-            return other_campaign == campaign_name
+            # We're a campaign, only conflict with a shared campaign
+            return other_campaign is not None and bool(our_campaigns & set(other_campaign.split(',')))
 
     if sys.platform == 'win32':
         try:
@@ -243,21 +259,17 @@ def check_ports_status(config: ParallelConfig) -> Tuple[List[str], List[str], Li
     blocked = []   # Ports in use by non-Appium processes
     free = []      # Ports that are free
 
-    for worker in config.workers:
-        port = worker.appium_port
-
-        # First check if there's a healthy Appium
-        if is_healthy_appium(port):
-            reusable.append(f"Port {port} (Worker {worker.worker_id}): Healthy Appium - will REUSE")
-        # Then check if port is in use by something else
-        elif is_port_in_use(port)[0]:
-            in_use, proc_info = is_port_in_use(port)
-            msg = f"Port {port} (Worker {worker.worker_id}): BLOCKED"
-            if proc_info:
-                msg += f" by {proc_info}"
-            blocked.append(msg)
+    # All ports probed concurrently under one shared deadline
+    table = probe_worker_ports(config)
+    for worker_id in sorted(table):
+        state = table[worker_id]
+        if state.status == PortStatus.HEALTHY_APPIUM:
+            reusable.append(state.describe())
+        elif state.status == PortStatus.FREE:
+            free.append(state.describe())
         else:
-            free.append(f"Port {port} (Worker {worker.worker_id}): Free - will START new Appium")
+            # BLOCKED, or UNKNOWN (probe missed the deadline - treat as blocked)
+            blocked.append(state.describe())
 
     return reusable, blocked, free
 
@@ -286,6 +298,20 @@ def check_all_ports_available(config: ParallelConfig) -> Tuple[bool, List[str]]:
     return len(blocked) == 0, blocked
 
 
+def log_port_table(config: ParallelConfig) -> Dict[int, 'PortState']:
+    """Probe all worker ports concurrently and log the resulting table."""
+    start = time.time()
+    table = probe_worker_ports(config)
+    logger.info(f"Port table ({len(table)} workers, probed in {time.time() - start:.1f}s):")
+    for worker_id in sorted(table):
+        state = table[worker_id]
+        if state.status in (PortStatus.BLOCKED, PortStatus.UNKNOWN):
+            logger.warning(f"  {state.describe()}")
+        else:
+            logger.info(f"  {state.describe()}")
+    return table
+
+
 def kill_process_on_port(port: int) -> bool:
     """Kill whatever process is using a port."""
     if sys.platform == 'win32':
@@ -363,11 +389,10 @@ def ensure_ports_available(config: ParallelConfig, force_kill: bool = False) ->
 
     # Kill ONLY blocked ports (not healthy Appium)
     logger.info("Force killing blocked ports (healthy Appium will be preserved)...")
-    for worker in config.workers:
-        port = worker.appium_port
-        # Only kill if blocked (not healthy Appium)
-        if not is_healthy_appium(port) and is_port_in_use(port)[0]:
-            kill_process_on_port(port)
+    table = probe_worker_ports(config, resolve_processes=False)
+    for state in table.values():
+        if state.status in (PortStatus.BLOCKED, PortStatus.UNKNOWN):
+            kill_process_on_port(state.port)
 
     time.sleep(2)  # Give OS time to release ports
 
@@ -413,17 +438,12 @@ def stop_all_phones() -> int:
     """
     logger.info("Stopping all running phones...")
     try:
-        client = GeelarkClient()
-        stopped = 0
-        for page in range(1, 20):
-            result = client.list_phones(page=page, page_size=100)
-            for phone in result.get('items', []):
-                if phone.get('status') != 0:  # 0=stopped, 1=starting, 2=running
-                    client.stop_phone(phone['id'])
-                    logger.info(f"  Stopped: {phone.get('serialName', 'unknown')}")
-                    stopped += 1
-            if len(result.get('items', [])) < 100:
-                break
+        result = stop_running_phones()
+        for name in result['stopped']:
+            logger.info(f"  Stopped: {name}")
+        for name, error in result['failed'].items():
+            logger.warning(f"  Failed to stop {name}: {error}")
+        stopped = len(result['stopped'])
         logger.info(f"Stopped {stopped} phone(s)")
         return stopped
     except Exception as e:
@@ -453,24 +473,14 @@ def stop_campaign_phones(campaign_accounts: List[str]) -> int:
     logger.info(f"Stopping phones for {len(campaign_accounts_set)} campaign accounts...")
 
     try:
-        client = GeelarkClient()
-        stopped = 0
-        skipped = 0
-
-        for page in range(1, 20):
-            result = client.list_phones(page=page, page_size=100)
-            for phone in result.get('items', []):
-                phone_name = phone.get('serialName', '')
-                if phone.get('status') != 0:  # 0=stopped, 1=starting, 2=running  # Running
-                    if phone_name in campaign_accounts_set:
-                        client.stop_phone(phone['id'])
-                        logger.info(f"  Stopped: {phone_name}")
-                        stopped += 1
-                    else:
-                        skipped += 1
-            if len(result.get('items', [])) < 100:
-                break
-
+        result = stop_running_phones(account_filter=campaign_accounts_set)
+        for name in result['stopped']:
+            logger.info(f"  Stopped: {name}")
+        for name, error in result['failed'].items():
+            logger.warning(f"  Failed to stop {name}: {error}")
+
+        stopped = len(result['stopped'])
+        skipped = result['skipped']
         if skipped > 0:
             logger.info(f"  Skipped {skipped} running phone(s) not in this campaign")
         logger.info(f"Stopped {stopped} campaign phone(s)")
@@ -483,10 +493,10 @@ def stop_campaign_phones(campaign_accounts: List[str]) -> int:
 def kill_all_appium_ports(config: ParallelConfig) -> int:
     """Kill ALL processes on ALL Appium ports (regardless of health)."""
     killed = 0
-    for worker in config.workers:
-        port = worker.appium_port
-        if is_port_in_use(port)[0]:
-            if kill_process_on_port(port):
+    table = probe_worker_ports(config, resolve_processes=False)
+    for state in table.values():
+        if state.status != PortStatus.FREE:
+            if kill_process_on_port(state.port):
                 killed += 1
     return killed
 
@@ -803,6 +813,40 @@ def seed_progress_file(
     return seed_progress_file_ctx(ctx, config, force_reseed=False)
 
 
+def start_metrics_endpoint(port: int, progress_files: List[str]):
+    """
+    Serve merged orchestrator + worker metrics on http://127.0.0.1:<port>/metrics.
+
+    Sets GEELARK_METRICS_DIR so workers started afterwards flush into
+    Config.METRICS_DIR (files from a previous run are removed first), and
+    adds a geelark_jobs_per_minute gauge computed from the progress files.
+    """
+    metrics_dir = os.path.abspath(Config.METRICS_DIR)
+    os.makedirs(metrics_dir, exist_ok=True)
+    for name in os.listdir(metrics_dir):
+        if name.endswith('.json'):
+            os.remove(os.path.join(metrics_dir, name))
+    os.environ[METRICS_DIR_ENV] = metrics_dir
+
+    window = Config.METRICS_JOBS_WINDOW_MINUTES
+
+    def jobs_per_minute():
+        counts = {'success': 0}
+        for progress_file in progress_files:
+            if not os.path.exists(progress_file):
+                continue
+            outcomes = ProgressTracker(progress_file).get_recent_outcomes(window)
+            counts['success'] += outcomes['success']
+            for category, count in outcomes['by_category'].items():
+                counts[category] = counts.get(category, 0) + count
+        return {('geelark_jobs_per_minute', (('outcome', outcome),)): count / window
+                for outcome, count in counts.items()}
+
+    server = start_metrics_server(port, metrics_dir, gauges=jobs_per_minute)
+    logger.info(f"Metrics: http://127.0.0.1:{port}/metrics (workers flush to {metrics_dir})")
+    return server
+
+
 def start_worker_process(worker_id: int, config: ParallelConfig) -> subprocess.Popen:
     """Start a single worker subprocess."""
     cmd = [
@@ -815,6 +859,17 @@ def start_worker_process(worker_id: int, config: ParallelConfig) -> subprocess.P
         '--device', config.device_type,
     ]
 
+    # Multi-campaign mode: workers claim through the shared scheduler
+    if config.campaign_spec:
+        cmd.extend(['--campaign-spec', config.campaign_spec])
+
+    if config.continuous_retry:
+        cmd.append('--continuous-retry')
+
+    # GrapheneOS fleet: one worker per attached device
+    if worker_id < len(config.device_serials):
+        cmd.extend(['--device-serial', config.device_serials[worker_id]])
+
     # Add navigation mode flags
     if not config.use_hybrid:
         cmd.append('--ai-only')
@@ -840,16 +895,44 @@ def start_worker_process(worker_id: int, config: ParallelConfig) -> subprocess.P
             start_new_session=True
         )
 
+    proc.worker_id = worker_id  # Lets the autoscaler map processes back to port slots
     logger.info(f"Worker {worker_id} started with PID {proc.pid}")
     return proc
 
 
-def start_all_workers(config: ParallelConfig) -> List[subprocess.Popen]:
-    """Start all worker processes."""
+def apply_device_fleet(config: ParallelConfig) -> int:
+    """
+    Bind one worker to each attached GrapheneOS device.
+
+    Sets config.device_serials (worker N drives device_serials[N]) and makes
+    sure a port slot exists for every device.
+
+    Returns:
+        Number of workers to start (0 if no device of the fleet is attached)
+    """
+    from device_fleet import DeviceFleet
+
+    fleet = DeviceFleet.from_config()
+    fleet.check_health()
+    config.device_serials = fleet.healthy_serials()
+    for worker_id in range(len(config.device_serials)):
+        config.ensure_worker(worker_id)
+
+    missing = [serial for serial in fleet.serials if serial not in config.device_serials]
+    logger.info(f"[FLEET] {len(config.device_serials)}/{len(fleet.serials)} device(s) attached: "
+                f"{', '.join(config.device_serials) or 'none'}")
+    for serial in missing:
+        logger.warning(f"[FLEET] Device {serial} not attached - its {len(fleet.accounts_on(serial))} "
+                       f"account(s) stay pending")
+    return len(config.device_serials)
+
+
+def start_all_workers(config: ParallelConfig, count: int = None) -> List[subprocess.Popen]:
+    """Start worker processes (the first `count` configured workers, default all)."""
     global _worker_processes
 
     processes = []
-    for worker in config.workers:
+    for worker in config.workers[:count]:
         proc = start_worker_process(worker.worker_id, config)
         processes.append(proc)
         time.sleep(60)  # Stagger starts - 60s between workers for Geelark ADB setup to complete
@@ -858,20 +941,25 @@ def start_all_workers(config: ParallelConfig) -> List[subprocess.Popen]:
     return processes
 
 
+def signal_worker(proc: subprocess.Popen) -> None:
+    """Ask a worker to finish its current job and exit."""
+    if proc.poll() is None:
+        try:
+            if sys.platform == 'win32':
+                proc.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                proc.terminate()
+        except Exception as e:
+            logger.warning(f"Error signaling process {proc.pid}: {e}")
+
+
 def stop_all_workers(processes: List[subprocess.Popen], timeout: int = 30) -> None:
     """Stop all worker processes gracefully."""
     logger.info(f"Stopping {len(processes)} worker(s)...")
 
     # Send termination signal
     for proc in processes:
-        if proc.poll() is None:
-            try:
-                if sys.platform == 'win32':
-                    proc.send_signal(signal.CTRL_BREAK_EVENT)
-                else:
-                    proc.terminate()
-            except Exception as e:
-                logger.warning(f"Error signaling process {proc.pid}: {e}")
+        signal_worker(proc)
 
     # Wait for graceful shutdown
     deadline = time.time() + timeout
@@ -915,16 +1003,96 @@ def force_kill_all(config: ParallelConfig = None):
             kill_process_on_port(port)
 
 
-def monitor_workers(processes: List[subprocess.Popen], config: ParallelConfig) -> None:
-    """Monitor worker processes until all complete or shutdown requested."""
+def next_free_worker_id(live: List[subprocess.Popen], max_workers: int) -> Optional[int]:
+    """
+    Lowest worker slot not used by a live worker whose Appium port is usable.
+
+    Ports come from Config.get_worker_appium_port; a slot whose port is held
+    by something other than a healthy Appium is skipped.
+    """
+    used = {getattr(p, 'worker_id', None) for p in live}
+    for worker_id in range(max_workers):
+        if worker_id in used:
+            continue
+        port = Config.get_worker_appium_port(worker_id)
+        state = probe_ports([port], deadline=3.0, resolve_processes=False)[port]
+        if state.status in (PortStatus.FREE, PortStatus.HEALTHY_APPIUM):
+            return worker_id
+        logger.warning(f"[AUTOSCALE] Skipping worker slot {worker_id}: {state.describe()}")
+    return None
+
+
+def autoscale_step(
+    autoscaler: WorkerAutoscaler,
+    processes: List[subprocess.Popen],
+    config: ParallelConfig,
+    queue,
+    draining: set,
+) -> None:
+    """
+    Evaluate the autoscaler once and start or drain one worker if it says so.
+
+    New workers are appended to `processes`. Drained workers get the normal
+    shutdown signal (they finish their current job first) and their PIDs are
+    added to `draining` so they no longer count as active.
+    """
+    policy = autoscaler.policy
+    live = [p for p in processes if p.poll() is None]
+    active = [p for p in live if p.pid not in draining]
+
+    stats = queue.get_stats()
+    outcomes = queue.get_recent_outcomes(policy.error_window_minutes)
+    cpu, memory = host_load()
+    decision = autoscaler.decide(len(active), stats, outcomes, cpu, memory)
+
+    if decision.delta > 0:
+        worker_id = next_free_worker_id(live, policy.max_workers)
+        if worker_id is None:
+            logger.warning(f"[AUTOSCALE] Wanted {decision.target} workers but no free port slot")
+            return
+        logger.info(f"[AUTOSCALE] {decision.current} -> {decision.target} workers: {decision.reason}")
+        config.ensure_worker(worker_id)
+        processes.append(start_worker_process(worker_id, config))
+    elif decision.delta < 0 and active:
+        victim = max(active, key=lambda p: getattr(p, 'worker_id', -1))
+        logger.info(f"[AUTOSCALE] {decision.current} -> {decision.target} workers: {decision.reason} "
+                    f"(draining worker {getattr(victim, 'worker_id', '?')}, PID {victim.pid})")
+        draining.add(victim.pid)
+        signal_worker(victim)
+    else:
+        logger.debug(f"[AUTOSCALE] Holding at {decision.current} workers: {decision.reason}")
+
+
+def monitor_workers(
+    processes: List[subprocess.Popen],
+    config: ParallelConfig,
+    scheduler: MultiCampaignScheduler = None,
+    autoscaler: WorkerAutoscaler = None,
+    retry_managers: List[ContinuousRetryManager] = None
+) -> None:
+    """
+    Monitor worker processes until all complete or shutdown requested.
+
+    With an autoscaler, the worker set is grown/shrunk in place (see autoscale_step).
+    With continuous retry managers, retryable failures are swept back into
+    the retry queue every few seconds and rolling stats join the status log.
+    """
     global _shutdown_requested
 
-    tracker = ProgressTracker(config.progress_file)
+    tracker = scheduler or ProgressTracker(config.progress_file)
 
     logger.info("Monitoring workers... (Ctrl+C to stop)")
+    if autoscaler:
+        policy = autoscaler.policy
+        logger.info(f"Autoscaling between {policy.min_workers} and {policy.max_workers} workers")
 
     last_status_time = 0
     status_interval = 30  # Print status every 30 seconds
+    last_scale_time = time.time()
+    scale_interval = 30  # Evaluate the autoscaler every 30 seconds
+    draining = set()  # PIDs asked to exit by the autoscaler
+    last_sweep_time = 0
+    sweep_interval = 10  # Requeue retryable failures every 10 seconds
 
     while not _shutdown_requested:
         # Check if all workers have exited
@@ -943,8 +1111,33 @@ def monitor_workers(processes: List[subprocess.Popen], config: ParallelConfig) -
                 f"{stats['pending']} pending, {stats['claimed']} in-progress | "
                 f"{active_workers}/{len(processes)} workers active"
             )
+            if scheduler:
+                for name, cstats in scheduler.get_campaign_stats().items():
+                    quota = f"/{cstats['quota']}" if cstats['quota'] is not None else ""
+                    logger.info(
+                        f"  [{name} w={cstats['weight']:g}] dispatched {cstats['dispatched']}{quota}: "
+                        f"{cstats['success']} success, {cstats['failed']} failed, "
+                        f"{cstats['pending']} pending, {cstats['claimed']} in-progress"
+                    )
+            for mgr in retry_managers or []:
+                mgr.log_window()
             last_status_time = now
 
+        if retry_managers and now - last_sweep_time >= sweep_interval:
+            for mgr in retry_managers:
+                try:
+                    mgr.sweep()
+                except Exception as e:
+                    logger.warning(f"Retry sweep failed for {mgr.tracker.progress_file}: {e}")
+            last_sweep_time = now
+
+        if autoscaler and now - last_scale_time >= scale_interval:
+            try:
+                autoscale_step(autoscaler, processes, config, tracker, draining)
+            except Exception as e:
+                logger.warning(f"[AUTOSCALE] Evaluation failed: {e}")
+            last_scale_time = now
+
         time.sleep(1)
 
     # If shutdown requested, stop workers
@@ -952,6 +1145,104 @@ def monitor_workers(processes: List[subprocess.Popen], config: ParallelConfig) -
         stop_all_workers(processes, timeout=config.shutdown_timeout)
 
 
+def run_continuous_retry(
+    parallel_config: ParallelConfig,
+    num_workers: int,
+    retry_mgrs: List[ContinuousRetryManager],
+    scheduler: MultiCampaignScheduler = None,
+    autoscaler: WorkerAutoscaler = None,
+) -> None:
+    """
+    Run workers with continuous retry scheduling (no pass barrier).
+
+    Workers stay up while backed-off retries are queued and exit once nothing
+    is left for them. The pool is then only restarted if a sweep requeued
+    failures or a job can be claimed right now. Open jobs nobody can claim
+    (daily limits, busy or unmapped accounts) do not restart it: the
+    orchestrator sleeps until the earliest retry is due, and stops once
+    nothing is due later or a round finished no job.
+    """
+    parallel_config.continuous_retry = True
+    queue = scheduler or retry_mgrs[0].tracker
+    limit = parallel_config.max_posts_per_account_per_day
+
+    # GrapheneOS fleet: workers only claim accounts on the attached devices
+    only_accounts = None
+    if parallel_config.device_serials:
+        from device_fleet import DeviceFleet
+        fleet = DeviceFleet.from_config()
+        only_accounts = set().union(*(fleet.accounts_on(s) for s in parallel_config.device_serials))
+
+    def job_states():
+        return [sorted(mgr.tracker.get_stats().items()) for mgr in retry_mgrs]
+
+    stalled = False  # Last round finished no job
+    while not _shutdown_requested:
+        requeued = sum(mgr.sweep() for mgr in retry_mgrs)
+        if not any(mgr.has_open_work() for mgr in retry_mgrs):
+            break
+
+        if requeued or (not stalled and queue.has_claimable_job(limit, only_accounts)):
+            before = job_states()
+            processes = start_all_workers(parallel_config, count=num_workers)
+            monitor_workers(processes, parallel_config, scheduler=scheduler,
+                            autoscaler=autoscaler, retry_managers=retry_mgrs)
+            stalled = job_states() == before
+            if stalled:
+                logger.warning("Worker round finished no job")
+            continue
+
+        next_retry = queue.next_retry_at(limit, only_accounts)
+        if next_retry is None or next_retry <= datetime.now():
+            reason = "the last round finished no job" if stalled else \
+                "none can be claimed (daily limits, busy or unmapped accounts)"
+            logger.info(f"Open jobs remain but {reason} - stopping")
+            break
+        logger.info(f"No job claimable now - next retry due at {next_retry.strftime('%H:%M:%S')}")
+        while not _shutdown_requested and datetime.now() < next_retry:
+            time.sleep(min(5.0, max(0.1, (next_retry - datetime.now()).total_seconds())))
+        stalled = False
+
+
+def prestage_day_ctx(ctx: PostingContext) -> int:
+    """
+    Push every open job's video to its GrapheneOS device in one batch.
+
+    Each attached device of the fleet gets one adb push per profile; files
+    already on the device are skipped. Workers then skip the push entirely.
+
+    Args:
+        ctx: PostingContext with an existing progress file
+
+    Returns:
+        Number of videos on the devices afterwards
+    """
+    from device_fleet import DeviceFleet
+    from grapheneos_device_manager import GrapheneOSDeviceManager
+
+    tracker = ProgressTracker(ctx.progress_file)
+    if not tracker.exists():
+        logger.error(f"Progress file not found: {ctx.progress_file} (run --seed-only first)")
+        return 0
+    jobs = tracker.get_open_jobs()
+
+    fleet = DeviceFleet.from_config()
+    fleet.check_health()
+    total = 0
+    for serial in fleet.serials:
+        if serial not in fleet.healthy_serials():
+            logger.warning(f"[PRESTAGE] Device {serial} not attached, skipping")
+            continue
+        manager = GrapheneOSDeviceManager(serial=serial, profile_mapping=fleet.profile_mapping(serial))
+        start = time.time()
+        staged = manager.stage_jobs(jobs)
+        count = sum(staged.values())
+        total += count
+        logger.info(f"[PRESTAGE] {serial}: {count} video(s) across {len(staged)} profile(s) "
+                    f"in {time.time() - start:.0f}s")
+    return total
+
+
 def show_status_ctx(ctx: PostingContext, parallel_config: ParallelConfig) -> None:
     """
     Show current status of progress and resources.
@@ -986,6 +1277,14 @@ def show_status_ctx(ctx: PostingContext, parallel_config: ParallelConfig) -> Non
             print("\n  Per-worker:")
             for wid, ws in sorted(worker_stats.items()):
                 print(f"    Worker {wid}: {ws['success']} success, {ws['failed']} failed")
+
+        # Flaky accounts (deferred to off-peak windows)
+        health = tracker.get_account_health()
+        flaky = sorted((score, acc) for acc, score in health.items() if tracker.health.is_flaky(score))
+        if flaky:
+            print(f"\n  Flaky accounts ({len(flaky)}, deferred to off-peak):")
+            for score, acc in flaky[:10]:
+                print(f"    {acc}: health {score:.2f}")
     else:
         print(f"\nProgress file not found: {ctx.progress_file}")
         print("  Run with --seed-only or --run to create it")
@@ -1010,9 +1309,12 @@ def show_status_ctx(ctx: PostingContext, parallel_config: ParallelConfig) -> Non
     # Running phones
     print("\nGeelark Phones:")
     try:
-        client = GeelarkClient()
-        result = client.list_phones(page_size=100)
-        running = [p for p in result.get('items', []) if p.get('status') != 0]  # 0=stopped, 1=starting, 2=running
+        async def _list_phones():
+            async with AsyncGeelarkClient() as client:
+                return await client.list_all_phones()
+
+        phones = run_async(_list_phones())
+        running = [p for p in phones if p.get('status') != 0]  # 0=stopped, 1=starting, 2=running
 
         # If campaign mode, highlight which phones are in the campaign
         if ctx.is_campaign_mode():
@@ -1068,6 +1370,8 @@ def run_parallel_posting_ctx(
     retry_all_failed: bool = True,
     retry_include_non_retryable: bool = False,
     retry_config: RetryConfig = None,
+    autoscale_policy: AutoscalePolicy = None,
+    device_type: str = "geelark",
 ) -> Dict:
     """
     Main entry point for parallel posting with PostingContext.
@@ -1079,6 +1383,8 @@ def run_parallel_posting_ctx(
         retry_all_failed: Retry failed jobs from previous runs
         retry_include_non_retryable: Include non-retryable in retry
         retry_config: Multi-pass retry configuration
+        autoscale_policy: Grow/shrink the pool while running (num_workers is the starting size)
+        device_type: geelark or grapheneos (grapheneos starts one worker per attached device)
 
     Returns:
         Dict with results
@@ -1089,6 +1395,17 @@ def run_parallel_posting_ctx(
 
     parallel_config = get_config(num_workers=num_workers)
     parallel_config.progress_file = ctx.progress_file
+    parallel_config.device_type = device_type
+
+    # GrapheneOS: one worker per attached device, not a fixed pool
+    if device_type == 'grapheneos':
+        num_workers = apply_device_fleet(parallel_config)
+        if num_workers == 0:
+            logger.error("No GrapheneOS device of the fleet is attached")
+            return {'error': 'no_devices'}
+        if autoscale_policy:
+            logger.info("[FLEET] Autoscaling disabled - the worker count follows the attached devices")
+            autoscale_policy = None
 
     # Store for emergency cleanup
     campaign_accounts = ctx.get_accounts() if ctx.is_campaign_mode() else None
@@ -1138,6 +1455,9 @@ def run_parallel_posting_ctx(
     # If campaign specified, only stop campaign phones (not VA phones)
     full_cleanup(parallel_config, campaign_accounts=campaign_accounts)
 
+    # One concurrent pass over all worker ports after cleanup
+    log_port_table(parallel_config)
+
     # Seed progress file
     tracker = ProgressTracker(ctx.progress_file)
 
@@ -1172,43 +1492,53 @@ def run_parallel_posting_ctx(
     stats = tracker.get_stats()
     logger.info(f"Starting with {stats['pending']} pending jobs for {ctx.describe()}")
 
-    # Initialize retry pass manager
-    retry_mgr = RetryPassManager(tracker, retry_config)
+    # Initialize retry manager (passes, or continuous backoff scheduling)
+    if retry_config.continuous:
+        retry_mgr = ContinuousRetryManager(tracker, retry_config)
+    else:
+        retry_mgr = RetryPassManager(tracker, retry_config)
+    autoscaler = WorkerAutoscaler(autoscale_policy) if autoscale_policy else None
 
     try:
         # Multi-pass retry loop
         result = PassResult.RETRYABLE_REMAINING
 
-        while result == PassResult.RETRYABLE_REMAINING and not _shutdown_requested:
-            # Start new pass
-            pass_num = retry_mgr.start_new_pass()
+        if retry_config.continuous:
+            run_continuous_retry(parallel_config, num_workers, [retry_mgr], autoscaler=autoscaler)
+            result = retry_mgr.finish()
+        else:
+            while result == PassResult.RETRYABLE_REMAINING and not _shutdown_requested:
+                # Start new pass
+                pass_num = retry_mgr.start_new_pass()
 
-            # Start workers for this pass
-            processes = start_all_workers(parallel_config)
+                # Start workers for this pass
+                processes = start_all_workers(parallel_config, count=num_workers)
 
-            # Monitor until pass complete
-            monitor_workers(processes, parallel_config)
+                # Monitor until pass complete
+                monitor_workers(processes, parallel_config, autoscaler=autoscaler)
 
-            # If shutdown requested, break out of retry loop
-            if _shutdown_requested:
-                logger.info("Shutdown requested, stopping retry loop")
-                break
+                # If shutdown requested, break out of retry loop
+                if _shutdown_requested:
+                    logger.info("Shutdown requested, stopping retry loop")
+                    break
 
-            # End pass and decide what to do next
-            result = retry_mgr.end_pass()
+                # End pass and decide what to do next
+                result = retry_mgr.end_pass()
 
-            if result == PassResult.RETRYABLE_REMAINING:
-                logger.info(f"Waiting {retry_config.retry_delay_seconds}s before next pass...")
-                for _ in range(retry_config.retry_delay_seconds):
-                    if _shutdown_requested:
-                        break
-                    time.sleep(1)
+                if result == PassResult.RETRYABLE_REMAINING:
+                    logger.info(f"Waiting {retry_config.retry_delay_seconds}s before next pass...")
+                    for _ in range(retry_config.retry_delay_seconds):
+                        if _shutdown_requested:
+                            break
+                        time.sleep(1)
 
         # Log final result
         if result == PassResult.ALL_COMPLETE:
             logger.info("All jobs completed successfully!")
         elif result == PassResult.ONLY_NON_RETRYABLE:
             logger.info("Stopped: Only non-retryable account failures remain")
+        elif result == PassResult.MAX_PASSES_REACHED and retry_config.continuous:
+            logger.info("Stopped: Remaining failures used up their retry limits")
         elif result == PassResult.MAX_PASSES_REACHED:
             logger.info(f"Stopped: Max passes ({retry_config.max_passes}) reached")
 
@@ -1230,7 +1560,10 @@ def run_parallel_posting_ctx(
     logger.info(f"    - Unknown: {failure_stats['unknown_failures']}")
     logger.info(f"  Retrying: {final_stats.get('retrying', 0)}")
     logger.info(f"  Pending:  {final_stats['pending']}")
-    logger.info(f"  Total passes: {retry_mgr.current_pass}")
+    if retry_config.continuous:
+        logger.info(f"  Retries requeued: {retry_mgr.requeued} (continuous mode)")
+    else:
+        logger.info(f"  Total passes: {retry_mgr.current_pass}")
     logger.info("="*60)
 
     # Add retry summary to results
@@ -1240,6 +1573,187 @@ def run_parallel_posting_ctx(
     return final_stats
 
 
+def run_multi_campaign_ctx(
+    ctxs: List[PostingContext],
+    num_workers: int = 3,
+    weights: Dict[str, float] = None,
+    quotas: Dict[str, int] = None,
+    retry_all_failed: bool = True,
+    retry_include_non_retryable: bool = False,
+    retry_config: RetryConfig = None,
+    autoscale_policy: AutoscalePolicy = None,
+    device_type: str = "geelark",
+) -> Dict:
+    """
+    Run several campaigns on ONE shared worker pool.
+
+    Each campaign keeps its own progress file; workers pick the campaign for
+    every job by weighted fair queuing (see campaign_scheduler.py), so idle
+    capacity in one campaign is absorbed by the others.
+
+    Args:
+        ctxs: Campaign PostingContexts (campaign mode only)
+        num_workers: Size of the shared worker pool
+        weights: Campaign name -> relative share (default 1.0 each)
+        quotas: Campaign name -> max jobs dispatched this run (default unlimited)
+        retry_all_failed: Retry failed jobs from previous runs
+        retry_include_non_retryable: Include non-retryable in retry
+        retry_config: Multi-pass retry configuration
+        autoscale_policy: Grow/shrink the shared pool while running
+        device_type: geelark or grapheneos (grapheneos starts one worker per attached device)
+
+    Returns:
+        Dict with per-campaign results
+    """
+    global _active_config, _shutdown_requested, _active_campaign_accounts
+
+    weights = weights or {}
+    quotas = quotas or {}
+    names = [ctx.campaign_name for ctx in ctxs]
+
+    setup_signal_handlers()
+
+    parallel_config = get_config(num_workers=num_workers)
+    parallel_config.progress_file = ctxs[0].progress_file  # Startup validation target
+    parallel_config.device_type = device_type
+
+    # GrapheneOS: one worker per attached device, not a fixed pool
+    if device_type == 'grapheneos':
+        num_workers = apply_device_fleet(parallel_config)
+        if num_workers == 0:
+            logger.error("No GrapheneOS device of the fleet is attached")
+            return {'error': 'no_devices'}
+        if autoscale_policy:
+            logger.info("[FLEET] Autoscaling disabled - the worker count follows the attached devices")
+            autoscale_policy = None
+
+    # Union of accounts for campaign-scoped cleanup
+    campaign_accounts = sorted({acc for ctx in ctxs for acc in ctx.get_accounts()})
+    _active_campaign_accounts = campaign_accounts
+    _active_config = parallel_config
+
+    if retry_config is None:
+        retry_config = RetryConfig()
+
+    logger.info(f"Starting multi-campaign posting: {', '.join(names)} ({num_workers} shared workers)")
+    for ctx in ctxs:
+        quota = quotas.get(ctx.campaign_name)
+        logger.info(f"  {ctx.campaign_name}: weight={weights.get(ctx.campaign_name, 1.0):g}, "
+                    f"quota={quota if quota is not None else 'none'}, progress={ctx.progress_file}")
+
+    logger.info(f"Checking for conflicting orchestrators (campaigns: {', '.join(names)})...")
+    has_conflicts, conflicts = check_for_running_orchestrators(names)
+    if has_conflicts:
+        logger.error("="*60)
+        logger.error("CONFLICT: Another orchestrator is running one of these campaigns!")
+        logger.error("="*60)
+        for conflict in conflicts:
+            logger.error(f"  - {conflict}")
+        logger.error("Please stop the other orchestrator first, or use --stop-all")
+        logger.error("="*60)
+        return {'error': 'orchestrator_conflict', 'conflicts': conflicts}
+    logger.info("No conflicting orchestrators found")
+
+    print_config(parallel_config)
+    parallel_config.ensure_logs_dir()
+
+    full_cleanup(parallel_config, release_claims=False, campaign_accounts=campaign_accounts)
+    log_port_table(parallel_config)
+
+    # Prepare every campaign's progress file
+    for ctx in ctxs:
+        tracker = ProgressTracker(ctx.progress_file)
+        tracker.release_stale_claims(max_age_seconds=0)
+        if retry_all_failed and tracker.exists() and tracker.get_stats()['failed'] > 0:
+            count = tracker.retry_all_failed(include_non_retryable=retry_include_non_retryable)
+            if count > 0:
+                logger.info(f"[{ctx.campaign_name}] Reset {count} failed jobs to RETRYING status")
+        if not tracker.exists():
+            count = seed_progress_file_ctx(ctx, parallel_config)
+            if count == 0:
+                logger.warning(f"[{ctx.campaign_name}] No jobs seeded - campaign will stay idle")
+
+    # Shared scheduler: spec for workers + fresh fair-queuing state
+    shares = [
+        CampaignShare.from_campaign(
+            ctx.campaign_config,
+            weight=weights.get(ctx.campaign_name, 1.0),
+            quota=quotas.get(ctx.campaign_name),
+        )
+        for ctx in ctxs
+    ]
+    scheduler = MultiCampaignScheduler(
+        shares, state_file=os.path.join(parallel_config.logs_dir, 'multi_campaign_state.json')
+    )
+    scheduler.reset()
+    spec_file = os.path.join(parallel_config.logs_dir, 'multi_campaign_spec.json')
+    scheduler.save_spec(spec_file)
+    parallel_config.campaign_spec = spec_file
+
+    stats = scheduler.get_stats()
+    if stats['pending'] + stats.get('retrying', 0) == 0:
+        logger.error("No jobs to process in any campaign")
+        return {'error': 'no_jobs'}
+    logger.info(f"Starting with {stats['pending']} pending jobs across {len(ctxs)} campaigns")
+
+    manager_cls = ContinuousRetryManager if retry_config.continuous else RetryPassManager
+    retry_mgrs = {
+        ctx.campaign_name: manager_cls(scheduler.trackers[ctx.campaign_name], retry_config)
+        for ctx in ctxs
+    }
+    autoscaler = WorkerAutoscaler(autoscale_policy) if autoscale_policy else None
+
+    try:
+        keep_going = not retry_config.continuous
+        if retry_config.continuous:
+            run_continuous_retry(parallel_config, num_workers, list(retry_mgrs.values()),
+                                 scheduler=scheduler, autoscaler=autoscaler)
+            for name, mgr in retry_mgrs.items():
+                logger.info(f"[{name}] Result: {mgr.finish().value}")
+
+        while keep_going and not _shutdown_requested:
+            for mgr in retry_mgrs.values():
+                mgr.start_new_pass()
+
+            processes = start_all_workers(parallel_config, count=num_workers)
+            monitor_workers(processes, parallel_config, scheduler=scheduler, autoscaler=autoscaler)
+
+            if _shutdown_requested:
+                logger.info("Shutdown requested, stopping retry loop")
+                break
+
+            results = {name: mgr.end_pass() for name, mgr in retry_mgrs.items()}
+            for name, result in results.items():
+                logger.info(f"[{name}] Pass result: {result.value}")
+            keep_going = any(r == PassResult.RETRYABLE_REMAINING for r in results.values())
+
+            if keep_going:
+                logger.info(f"Waiting {retry_config.retry_delay_seconds}s before next pass...")
+                for _ in range(retry_config.retry_delay_seconds):
+                    if _shutdown_requested:
+                        break
+                    time.sleep(1)
+
+    finally:
+        full_cleanup(parallel_config, release_claims=False, campaign_accounts=campaign_accounts)
+        for tracker in scheduler.trackers.values():
+            tracker.release_stale_claims(max_age_seconds=0)
+        _active_campaign_accounts = None
+
+    final = {}
+    campaign_stats = scheduler.get_campaign_stats()
+    logger.info("="*60)
+    logger.info("FINAL RESULTS - multi-campaign")
+    for name, cstats in campaign_stats.items():
+        logger.info(f"  {name}: {cstats['success']} success, {cstats['failed']} failed, "
+                    f"{cstats.get('retrying', 0)} retrying, {cstats['pending']} pending "
+                    f"(dispatched {cstats['dispatched']})")
+        final[name] = dict(cstats, retry_summary=retry_mgrs[name].get_summary())
+    logger.info("="*60)
+
+    return {'campaigns': final}
+
+
 def run_parallel_posting(
     num_workers: int = 3,
     state_file: str = "scheduler_state.json",
@@ -1305,6 +1819,22 @@ def load_campaign_or_exit(campaign_arg: str) -> CampaignConfig:
         sys.exit(1)
 
 
+def parse_campaign_option(value: Optional[str]) -> Dict[str, str]:
+    """Parse "name=value,name=value" CLI options (--campaign-weights/--campaign-quotas)."""
+    result = {}
+    if not value:
+        return result
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        if '=' not in item:
+            raise ValueError(f"expected name=value, got '{item}'")
+        name, val = item.split('=', 1)
+        result[name.strip()] = val.strip()
+    return result
+
+
 def list_campaigns_command():
     """Handle --list-campaigns command."""
     campaigns = CampaignConfig.list_campaigns()
@@ -1334,6 +1864,7 @@ def list_campaigns_command():
         print(f"    Videos:       {c.videos_dir}")
         print(f"    Captions:     {c.captions_file}")
         print(f"    Progress:     {c.progress_file}")
+        print(f"    Platform:     {c.platform}")
         print(f"    Daily limit:  {c.max_posts_per_account_per_day} posts/account")
 
     print("\n" + "="*60)
@@ -1354,6 +1885,9 @@ Examples:
   # Run a specific campaign
   python parallel_orchestrator.py --campaign viral --workers 5 --run
 
+  # Run two campaigns on one shared pool (viral gets 2/3 of the jobs)
+  python parallel_orchestrator.py --campaigns viral,podcast --campaign-weights viral=2,podcast=1 --workers 6 --run
+
   # Check current status
   python parallel_orchestrator.py --status
 
@@ -1380,6 +1914,8 @@ Examples:
                         help='Stop all workers, Appium servers, and phones')
     parser.add_argument('--seed-only', action='store_true',
                         help='Only seed progress file, do not run')
+    parser.add_argument('--prestage-day', action='store_true',
+                        help='GrapheneOS: push all open jobs\' videos to the devices now, do not run')
     parser.add_argument('--force-reseed', action='store_true',
                         help='Force reseed progress file even if exists')
     parser.add_argument('--force-kill-ports', action='store_true',
@@ -1402,12 +1938,32 @@ Examples:
                         help='Max retries per job for infrastructure errors (default: 3)')
     parser.add_argument('--no-retry-unknown', action='store_true',
                         help='Do NOT retry jobs with unknown/unclassified errors (default: retry them)')
+    parser.add_argument('--continuous-retry', action='store_true',
+                        help='No retry passes: per-job exponential backoff, retries interleave with fresh jobs')
 
     # Campaign support
     parser.add_argument('--campaign', '-c', type=str, default=None,
                         help='Campaign name to run (e.g., "viral", "podcast"). Uses campaigns/<name>/ folder.')
     parser.add_argument('--list-campaigns', action='store_true',
                         help='List all available campaigns')
+    parser.add_argument('--campaigns', type=str, default=None,
+                        help='Comma-separated campaigns sharing ONE worker pool (multi-campaign mode, use with --run)')
+    parser.add_argument('--campaign-weights', type=str, default=None,
+                        help='Fair-share weights for --campaigns, e.g. "viral=2,podcast=1" (default 1 each)')
+    parser.add_argument('--campaign-quotas', type=str, default=None,
+                        help='Max jobs per campaign this run for --campaigns, e.g. "podcast=50"')
+
+    # Autoscaling (--workers is the starting pool size)
+    parser.add_argument('--autoscale', action='store_true',
+                        help='Grow/shrink workers while running based on backlog, infra error rate and host load')
+    parser.add_argument('--min-workers', type=int, default=Config.AUTOSCALE_MIN_WORKERS,
+                        help=f'Autoscale lower bound (default: {Config.AUTOSCALE_MIN_WORKERS})')
+    parser.add_argument('--max-workers', type=int, default=Config.MAX_WORKERS,
+                        help=f'Autoscale upper bound (default: {Config.MAX_WORKERS})')
+
+    # Metrics endpoint (Prometheus text format, local only)
+    parser.add_argument('--metrics-port', type=int, nargs='?', const=Config.METRICS_PORT, default=None,
+                        help=f'Serve /metrics on 127.0.0.1 (default port when given without a value: {Config.METRICS_PORT})')
 
     # Navigation mode (hybrid vs AI-only)
     parser.add_argument('--ai-only', action='store_true',
@@ -1426,6 +1982,18 @@ Examples:
 
     parallel_config = get_config(num_workers=args.workers)
 
+    autoscale_policy = None
+    if args.autoscale:
+        try:
+            autoscale_policy = AutoscalePolicy(min_workers=args.min_workers, max_workers=args.max_workers)
+        except ValueError as e:
+            logger.error(f"Invalid autoscale bounds: {e}")
+            sys.exit(1)
+        if not autoscale_policy.min_workers <= args.workers <= autoscale_policy.max_workers:
+            logger.error(f"--workers {args.workers} must be within --min-workers/--max-workers "
+                         f"({autoscale_policy.min_workers}-{autoscale_policy.max_workers})")
+            sys.exit(1)
+
     # Apply navigation mode settings
     if args.ai_only:
         parallel_config.use_hybrid = False
@@ -1455,6 +2023,61 @@ Examples:
         list_campaigns_command()
         sys.exit(0)
 
+    # ============================================================
+    # STEP 1b: Multi-campaign mode (one shared worker pool)
+    # ============================================================
+    if args.campaigns:
+        if args.campaign:
+            logger.error("Use either --campaign or --campaigns, not both")
+            sys.exit(1)
+        if not args.run:
+            logger.error("--campaigns is only supported with --run (use --campaign NAME for other commands)")
+            sys.exit(1)
+
+        ctxs = []
+        for name in [n.strip() for n in args.campaigns.split(',') if n.strip()]:
+            campaign_config = load_campaign_or_exit(name)
+            if not campaign_config.enabled:
+                logger.error(f"Campaign '{campaign_config.name}' is disabled")
+                sys.exit(1)
+            ctxs.append(PostingContext.from_campaign(campaign_config))
+
+        try:
+            weights = {k: float(v) for k, v in parse_campaign_option(args.campaign_weights).items()}
+            quotas = {k: int(v) for k, v in parse_campaign_option(args.campaign_quotas).items()}
+        except ValueError as e:
+            logger.error(f"Invalid --campaign-weights/--campaign-quotas: {e}")
+            sys.exit(1)
+        unknown = (set(weights) | set(quotas)) - {c.campaign_name for c in ctxs}
+        if unknown:
+            logger.error(f"Weights/quotas given for campaigns not in --campaigns: {', '.join(sorted(unknown))}")
+            sys.exit(1)
+
+        retry_cfg = RetryConfig(
+            max_passes=args.max_passes,
+            retry_delay_seconds=args.retry_delay,
+            infrastructure_retry_limit=args.infra_retry_limit,
+            unknown_error_is_retryable=not args.no_retry_unknown,
+            continuous=args.continuous_retry,
+        )
+        if args.metrics_port:
+            start_metrics_endpoint(args.metrics_port, [c.progress_file for c in ctxs])
+
+        results = run_multi_campaign_ctx(
+            ctxs,
+            num_workers=args.workers,
+            weights=weights,
+            quotas=quotas,
+            retry_all_failed=True,
+            retry_include_non_retryable=args.retry_include_non_retryable,
+            retry_config=retry_cfg,
+            autoscale_policy=autoscale_policy,
+            device_type=args.device,
+        )
+        if results.get('error'):
+            sys.exit(1)
+        sys.exit(0)
+
     # ============================================================
     # STEP 2: Build PostingContext (single source of truth)
     # ============================================================
@@ -1534,6 +2157,13 @@ Examples:
             logger.error("Failed to seed progress file (no jobs created)")
             sys.exit(1)
 
+    elif args.prestage_day:
+        if args.device != 'grapheneos':
+            logger.error("--prestage-day needs --device grapheneos")
+            sys.exit(1)
+        count = prestage_day_ctx(ctx)
+        logger.info(f"{count} video(s) staged on device for {ctx.describe()}")
+
     elif args.run:
         # SAFETY CHECK: --force-reseed requires --reset-day to prevent accidental mid-day reseeds
         if args.force_reseed and os.path.exists(ctx.progress_file):
@@ -1550,13 +2180,18 @@ Examples:
             max_passes=args.max_passes,
             retry_delay_seconds=args.retry_delay,
             infrastructure_retry_limit=args.infra_retry_limit,
-            unknown_error_is_retryable=not args.no_retry_unknown
+            unknown_error_is_retryable=not args.no_retry_unknown,
+            continuous=args.continuous_retry,
         )
 
         logger.info(f"Retry config: max_passes={retry_cfg.max_passes}, "
                    f"retry_delay={retry_cfg.retry_delay_seconds}s, "
                    f"infra_limit={retry_cfg.infrastructure_retry_limit}, "
-                   f"retry_unknown={retry_cfg.unknown_error_is_retryable}")
+                   f"retry_unknown={retry_cfg.unknown_error_is_retryable}, "
+                   f"continuous={retry_cfg.continuous}")
+
+        if args.metrics_port:
+            start_metrics_endpoint(args.metrics_port, [ctx.progress_file])
 
         results = run_parallel_posting_ctx(
             ctx=ctx,
@@ -1565,6 +2200,8 @@ Examples:
             retry_all_failed=True,  # Always retry failed jobs on start
             retry_include_non_retryable=args.retry_include_non_retryable,
             retry_config=retry_cfg,
+            autoscale_policy=autoscale_policy,
+            device_type=args.device,
         )
         if results.get('error'):
             sys.exit(1)
@@ -4,7 +4,8 @@ Parallel Worker Process for Multi-Appium Posting.
 This module implements a single worker process that:
 1. Starts its own dedicated Appium server
 2. Claims and processes jobs from the shared progress tracker
-3. Uses the existing SmartInstagramPoster for actual posting
+3. Uses the existing SmartInstagramPoster (or TikTokPoster for TikTok jobs)
+   for actual posting
 4. Handles clean shutdown on signals
 
 Each worker is completely isolated - its own Appium server, own systemPort,
@@ -36,7 +37,10 @@ import subprocess
 
 from parallel_config import ParallelConfig, WorkerConfig, get_config
 from appium_server_manager import AppiumServerManager, AppiumServerError
-from progress_tracker import ProgressTracker
+from appium_session_manager import AppiumSessionManager
+from progress_tracker import ProgressTracker, job_platform
+from campaign_scheduler import MultiCampaignScheduler
+from retry_manager import backoff_delay
 from geelark_client import GeelarkClient
 # Import consolidated ADB helpers from device_connection
 from device_connection import (
@@ -49,16 +53,21 @@ from device_manager_base import DeviceManager
 # Comprehensive error debugging with screenshots
 from error_debugger import ErrorDebugger
 # Master ledger for tracking ALL posted videos
-from posted_ledger import record_successful_post
+from posted_ledger import record_successful_post, is_already_posted, ledger_path_for
+# Metrics flushed to GEELARK_METRICS_DIR for the orchestrator's /metrics endpoint
+from metrics import metrics
 
 
-def create_device_manager(account_name: str, device_type: str) -> Optional[DeviceManager]:
+def create_device_manager(account_name: str, device_type: str,
+                          device_serial: str = None) -> Optional[DeviceManager]:
     """
     Factory function to create the appropriate DeviceManager.
 
     Args:
         account_name: Account/phone name for the posting job
         device_type: 'geelark' or 'grapheneos'
+        device_serial: GrapheneOS device this worker drives (default: the
+            fleet device hosting the account, see device_fleet.py)
 
     Returns:
         DeviceManager instance for grapheneos, or None for geelark
@@ -71,16 +80,88 @@ def create_device_manager(account_name: str, device_type: str) -> Optional[Devic
     elif device_type == 'grapheneos':
         # Import GrapheneOS components only when needed
         from grapheneos_device_manager import GrapheneOSDeviceManager
-        from grapheneos_config import PROFILE_MAPPING, DEVICE_SERIAL
+        from grapheneos_config import DEVICE_SERIAL
+        from device_fleet import DeviceFleet
 
+        fleet = DeviceFleet.from_config()
+        serial = device_serial or fleet.device_for_account(account_name) or DEVICE_SERIAL
         return GrapheneOSDeviceManager(
-            serial=DEVICE_SERIAL,
-            profile_mapping=PROFILE_MAPPING
+            serial=serial,
+            profile_mapping=fleet.profile_mapping(serial)
         )
     else:
         raise ValueError(f"Unknown device_type: {device_type}")
 
 
+def create_profile_batcher(device_type: str, device_serial: str = None):
+    """
+    ProfileBatcher for the worker's GrapheneOS phone, or None (Geelark, no
+    single device to batch for, or batching off).
+
+    See grapheneos_device_manager.ProfileBatcher.
+    """
+    if device_type != 'grapheneos' or not device_serial:
+        return None
+
+    from grapheneos_device_manager import GrapheneOSDeviceManager, ProfileBatcher
+    from grapheneos_config import PROFILE_BATCHING, PRESTAGE_NEXT_PROFILE, PRESTAGE_MAX_VIDEOS
+    from device_fleet import DeviceFleet
+    if not PROFILE_BATCHING:
+        return None
+
+    profile_mapping = DeviceFleet.from_config().profile_mapping(device_serial)
+    batcher = ProfileBatcher(
+        GrapheneOSDeviceManager(serial=device_serial, profile_mapping=profile_mapping),
+        prestage_limit=PRESTAGE_MAX_VIDEOS if PRESTAGE_NEXT_PROFILE else 0
+    )
+    batcher.sync()
+    return batcher
+
+
+def create_poster(
+    platform: str,
+    account: str,
+    worker_config: WorkerConfig,
+    device_manager: Optional[DeviceManager],
+    device_type: str,
+    session_manager: AppiumSessionManager = None
+):
+    """
+    Factory function to create the poster for a job's platform.
+
+    Both posters share connect() / post() / cleanup() / last_error_message.
+
+    Args:
+        platform: 'instagram' or 'tiktok'
+        account: Account/phone name for the posting job
+        worker_config: This worker's configuration (Appium URL, systemPort)
+        device_manager: From create_device_manager (None for Geelark)
+        device_type: 'geelark' or 'grapheneos'
+        session_manager: Worker-wide AppiumSessionManager (Instagram only)
+    """
+    # Import here to avoid circular imports and ensure ANDROID_HOME is set
+    if platform == 'instagram':
+        from post_reel_smart import SmartInstagramPoster
+        return SmartInstagramPoster(
+            phone_name=account,
+            system_port=worker_config.system_port,
+            appium_url=worker_config.appium_url,
+            device_manager=device_manager,
+            session_manager=session_manager
+        )
+    elif platform == 'tiktok':
+        from tiktok_poster import TikTokPoster
+        return TikTokPoster(
+            phone_name=account,
+            system_port=worker_config.system_port,
+            appium_url=worker_config.appium_url,
+            device_manager=device_manager,
+            device_type=device_type
+        )
+    else:
+        raise ValueError(f"Unknown platform: {platform}")
+
+
 # Global flag for clean shutdown
 _shutdown_requested = False
 
@@ -165,8 +246,12 @@ def stop_phone_by_name(phone_name: str, logger: logging.Logger) -> bool:
         return False
 
 
-def kill_appium_sessions(appium_url: str, logger: logging.Logger):
-    """Kill any existing sessions on this Appium server to prevent orphaned sessions."""
+def kill_appium_sessions(appium_url: str, logger: logging.Logger, keep_session_ids=None):
+    """Kill any existing sessions on this Appium server to prevent orphaned sessions.
+
+    Sessions in keep_session_ids (held by this worker's AppiumSessionManager)
+    are left alone so they can be reused by the next job.
+    """
     import urllib.request
     import json
 
@@ -179,6 +264,8 @@ def kill_appium_sessions(appium_url: str, logger: logging.Logger):
 
             for session in sessions:
                 session_id = session.get('id')
+                if session_id and keep_session_ids and session_id in keep_session_ids:
+                    continue
                 if session_id:
                     try:
                         # Delete this session
@@ -201,7 +288,9 @@ def execute_posting_job(
     logger: logging.Logger,
     tracker=None,
     worker_id: int = None,
-    device_type: str = "geelark"
+    device_type: str = "geelark",
+    session_manager: AppiumSessionManager = None,
+    device_serial: str = None
 ) -> tuple:
     """
     Execute a single posting job.
@@ -214,6 +303,8 @@ def execute_posting_job(
         tracker: ProgressTracker instance for verification and error classification
         worker_id: Worker ID for verification
         device_type: 'geelark' (cloud phones) or 'grapheneos' (physical Pixel)
+        session_manager: Worker-wide AppiumSessionManager for session reuse
+        device_serial: GrapheneOS device this worker drives (None = route by account)
 
     Returns:
         (success: bool, error_message: str, error_category: str, error_type: str)
@@ -222,19 +313,20 @@ def execute_posting_job(
         - error_category: 'account', 'infrastructure', or 'unknown'
         - error_type: Specific error type (e.g., 'suspended', 'adb_timeout')
     """
-    # Import here to avoid circular imports and ensure ANDROID_HOME is set
-    from post_reel_smart import SmartInstagramPoster
-
     account = job['account']
     video_path = job['video_path']
     caption = job['caption']
     job_id = job['job_id']
+    platform = job_platform(job)
 
     # Create error debugger for comprehensive error capture
     debugger = ErrorDebugger(account=account, job_id=job_id, output_dir="error_logs")
 
     # Kill any orphaned Appium sessions before starting (prevents session limit issues)
-    kill_appium_sessions(worker_config.appium_url, logger)
+    kill_appium_sessions(
+        worker_config.appium_url, logger,
+        keep_session_ids=session_manager.session_ids() if session_manager else None
+    )
 
     # SAFETY CHECK: Verify job is still valid before posting (prevents duplicates)
     if tracker and worker_id is not None:
@@ -243,7 +335,7 @@ def execute_posting_job(
             logger.warning(f"Job {job_id} failed pre-post verification: {error}")
             return False, f"Pre-post verification failed: {error}", 'infrastructure', 'verification_failed'
 
-    logger.info(f"Starting job {job_id}: posting to {account} (device: {device_type})")
+    logger.info(f"Starting job {job_id}: posting to {account} on {platform} (device: {device_type})")
     logger.info(f"  Video: {video_path}")
     logger.info(f"  Caption: {caption[:50]}...")
 
@@ -251,16 +343,14 @@ def execute_posting_job(
     device_manager = None
     try:
         # Create device manager based on device type
-        device_manager = create_device_manager(account, device_type)
+        device_manager = create_device_manager(account, device_type, device_serial)
 
         # Create poster with this worker's Appium URL and systemPort
         # For Geelark: device_manager=None, uses phone_name internally
         # For GrapheneOS: device_manager provided, ignores phone_name
-        poster = SmartInstagramPoster(
-            phone_name=account,
-            system_port=worker_config.system_port,
-            appium_url=worker_config.appium_url,
-            device_manager=device_manager
+        poster = create_poster(
+            platform, account, worker_config, device_manager,
+            device_type, session_manager
         )
 
         # Connect to device
@@ -269,11 +359,19 @@ def execute_posting_job(
 
         # Post the video
         logger.info("Posting video...")
-        success = poster.post(
-            video_path, caption, humanize=True,
-            use_hybrid=config.use_hybrid,
-            ai_fallback=config.ai_fallback
-        )
+        if platform == 'tiktok':
+            # TikTokPoster humanizes every action itself (humanize=True by default)
+            success = poster.post(
+                video_path, caption,
+                use_hybrid=config.use_hybrid,
+                ai_fallback=config.ai_fallback
+            )
+        else:
+            success = poster.post(
+                video_path, caption, humanize=True,
+                use_hybrid=config.use_hybrid,
+                ai_fallback=config.ai_fallback
+            )
 
         if success:
             logger.info(f"Job {job_id} completed successfully!")
@@ -364,12 +462,22 @@ def execute_posting_job(
             stop_phone_by_name(account, logger)
 
 
+def retry_delay_for(job: dict, config: ParallelConfig) -> float:
+    """Minutes until a failed job may retry: fixed, or exponential backoff in continuous mode."""
+    if not config.continuous_retry:
+        return config.retry_delay_minutes
+    attempts = int(job.get('attempts') or 0) + 1  # Including the attempt that just failed
+    return backoff_delay(attempts) / 60
+
+
 def run_worker(
     worker_id: int,
     config: ParallelConfig,
     progress_file: str = None,
     delay_between_jobs: int = None,
-    device_type: str = "geelark"
+    device_type: str = "geelark",
+    campaign_scheduler: MultiCampaignScheduler = None,
+    device_serial: str = None
 ) -> dict:
     """
     Main worker loop.
@@ -380,6 +488,10 @@ def run_worker(
         progress_file: Override progress file path
         delay_between_jobs: Override delay between jobs
         device_type: 'geelark' (cloud phones) or 'grapheneos' (physical Pixel)
+        campaign_scheduler: Multi-campaign mode - claim from several campaigns'
+            progress files by weighted fair queuing (progress_file is ignored)
+        device_serial: GrapheneOS fleet - the device this worker drives; only
+            jobs for accounts on that device are claimed
 
     Returns:
         Dict with worker stats: {jobs_completed, jobs_failed, ...}
@@ -395,10 +507,15 @@ def run_worker(
     logger.info("="*60)
     logger.info(f"WORKER {worker_id} STARTING")
     logger.info(f"  Device type: {device_type}")
+    if device_serial:
+        logger.info(f"  Device serial: {device_serial}")
     logger.info(f"  Appium port: {worker_config.appium_port}")
     logger.info(f"  Appium URL: {worker_config.appium_url}")
     logger.info(f"  systemPort: {worker_config.system_port}")
-    logger.info(f"  Progress file: {progress_file}")
+    if campaign_scheduler:
+        logger.info(f"  Campaigns: {', '.join(s.name for s in campaign_scheduler.shares)}")
+    else:
+        logger.info(f"  Progress file: {progress_file}")
     logger.info("="*60)
 
     # Stats tracking
@@ -411,12 +528,33 @@ def run_worker(
         'exit_reason': None
     }
 
-    # Initialize progress tracker
+    # Initialize progress tracker (multi-campaign: the scheduler is the queue)
     tracker = ProgressTracker(progress_file)
+    queue = campaign_scheduler or tracker
 
     # Start Appium server
     appium_manager = AppiumServerManager(worker_config, config)
 
+    # Appium sessions survive across jobs on the same device (validated before reuse)
+    session_manager = AppiumSessionManager()
+
+    # GrapheneOS fleet: this worker only serves the accounts on its own device
+    fleet = None
+    device_accounts = None
+    if device_type == 'grapheneos':
+        from device_fleet import DeviceFleet
+        fleet = DeviceFleet.from_config()
+        if not device_serial and len(fleet.serials) == 1:
+            device_serial = fleet.serials[0]
+        if device_serial:
+            device_accounts = fleet.accounts_on(device_serial)
+            logger.info(f"  Device accounts: {len(device_accounts)}")
+
+    # GrapheneOS: claim the active profile's jobs first, pre-push the next profile's videos
+    profile_batcher = create_profile_batcher(device_type, device_serial)
+    if profile_batcher:
+        logger.info(f"  Profile batching on (active user: {profile_batcher.active_profile})")
+
     try:
         logger.info("Starting Appium server...")
         appium_manager.start(timeout=60)
@@ -431,7 +569,7 @@ def run_worker(
         # Main job processing loop
         while not _shutdown_requested:
             # Check if there are any remaining jobs (pending, claimed, or retrying)
-            progress_stats = tracker.get_stats()
+            progress_stats = queue.get_stats()
             retrying_count = progress_stats.get('retrying', 0)
             if progress_stats['pending'] == 0 and progress_stats['claimed'] == 0 and retrying_count == 0:
                 logger.info("No more jobs to process, exiting")
@@ -447,27 +585,63 @@ def run_worker(
                 stats['exit_reason'] = f"Appium unhealthy: {e}"
                 break
 
+            # GrapheneOS fleet: don't claim for a device that is not attached
+            if fleet is not None and device_serial:
+                fleet.check_health([device_serial])
+                if not fleet.health[device_serial].attached:
+                    if not fleet.is_healthy(device_serial):
+                        logger.error(f"Device {device_serial} missing for {fleet.max_misses} checks, stopping worker")
+                        stats['exit_reason'] = "device_detached"
+                        break
+                    time.sleep(Config.FLEET_RECHECK_SECONDS)
+                    continue
+
             # Release any stale claims (jobs claimed but never completed)
-            released = tracker.release_stale_claims(max_age_seconds=600)
+            released = queue.release_stale_claims(max_age_seconds=600)
             if released > 0:
                 logger.info(f"Released {released} stale job claims")
 
-            # Try to claim a RETRY job first (jobs that failed but can be retried)
-            job = tracker.claim_retry_job(worker_id, max_posts_per_account_per_day=config.max_posts_per_account_per_day)
-            is_retry = job is not None
+            # Profile batching: the active profile's accounts first, then any
+            # account on this device (any account at all without a fleet device)
+            preferred = profile_batcher.preferred_accounts() if profile_batcher else None
+            claim_scopes = [preferred, device_accounts] if preferred else [device_accounts]
 
-            if job is None:
-                # No retry jobs, try to claim a regular pending job
-                job = tracker.claim_next_job(worker_id, max_posts_per_account_per_day=config.max_posts_per_account_per_day)
+            for only_accounts in claim_scopes:
+                if campaign_scheduler:
+                    # Weighted fair pick across campaigns (retries first within a campaign)
+                    job, job_tracker, is_retry = campaign_scheduler.claim_job(worker_id, only_accounts=only_accounts)
+                else:
+                    job_tracker = tracker
+                    # Try to claim a RETRY job first (jobs that failed but can be retried)
+                    job = tracker.claim_retry_job(worker_id, max_posts_per_account_per_day=config.max_posts_per_account_per_day,
+                                                  only_accounts=only_accounts)
+                    is_retry = job is not None
+
+                    if job is None:
+                        # No retry jobs, try to claim a regular pending job
+                        job = tracker.claim_next_job(worker_id, max_posts_per_account_per_day=config.max_posts_per_account_per_day,
+                                                     only_accounts=only_accounts)
+                if job is not None:
+                    break
 
             if job is None:
                 # No jobs available - check if we should wait or exit
                 # Also check for retrying jobs that might become ready
-                retry_jobs = tracker.get_retry_jobs()
+                retry_jobs = queue.get_retry_jobs()
+                if device_accounts is not None:
+                    # Retries for accounts on other (or unmapped) devices are not ours to wait for
+                    retry_jobs = [j for j in retry_jobs if j.get('account') in device_accounts]
                 if progress_stats['claimed'] > 0 or len(retry_jobs) > 0:
                     logger.debug(f"Waiting for jobs... (claimed: {progress_stats['claimed']}, retrying: {len(retry_jobs)})")
                     time.sleep(5)
                     continue
+                # Continuous retry: stay alive for backed-off retries instead of ending the pass
+                next_retry = queue.next_retry_at(config.max_posts_per_account_per_day, device_accounts) if config.continuous_retry else None
+                if next_retry is not None:
+                    wait = min(30.0, max(1.0, (next_retry - datetime.now()).total_seconds()))
+                    logger.debug(f"Next retry due at {next_retry.strftime('%H:%M:%S')}, waiting {wait:.0f}s")
+                    time.sleep(wait)
+                    continue
                 else:
                     logger.info("No more jobs, exiting")
                     stats['exit_reason'] = "all_jobs_complete"
@@ -475,33 +649,53 @@ def run_worker(
 
             # Execute the job
             job_id = job['job_id']
+
+            # Last duplicate check: another campaign/run may have posted it since seeding
+            platform = job_platform(job)
+            ledger_path = ledger_path_for(platform)
+            if is_already_posted(job.get('account', ''), job.get('video_path', ''), ledger_path):
+                logger.info(f"Skipping job {job_id} - already posted to {job.get('account')} (master ledger)")
+                job_tracker.update_job_status(job_id, 'skipped', worker_id, error='already posted (master ledger)')
+                metrics.inc('geelark_jobs_total', outcome='skipped', platform=platform)
+                continue
+
+            if profile_batcher:
+                profile_batcher.job_claimed(job.get('account', ''))
+                profile_batcher.prestage_next(queue.get_open_jobs())
+
             attempt_info = f" (retry attempt {job.get('attempts', '?')})" if is_retry else ""
-            logger.info(f"Processing job {job_id}{attempt_info}")
+            campaign_info = f" [campaign {job['campaign']}]" if job.get('campaign') else ""
+            logger.info(f"Processing {platform} job {job_id}{attempt_info}{campaign_info}")
 
             try:
                 success, error, error_category, error_type = execute_posting_job(
                     job, worker_config, config, logger,
-                    tracker=tracker, worker_id=worker_id,
-                    device_type=device_type
+                    tracker=job_tracker, worker_id=worker_id,
+                    device_type=device_type,
+                    session_manager=session_manager,
+                    device_serial=device_serial
                 )
 
                 if success:
-                    tracker.update_job_status(job_id, 'success', worker_id)
+                    job_tracker.update_job_status(job_id, 'success', worker_id)
                     # Record to master ledger (prevents posting same video again)
                     record_successful_post(
                         account=job.get('account', ''),
-                        video_path=job.get('video_path', '')
+                        video_path=job.get('video_path', ''),
+                        ledger_path=ledger_path
                     )
                     stats['jobs_completed'] += 1
+                    metrics.inc('geelark_jobs_total', outcome='success', platform=platform)
                 else:
                     # Pass error classification for proper retry handling
-                    tracker.update_job_status(
+                    job_tracker.update_job_status(
                         job_id, 'failed', worker_id, error=error,
                         error_category=error_category,
                         error_type=error_type,
-                        retry_delay_minutes=config.retry_delay_minutes
+                        retry_delay_minutes=retry_delay_for(job, config)
                     )
                     stats['jobs_failed'] += 1
+                    metrics.inc('geelark_jobs_total', outcome=error_category or 'unknown', platform=platform)
                     # Log the classification for debugging
                     logger.info(f"Job {job_id} classified as: {error_category}/{error_type}")
 
@@ -511,14 +705,15 @@ def run_worker(
                 logger.error(f"Unhandled exception processing job {job_id}: {error_msg}")
                 logger.error(f"Full traceback:\n{traceback.format_exc()}")
                 # Classify the exception
-                cat, etype = tracker._classify_error(error_msg)
-                tracker.update_job_status(
+                cat, etype = job_tracker._classify_error(error_msg)
+                job_tracker.update_job_status(
                     job_id, 'failed', worker_id, error=error_msg,
                     error_category=cat,
                     error_type=etype,
-                    retry_delay_minutes=config.retry_delay_minutes
+                    retry_delay_minutes=retry_delay_for(job, config)
                 )
                 stats['jobs_failed'] += 1
+                metrics.inc('geelark_jobs_total', outcome=cat or 'unknown', platform=platform)
 
             # Delay before next job
             if not _shutdown_requested and delay > 0:
@@ -532,6 +727,17 @@ def run_worker(
     finally:
         # Clean shutdown
         logger.info("Cleaning up...")
+        metrics.flush()
+
+        if profile_batcher:
+            profile_batcher.wait(timeout=60)
+            stats['profile_switches'] = profile_batcher.switches
+            logger.info(f"Profile switches: {profile_batcher.switches}")
+
+        # Close any cached Appium sessions before stopping the server
+        session_stats = session_manager.stats()
+        logger.info(f"Appium sessions: {session_stats['created']} created, {session_stats['reused']} reused")
+        session_manager.close_all()
 
         # Stop Appium server
         try:
@@ -562,6 +768,12 @@ def main():
                         choices=['geelark', 'grapheneos'],
                         default='geelark',
                         help='Device type: geelark (cloud phones) or grapheneos (physical Pixel)')
+    parser.add_argument('--campaign-spec', default=None,
+                        help='Multi-campaign spec JSON (written by the orchestrator); overrides --progress-file')
+    parser.add_argument('--continuous-retry', action='store_true',
+                        help='Back off failed jobs exponentially and wait for queued retries instead of exiting')
+    parser.add_argument('--device-serial', default=None,
+                        help='GrapheneOS fleet: serial of the device this worker drives')
 
     args = parser.parse_args()
 
@@ -570,6 +782,7 @@ def main():
 
     # Create config
     config = get_config(num_workers=args.num_workers)
+    config.continuous_retry = args.continuous_retry
 
     # Run worker
     stats = run_worker(
@@ -577,7 +790,9 @@ def main():
         config=config,
         progress_file=args.progress_file,
         delay_between_jobs=args.delay,
-        device_type=args.device
+        device_type=args.device,
+        campaign_scheduler=MultiCampaignScheduler.load_spec(args.campaign_spec) if args.campaign_spec else None,
+        device_serial=args.device_serial
     )
 
     # Exit with appropriate code
@@ -12,6 +12,7 @@ from typing import Optional, Tuple
 
 from config import Config
 from geelark_client import GeelarkClient
+from adb_shell_pool import pooled_shell
 
 
 ADB_PATH = Config.ADB_PATH
@@ -169,12 +170,7 @@ def adb_shell(device: str, cmd: str, timeout: int = 30) -> str:
     Returns:
         Command output as string.
     """
-    result = subprocess.run(
-        [ADB_PATH, "-s", device, "shell", cmd],
-        capture_output=True, timeout=timeout,
-        encoding='utf-8', errors='replace'
-    )
-    return result.stdout.strip() if result.stdout else ""
+    return pooled_shell(device, cmd, timeout=timeout)[1]
 
 
 def adb_install(device: str, apk_path: str, timeout: int = 120) -> str:
@@ -0,0 +1,238 @@
+"""
+Concurrent Port Prober - probe every worker's Appium port in one pass.
+
+The orchestrators used to check each worker port one after another: a TCP
+connect, an Appium /status request and (if the port was taken) a netstat /
+lsof call. Each of those can take seconds to time out, so with 10+ workers
+startup and shutdown stalled on serial checks.
+
+probe_ports() runs the socket and /status checks for all ports concurrently
+under one shared deadline, resolves owning processes with a single
+netstat/lsof call, and returns a port-state table.
+
+Usage:
+    from port_prober import probe_worker_ports, PortStatus
+
+    table = probe_worker_ports(parallel_config, deadline=5.0)
+    for state in table.values():
+        print(state.port, state.status, state.process_info)
+"""
+import json
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from urllib.request import urlopen, Request
+
+
+class PortStatus:
+    """Port states reported by the prober."""
+    FREE = 'free'                  # Nothing listening - will START new Appium
+    HEALTHY_APPIUM = 'healthy'     # Appium answering /status ready=True - REUSE
+    BLOCKED = 'blocked'            # Something else (or a hung Appium) holds the port
+    UNKNOWN = 'unknown'            # Probe did not finish before the deadline
+
+
+@dataclass
+class PortState:
+    """Result of probing one port."""
+    port: int
+    status: str = PortStatus.UNKNOWN
+    worker_id: Optional[int] = None
+    process_info: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def in_use(self) -> bool:
+        """True if anything (healthy or not) holds the port."""
+        return self.status in (PortStatus.HEALTHY_APPIUM, PortStatus.BLOCKED)
+
+    @property
+    def healthy(self) -> bool:
+        return self.status == PortStatus.HEALTHY_APPIUM
+
+    def describe(self) -> str:
+        """Status line in the format the orchestrator logs."""
+        label = f"Port {self.port}"
+        if self.worker_id is not None:
+            label += f" (Worker {self.worker_id})"
+        if self.status == PortStatus.HEALTHY_APPIUM:
+            return f"{label}: Healthy Appium - will REUSE"
+        if self.status == PortStatus.FREE:
+            return f"{label}: Free - will START new Appium"
+        if self.status == PortStatus.BLOCKED:
+            msg = f"{label}: BLOCKED"
+            if self.process_info:
+                msg += f" by {self.process_info}"
+            return msg
+        return f"{label}: UNKNOWN (probe timed out)"
+
+
+def _port_open(port: int, timeout: float) -> bool:
+    """TCP connect check on localhost."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(max(timeout, 0.05))
+        return s.connect_ex(('127.0.0.1', port)) == 0
+
+
+def _appium_ready(port: int, timeout: float) -> bool:
+    """Appium /status check (ready=True)."""
+    try:
+        req = Request(f"http://127.0.0.1:{port}/status", method='GET')
+        with urlopen(req, timeout=max(timeout, 0.05)) as response:
+            data = json.loads(response.read().decode())
+            return bool(data.get('value', {}).get('ready', False))
+    except Exception:
+        return False
+
+
+def _probe_one(port: int, stop_at: float, connect_timeout: float, http_timeout: float) -> PortState:
+    """Probe a single port, never waiting past stop_at."""
+    start = time.time()
+    state = PortState(port=port)
+
+    remaining = stop_at - time.time()
+    if remaining <= 0:
+        return state
+    if not _port_open(port, min(connect_timeout, remaining)):
+        state.status = PortStatus.FREE
+    else:
+        remaining = stop_at - time.time()
+        if remaining > 0 and _appium_ready(port, min(http_timeout, remaining)):
+            state.status = PortStatus.HEALTHY_APPIUM
+        else:
+            state.status = PortStatus.BLOCKED
+
+    state.elapsed = time.time() - start
+    return state
+
+
+def listening_pids(ports: Iterable[int], timeout: float = 10) -> Dict[int, str]:
+    """
+    Map listening ports to owning process descriptions with ONE system call.
+
+    Windows: a single `netstat -ano` (+ `tasklist` for names).
+    Unix: a single `lsof -nP -iTCP -sTCP:LISTEN`.
+
+    Returns:
+        Dict port -> "PID 1234: name" (ports without a listener are omitted)
+    """
+    wanted = set(ports)
+    found: Dict[int, str] = {}
+    if not wanted:
+        return found
+
+    try:
+        if sys.platform == 'win32':
+            result = subprocess.run(['netstat', '-ano'], capture_output=True, text=True, timeout=timeout)
+            pids: Dict[int, str] = {}
+            for line in result.stdout.split('\n'):
+                if 'LISTENING' not in line:
+                    continue
+                parts = line.split()
+                if len(parts) < 2:
+                    continue
+                local = parts[1]
+                try:
+                    port = int(local.rsplit(':', 1)[-1])
+                except ValueError:
+                    continue
+                if port in wanted and port not in pids:
+                    pids[port] = parts[-1]
+
+            names: Dict[str, str] = {}
+            if pids:
+                listing = subprocess.run(['tasklist', '/FO', 'CSV', '/NH'],
+                                         capture_output=True, text=True, timeout=timeout)
+                for row in listing.stdout.split('\n'):
+                    cols = [c.strip('"') for c in row.strip().split('","')]
+                    if len(cols) >= 2:
+                        names[cols[1]] = cols[0]
+            for port, pid in pids.items():
+                name = names.get(pid)
+                found[port] = f"PID {pid}: {name}" if name else f"PID {pid}"
+        else:
+            result = subprocess.run(['lsof', '-nP', '-iTCP', '-sTCP:LISTEN'],
+                                    capture_output=True, text=True, timeout=timeout)
+            for line in result.stdout.split('\n')[1:]:
+                parts = line.split()
+                if len(parts) < 9:
+                    continue
+                try:
+                    port = int(parts[8].rsplit(':', 1)[-1])
+                except ValueError:
+                    continue
+                if port in wanted and port not in found:
+                    found[port] = f"PID {parts[1]}: {parts[0]}"
+    except Exception:
+        pass
+
+    return found
+
+
+def probe_ports(
+    ports: Iterable[int],
+    deadline: float = 5.0,
+    connect_timeout: float = 1.0,
+    http_timeout: float = 3.0,
+    resolve_processes: bool = True,
+    worker_ids: Optional[Dict[int, int]] = None,
+) -> Dict[int, PortState]:
+    """
+    Probe many ports concurrently under a shared deadline.
+
+    Args:
+        ports: Ports to probe
+        deadline: Total seconds for the whole pass (not per port)
+        connect_timeout: Max seconds for each TCP connect
+        http_timeout: Max seconds for each Appium /status request
+        resolve_processes: Look up the owning process for BLOCKED ports
+        worker_ids: Optional port -> worker_id map for labelling
+
+    Returns:
+        Dict port -> PortState. Ports whose probe missed the deadline are UNKNOWN.
+    """
+    ports = list(dict.fromkeys(ports))
+    worker_ids = worker_ids or {}
+    stop_at = time.time() + deadline
+    table = {port: PortState(port=port, worker_id=worker_ids.get(port)) for port in ports}
+    if not ports:
+        return table
+
+    executor = ThreadPoolExecutor(max_workers=min(32, len(ports)), thread_name_prefix="port-probe")
+    try:
+        futures = {
+            executor.submit(_probe_one, port, stop_at, connect_timeout, http_timeout): port
+            for port in ports
+        }
+        done, _ = wait(futures, timeout=max(0.0, stop_at - time.time()) + 0.5)
+        for future in done:
+            state = future.result()
+            state.worker_id = worker_ids.get(state.port)
+            table[state.port] = state
+    finally:
+        executor.shutdown(wait=False)
+
+    if resolve_processes:
+        blocked = [p for p, s in table.items() if s.status == PortStatus.BLOCKED]
+        if blocked:
+            owners = listening_pids(blocked)
+            for port in blocked:
+                table[port].process_info = owners.get(port)
+
+    return table
+
+
+def probe_worker_ports(config, deadline: float = 5.0, **kwargs) -> Dict[int, PortState]:
+    """
+    Probe every worker's Appium port from a ParallelConfig.
+
+    Returns:
+        Dict worker_id -> PortState
+    """
+    worker_ids = {w.appium_port: w.worker_id for w in config.workers}
+    table = probe_ports(worker_ids.keys(), deadline=deadline, worker_ids=worker_ids, **kwargs)
+    return {worker_ids[port]: state for port, state in table.items()}
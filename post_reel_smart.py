@@ -29,7 +29,6 @@ import anthropic
 from geelark_client import GeelarkClient
 
 # Appium imports
-from appium import webdriver
 from appium.options.android import UiAutomator2Options
 from appium.webdriver.common.appiumby import AppiumBy
 
@@ -44,8 +43,15 @@ from appium_ui_controller import AppiumUIController
 from flow_logger import FlowLogger
 # Comprehensive error debugging with screenshots
 from error_debugger import ErrorDebugger
+# Black box - last navigation steps, written only on failure
+from black_box import BlackBoxRecorder
+# Latency/phase metrics for the orchestrator's /metrics endpoint
+from metrics import metrics
+# Probe results cached when jobs are seeded
+from video_preflight import cached_probe
 # Hybrid Navigator - rule-based + AI fallback
 from hybrid_navigator import HybridNavigator
+from screen_detector import ScreenDetector, ScreenType
 
 # Use centralized paths and screen coordinates
 APPIUM_SERVER = Config.DEFAULT_APPIUM_URL
@@ -66,7 +72,7 @@ SWIPE_DURATION_MAX = Config.SWIPE_DURATION_MAX
 
 class SmartInstagramPoster:
     def __init__(self, phone_name=None, system_port=8200, appium_url=None,
-                 device_manager: DeviceManager = None):
+                 device_manager: DeviceManager = None, session_manager=None):
         """
         Initialize SmartInstagramPoster.
 
@@ -76,6 +82,8 @@ class SmartInstagramPoster:
             appium_url: Appium server URL
             device_manager: Optional DeviceManager instance (for GrapheneOS or testing)
                            If not provided, creates DeviceConnectionManager (Geelark)
+            session_manager: Optional AppiumSessionManager - keeps the Appium session
+                           alive across jobs on the same device
         """
         # Device manager: use provided one or create DeviceConnectionManager
         if device_manager is not None:
@@ -87,7 +95,8 @@ class SmartInstagramPoster:
             self._conn = DeviceConnectionManager(
                 phone_name=self.phone_name,
                 system_port=system_port,
-                appium_url=appium_url or APPIUM_SERVER
+                appium_url=appium_url or APPIUM_SERVER,
+                session_manager=session_manager
             )
             # Override the device for Appium connection
             self._uses_external_device_manager = True
@@ -98,7 +107,8 @@ class SmartInstagramPoster:
             self._conn = DeviceConnectionManager(
                 phone_name=phone_name,
                 system_port=system_port,
-                appium_url=appium_url or APPIUM_SERVER
+                appium_url=appium_url or APPIUM_SERVER,
+                session_manager=session_manager
             )
             self._device_manager = self._conn  # DeviceConnectionManager IS a DeviceManager
             self.phone_name = phone_name
@@ -115,6 +125,7 @@ class SmartInstagramPoster:
         self._ui_controller = None
         # State tracking
         self.video_uploaded = False  # File has been ADB-pushed to device storage
+        self.remote_video_path = None  # Where the uploaded video lives on the device
         self.video_selected = False  # User has selected video in gallery UI (past GALLERY_PICKER)
         self.caption_entered = False
         self.share_clicked = False
@@ -584,6 +595,7 @@ class SmartInstagramPoster:
             # Send to Claude Vision for analysis
             print("    Analyzing screenshot with Claude Vision...")
 
+            ai_start = time.time()
             response = self.anthropic.messages.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=500,
@@ -622,6 +634,7 @@ Be concise and direct."""
                     }
                 ]
             )
+            metrics.observe('geelark_ai_call_seconds', time.time() - ai_start, caller='vision')
 
             analysis = response.content[0].text
             print(f"    Vision analysis: {analysis[:100]}...")
@@ -892,6 +905,7 @@ Be concise and direct."""
             print("    ERROR: Appium driver not connected!")
             return False
 
+    @metrics.timed('geelark_dump_ui_seconds', platform='instagram')
     def dump_ui(self):
         """Dump UI hierarchy and return parsed elements using Appium (required)"""
         elements = []
@@ -980,7 +994,8 @@ Be concise and direct."""
         if self._uses_external_device_manager:
             # GrapheneOS mode: use external device manager for connection
             print(f"Connecting via {self._device_manager.device_type}...")
-            self._device_manager.ensure_connected(self.phone_name)
+            with metrics.timer('geelark_phase_seconds', phase='adb_connect'):
+                self._device_manager.ensure_connected(self.phone_name)
 
             # Set up _conn.device for Appium (uses serial/address from device manager)
             adb_address = self._device_manager.get_adb_address()
@@ -1008,10 +1023,8 @@ Be concise and direct."""
 
             for attempt in range(3):
                 try:
-                    self._conn.appium_driver = webdriver.Remote(
-                        command_executor=self._conn.appium_url,
-                        options=options
-                    )
+                    with metrics.timer('geelark_phase_seconds', phase='appium_session'):
+                        self._conn.appium_driver = self._conn.create_appium_session(options)
                     print(f"  Appium connected to GrapheneOS device!")
                     return True
                 except Exception as e:
@@ -1045,6 +1058,13 @@ Be concise and direct."""
         if not os.path.exists(video_path):
             return False, f"File not found: {video_path}"
 
+        # Checked when the job was seeded (and unchanged since) - no need to probe again
+        probe = cached_probe(video_path)
+        if probe is not None:
+            if not probe.valid:
+                return False, probe.error
+            return True, probe.duration if probe.probed else "skipped"
+
         try:
             # Use ffprobe to check video metadata
             result = subprocess.run(
@@ -1084,6 +1104,7 @@ Be concise and direct."""
         except Exception as e:
             return False, f"Validation error: {str(e)}"
 
+    @metrics.timed('geelark_phase_seconds', phase='upload')
     def upload_video(self, video_path):
         """Upload video to phone using DeviceManager abstraction.
 
@@ -1095,10 +1116,13 @@ Be concise and direct."""
         # This abstracts away the difference between Geelark API and adb push
         remote_path = self._device_manager.upload_video(video_path)
         print(f"  Video uploaded to: {remote_path}")
+        self.remote_video_path = remote_path
 
-        # Trigger media scanner so gallery sees the video
-        self.adb("am broadcast -a android.intent.action.MEDIA_SCANNER_SCAN_FILE -d file:///sdcard/Download/")
-        time.sleep(3)
+        # GrapheneOS already scanned the file into the profile's MediaStore and
+        # polled for its row; Geelark uploads still need a scan of Download
+        if self._device_manager.device_type != "grapheneos":
+            self.adb("am broadcast -a android.intent.action.MEDIA_SCANNER_SCAN_FILE -d file:///sdcard/Download/")
+            time.sleep(3)
 
         # Clean up old screenshots
         print("  Cleaning screenshots...")
@@ -1108,8 +1132,59 @@ Be concise and direct."""
         self.video_uploaded = True
         return True
 
+    def _media_content_uri(self, remote_path):
+        """MediaStore content:// URI of an uploaded video, or None if not indexed yet."""
+        name = os.path.basename(remote_path)
+        if "'" in name or '"' in name:
+            return None
+        self.adb(f"am broadcast -a android.intent.action.MEDIA_SCANNER_SCAN_FILE -d 'file://{remote_path}'")
+        time.sleep(1)
+        output = self.adb(
+            "content query --uri content://media/external/video/media --projection _id "
+            f"--where \"_display_name='{name}'\" --sort 'date_added DESC'"
+        ) or ""
+        match = re.search(r'_id=(\d+)', output)
+        return f"content://media/external/video/media/{match.group(1)}" if match else None
+
+    def open_composer_via_share_intent(self):
+        """Hand the uploaded video to Instagram's reel composer with ACTION_SEND.
+
+        Skips CREATE_MENU and GALLERY_PICKER: Instagram opens straight in the
+        video editor or share preview.
+
+        Returns:
+            True if the composer is showing, False if the caller should use the
+            regular create -> gallery flow instead
+        """
+        if not self.remote_video_path:
+            return False
+
+        uri = self._media_content_uri(self.remote_video_path) or f"file://{self.remote_video_path}"
+        print(f"\nSharing video to Instagram composer: {uri}")
+        self.adb(
+            "am start -a android.intent.action.SEND -t video/mp4 "
+            f"--eu android.intent.extra.STREAM '{uri}' --grant-read-uri-permission "
+            f"-n {Config.INSTAGRAM_REEL_SHARE_ACTIVITY}"
+        )
+
+        detector = ScreenDetector()
+        for _ in range(Config.SHARE_INTENT_CHECKS):
+            time.sleep(2)
+            try:
+                elements, _ = self.dump_ui()
+            except Exception as e:
+                print(f"  [SHARE INTENT] UI dump error: {e}")
+                continue
+            screen_type = detector.detect(elements).screen_type
+            if screen_type in (ScreenType.VIDEO_EDITING, ScreenType.SHARE_PREVIEW):
+                print(f"  [SHARE INTENT] Composer open at {screen_type.name}")
+                return True
+
+        print("  [SHARE INTENT] Composer not confirmed, using regular flow")
+        return False
+
     def post(self, video_path, caption, max_steps=30, humanize=False, job_id=None,
-             use_hybrid=True, ai_fallback=True):
+             use_hybrid=True, ai_fallback=True, use_share_intent=None):
         """Main posting flow with smart navigation
 
         Args:
@@ -1124,10 +1199,14 @@ Be concise and direct."""
                          If True (default), AI rescues when rules fail (production mode)
                          If False, STRICT rules-only - failures expose broken rules
                          Use ai_fallback=False to TEST which rules work/fail
+            use_share_intent: Open the composer with an ACTION_SEND intent, falling back
+                              to the gallery flow (default: Config.SHARE_INTENT_POSTING)
         """
+        if use_share_intent is None:
+            use_share_intent = Config.SHARE_INTENT_POSTING
 
         # Initialize flow logger for pattern analysis
-        flow_logger = FlowLogger(self.phone_name, log_dir="flow_analysis")
+        flow_logger = FlowLogger(self.phone_name, log_dir="flow_analysis", enabled=Config.FLOW_LOGGING)
 
         # Initialize error debugger for comprehensive error capture
         job_id = job_id or os.path.basename(video_path)
@@ -1136,6 +1215,7 @@ Be concise and direct."""
             job_id=job_id,
             output_dir="error_logs"
         )
+        black_box = BlackBoxRecorder(account=self.phone_name, job_id=job_id)
 
         # Navigation mode setup
         if use_hybrid:
@@ -1182,6 +1262,16 @@ Be concise and direct."""
         if humanize:
             self.humanize_before_post()
 
+        # Jump straight into the composer; navigation then starts at the editor
+        if use_share_intent:
+            if self.open_composer_via_share_intent():
+                self.video_selected = True
+            else:
+                self.adb("am force-stop com.instagram.android")
+                time.sleep(2)
+                self.adb("monkey -p com.instagram.android 1")
+                time.sleep(5)
+
         # Loop detection - track recent actions to detect stuck states
         recent_actions = []  # List of (action_type, x, y) tuples
         LOOP_THRESHOLD = 5  # If 5 consecutive same actions, we're stuck
@@ -1189,13 +1279,17 @@ Be concise and direct."""
         MAX_LOOP_RECOVERIES = 2  # Give up after this many recovery attempts
 
         # Vision-action loop
+        nav_start = time.time()
         for step in range(max_steps):
             print(f"\n--- Step {step + 1} ---")
 
             # Dump UI
+            step_start = time.time()
             elements, raw_xml = self.dump_ui()
+            dump_seconds = time.time() - step_start
             if not elements:
                 print("  No UI elements found, waiting...")
+                black_box.record(step + 1, [], timings={'dump_ui': dump_seconds}, note="no UI elements")
                 time.sleep(2)
                 continue
 
@@ -1204,6 +1298,9 @@ Be concise and direct."""
             if error_type:
                 print(f"  [ERROR DETECTED] {error_type}: {error_msg}")
                 self.last_error_type = error_type
+                black_box.record(step + 1, elements, timings={'dump_ui': dump_seconds},
+                                 note=f"{error_type}: {error_msg}")
+                black_box.flush(error_type, context={"error_message": error_msg})
 
                 # COMPREHENSIVE ERROR CAPTURE - screenshot + full state
                 self._debugger.capture_error(
@@ -1260,6 +1357,8 @@ Be concise and direct."""
 
             # Navigation: Hybrid (rule-based + AI fallback) or AI-only
             ai_called = False
+            screen_name, confidence = None, None
+            nav_start_step = time.time()
             try:
                 if self._hybrid_navigator is not None:
                     # HYBRID MODE: Rule-based detection with AI fallback
@@ -1279,6 +1378,7 @@ Be concise and direct."""
                     nav_result = self._hybrid_navigator.navigate(elements)
                     action = nav_result.action
                     ai_called = nav_result.used_ai
+                    screen_name, confidence = nav_result.screen_type.name, nav_result.action_confidence
 
                     # Log whether rule-based or AI was used
                     if nav_result.used_ai:
@@ -1293,6 +1393,8 @@ Be concise and direct."""
                     print(f"  [AI] -> {action['action']}")
             except Exception as e:
                 print(f"  Analysis error: {e}")
+                black_box.record(step + 1, elements, timings={'dump_ui': dump_seconds},
+                                 note=f"analysis_error: {e}")
                 # COMPREHENSIVE ERROR CAPTURE
                 self._debugger.capture_error(
                     error=e,
@@ -1312,18 +1414,26 @@ Be concise and direct."""
 
             print(f"  Action: {action['action']} - {action.get('reason', '')}")
 
+            step_state = {
+                'video_uploaded': self.video_uploaded,
+                'video_selected': self.video_selected,
+                'caption_entered': self.caption_entered,
+                'share_clicked': self.share_clicked
+            }
+            box_entry = black_box.record(
+                step + 1, elements, screen_type=screen_name, confidence=confidence,
+                used_ai=ai_called, action=action, state=step_state,
+                timings={'dump_ui': dump_seconds, 'navigate': time.time() - nav_start_step},
+                driver=self.appium_driver
+            )
+
             # Log the step for pattern analysis
             flow_logger.log_step(
                 elements=elements,
                 action=action,
                 ai_called=ai_called,  # Track whether AI was used this step
                 ai_tokens=0,  # TODO: capture actual token usage from analyzer
-                state={
-                    'video_uploaded': self.video_uploaded,
-                    'video_selected': self.video_selected,
-                    'caption_entered': self.caption_entered,
-                    'share_clicked': self.share_clicked
-                },
+                state=step_state,
                 result="pending"
             )
 
@@ -1361,9 +1471,12 @@ Be concise and direct."""
 
             # Special case: 'done' - returns from function
             if action_name == 'done':
+                metrics.observe('geelark_phase_seconds', time.time() - nav_start, phase='navigation')
                 print("\n[SUCCESS] Share initiated!")
                 # Wait for upload to actually complete (poll UI for confirmation)
-                if self.wait_for_upload_complete(timeout=60):
+                with metrics.timer('geelark_phase_seconds', phase='share'):
+                    upload_confirmed = self.wait_for_upload_complete(timeout=60)
+                if upload_confirmed:
                     print("[SUCCESS] Upload confirmed complete!")
                 else:
                     print("[WARNING] Upload confirmation timeout - may still be processing")
@@ -1378,6 +1491,7 @@ Be concise and direct."""
                     print(f"  Estimated savings: ${stats['estimated_savings_per_post']:.2f}")
                 else:
                     print(f"\n[SUCCESS] Post completed in {step + 1} steps (AI-only mode)")
+                black_box.clear()
                 flow_logger.log_success()
                 flow_logger.close()
                 return True
@@ -1388,6 +1502,7 @@ Be concise and direct."""
                 print(f"\n[ERROR] {error_reason}")
                 self.last_error_type = action.get('error_type', 'ai_error')
                 self.last_error_message = error_reason
+                black_box.flush(self.last_error_type, context={"error_message": error_reason})
                 flow_logger.log_failure(f"ai_error: {error_reason}")
                 flow_logger.close()
                 return False
@@ -1398,9 +1513,11 @@ Be concise and direct."""
                     continue  # Helper handled it and wants to skip to next step
 
             # Dispatch table for standard actions
+            action_start = time.time()
             action_handlers = self._get_action_handlers()
             if action_name in action_handlers:
                 action_handlers[action_name](action, elements)
+            box_entry['timings']['action'] = time.time() - action_start
 
             # Track action and check for stuck loops
             self._track_action_for_loop_detection(action, elements, recent_actions, LOOP_THRESHOLD)
@@ -1438,6 +1555,7 @@ Be concise and direct."""
                 else:
                     self.last_error_message = "Loop recovery failed - could not escape stuck state"
                     self.last_error_type = "loop_stuck"
+                black_box.flush("loop_stuck", elements, context={"recent_actions": recent_actions[-10:]})
                 flow_logger.log_failure(f"loop_stuck: {self.last_error_message}")
                 flow_logger.close()
                 return False
@@ -1463,12 +1581,14 @@ Be concise and direct."""
             time.sleep(1)
 
         print(f"\n[FAILED] Max steps ({max_steps}) reached")
+        metrics.observe('geelark_phase_seconds', time.time() - nav_start, phase='navigation')
 
         # Get final UI state for error capture
         try:
             final_elements, _ = self.dump_ui()
         except:
             final_elements = []
+        black_box.flush("max_steps", final_elements, context={"max_steps": max_steps})
 
         # COMPREHENSIVE ERROR CAPTURE
         self._debugger.capture_error(
@@ -1511,15 +1631,21 @@ Be concise and direct."""
         """
         print("\nCleaning up...")
         try:
-            self.adb("rm -f /sdcard/Download/*.mp4")
+            if self._device_manager.device_type == "grapheneos" and self.remote_video_path:
+                # Videos for later jobs wait in the staging folder, not in Download
+                self.adb(f"rm -f '{self.remote_video_path}'")
+            else:
+                self.adb("rm -f /sdcard/Download/*.mp4")
         except Exception:
             pass  # Ignore cleanup errors - video deletion is best-effort
 
-        # Close Appium driver if open
+        # GrapheneOS: keep the Appium session for the next job (if session reuse is on).
+        # Geelark: the phone is stopped below, so its session would be dead anyway.
         try:
-            if self.appium_driver:
-                self.appium_driver.quit()
-                print("  Appium driver closed")
+            if self._device_manager.device_type == "grapheneos":
+                self._conn.release_appium()
+            else:
+                self._conn.discard_appium()
         except Exception:
             pass
 
@@ -1551,6 +1677,8 @@ def main():
     parser.add_argument('--appium-url',
                         default='http://127.0.0.1:4723',
                         help='Appium server URL (default: http://127.0.0.1:4723)')
+    parser.add_argument('--share-intent', action='store_true',
+                        help='Open the reel composer via ACTION_SEND instead of the gallery picker')
 
     args = parser.parse_args()
 
@@ -1579,7 +1707,8 @@ def main():
 
     try:
         poster.connect()
-        success = poster.post(args.video_path, args.caption)
+        success = poster.post(args.video_path, args.caption,
+                              use_share_intent=args.share_intent or None)
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"ERROR: {e}")
@@ -5,18 +5,36 @@ This module tracks EVERY successful post across ALL campaigns and runs.
 It is the source of truth for "has this video been posted to this account?"
 
 The ledger is:
-- Append-only: NEVER deleted, only added to
+- Append-only: NEVER deleted, only added to (compaction only drops duplicate rows)
 - Immediate: Updated the moment a post succeeds
 - Checked before posting: Prevents duplicates
 
 Format: account|video_filename|timestamp
 Example: podclipcrafters|DM6m1Econ4x-2.mp4|2025-12-17T10:30:00
+
+Instagram posts go to all_posted_videos.txt; other platforms get their own
+ledger next to it (all_posted_videos_tiktok.txt, see ledger_path_for), since
+posting a video to an account's TikTok says nothing about its Instagram.
+
+Lookups go through a LedgerIndex (one per ledger path) holding
+account -> videos and video -> accounts maps, so duplicate checks and
+per-account/per-video queries are O(1) however large the ledger grows.
+The index remembers how far into the file it has read; every lookup stats
+the ledger and parses only the lines other processes appended since.
+
+compact_ledger() rewrites the ledger without duplicate rows and writes a
+compact index next to it (<ledger>.idx.json). A fresh process loads that
+index and tail-reads only what was appended after the compaction, instead
+of parsing every row.
 """
 
 import os
+import json
+import time
 import logging
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Set, Tuple
+from typing import Dict, Optional, Set, Tuple
 from threading import Lock
 
 # Try to import portalocker for file locking
@@ -31,14 +49,19 @@ logger = logging.getLogger(__name__)
 # Default ledger path
 DEFAULT_LEDGER_PATH = "all_posted_videos.txt"
 
-# In-memory cache for fast duplicate checking
-_ledger_cache: Set[Tuple[str, str]] = set()
-_cache_loaded = False
-_cache_lock = Lock()
+# Compact on-disk index written by compact_ledger()
+INDEX_SUFFIX = ".idx.json"
+
+# Writers lock <ledger>.lock, not the ledger itself: Windows can't replace a
+# file that is open, and its byte-range locks would also block reads
+LOCK_SUFFIX = ".lock"
 
 
 def _get_ledger_path() -> str:
     """Get the path to the master ledger file."""
+    # POSTED_LEDGER_PATH redirects the ledger (load tests must not touch the real one)
+    if os.environ.get("POSTED_LEDGER_PATH"):
+        return os.environ["POSTED_LEDGER_PATH"]
     # Use the project root directory
     return os.path.join(
         os.path.dirname(os.path.abspath(__file__)),
@@ -46,48 +69,168 @@ def _get_ledger_path() -> str:
     )
 
 
-def load_ledger_cache(ledger_path: str = None) -> Set[Tuple[str, str]]:
+def ledger_path_for(platform: str = None) -> Optional[str]:
     """
-    Load the entire ledger into memory for fast duplicate checking.
+    Ledger path for a platform (None = the default Instagram ledger).
 
-    Returns:
-        Set of (account, video_filename) tuples that have been posted
+    Pass the result as ledger_path to the functions below.
     """
-    global _ledger_cache, _cache_loaded
+    if not platform or platform == "instagram":
+        return None
+    base, ext = os.path.splitext(_get_ledger_path())
+    return f"{base}_{platform}{ext}"
 
-    path = ledger_path or _get_ledger_path()
 
-    with _cache_lock:
-        if _cache_loaded and not ledger_path:
-            return _ledger_cache
+def _parse_line(line: str) -> Optional[Tuple[str, str]]:
+    """(account, video_filename) from a ledger line, or None for blanks/comments."""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    parts = line.split('|')
+    if len(parts) < 2:
+        return None
+    return parts[0].strip(), parts[1].strip()
+
+
+class LedgerIndex:
+    """
+    In-memory index of one ledger file, kept current by tail-reading.
+
+    `offset` is the byte position up to which the file has been parsed; only
+    complete lines are consumed, so a row another process is still writing
+    is picked up on the next refresh. If the file shrinks or is replaced
+    (compaction), the index is rebuilt.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.by_account: Dict[str, Set[str]] = {}
+        self.by_video: Dict[str, Set[str]] = {}
+        self.total = 0          # Distinct (account, video) pairs
+        self.offset = 0
+        self.inode = None
+        self.lock = Lock()
+
+    def add(self, account: str, video_filename: str) -> bool:
+        """Add one pair; returns False if it was already indexed."""
+        videos = self.by_account.setdefault(account, set())
+        if video_filename in videos:
+            return False
+        videos.add(video_filename)
+        self.by_video.setdefault(video_filename, set()).add(account)
+        self.total += 1
+        return True
 
-        _ledger_cache = set()
+    def contains(self, account: str, video_filename: str) -> bool:
+        return video_filename in self.by_account.get(account, ())
 
-        if not os.path.exists(path):
-            logger.info(f"Master ledger not found at {path}, starting fresh")
-            _cache_loaded = True
-            return _ledger_cache
+    def _reset(self):
+        self.by_account = {}
+        self.by_video = {}
+        self.total = 0
+        self.offset = 0
+        self.inode = None
 
+    def _load_index_file(self, st: os.stat_result) -> bool:
+        """Seed the maps from the compact index if it matches the current ledger."""
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    parts = line.split('|')
-                    if len(parts) >= 2:
-                        account = parts[0].strip()
-                        video_filename = parts[1].strip()
-                        _ledger_cache.add((account, video_filename))
-
-            logger.info(f"Loaded {len(_ledger_cache)} posted entries from master ledger")
-            _cache_loaded = True
+            with open(self.path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('inode') != st.st_ino or data.get('size', 0) > st.st_size:
+                return False
+            for account, videos in data.get('accounts', {}).items():
+                for video_filename in videos:
+                    self.add(account, video_filename)
+            self.offset = data['size']
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            self._reset()
+            return False
+
+    def refresh(self) -> int:
+        """
+        Parse lines appended since the last refresh (rebuilding if the file
+        was truncated or replaced). Caller holds self.lock.
+
+        Returns:
+            Number of new pairs indexed
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self.inode is not None:
+                self._reset()
+            return 0
+
+        if self.inode != st.st_ino or st.st_size < self.offset:
+            if self.inode is not None:
+                logger.info(f"Master ledger {self.path} was replaced, rebuilding index")
+            self._reset()
+            self.inode = st.st_ino
+            if self._load_index_file(st):
+                logger.info(f"Loaded {self.total} posted entries from ledger index")
+
+        if st.st_size == self.offset:
+            return 0
+
+        added = 0
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(st.st_size - self.offset)
+        end = chunk.rfind(b'\n')
+        if end < 0:
+            return 0  # Only a partial line so far
+        for raw in chunk[:end].split(b'\n'):
+            entry = _parse_line(raw.decode('utf-8', errors='replace'))
+            if entry and self.add(*entry):
+                added += 1
+        self.offset += end + 1
+        return added
+
+
+# One index per ledger path
+_indexes: Dict[str, LedgerIndex] = {}
+_indexes_lock = Lock()
+
+
+def get_ledger_index(ledger_path: str = None) -> LedgerIndex:
+    """
+    Get the up-to-date index for a ledger (created and loaded on first use).
 
+    Never raises on a read error: the index keeps what it had and the error
+    is logged, so duplicate checks degrade instead of crashing a worker.
+    """
+    path = ledger_path or _get_ledger_path()
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = _indexes[path] = LedgerIndex(path)
+            if not os.path.exists(path):
+                logger.info(f"Master ledger not found at {path}, starting fresh")
+
+    with index.lock:
+        try:
+            added = index.refresh()
+            if added:
+                logger.debug(f"Master ledger: indexed {added} new entries ({index.total} total)")
         except Exception as e:
-            logger.error(f"Error loading master ledger: {e}")
-            _cache_loaded = True  # Mark as loaded even on error to avoid infinite retries
+            logger.error(f"Error reading master ledger: {e}")
+    return index
 
-    return _ledger_cache
+
+def load_ledger_cache(ledger_path: str = None) -> Set[Tuple[str, str]]:
+    """
+    Load the ledger as a set of pairs.
+
+    Builds a full copy (O(entries)); lookups should use is_already_posted()
+    and the get_* helpers, which go through the index.
+
+    Returns:
+        Set of (account, video_filename) tuples that have been posted
+    """
+    index = get_ledger_index(ledger_path)
+    with index.lock:
+        return {(account, video) for account, videos in index.by_account.items() for video in videos}
 
 
 def is_already_posted(account: str, video_path: str, ledger_path: str = None) -> bool:
@@ -102,13 +245,43 @@ def is_already_posted(account: str, video_path: str, ledger_path: str = None) ->
     Returns:
         True if this video was already posted to this account
     """
-    # Load cache if needed
-    cache = load_ledger_cache(ledger_path)
+    index = get_ledger_index(ledger_path)
 
     # Extract just the filename from the path
     video_filename = os.path.basename(video_path)
 
-    return (account, video_filename) in cache
+    return index.contains(account, video_filename)
+
+
+@contextmanager
+def _ledger_lock(path: str):
+    """
+    Hold the ledger's exclusive write lock (on <ledger>.lock).
+
+    The ledger is opened only after the lock is taken, so an append never
+    lands in a file a compaction has just replaced.
+    """
+    if not HAS_PORTALOCKER:
+        yield
+        return
+    with open(path + LOCK_SUFFIX, 'a') as lock_handle:
+        portalocker.lock(lock_handle, portalocker.LOCK_EX)
+        try:
+            yield
+        finally:
+            portalocker.unlock(lock_handle)
+
+
+def _replace(src: str, dst: str, attempts: int = 10) -> None:
+    """os.replace, retried while a reader briefly holds dst open (Windows)."""
+    for attempt in range(attempts):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.1)
 
 
 def record_successful_post(
@@ -130,8 +303,6 @@ def record_successful_post(
     Returns:
         True if recorded successfully
     """
-    global _ledger_cache
-
     path = ledger_path or _get_ledger_path()
     video_filename = os.path.basename(video_path)
     timestamp = datetime.now().isoformat()
@@ -143,20 +314,10 @@ def record_successful_post(
         os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
 
         # Append to file with locking
-        with open(path, 'a', encoding='utf-8') as f:
-            if HAS_PORTALOCKER:
-                portalocker.lock(f, portalocker.LOCK_EX)
-            try:
-                f.write(entry)
-                f.flush()
-                os.fsync(f.fileno())  # Force write to disk
-            finally:
-                if HAS_PORTALOCKER:
-                    portalocker.unlock(f)
-
-        # Update cache
-        with _cache_lock:
-            _ledger_cache.add((account, video_filename))
+        with _ledger_lock(path), open(path, 'a', encoding='utf-8') as f:
+            f.write(entry)
+            f.flush()
+            os.fsync(f.fileno())  # Force write to disk
 
         logger.info(f"MASTER LEDGER: Recorded {account}|{video_filename}")
         return True
@@ -164,11 +325,15 @@ def record_successful_post(
     except Exception as e:
         logger.error(f"CRITICAL: Failed to record to master ledger: {e}")
         logger.error(f"  Entry was: {entry.strip()}")
-        # Still update cache to prevent immediate duplicate
-        with _cache_lock:
-            _ledger_cache.add((account, video_filename))
         return False
 
+    finally:
+        # Update the index right away (the tail-read sees the row again - harmless)
+        # and even on a write error, to prevent an immediate duplicate
+        index = get_ledger_index(path)
+        with index.lock:
+            index.add(account, video_filename)
+
 
 def get_posted_videos_for_account(account: str, ledger_path: str = None) -> Set[str]:
     """
@@ -181,8 +346,9 @@ def get_posted_videos_for_account(account: str, ledger_path: str = None) -> Set[
     Returns:
         Set of video filenames posted to this account
     """
-    cache = load_ledger_cache(ledger_path)
-    return {video for acc, video in cache if acc == account}
+    index = get_ledger_index(ledger_path)
+    with index.lock:
+        return set(index.by_account.get(account, ()))
 
 
 def get_accounts_for_video(video_path: str, ledger_path: str = None) -> Set[str]:
@@ -196,9 +362,10 @@ def get_accounts_for_video(video_path: str, ledger_path: str = None) -> Set[str]
     Returns:
         Set of account names that have posted this video
     """
-    cache = load_ledger_cache(ledger_path)
+    index = get_ledger_index(ledger_path)
     video_filename = os.path.basename(video_path)
-    return {acc for acc, video in cache if video == video_filename}
+    with index.lock:
+        return set(index.by_video.get(video_filename, ()))
 
 
 def get_stats(ledger_path: str = None) -> dict:
@@ -208,31 +375,94 @@ def get_stats(ledger_path: str = None) -> dict:
     Returns:
         Dict with counts and stats
     """
-    cache = load_ledger_cache(ledger_path)
-
-    accounts = set(acc for acc, _ in cache)
-    videos = set(video for _, video in cache)
+    index = get_ledger_index(ledger_path)
 
     return {
-        'total_posts': len(cache),
-        'unique_accounts': len(accounts),
-        'unique_videos': len(videos),
+        'total_posts': index.total,
+        'unique_accounts': len(index.by_account),
+        'unique_videos': len(index.by_video),
     }
 
 
+def compact_ledger(ledger_path: str = None) -> dict:
+    """
+    Rewrite the ledger without duplicate rows and rebuild the compact index.
+
+    The first (earliest) row of every (account, video) pair is kept. Runs
+    under the ledger's exclusive lock; the new file replaces the old one
+    atomically once every handle on it is closed, and writers that were
+    waiting for the lock open the new one.
+
+    Returns:
+        Dict with rows_before, rows_after and the index path
+    """
+    path = ledger_path or _get_ledger_path()
+    if not os.path.exists(path):
+        return {'rows_before': 0, 'rows_after': 0, 'index_path': None}
+
+    tmp_path = path + '.compact.tmp'
+    index_path = path + INDEX_SUFFIX
+    seen: Dict[str, Set[str]] = {}
+    rows_before = rows_after = 0
+
+    with _ledger_lock(path):
+        with open(path, 'r', encoding='utf-8') as src, open(tmp_path, 'w', encoding='utf-8') as dst:
+            for line in src:
+                entry = _parse_line(line)
+                if entry is None:
+                    if line.startswith('#'):
+                        dst.write(line if line.endswith('\n') else line + '\n')
+                    continue
+                rows_before += 1
+                account, video_filename = entry
+                videos = seen.setdefault(account, set())
+                if video_filename in videos:
+                    continue
+                videos.add(video_filename)
+                dst.write(line if line.endswith('\n') else line + '\n')
+                rows_after += 1
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        _replace(tmp_path, path)
+        st = os.stat(path)
+
+        index_tmp = index_path + '.tmp'
+        with open(index_tmp, 'w', encoding='utf-8') as idx:
+            json.dump({
+                'inode': st.st_ino,
+                'size': st.st_size,
+                'built_at': datetime.now().isoformat(),
+                'accounts': {account: sorted(videos) for account, videos in seen.items()},
+            }, idx)
+        _replace(index_tmp, index_path)
+
+    logger.info(f"Compacted master ledger: {rows_before} -> {rows_after} rows, index at {index_path}")
+    return {'rows_before': rows_before, 'rows_after': rows_after, 'index_path': index_path}
+
+
 def clear_cache():
-    """Clear the in-memory cache. Use after modifying ledger externally."""
-    global _ledger_cache, _cache_loaded
-    with _cache_lock:
-        _ledger_cache = set()
-        _cache_loaded = False
+    """Drop all in-memory indexes. Use after modifying ledger externally."""
+    with _indexes_lock:
+        _indexes.clear()
 
 
 if __name__ == "__main__":
-    # Demo/test
+    import argparse
+
     logging.basicConfig(level=logging.INFO)
 
+    parser = argparse.ArgumentParser(description="Master ledger of posted videos")
+    parser.add_argument('--ledger', default=None, help='Ledger path (default: all_posted_videos.txt)')
+    parser.add_argument('--compact', action='store_true',
+                        help='Drop duplicate rows and rebuild the compact index')
+    args = parser.parse_args()
+
+    if args.compact:
+        result = compact_ledger(args.ledger)
+        print(f"Compacted: {result['rows_before']} -> {result['rows_after']} rows")
+
     print("Master Ledger Stats:")
-    stats = get_stats()
+    stats = get_stats(args.ledger)
     for key, value in stats.items():
         print(f"  {key}: {value}")
@@ -0,0 +1,231 @@
+"""
+Posting Planner - spread each account's daily posts across time windows.
+
+PostingScheduler used to hand the first pending job to the first available
+account, so every account posted as soon as the scheduler started and the
+only pacing was the per-day limit. The planner builds a day schedule instead:
+
+- Each account gets as many slots as it may still post today, spread evenly
+  over the configured posting windows with a random phase per account, so
+  accounts do not all post at the same moment.
+- Consecutive posts of one account are at least min_spacing_minutes apart
+  (only when windows are configured).
+- Slots live in a heap ordered by slot time. The scheduler pops every slot
+  that is due and takes the first one whose account is actually usable; a
+  blocked account (cooldown, spacing, busy) is pushed back to the time it
+  becomes usable, so it never holds up a later account that is ready.
+
+With no windows configured, slots are due immediately and spacing is not
+applied, which keeps the old "post as soon as possible" behaviour minus the
+head-of-line blocking.
+
+Usage:
+    planner = PostingPlanner(windows=["09:00-12:00", "18:00-22:00"], min_spacing_minutes=120)
+    planner.plan_day({"phone1": 2, "phone2": 1})
+
+    for slot_time, account in planner.pop_due():
+        ...                                   # use it, or planner.push(account, later)
+    planner.record_post("phone1")
+"""
+import heapq
+import random
+from datetime import datetime, date, time as dtime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+
+
+def parse_window(spec: str) -> Tuple[int, int]:
+    """
+    Parse "HH:MM-HH:MM" into (start_minute, end_minute) since midnight.
+
+    "24:00" is accepted as the end of the day.
+
+    Raises:
+        ValueError: If the spec is malformed or the window is empty
+    """
+    try:
+        start_str, end_str = spec.split('-')
+        minutes = []
+        for part in (start_str, end_str):
+            hours, mins = part.strip().split(':')
+            minutes.append(int(hours) * 60 + int(mins))
+    except ValueError:
+        raise ValueError(f"Invalid posting window '{spec}' (expected HH:MM-HH:MM)")
+
+    start, end = minutes
+    if not (0 <= start < end <= 24 * 60):
+        raise ValueError(f"Invalid posting window '{spec}' (start must be before end, within one day)")
+    return start, end
+
+
+class PostingPlanner:
+    """Heap of (slot_time, account) slots for the current day."""
+
+    def __init__(self, windows: Iterable[str] = None, min_spacing_minutes: float = None,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            windows: Posting windows as "HH:MM-HH:MM" strings (default: Config.POSTING_WINDOWS).
+                     Empty means slots are due right away.
+            min_spacing_minutes: Minimum gap between two posts of one account
+                                 (default: Config.MIN_ACCOUNT_SPACING_MINUTES;
+                                 ignored without windows)
+            seed: Optional RNG seed for reproducible plans
+        """
+        if windows is None:
+            windows = Config.POSTING_WINDOWS
+        if min_spacing_minutes is None:
+            min_spacing_minutes = Config.MIN_ACCOUNT_SPACING_MINUTES
+
+        self.windows: List[str] = list(windows)
+        self._window_minutes = sorted(parse_window(w) for w in self.windows)
+        # No windows = post as soon as possible, so no spacing either
+        self.min_spacing = timedelta(minutes=min_spacing_minutes if self.windows else 0)
+        self._rng = random.Random(seed)
+
+        self.day: Optional[date] = None
+        self._slots: List[Tuple[datetime, int, str]] = []
+        self._seq = 0
+        self._planned: set = set()
+        self._last_post: Dict[str, datetime] = {}
+
+    # ==================== PLANNING ====================
+
+    def _segments(self, day: date, start: datetime) -> List[Tuple[datetime, datetime]]:
+        """Posting windows of `day` clipped to begin no earlier than `start`."""
+        midnight = datetime.combine(day, dtime.min)
+        segments = []
+        for begin_min, end_min in self._window_minutes:
+            begin = max(midnight + timedelta(minutes=begin_min), start)
+            end = midnight + timedelta(minutes=end_min)
+            if begin < end:
+                segments.append((begin, end))
+        return segments
+
+    @staticmethod
+    def _at_offset(segments: List[Tuple[datetime, datetime]], offset: float) -> datetime:
+        """Map seconds of window time onto wall-clock time."""
+        for begin, end in segments:
+            length = (end - begin).total_seconds()
+            if offset < length:
+                return begin + timedelta(seconds=offset)
+            offset -= length
+        return segments[-1][1]
+
+    def plan_day(self, posts_left: Dict[str, int], now: datetime = None) -> int:
+        """
+        Replace the plan with a fresh schedule for today.
+
+        Args:
+            posts_left: account -> posts it may still make today
+            now: Current time (default: datetime.now())
+
+        Returns:
+            Number of slots planned
+        """
+        now = now or datetime.now()
+        self.day = now.date()
+        self._slots = []
+        self._planned = set()
+
+        accounts = list(posts_left.items())
+        self._rng.shuffle(accounts)  # Equal slot times fall back to insertion order
+        for account, count in accounts:
+            self.add_account(account, count, now)
+        return len(self._slots)
+
+    def add_account(self, account: str, posts: int, now: datetime = None) -> int:
+        """
+        Plan `posts` slots for one account over what is left of today's windows.
+
+        Slots that do not fit before the last window closes are dropped.
+
+        Returns:
+            Number of slots added
+        """
+        now = now or datetime.now()
+        if self.day is None:
+            self.day = now.date()
+        self._planned.add(account)
+        if posts <= 0:
+            return 0
+
+        start = max(now, self.not_before(account) or now)
+        spacing = self.min_spacing.total_seconds()
+
+        if not self._window_minutes:
+            times = [start + timedelta(seconds=k * spacing) for k in range(posts)]
+        else:
+            segments = self._segments(self.day, start)
+            total = sum((end - begin).total_seconds() for begin, end in segments)
+            if total <= 0:
+                return 0
+            stride = total / posts
+            phase = self._rng.uniform(0, stride)
+            times = []
+            previous = None
+            for k in range(posts):
+                offset = phase + k * stride
+                if previous is not None:
+                    offset = max(offset, previous + spacing)
+                if offset >= total:
+                    break
+                times.append(self._at_offset(segments, offset))
+                previous = offset
+
+        for slot_time in times:
+            self.push(account, slot_time)
+        return len(times)
+
+    def is_planned(self, account: str) -> bool:
+        """True if the account was included in today's plan."""
+        return account in self._planned
+
+    def needs_replan(self, now: datetime = None) -> bool:
+        """True if no plan exists yet or the day rolled over."""
+        now = now or datetime.now()
+        return self.day != now.date()
+
+    # ==================== HEAP ====================
+
+    def push(self, account: str, slot_time: datetime) -> None:
+        """Add (or put back) a slot for account."""
+        self._seq += 1
+        heapq.heappush(self._slots, (slot_time, self._seq, account))
+
+    def pop_due(self, now: datetime = None) -> List[Tuple[datetime, str]]:
+        """
+        Remove and return every slot due at `now`, earliest first.
+
+        The caller pushes back the slots it does not use.
+        """
+        now = now or datetime.now()
+        due = []
+        while self._slots and self._slots[0][0] <= now:
+            slot_time, _, account = heapq.heappop(self._slots)
+            due.append((slot_time, account))
+        return due
+
+    def next_slot(self) -> Optional[Tuple[datetime, str]]:
+        """Earliest planned (slot_time, account), or None if the plan is empty."""
+        if not self._slots:
+            return None
+        slot_time, _, account = self._slots[0]
+        return slot_time, account
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # ==================== SPACING ====================
+
+    def record_post(self, account: str, when: datetime = None) -> None:
+        """Remember a successful post so the account's next slot honours the spacing."""
+        self._last_post[account] = when or datetime.now()
+
+    def not_before(self, account: str) -> Optional[datetime]:
+        """Earliest time the account may post again, or None if unrestricted."""
+        last = self._last_post.get(account)
+        if last is None:
+            return None
+        return last + self.min_spacing
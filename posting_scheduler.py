@@ -21,7 +21,6 @@ setup_environment()
 import csv
 import json
 import time
-import glob
 import logging
 import threading
 import traceback
@@ -31,6 +30,9 @@ from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Optional, Callable, Set
 from enum import Enum
 from geelark_client import GeelarkClient
+from posting_planner import PostingPlanner, parse_window
+from dedupe_index import get_dedupe_index
+from state_journal import StateJournal
 
 # === SINGLE-INSTANCE LOCK MECHANISM ===
 LOCK_FILE = "scheduler.lock"
@@ -288,8 +290,16 @@ class PostStatus(Enum):
     RETRYING = "retrying"
 
 
+class _TracksChanges:
+    """Flags the instance dirty on every attribute write; save_state() persists and clears it."""
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        self.__dict__['_dirty'] = True
+
+
 @dataclass
-class PostJob:
+class PostJob(_TracksChanges):
     """A single post job"""
     id: str  # unique id: shortcode
     video_path: str
@@ -318,75 +328,22 @@ def get_already_posted_from_csv() -> Set[str]:
 
     Returns a set of shortcodes that have already been posted successfully.
     This prevents duplicate posts even across scheduler restarts.
-    """
-    posted = set()
-
-    # 1. Read from batch_results CSV files
-    for filepath in glob.glob("batch_results_*.csv"):
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get('status') == 'success':
-                        # Handle both 'shortcode' column and first column as shortcode
-                        shortcode = row.get('shortcode') or list(row.values())[0] if row else None
-                        if shortcode:
-                            posted.add(shortcode)
-        except Exception as e:
-            logger.warning(f"Could not read {filepath}: {e}")
-
-    # 2. Also read from scheduler_state.json (catches successes before CSV write was added)
-    state_file = "scheduler_state.json"
-    if os.path.exists(state_file):
-        try:
-            with open(state_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            for job in data.get('jobs', []):
-                if job.get('status') == 'success':
-                    posted.add(job.get('id'))
-        except Exception as e:
-            logger.warning(f"Could not read {state_file}: {e}")
 
-    return posted
+    Answered from the dedupe index, which only parses rows appended since
+    the last call (see dedupe_index.py).
+    """
+    return get_dedupe_index().posted_shortcodes()
 
 
 def get_accounts_posted_today() -> Set[str]:
     """Get all accounts that have successfully posted TODAY.
 
     This prevents the same account from posting twice in one day.
+    Answered from the dedupe index (today's batch_results CSVs plus
+    scheduler_state.json successes).
     """
     today = datetime.now().strftime("%Y%m%d")
-    posted_accounts = set()
-
-    # 1. Read from today's batch_results CSV files
-    for filepath in glob.glob(f"batch_results_{today}*.csv"):
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get('status') == 'success':
-                        # Handle both 'phone' and 'account' column names
-                        account = row.get('phone') or row.get('account')
-                        if account:
-                            posted_accounts.add(account)
-        except Exception as e:
-            logger.warning(f"Could not read {filepath}: {e}")
-
-    # 2. Also read from scheduler_state.json
-    state_file = "scheduler_state.json"
-    if os.path.exists(state_file):
-        try:
-            with open(state_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            for job in data.get('jobs', []):
-                if job.get('status') == 'success':
-                    account = job.get('account')
-                    if account:
-                        posted_accounts.add(account)
-        except Exception as e:
-            logger.warning(f"Could not read {state_file}: {e}")
-
-    return posted_accounts
+    return get_dedupe_index().accounts_posted_on(today)
 
 
 def log_and_mark_failed(account: str, shortcode: str, phase: str, exc: Exception):
@@ -481,7 +438,7 @@ def close_all_running_phones(account_names: Set[str] = None) -> int:
 
 
 @dataclass
-class AccountState:
+class AccountState(_TracksChanges):
     """Track posting state for an account"""
     name: str
     last_post_date: str = ""  # YYYY-MM-DD
@@ -541,6 +498,11 @@ class PostingScheduler:
 
     def __init__(self, state_file: str = "scheduler_state.json"):
         self.state_file = state_file
+        self.journal = StateJournal(state_file)
+        self._save_lock = threading.RLock()
+        self._persisted_job_ids: Set[str] = set()
+        self._persisted_accounts: Set[str] = set()
+        self._persisted_settings: Dict = {}
         self.jobs: Dict[str, PostJob] = {}  # id -> PostJob
         self.accounts: Dict[str, AccountState] = {}  # name -> AccountState
         self.video_folders: List[str] = []
@@ -552,6 +514,11 @@ class PostingScheduler:
         self.humanize = True
         self.delay_between_posts = 10  # seconds
         self.test_retry_mode = False  # If True, first attempt always fails
+        self.posting_windows: List[str] = list(Config.POSTING_WINDOWS)
+        self.min_spacing_minutes = Config.MIN_ACCOUNT_SPACING_MINUTES
+
+        # Day plan (built lazily from the settings above, rebuilt at day rollover)
+        self.planner: Optional[PostingPlanner] = None
 
         # Runtime
         self.running = False
@@ -570,11 +537,10 @@ class PostingScheduler:
         self.load_state()
 
     def load_state(self):
-        """Load state from disk"""
-        if os.path.exists(self.state_file):
+        """Load state from disk (snapshot + replayed delta log)"""
+        if os.path.exists(self.state_file) or os.path.exists(self.journal.wal_path):
             try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = self.journal.load()
 
                 # Load jobs
                 for job_data in data.get('jobs', []):
@@ -594,29 +560,91 @@ class PostingScheduler:
                 self.humanize = settings.get('humanize', True)
                 self.delay_between_posts = settings.get('delay_between_posts', 10)
                 self.video_folders = settings.get('video_folders', [])
+                self.posting_windows = settings.get('posting_windows', list(Config.POSTING_WINDOWS))
+                self.min_spacing_minutes = settings.get('min_spacing_minutes', Config.MIN_ACCOUNT_SPACING_MINUTES)
 
                 self._log(f"Loaded state: {len(self.jobs)} jobs, {len(self.accounts)} accounts")
             except Exception as e:
                 self._log(f"Error loading state: {e}")
+                return
+
+            if self.journal.pending_deltas:
+                # Fold replayed deltas into a fresh snapshot
+                self.save_state(snapshot=True)
+            else:
+                self._mark_persisted()
 
-    def save_state(self):
-        """Save state to disk"""
-        data = {
-            'jobs': [job.to_dict() for job in self.jobs.values()],
-            'accounts': [asdict(acc) for acc in self.accounts.values()],
-            'settings': {
-                'max_retries': self.max_retries,
-                'retry_delay_minutes': self.retry_delay_minutes,
-                'posts_per_account_per_day': self.posts_per_account_per_day,
-                'humanize': self.humanize,
-                'delay_between_posts': self.delay_between_posts,
-                'video_folders': self.video_folders,
-            },
-            'saved_at': datetime.now().isoformat()
+    def _settings_dict(self) -> Dict:
+        return {
+            'max_retries': self.max_retries,
+            'retry_delay_minutes': self.retry_delay_minutes,
+            'posts_per_account_per_day': self.posts_per_account_per_day,
+            'humanize': self.humanize,
+            'delay_between_posts': self.delay_between_posts,
+            'video_folders': list(self.video_folders),
+            'posting_windows': list(self.posting_windows),
+            'min_spacing_minutes': self.min_spacing_minutes,
         }
 
-        with open(self.state_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    def _mark_persisted(self):
+        """Treat the in-memory state as what is on disk (after load/snapshot)."""
+        for obj in list(self.jobs.values()) + list(self.accounts.values()):
+            obj.__dict__['_dirty'] = False
+        self._persisted_job_ids = set(self.jobs)
+        self._persisted_accounts = set(self.accounts)
+        self._persisted_settings = self._settings_dict()
+
+    def save_state(self, snapshot: bool = False):
+        """Save state to disk.
+
+        Appends only the jobs/accounts changed since the last save to the
+        delta log; every Config.STATE_SNAPSHOT_EVERY saves (or when snapshot
+        is True) the full state is written atomically and the log truncated.
+        """
+        with self._save_lock:
+            changed_jobs = [job for job in self.jobs.values() if job.__dict__.get('_dirty')]
+            changed_accounts = [acc for acc in self.accounts.values() if acc.__dict__.get('_dirty')]
+            for obj in changed_jobs + changed_accounts:
+                obj.__dict__['_dirty'] = False  # Cleared first: a concurrent write re-flags it
+
+            job_ids = set(self.jobs)
+            account_names = set(self.accounts)
+            settings = self._settings_dict()
+
+            if snapshot:
+                self.journal.write_snapshot({
+                    'jobs': [job.to_dict() for job in self.jobs.values()],
+                    'accounts': [asdict(acc) for acc in self.accounts.values()],
+                    'settings': settings,
+                    'saved_at': datetime.now().isoformat()
+                })
+            else:
+                delta = {}
+                if changed_jobs:
+                    delta['jobs'] = [job.to_dict() for job in changed_jobs]
+                if changed_accounts:
+                    delta['accounts'] = [asdict(acc) for acc in changed_accounts]
+                if self._persisted_job_ids - job_ids:
+                    delta['removed_jobs'] = sorted(self._persisted_job_ids - job_ids)
+                if self._persisted_accounts - account_names:
+                    delta['removed_accounts'] = sorted(self._persisted_accounts - account_names)
+                if settings != self._persisted_settings:
+                    delta['settings'] = settings
+                if not delta:
+                    return
+                try:
+                    self.journal.append(delta)
+                except Exception:
+                    for obj in changed_jobs + changed_accounts:
+                        obj.__dict__['_dirty'] = True
+                    raise
+
+            self._persisted_job_ids = job_ids
+            self._persisted_accounts = account_names
+            self._persisted_settings = settings
+
+            if not snapshot and self.journal.snapshot_due():
+                self.save_state(snapshot=True)
 
     def _log(self, message: str):
         """Log message and notify GUI"""
@@ -729,55 +757,129 @@ class PostingScheduler:
             del self.accounts[name]
             self.save_state()
 
+    def set_posting_plan(self, windows: List[str] = None, min_spacing_minutes: float = None):
+        """Change posting windows / per-account spacing. The day plan is rebuilt on next use."""
+        if windows is not None:
+            for spec in windows:
+                parse_window(spec)  # Raises ValueError on bad input
+            self.posting_windows = list(windows)
+        if min_spacing_minutes is not None:
+            self.min_spacing_minutes = min_spacing_minutes
+        self.planner = None
+        self._log(f"Posting plan: windows={self.posting_windows or 'any time'}, "
+                  f"min spacing={self.min_spacing_minutes} min")
+        self.save_state()
+
+    def _posts_left_today(self, acc: AccountState, accounts_posted_today: Set[str]) -> int:
+        """How many more posts this account may make today."""
+        if acc.name in accounts_posted_today:
+            return 0
+        if acc.last_post_date != datetime.now().strftime("%Y-%m-%d"):
+            return self.posts_per_account_per_day
+        return max(0, self.posts_per_account_per_day - acc.posts_today)
+
+    def _ensure_plan(self, accounts_posted_today: Set[str]) -> PostingPlanner:
+        """Build today's plan if missing or stale, and plan slots for newly added accounts."""
+        now = datetime.now()
+        if self.planner is None:
+            self.planner = PostingPlanner(self.posting_windows, self.min_spacing_minutes)
+        if self.planner.needs_replan(now):
+            slots = self.planner.plan_day({
+                acc.name: self._posts_left_today(acc, accounts_posted_today)
+                for acc in self.accounts.values()
+            }, now)
+            next_slot = self.planner.next_slot()
+            self._log(f"[PLAN] {slots} posting slots planned for {now.strftime('%Y-%m-%d')}"
+                      + (f", first at {next_slot[0].strftime('%H:%M')}" if next_slot else ""))
+        else:
+            for acc in self.accounts.values():
+                if not self.planner.is_planned(acc.name):
+                    self.planner.add_account(acc.name, self._posts_left_today(acc, accounts_posted_today), now)
+        return self.planner
+
+    def _find_job_for(self, account: str, available_names: Set[str]) -> Optional[PostJob]:
+        """Pick the job to run in this account's slot (its own due retry, then pending, then orphaned retry)."""
+        now = datetime.now()
+        ready_retries = []
+        for job in self.jobs.values():
+            if job.status == PostStatus.RETRYING.value:
+                # Check if retry delay has passed
+                if job.last_attempt:
+                    last = datetime.fromisoformat(job.last_attempt)
+                    if now < last + timedelta(minutes=self.retry_delay_minutes):
+                        continue  # Not ready yet
+                ready_retries.append(job)
+
+        for job in ready_retries:
+            if job.account == account:
+                return job
+
+        # Pending jobs next (priority over reassigning retries)
+        for job in self.jobs.values():
+            if job.status == PostStatus.PENDING.value:
+                job.account = account
+                return job
+
+        # Retry whose original account can't post (limit/cooldown) - reassign it
+        for job in ready_retries:
+            if job.account not in available_names:
+                job.account = account
+                return job
+
+        return None
+
     def get_next_job(self) -> Optional[PostJob]:
-        """Get next job that's ready to post"""
+        """Get the job for the earliest due slot whose account is ready to post"""
         # Get accounts that already posted today from CSV logs (this is the ground truth)
         accounts_posted_today = get_accounts_posted_today()
 
         # Find accounts that can post today (not in CSV logs as already posted, not on cooldown)
-        available_accounts = [
-            acc for acc in self.accounts.values()
+        available_names = {
+            acc.name for acc in self.accounts.values()
             if acc.can_post_today(self.posts_per_account_per_day)
             and acc.name not in accounts_posted_today
             and not acc.is_on_cooldown()  # Skip accounts on infra error cooldown
-        ]
+        }
 
         # Log accounts on cooldown for visibility
         on_cooldown = [acc.name for acc in self.accounts.values() if acc.is_on_cooldown()]
         if on_cooldown:
             logger.debug(f"Accounts on cooldown: {on_cooldown}")
 
-        if not available_accounts:
-            return None
+        planner = self._ensure_plan(accounts_posted_today)
+        now = datetime.now()
+        chosen = None
+        put_back = []
 
-        available_names = [a.name for a in available_accounts]
+        # Walk every due slot in time order; a blocked account never stalls a ready one
+        for slot_time, name in planner.pop_due(now):
+            if chosen is not None:
+                put_back.append((name, slot_time))
+                continue
 
-        # Find pending jobs first (priority)
-        for job in self.jobs.values():
-            if job.status == PostStatus.PENDING.value:
-                # Assign to first available account
-                job.account = available_accounts[0].name
-                return job
+            acc = self.accounts.get(name)
+            if acc is None:
+                continue  # Account removed - drop its slots
+            if name not in available_names:
+                if acc.is_on_cooldown():
+                    put_back.append((name, datetime.fromisoformat(acc.cooldown_until)))
+                continue  # At daily limit - slot is spent
+
+            not_before = planner.not_before(name)
+            if not_before and not_before > now:
+                put_back.append((name, not_before))
+                continue
 
-        # Then check retrying jobs
-        for job in self.jobs.values():
-            if job.status == PostStatus.RETRYING.value:
-                # Check if retry delay has passed
-                if job.last_attempt:
-                    last = datetime.fromisoformat(job.last_attempt)
-                    retry_after = last + timedelta(minutes=self.retry_delay_minutes)
-                    if datetime.now() < retry_after:
-                        continue  # Not ready yet
+            job = self._find_job_for(name, available_names)
+            if job is None:
+                put_back.append((name, slot_time))  # Nothing to post yet - keep the slot
+                continue
+            chosen = job
 
-                # Reassign to any available account (original may be at limit)
-                if job.account in available_names:
-                    return job
-                elif available_accounts:
-                    # Original account unavailable, use another
-                    job.account = available_accounts[0].name
-                    return job
+        for name, slot_time in put_back:
+            planner.push(name, slot_time)
 
-        return None
+        return chosen
 
     def get_retry_jobs(self) -> List[PostJob]:
         """Get jobs that are waiting to retry"""
@@ -843,6 +945,8 @@ class PostingScheduler:
                 job.completed_at = datetime.now().isoformat()
                 job.last_error = ""
                 self.accounts[job.account].record_post(True)
+                if self.planner:
+                    self.planner.record_post(job.account)
                 self._log(f"[OK] {job.id} posted successfully ({total_time:.1f}s)")
                 logger.info(f"execute_job SUCCESS: job={job.id}, total_time={total_time:.1f}s")
 
@@ -906,6 +1010,10 @@ class PostingScheduler:
             # Record with is_infra_error to trigger account cooldown if needed
             self.accounts[job.account].record_post(False, is_infra_error=is_infra_error)
 
+            # The failed attempt didn't use up the account's daily post - give its slot back
+            if self.planner:
+                self.planner.push(job.account, datetime.now() + timedelta(minutes=self.retry_delay_minutes))
+
             if self.on_job_complete:
                 self.on_job_complete(job, False)
 
@@ -1030,6 +1138,10 @@ class PostingScheduler:
                             wait_secs = (next_retry - datetime.now()).total_seconds()
                             if wait_secs > 0:
                                 self._log(f"Next retry in {int(wait_secs)}s")
+                    elif self.get_pending_jobs() and self.planner:
+                        next_slot = self.planner.next_slot()
+                        if next_slot and next_slot[0] > datetime.now():
+                            logger.debug(f"Next planned slot: {next_slot[1]} at {next_slot[0].strftime('%H:%M:%S')}")
 
                     # Wait before checking again
                     time.sleep(5)
@@ -1080,6 +1192,9 @@ class PostingScheduler:
         if self.worker_thread:
             self.worker_thread.join(timeout=5)
 
+        # Persist dedupe offsets so the next start skips what was already parsed
+        get_dedupe_index().save(force=True)
+
         # CRITICAL: Close ALL running phones when stopping
         # This ensures no phones are left running after script ends
         self._log("[SHUTDOWN] Closing all managed phones...")
@@ -1089,7 +1204,7 @@ class PostingScheduler:
             self._log(f"[SHUTDOWN] Closed {stopped} phone(s)")
 
         self._log("Scheduler stopped")
-        self.save_state()
+        self.save_state(snapshot=True)
 
     def pause(self):
         """Pause the scheduler"""
@@ -1112,6 +1227,8 @@ class PostingScheduler:
             'failed': len(self.get_failed_jobs()),
             'accounts': len(self.accounts),
             'accounts_on_cooldown': accounts_on_cooldown,
+            'planned_slots': len(self.planner) if self.planner else None,
+            'next_slot': self.planner.next_slot() if self.planner else None,
             'running': self.running,
             'paused': self.paused,
             'appium_healthy': check_appium_health(),
@@ -1235,6 +1352,10 @@ if __name__ == "__main__":
     parser.add_argument('--run', action='store_true', help='Run scheduler')
     parser.add_argument('--retry-all', action='store_true', help='Retry all failed jobs')
     parser.add_argument('--force', action='store_true', help='Force run even if lock exists')
+    parser.add_argument('--windows', nargs='*', metavar='HH:MM-HH:MM',
+                        help='Posting windows to spread posts across (no value = post any time)')
+    parser.add_argument('--min-spacing', type=float, metavar='MINUTES',
+                        help='Minimum minutes between two posts of the same account')
 
     args = parser.parse_args()
 
@@ -1261,6 +1382,13 @@ if __name__ == "__main__":
     if args.retry_all:
         scheduler.retry_all_failed()
 
+    if args.windows is not None or args.min_spacing is not None:
+        try:
+            scheduler.set_posting_plan(args.windows, args.min_spacing)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+
     if args.status:
         stats = scheduler.get_stats()
         print("\n=== Scheduler Status ===")
@@ -1271,6 +1399,8 @@ if __name__ == "__main__":
         print(f"  - Failed: {stats['failed']}")
         print(f"Accounts: {stats['accounts']}")
         print(f"Running: {stats['running']}")
+        print(f"Posting windows: {', '.join(scheduler.posting_windows) or 'any time'} "
+              f"(min spacing {scheduler.min_spacing_minutes} min)")
 
         # Show Appium health
         appium_status = "HEALTHY" if stats['appium_healthy'] else "NOT READY"
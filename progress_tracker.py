@@ -32,13 +32,12 @@ Usage:
 
 import os
 import csv
-import json
 import time
 import shutil
 import tempfile
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from dataclasses import dataclass
 
 # Cross-platform file locking
@@ -52,15 +51,29 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+from account_health import AccountHealthStore
+from config import Config
+from state_journal import read_state
+from video_preflight import preflight_videos
+from metrics import metrics
+
 # Import master ledger for duplicate checking
 try:
-    from posted_ledger import is_already_posted
+    from posted_ledger import is_already_posted, ledger_path_for
     HAS_LEDGER = True
 except ImportError:
     HAS_LEDGER = False
     def is_already_posted(account, video_path, ledger_path=None):
         return False  # Fallback: no duplicate checking
 
+    def ledger_path_for(platform=None):
+        return None
+
+
+def job_platform(job: Dict[str, Any]) -> str:
+    """Platform a job posts to (jobs from before the platform column are Instagram)."""
+    return (job.get('platform') or Config.DEFAULT_PLATFORM).lower()
+
 
 class FileLockError(Exception):
     """Raised when file lock cannot be acquired."""
@@ -88,7 +101,7 @@ class ProgressTracker:
         'job_id', 'account', 'video_path', 'caption', 'status',
         'worker_id', 'claimed_at', 'completed_at', 'error',
         'attempts', 'max_attempts', 'retry_at', 'error_type',
-        'error_category', 'pass_number', 'run_id', 'video_id'
+        'error_category', 'pass_number', 'run_id', 'video_id', 'platform'
     ]
 
     # Valid status values
@@ -158,6 +171,8 @@ class ProgressTracker:
         self.progress_file = progress_file
         self.lock_file = progress_file + '.lock'
         self.lock_timeout = lock_timeout
+        # Per-account health, kept next to the progress file (read/written under the lock)
+        self.health = AccountHealthStore(progress_file + '.health.json')
 
     def _acquire_lock(self, file_handle) -> None:
         """Acquire exclusive lock on the file."""
@@ -240,7 +255,8 @@ class ProgressTracker:
         os.makedirs(os.path.dirname(self.lock_file) or '.', exist_ok=True)
 
         with open(self.lock_file, 'w') as lock_handle:
-            self._acquire_lock(lock_handle)
+            with metrics.timer('geelark_progress_lock_wait_seconds'):
+                self._acquire_lock(lock_handle)
             try:
                 jobs = self._read_all_jobs() if os.path.exists(self.progress_file) else []
                 jobs, result = operation(jobs)
@@ -274,11 +290,12 @@ class ProgressTracker:
                         success_counts[acc] = success_counts.get(acc, 0) + 1
         return success_counts
 
-    def _load_assigned_counts(self) -> Dict[str, int]:
+    def _load_assigned_counts(self, platform: str = None) -> Dict[str, int]:
         """
         Load assigned counts per account from existing progress file.
 
         Assigned = pending + claimed + success + retrying (any job that "counts" toward daily limit)
+        Only jobs of `platform` are counted when it is given (limits are per platform).
 
         CRITICAL: This prevents reusing accounts within a batch when reseeding.
         For max_posts_per_account_per_day=1, each account should only appear once
@@ -298,6 +315,8 @@ class ProgressTracker:
             reader = csv.DictReader(f)
             for row in reader:
                 if row.get('status') in active_statuses:
+                    if platform and job_platform(row) != platform:
+                        continue
                     acc = row.get('account', '')
                     if acc:
                         assigned_counts[acc] = assigned_counts.get(acc, 0) + 1
@@ -331,16 +350,19 @@ class ProgressTracker:
         if not os.path.exists(state_file):
             raise FileNotFoundError(f"Scheduler state file not found: {state_file}")
 
-        with open(state_file, 'r', encoding='utf-8') as f:
-            state = json.load(f)
+        # Snapshot plus any deltas the scheduler has not folded in yet
+        state = read_state(state_file)
 
         jobs_data = state.get('jobs', [])
         accounts = account_list or [acc['name'] for acc in state.get('accounts', [])]
 
+        # Scheduler state jobs are Instagram posts
+        max_posts_per_account_per_day = self._daily_limit(Config.DEFAULT_PLATFORM, max_posts_per_account_per_day)
+
         # CRITICAL: Build assigned_count_by_account from existing progress file
         # This tracks ALL jobs assigned to each account TODAY (pending, claimed, success, retrying)
         # Using assigned counts (not just success) prevents same-account reuse within a batch
-        assigned_count_by_account = self._load_assigned_counts()
+        assigned_count_by_account = self._load_assigned_counts(Config.DEFAULT_PLATFORM)
         existing_job_ids = set()
         existing_jobs = []
 
@@ -469,6 +491,9 @@ class ProgressTracker:
         2. Matching videos to captions via filename
         3. Distributing jobs across campaign accounts with daily limits
 
+        Jobs carry the campaign's platform; daily limits and the master
+        ledger are checked for that platform only.
+
         Args:
             campaign_config: CampaignConfig instance with paths to CSV, videos, accounts
             max_posts_per_account_per_day: Max posts per account per day (default 1)
@@ -486,8 +511,12 @@ class ProgressTracker:
             logger.error(f"No accounts found in {campaign_config.accounts_file}")
             return 0
 
+        platform = getattr(campaign_config, 'platform', Config.DEFAULT_PLATFORM)
+        max_posts_per_account_per_day = self._daily_limit(platform, max_posts_per_account_per_day)
+        ledger_path = ledger_path_for(platform)
+
         # Load assigned counts to enforce daily limits
-        assigned_count_by_account = self._load_assigned_counts()
+        assigned_count_by_account = self._load_assigned_counts(platform)
 
         # Filter to available accounts (under daily limit)
         available_accounts = [
@@ -557,6 +586,18 @@ class ProgressTracker:
             for job in existing_jobs:
                 existing_job_ids.add(job.get('job_id', ''))
 
+        # Pre-flight: probe new videos once (cached) so invalid ones never reach a worker
+        if Config.VIDEO_PREFLIGHT:
+            candidates = [
+                path for path in video_files
+                if f"{os_module.path.basename(path)}_{campaign_config.name}" not in existing_job_ids
+            ]
+            probes = preflight_videos(candidates)
+            for path, probe in probes.items():
+                if not probe.valid:
+                    logger.warning(f"Skipping {os_module.path.basename(path)}: {probe.error}")
+            video_files = [path for path in video_files if probes.get(path) is None or probes[path].valid]
+
         # Create jobs - one video per available account
         # Shuffle videos for random distribution
         random.shuffle(video_files)
@@ -604,7 +645,7 @@ class ProgressTracker:
 
                 if seeding_assigned_counts.get(acc, 0) < max_posts_per_account_per_day:
                     # CRITICAL: Check master ledger to prevent duplicate posts
-                    if is_already_posted(acc, video_path):
+                    if is_already_posted(acc, video_path, ledger_path):
                         logger.debug(f"Skipping {video_filename} for {acc} - already posted (master ledger)")
                         continue
                     assigned_account = acc
@@ -630,7 +671,8 @@ class ProgressTracker:
                 'retry_at': '',
                 'error_type': '',
                 'error_category': '',
-                'pass_number': ''
+                'pass_number': '',
+                'platform': platform
             })
 
         # Write jobs
@@ -640,9 +682,28 @@ class ProgressTracker:
             self._write_all_jobs(all_jobs)
 
         accounts_used = len(set(j['account'] for j in new_jobs))
-        logger.info(f"Seeded {len(new_jobs)} jobs across {accounts_used} accounts")
+        logger.info(f"Seeded {len(new_jobs)} {platform} jobs across {accounts_used} accounts")
         return len(new_jobs)
 
+    def _daily_limit(self, platform: str, default: int) -> int:
+        """Daily post limit per account on a platform (Config.PLATFORM_MAX_POSTS_PER_DAY overrides)."""
+        return dict(Config.PLATFORM_MAX_POSTS_PER_DAY).get(platform, default)
+
+    def _success_counts(self, jobs: List[Dict[str, Any]],
+                        extra: Optional[Dict[tuple, int]] = None) -> Dict[tuple, int]:
+        """Successful posts per (account, platform), plus `extra` (e.g. other campaigns' counts)."""
+        counts = dict(extra or {})
+        for job in jobs:
+            if job.get('status') == self.STATUS_SUCCESS and job.get('account'):
+                key = (job['account'], job_platform(job))
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def _at_daily_limit(self, job: Dict[str, Any], success_counts: Dict[tuple, int], default: int) -> bool:
+        """True if the job's account has used up its daily limit on the job's platform."""
+        platform = job_platform(job)
+        return success_counts.get((job.get('account', ''), platform), 0) >= self._daily_limit(platform, default)
+
     def _within_daily_limit(self, account: str, success_counts: Dict[str, int], max_per_day: int) -> bool:
         """
         Check if an account is within its daily posting limit.
@@ -657,7 +718,42 @@ class ProgressTracker:
         """
         return success_counts.get(account, 0) < max_per_day
 
-    def claim_next_job(self, worker_id: int, max_posts_per_account_per_day: int = 1) -> Optional[Dict[str, Any]]:
+    def _pick_by_health(self, candidates: List[Dict[str, Any]],
+                        claimable_elsewhere: set = frozenset()) -> Optional[Dict[str, Any]]:
+        """
+        Choose among claimable jobs by account health (call under the lock).
+
+        Healthy accounts go first (best score first, file order on ties).
+        Outside off-peak windows a flaky account is deferred only while a
+        healthy account has a job that can be claimed right now through the
+        other claim path; busy accounts and retries that are not due yet do
+        not count, so the worker never idles on a flaky account.
+
+        Args:
+            candidates: Jobs that pass all claim checks, in file order
+            claimable_elsewhere: Accounts with a job the other claim method can take right now
+        """
+        if not candidates:
+            return None
+
+        scores = self.health.scores({j['account'] for j in candidates} | set(claimable_elsewhere))
+        best = sorted(candidates, key=lambda j: -scores[j['account']])[0]  # Stable: ties keep file order
+        best_score = scores[best['account']]
+        if not self.health.is_flaky(best_score) or self.health.is_off_peak():
+            return best
+
+        if any(not self.health.is_flaky(scores[acc]) for acc in claimable_elsewhere):
+            logger.debug(f"Deferring flaky account {best['account']} (health {best_score:.2f}) "
+                         f"until off-peak - a healthy account can be claimed now")
+            return None
+
+        logger.info(f"Only flaky accounts left - using {best['account']} (health {best_score:.2f})")
+        return best
+
+    def claim_next_job(self, worker_id: int, max_posts_per_account_per_day: int = 1,
+                       only_accounts: Optional[set] = None,
+                       exclude_accounts: Optional[set] = None,
+                       extra_success_counts: Optional[Dict[tuple, int]] = None) -> Optional[Dict[str, Any]]:
         """
         Claim the next pending job for a worker.
 
@@ -671,42 +767,46 @@ class ProgressTracker:
         3. Daily limit check - a worker will NOT claim a job if the account
            has already hit max_posts_per_account_per_day successful posts.
 
+        Among the claimable jobs the healthiest account wins, so a flaky
+        account only goes when no healthy one can (see _pick_by_health).
+
         Args:
             worker_id: ID of the worker claiming the job
             max_posts_per_account_per_day: Max successful posts per account per day (default 1)
+            only_accounts: If given, only jobs of these accounts are considered
+                (e.g. the accounts on the active GrapheneOS profile)
+            exclude_accounts: Accounts busy elsewhere (e.g. claimed in another
+                campaign's progress file), treated as in use
+            extra_success_counts: (account, platform) -> successful posts recorded
+                elsewhere today, added to this file's counts for the daily limit
 
         Returns:
             The claimed job dict, or None if no pending jobs available
         """
         def _claim_operation(jobs):
-            # First, find all accounts currently being processed (claimed by any worker)
-            accounts_in_use = set()
+            now = datetime.now()
 
-            # DEFENSE IN DEPTH: Build success counts to check daily limits
-            success_counts = {}
+            # First, find all accounts currently being processed (claimed by any worker).
+            # An account is one phone, so this holds across platforms.
+            accounts_in_use = set(exclude_accounts or ())
             for job in jobs:
                 if job.get('status') == self.STATUS_CLAIMED:
                     account = job.get('account', '')
                     if account:
                         accounts_in_use.add(account)
-                elif job.get('status') == self.STATUS_SUCCESS:
-                    account = job.get('account', '')
-                    if account:
-                        success_counts[account] = success_counts.get(account, 0) + 1
 
             if accounts_in_use:
                 logger.debug(f"Accounts currently in use: {accounts_in_use}")
 
-            # Find accounts at daily limit
-            accounts_at_limit = {acc for acc, cnt in success_counts.items() if cnt >= max_posts_per_account_per_day}
-            if accounts_at_limit:
-                logger.debug(f"Accounts at daily limit ({max_posts_per_account_per_day}): {accounts_at_limit}")
+            # DEFENSE IN DEPTH: Build success counts (per account and platform) to check daily limits
+            success_counts = self._success_counts(jobs, extra_success_counts)
 
-            # Find a pending or retrying job that:
-            # 1. HAS an account assigned
+            # Collect pending or retrying jobs that:
+            # 1. HAVE an account assigned
             # 2. Account is NOT currently in use
             # 3. Account has NOT hit daily limit (defense in depth)
             claimable_statuses = {self.STATUS_PENDING, self.STATUS_RETRYING}
+            candidates = []
             for job in jobs:
                 if job.get('status') in claimable_statuses:
                     account = job.get('account', '')
@@ -714,26 +814,38 @@ class ProgressTracker:
                     # Skip jobs without an assigned account (waiting for one to be freed)
                     if not account:
                         continue
+                    if only_accounts is not None and account not in only_accounts:
+                        continue
 
                     if account in accounts_in_use:
                         # Skip - another worker is already processing this account
                         logger.debug(f"Skipping job {job['job_id']} - account {account} in use")
                         continue
 
-                    # DEFENSE IN DEPTH: Check daily limit
-                    if account in accounts_at_limit:
-                        logger.warning(f"Skipping job {job['job_id']} - account {account} at daily limit of {max_posts_per_account_per_day}")
+                    # DEFENSE IN DEPTH: Check daily limit (per platform)
+                    if self._at_daily_limit(job, success_counts, max_posts_per_account_per_day):
+                        logger.warning(f"Skipping job {job['job_id']} - account {account} at daily "
+                                       f"{job_platform(job)} limit of {self._daily_limit(job_platform(job), max_posts_per_account_per_day)}")
                         continue
 
-                    # Claim this job
-                    job['status'] = self.STATUS_CLAIMED
-                    job['worker_id'] = str(worker_id)
-                    job['claimed_at'] = datetime.now().isoformat()
-                    logger.info(f"Worker {worker_id} claimed job {job['job_id']} (account: {account})")
-                    return jobs, dict(job)
+                    # A backed-off retry waits for its retry_at (claim_retry_job takes it then)
+                    if not self._retry_due(job, now):
+                        continue
+
+                    candidates.append(job)
+
+            # Every claimable job is a candidate here, so the healthiest one simply wins
+            job = self._pick_by_health(candidates)
+            if job is None:
+                # No available jobs (none pending, or accounts in use/waiting)
+                return jobs, None
 
-            # No available jobs (either none pending, all have accounts in use, or all waiting for accounts)
-            return jobs, None
+            # Claim this job
+            job['status'] = self.STATUS_CLAIMED
+            job['worker_id'] = str(worker_id)
+            job['claimed_at'] = datetime.now().isoformat()
+            logger.info(f"Worker {worker_id} claimed job {job['job_id']} (account: {job['account']})")
+            return jobs, dict(job)
 
         return self._locked_operation(_claim_operation)
 
@@ -896,6 +1008,14 @@ class ProgressTracker:
                         job['status'] = status
                         logger.info(f"Worker {worker_id} updated job {job_id} to {status}")
 
+                    if status in (self.STATUS_SUCCESS, self.STATUS_FAILED) and job.get('account'):
+                        try:
+                            self.health.record_outcome(
+                                job['account'], status == self.STATUS_SUCCESS,
+                                job.get('error_category', ''), job.get('error_type', ''))
+                        except Exception as e:
+                            logger.warning(f"Could not update health for {job['account']}: {e}")
+
                     return jobs, True
 
             logger.warning(f"Job {job_id} not found in progress file")
@@ -938,7 +1058,110 @@ class ProgressTracker:
 
         return ready_jobs
 
-    def claim_retry_job(self, worker_id: int, max_posts_per_account_per_day: int = 1) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _retry_due(job: Dict[str, Any], now: datetime) -> bool:
+        """False for a RETRYING job whose retry_at is still in the future."""
+        if job.get('status') != ProgressTracker.STATUS_RETRYING or not job.get('retry_at'):
+            return True
+        try:
+            return now >= datetime.fromisoformat(job['retry_at'])
+        except ValueError:
+            return True  # Invalid timestamp, allow retry
+
+    def has_claimable_job(self, max_posts_per_account_per_day: int = 1,
+                          only_accounts: Optional[set] = None,
+                          exclude_accounts: Optional[set] = None,
+                          extra_success_counts: Optional[Dict[tuple, int]] = None) -> bool:
+        """
+        True if claim_retry_job/claim_next_job would hand out a job right now.
+
+        Read-only: same account, busy-account, daily-limit and retry_at checks
+        as the claims (flaky accounts count, they are used when nothing else is).
+        """
+        if not os.path.exists(self.progress_file):
+            return False
+        jobs = self._read_all_jobs()
+        now = datetime.now()
+        success_counts = self._success_counts(jobs, extra_success_counts)
+        accounts_in_use = {job['account'] for job in jobs
+                           if job.get('account') and job.get('status') == self.STATUS_CLAIMED}
+        accounts_in_use |= set(exclude_accounts or ())
+
+        for job in jobs:
+            if job.get('status') not in (self.STATUS_PENDING, self.STATUS_RETRYING):
+                continue
+            account = job.get('account', '')
+            if not account or account in accounts_in_use:
+                continue
+            if only_accounts is not None and account not in only_accounts:
+                continue
+            if self._at_daily_limit(job, success_counts, max_posts_per_account_per_day):
+                continue
+            if self._retry_due(job, now):
+                return True
+        return False
+
+    def get_account_activity(self) -> Tuple[set, Dict[tuple, int]]:
+        """
+        Accounts with a claimed job and successful posts per (account, platform).
+
+        Used to enforce account locking and daily limits across several
+        progress files that share accounts (see MultiCampaignScheduler).
+        """
+        if not os.path.exists(self.progress_file):
+            return set(), {}
+        jobs = self._read_all_jobs()
+        claimed = {job['account'] for job in jobs
+                   if job.get('account') and job.get('status') == self.STATUS_CLAIMED}
+        return claimed, self._success_counts(jobs)
+
+    def get_open_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Get all jobs still waiting to run (pending or retrying, due or not).
+
+        Returns:
+            List of job dicts in file order
+        """
+        if not os.path.exists(self.progress_file):
+            return []
+        open_statuses = {self.STATUS_PENDING, self.STATUS_RETRYING}
+        return [job for job in self._read_all_jobs() if job.get('status') in open_statuses]
+
+    def next_retry_at(self, max_posts_per_account_per_day: int = 1,
+                      only_accounts: Optional[set] = None) -> Optional[datetime]:
+        """
+        Earliest retry_at among RETRYING jobs that can still be claimed some day.
+
+        Jobs whose account already hit the daily limit (or is outside
+        only_accounts) are ignored, so a worker waiting on this never waits
+        for a retry that cannot run.
+
+        Returns:
+            datetime (may be in the past = due now), or None if nothing is queued
+        """
+        jobs = self._read_all_jobs()
+        success_counts = self._success_counts(jobs)
+
+        earliest = None
+        for job in jobs:
+            if job.get('status') != self.STATUS_RETRYING or not job.get('account'):
+                continue
+            if only_accounts is not None and job['account'] not in only_accounts:
+                continue
+            if self._at_daily_limit(job, success_counts, max_posts_per_account_per_day):
+                continue
+            try:
+                retry_at = datetime.fromisoformat(job['retry_at']) if job.get('retry_at') else datetime.now()
+            except ValueError:
+                retry_at = datetime.now()
+            if earliest is None or retry_at < earliest:
+                earliest = retry_at
+        return earliest
+
+    def claim_retry_job(self, worker_id: int, max_posts_per_account_per_day: int = 1,
+                        only_accounts: Optional[set] = None,
+                        exclude_accounts: Optional[set] = None,
+                        extra_success_counts: Optional[Dict[tuple, int]] = None) -> Optional[Dict[str, Any]]:
         """
         Claim a job that is ready to be retried.
 
@@ -948,6 +1171,9 @@ class ProgressTracker:
         Args:
             worker_id: ID of the worker claiming the job
             max_posts_per_account_per_day: Max successful posts per account per day
+            only_accounts: If given, only jobs of these accounts are considered
+            exclude_accounts: Accounts busy elsewhere, treated as in use
+            extra_success_counts: Successful posts recorded elsewhere today (see claim_next_job)
 
         Returns:
             The claimed job dict, or None if no retry jobs available
@@ -955,26 +1181,35 @@ class ProgressTracker:
         def _claim_retry_operation(jobs):
             now = datetime.now()
 
-            # Build success counts for daily limit check
-            success_counts = {}
-            accounts_in_use = set()
+            # Build success counts (per account and platform) for daily limit check
+            success_counts = self._success_counts(jobs, extra_success_counts)
+            accounts_in_use = {job['account'] for job in jobs
+                               if job.get('account') and job.get('status') == self.STATUS_CLAIMED}
+            accounts_in_use |= set(exclude_accounts or ())
 
+            # Collect RETRYING jobs ready to retry; pending work claim_next_job
+            # could take right now decides whether a flaky retry waits
+            candidates = []
+            claimable_pending = set()
             for job in jobs:
+                status = job.get('status')
+                if status not in (self.STATUS_RETRYING, self.STATUS_PENDING):
+                    continue
+
                 acc = job.get('account', '')
                 if not acc:
                     continue
-                if job.get('status') == self.STATUS_CLAIMED:
-                    accounts_in_use.add(acc)
-                elif job.get('status') == self.STATUS_SUCCESS:
-                    success_counts[acc] = success_counts.get(acc, 0) + 1
+                if only_accounts is not None and acc not in only_accounts:
+                    continue
 
-            # Find a RETRYING job ready to retry
-            for job in jobs:
-                if job.get('status') != self.STATUS_RETRYING:
+                # Check daily limit
+                if self._at_daily_limit(job, success_counts, max_posts_per_account_per_day):
                     continue
 
-                acc = job.get('account', '')
-                if not acc:
+                # Pending work is claimed by claim_next_job, but a flaky retry must not jump it
+                if status == self.STATUS_PENDING:
+                    if acc not in accounts_in_use:
+                        claimable_pending.add(acc)
                     continue
 
                 # Check retry_at
@@ -991,19 +1226,21 @@ class ProgressTracker:
                 if acc in accounts_in_use:
                     continue
 
-                # Check daily limit
-                if success_counts.get(acc, 0) >= max_posts_per_account_per_day:
-                    continue
+                candidates.append(job)
 
-                # Claim this job
-                job['status'] = self.STATUS_CLAIMED
-                job['worker_id'] = str(worker_id)
-                job['claimed_at'] = now.isoformat()
-                job['retry_at'] = ''  # Clear retry_at
-                logger.info(f"Worker {worker_id} claimed RETRY job {job['job_id']} (account: {acc}, attempt {job.get('attempts', '?')})")
-                return jobs, dict(job)
+            # Earliest retry_at first; health ordering below keeps this for equal scores
+            candidates.sort(key=lambda j: j.get('retry_at') or '')
+            job = self._pick_by_health(candidates, claimable_pending)
+            if job is None:
+                return jobs, None
 
-            return jobs, None
+            # Claim this job
+            job['status'] = self.STATUS_CLAIMED
+            job['worker_id'] = str(worker_id)
+            job['claimed_at'] = now.isoformat()
+            job['retry_at'] = ''  # Clear retry_at
+            logger.info(f"Worker {worker_id} claimed RETRY job {job['job_id']} (account: {job['account']}, attempt {job.get('attempts', '?')})")
+            return jobs, dict(job)
 
         return self._locked_operation(_claim_retry_operation)
 
@@ -1212,6 +1449,53 @@ class ProgressTracker:
             'unknown_failures': by_category.get('unknown', 0)
         }
 
+    def get_account_health(self) -> Dict[str, float]:
+        """Health score per account in this progress file (0-1, higher = healthier)."""
+        accounts = {job.get('account', '') for job in self._read_all_jobs()} - {''}
+        return self.health.scores(accounts)
+
+    def get_recent_outcomes(self, window_minutes: float = 15) -> Dict[str, Any]:
+        """
+        Outcomes of attempts that finished in the last window_minutes.
+
+        Only each job's latest attempt is visible (completed_at is overwritten
+        on every attempt), which is enough for rate-style health signals.
+
+        Returns:
+            Dict with structure:
+            {
+                'total': 12,                      # Attempts finished in the window
+                'success': 9,
+                'by_category': {'infrastructure': 2, 'account': 1},
+                'by_type': {'adb_timeout': 2, 'suspended': 1},
+            }
+        """
+        cutoff = datetime.now() - timedelta(minutes=window_minutes)
+        outcomes = {'total': 0, 'success': 0, 'by_category': {}, 'by_type': {}}
+
+        for job in self._read_all_jobs():
+            completed_at = job.get('completed_at', '')
+            if not completed_at:
+                continue
+            try:
+                if datetime.fromisoformat(completed_at) < cutoff:
+                    continue
+            except ValueError:
+                continue
+
+            status = job.get('status', '')
+            if status == self.STATUS_SUCCESS:
+                outcomes['total'] += 1
+                outcomes['success'] += 1
+            elif status in (self.STATUS_FAILED, self.STATUS_RETRYING):
+                outcomes['total'] += 1
+                category = job.get('error_category', '') or 'unknown'
+                error_type = job.get('error_type', '') or 'unclassified'
+                outcomes['by_category'][category] = outcomes['by_category'].get(category, 0) + 1
+                outcomes['by_type'][error_type] = outcomes['by_type'].get(error_type, 0) + 1
+
+        return outcomes
+
     def get_worker_stats(self) -> Dict[int, Dict[str, int]]:
         """Get statistics per worker."""
         jobs = self._read_all_jobs()
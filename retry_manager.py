@@ -22,6 +22,12 @@ Pass Flow:
             - Only non-retryable remain, OR
             - Max passes reached
 
+Continuous mode (ContinuousRetryManager) drops the pass barrier: every
+retryable failure is put back as RETRYING with its own exponential backoff
+plus jitter (retry_at), workers keep running and claim due retries (earliest
+retry_at first) in between fresh jobs, and the pass summary becomes a
+rolling-window summary.
+
 Usage:
     from retry_manager import RetryPassManager, RetryConfig
     from progress_tracker import ProgressTracker
@@ -37,12 +43,15 @@ Usage:
         result = retry_mgr.end_pass()
 """
 
+import heapq
 import logging
+import random
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 
+from config import Config
 from progress_tracker import ProgressTracker
 
 logger = logging.getLogger(__name__)
@@ -63,6 +72,24 @@ class RetryConfig:
     retry_delay_seconds: int = 30  # Delay between passes
     infrastructure_retry_limit: int = 3  # Max retries per job for infra errors
     unknown_error_is_retryable: bool = True  # Treat unclassified errors as retryable
+    continuous: bool = False  # No passes: per-job backoff, retries interleave with fresh work
+    stats_window_minutes: int = 15  # Rolling window for continuous-mode stats
+
+
+def backoff_delay(attempts: int, rng: random.Random = None) -> float:
+    """
+    Seconds to wait before retry number `attempts` (1 = first retry).
+
+    Exponential: RETRY_BACKOFF_BASE_SECONDS * 2^(attempts-1), capped at
+    RETRY_BACKOFF_MAX_SECONDS, then scaled by a random factor in
+    [1 - RETRY_BACKOFF_JITTER, 1 + RETRY_BACKOFF_JITTER] so jobs that failed
+    together (e.g. one Geelark outage) don't all come back at once.
+    """
+    rng = rng or random
+    delay = Config.RETRY_BACKOFF_BASE_SECONDS * (2 ** max(0, attempts - 1))
+    delay = min(delay, Config.RETRY_BACKOFF_MAX_SECONDS)
+    jitter = Config.RETRY_BACKOFF_JITTER
+    return delay * rng.uniform(1 - jitter, 1 + jitter)
 
 
 @dataclass
@@ -92,6 +119,26 @@ class PassStats:
         return None
 
 
+@dataclass
+class WindowStats:
+    """PassStats counterpart for continuous mode: attempts finished in a rolling window."""
+    window_minutes: float
+    total_jobs: int = 0  # Attempts finished in the window
+    succeeded: int = 0
+    failed_account: int = 0
+    failed_infrastructure: int = 0
+    failed_unknown: int = 0
+    retry_queue: int = 0  # Jobs waiting in RETRYING at snapshot time
+    end_time: datetime = field(default_factory=datetime.now)
+
+    @property
+    def success_rate(self) -> float:
+        """Calculate success rate as percentage."""
+        if self.total_jobs == 0:
+            return 0.0
+        return self.succeeded / self.total_jobs * 100
+
+
 class RetryPassManager:
     """
     Manages multi-pass retry logic for job processing.
@@ -239,29 +286,27 @@ class RetryPassManager:
         - Attempts haven't exceeded infrastructure_retry_limit
         """
         jobs = self.tracker._read_all_jobs()
-        retryable = []
+        return [job for job in jobs if self._is_retryable_failure(job)]
 
-        for job in jobs:
-            if job.get('status') != self.tracker.STATUS_FAILED:
-                continue
+    def _is_retryable_failure(self, job: Dict[str, Any]) -> bool:
+        """True if a FAILED job may be retried under this config's limits."""
+        if job.get('status') != self.tracker.STATUS_FAILED:
+            return False
 
-            category = job.get('error_category', 'unknown') or 'unknown'
-            attempts = int(job.get('attempts', 0) or 0)
+        category = job.get('error_category', 'unknown') or 'unknown'
+        attempts = int(job.get('attempts', 0) or 0)
 
-            # Never retry account issues
-            if category in self.tracker.NON_RETRYABLE_CATEGORIES:
-                continue
+        # Never retry account issues
+        if category in self.tracker.NON_RETRYABLE_CATEGORIES:
+            return False
 
-            # Check retry limits
-            if category == 'infrastructure':
-                if attempts < self.config.infrastructure_retry_limit:
-                    retryable.append(job)
-            elif self.config.unknown_error_is_retryable:
-                # Unknown errors get limited retries
-                if attempts < 2:
-                    retryable.append(job)
-
-        return retryable
+        # Check retry limits
+        if category == 'infrastructure':
+            return attempts < self.config.infrastructure_retry_limit
+        if self.config.unknown_error_is_retryable:
+            # Unknown errors get limited retries
+            return attempts < 2
+        return False
 
     def _reset_retryable_jobs_for_retry(self) -> int:
         """
@@ -275,20 +320,8 @@ class RetryPassManager:
             next_pass = self.current_pass + 1
 
             for job in jobs:
-                if job.get('status') != self.tracker.STATUS_FAILED:
-                    continue
-
-                category = job.get('error_category', 'unknown') or 'unknown'
-                attempts = int(job.get('attempts', 0) or 0)
-
-                should_retry = False
-                if category == 'infrastructure':
-                    should_retry = attempts < self.config.infrastructure_retry_limit
-                elif category == 'unknown' and self.config.unknown_error_is_retryable:
-                    should_retry = attempts < 2
                 # 'account' category is never retried
-
-                if should_retry:
+                if self._is_retryable_failure(job):
                     job['status'] = self.tracker.STATUS_PENDING
                     job['pass_number'] = str(next_pass)
                     job['worker_id'] = ''
@@ -354,6 +387,165 @@ class RetryPassManager:
         }
 
 
+
+class ContinuousRetryManager(RetryPassManager):
+    """
+    Barrier-free retry scheduling (RetryConfig.continuous).
+
+    Instead of start_new_pass()/end_pass() around a whole worker run, the
+    orchestrator calls sweep() every few seconds while workers are running.
+    A sweep puts retryable FAILED jobs (same limits as pass mode) back to
+    RETRYING with retry_at = now + backoff_delay(attempts), and rebuilds a
+    priority queue of (retry_at, job_id) for reporting. Workers started with
+    --continuous-retry use the same backoff when a job fails, stay alive
+    while retries are queued, and claim each retry as soon as it is due
+    (earliest retry_at first) in between fresh jobs.
+
+    Stats are reported over a rolling window instead of per pass.
+    """
+
+    def __init__(self, tracker: ProgressTracker, config: RetryConfig = None):
+        super().__init__(tracker, config)
+        self.requeued = 0
+        self.window_history: List[WindowStats] = []
+        self._queue: List[Tuple[datetime, str]] = []  # heap of (retry_at, job_id)
+
+    def sweep(self, now: datetime = None) -> int:
+        """
+        Requeue retryable failures with backoff and refresh the retry queue.
+
+        Returns:
+            Number of FAILED jobs moved back to RETRYING
+        """
+        now = now or datetime.now()
+
+        def _sweep_operation(jobs):
+            requeued = 0
+            queue = []
+            for job in jobs:
+                if self._is_retryable_failure(job):
+                    attempts = int(job.get('attempts', 0) or 0)
+                    delay = backoff_delay(attempts)
+                    job['status'] = self.tracker.STATUS_RETRYING
+                    job['retry_at'] = (now + timedelta(seconds=delay)).isoformat()
+                    job['worker_id'] = ''
+                    job['claimed_at'] = ''
+                    requeued += 1
+                    logger.info(f"Requeued {job['job_id']} ({job.get('error_category') or 'unknown'}/"
+                                f"{job.get('error_type') or '?'}, attempt {attempts}) - retry in {delay:.0f}s")
+
+                if job.get('status') == self.tracker.STATUS_RETRYING:
+                    try:
+                        retry_at = datetime.fromisoformat(job['retry_at']) if job.get('retry_at') else now
+                    except ValueError:
+                        retry_at = now
+                    queue.append((retry_at, job['job_id']))
+
+            heapq.heapify(queue)
+            return (jobs if requeued else None), (requeued, queue)
+
+        requeued, self._queue = self.tracker._locked_operation(_sweep_operation)
+        self.requeued += requeued
+        return requeued
+
+    def next_retry(self) -> Optional[Tuple[datetime, str]]:
+        """Earliest queued (retry_at, job_id) as of the last sweep."""
+        return self._queue[0] if self._queue else None
+
+    def has_open_work(self) -> bool:
+        """True while jobs are pending, claimed or waiting to retry."""
+        stats = self.tracker.get_stats()
+        return stats['pending'] + stats['claimed'] + stats.get('retrying', 0) > 0
+
+    def window_stats(self) -> WindowStats:
+        """Outcomes of attempts finished in the last stats_window_minutes."""
+        window = self.config.stats_window_minutes
+        outcomes = self.tracker.get_recent_outcomes(window)
+        by_category = outcomes['by_category']
+        return WindowStats(
+            window_minutes=window,
+            total_jobs=outcomes['total'],
+            succeeded=outcomes['success'],
+            failed_account=by_category.get('account', 0) + by_category.get('content', 0),
+            failed_infrastructure=by_category.get('infrastructure', 0),
+            failed_unknown=sum(count for category, count in by_category.items()
+                               if category not in ('account', 'content', 'infrastructure')),
+            retry_queue=len(self._queue),
+        )
+
+    def log_window(self) -> WindowStats:
+        """Log the rolling-window summary and keep it for get_summary()."""
+        stats = self.window_stats()
+        self.window_history.append(stats)
+        del self.window_history[:-96]
+
+        next_retry = self.next_retry()
+        next_info = ""
+        if next_retry:
+            wait = max(0, int((next_retry[0] - datetime.now()).total_seconds()))
+            next_info = f", next in {wait}s ({next_retry[1]})"
+        logger.info(
+            f"Last {stats.window_minutes}min: {stats.total_jobs} attempts, "
+            f"{stats.success_rate:.0f}% success | failed: {stats.failed_account} account, "
+            f"{stats.failed_infrastructure} infra, {stats.failed_unknown} unknown | "
+            f"retry queue {stats.retry_queue}{next_info}"
+        )
+        return stats
+
+    def finish(self) -> PassResult:
+        """
+        Final verdict once workers have stopped.
+
+        MAX_PASSES_REACHED here means retryable failures used up their
+        per-job retry limits.
+        """
+        tracker_stats = self.tracker.get_stats()
+        failure_stats = self.tracker.get_failure_stats()
+
+        if tracker_stats['pending'] + tracker_stats['claimed'] + tracker_stats.get('retrying', 0) > 0:
+            return PassResult.RETRYABLE_REMAINING
+        if tracker_stats['failed'] == 0:
+            logger.info("All jobs complete!")
+            return PassResult.ALL_COMPLETE
+        if failure_stats['infrastructure_failures'] + failure_stats['unknown_failures'] == 0:
+            logger.info("Only non-retryable failures remain")
+            return PassResult.ONLY_NON_RETRYABLE
+        logger.warning("Retryable failures used up their retry limits")
+        return PassResult.MAX_PASSES_REACHED
+
+    def get_summary(self) -> Dict[str, Any]:
+        """
+        Get summary of the continuous run.
+
+        Returns:
+            Dict with requeue count and rolling-window statistics
+        """
+        return {
+            'mode': 'continuous',
+            'requeued': self.requeued,
+            'config': {
+                'retry_backoff_base_seconds': Config.RETRY_BACKOFF_BASE_SECONDS,
+                'retry_backoff_max_seconds': Config.RETRY_BACKOFF_MAX_SECONDS,
+                'retry_backoff_jitter': Config.RETRY_BACKOFF_JITTER,
+                'infrastructure_retry_limit': self.config.infrastructure_retry_limit,
+                'unknown_error_is_retryable': self.config.unknown_error_is_retryable,
+                'stats_window_minutes': self.config.stats_window_minutes,
+            },
+            'windows': [
+                {
+                    'end_time': w.end_time.isoformat(),
+                    'attempts': w.total_jobs,
+                    'succeeded': w.succeeded,
+                    'failed_account': w.failed_account,
+                    'failed_infrastructure': w.failed_infrastructure,
+                    'failed_unknown': w.failed_unknown,
+                    'success_rate': f"{w.success_rate:.1f}%",
+                    'retry_queue': w.retry_queue,
+                }
+                for w in self.window_history
+            ]
+        }
+
 if __name__ == "__main__":
     # Demo/test
     import os
@@ -0,0 +1,141 @@
+"""
+State Journal - write-ahead delta log + periodic atomic snapshots.
+
+PostingScheduler used to rewrite the whole scheduler_state.json (every job
+and account, pretty-printed) after every change. With thousands of jobs that
+is slow, and a crash in the middle of the write left a truncated file. The
+journal splits persistence in two:
+
+- Snapshot (<state_file>, same JSON layout as before): written to a temp
+  file, fsynced and os.replace()d into place, so readers only ever see a
+  complete file. Records the sequence number of the last delta it includes.
+- Delta log (<state_file>.wal): one JSON line per save holding only the jobs
+  and accounts that changed (full records, last write wins), removed ids and
+  the settings. Appended and fsynced; cheap regardless of queue size.
+
+load() reads the snapshot and replays deltas newer than it. A torn last line
+(crash mid-append) is ignored. After every `snapshot_every` deltas the owner
+writes a new snapshot and the log is truncated.
+
+Readers that only need a recent view (dashboard) can use read_snapshot();
+read_state() adds the replay, which is bounded by the snapshot interval.
+"""
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+WAL_SUFFIX = ".wal"
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {'jobs': [], 'accounts': [], 'settings': {}}
+
+
+def read_snapshot(path: str) -> Dict[str, Any]:
+    """Last snapshot only (empty state if missing or unreadable)."""
+    if not os.path.exists(path):
+        return _empty_state()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read state snapshot {path}: {e}")
+        return _empty_state()
+
+
+def apply_delta(jobs: Dict[str, dict], accounts: Dict[str, dict],
+                settings: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    """Fold one delta record into keyed job/account dicts (in place)."""
+    for job in delta.get('jobs', []):
+        jobs[job['id']] = job
+    for job_id in delta.get('removed_jobs', []):
+        jobs.pop(job_id, None)
+    for acc in delta.get('accounts', []):
+        accounts[acc['name']] = acc
+    for name in delta.get('removed_accounts', []):
+        accounts.pop(name, None)
+    if 'settings' in delta:
+        settings.clear()
+        settings.update(delta['settings'])
+
+
+class StateJournal:
+    """Snapshot + delta log for one state file. Not thread-safe; the owner serializes calls."""
+
+    def __init__(self, path: str, snapshot_every: int = None):
+        self.path = path
+        self.wal_path = path + WAL_SUFFIX
+        self.snapshot_every = snapshot_every or Config.STATE_SNAPSHOT_EVERY
+        self.seq = 0                 # Sequence number of the last delta written/replayed
+        self.pending_deltas = 0      # Deltas in the log since the last snapshot
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Snapshot with newer deltas replayed, in the snapshot's layout.
+        """
+        snapshot = read_snapshot(self.path)
+        snapshot_seq = snapshot.get('wal_seq', 0)
+        jobs = {job['id']: job for job in snapshot.get('jobs', [])}
+        accounts = {acc['name']: acc for acc in snapshot.get('accounts', [])}
+        settings = dict(snapshot.get('settings', {}))
+        self.seq = snapshot_seq
+        self.pending_deltas = 0
+
+        if os.path.exists(self.wal_path):
+            with open(self.wal_path, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        delta = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Ignoring torn record at {self.wal_path}:{line_no} and after")
+                        break
+                    if delta.get('seq', 0) <= snapshot_seq:
+                        continue  # Already folded into the snapshot
+                    apply_delta(jobs, accounts, settings, delta)
+                    self.seq = delta['seq']
+                    self.pending_deltas += 1
+
+        state = dict(snapshot)
+        state.update({'jobs': list(jobs.values()), 'accounts': list(accounts.values()), 'settings': settings})
+        return state
+
+    def append(self, delta: Dict[str, Any]) -> None:
+        """Durably append one delta (seq and timestamp are filled in)."""
+        record = dict(delta, seq=self.seq + 1, at=datetime.now().isoformat())
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.wal_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.seq += 1
+        self.pending_deltas += 1
+
+    def snapshot_due(self) -> bool:
+        return self.pending_deltas >= self.snapshot_every
+
+    def write_snapshot(self, state: Dict[str, Any]) -> None:
+        """Atomically replace the snapshot with `state`, then truncate the log."""
+        data = dict(state, wal_seq=self.seq)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        # A crash before this truncate is harmless: replay skips seq <= wal_seq
+        with open(self.wal_path, 'w', encoding='utf-8'):
+            pass
+        self.pending_deltas = 0
+
+
+def read_state(path: str) -> Dict[str, Any]:
+    """Current state (snapshot + delta log) without taking ownership of the journal."""
+    return StateJournal(path).load()
@@ -49,6 +49,10 @@ from appium_ui_controller import AppiumUIController
 from flow_logger import FlowLogger
 # Comprehensive error debugging with screenshots
 from error_debugger import ErrorDebugger
+# Black box - last navigation steps, written only on failure
+from black_box import BlackBoxRecorder
+# Latency/phase metrics for the orchestrator's /metrics endpoint
+from metrics import metrics
 # Hybrid Navigator - rule-based + AI fallback
 from tiktok_hybrid_navigator import TikTokHybridNavigator
 from tiktok_screen_detector import TikTokScreenType
@@ -448,6 +452,10 @@ class TikTokPoster:
             for action_type, count in summary['actions_by_type'].items():
                 print(f"  {action_type}: {count}")
 
+        # Let queued step screenshots finish before the driver goes away
+        if getattr(self, '_debugger', None):
+            self._debugger.close()
+
         # Close Appium driver if open
         try:
             if self.appium_driver:
@@ -459,6 +467,11 @@ class TikTokPoster:
         # Use device manager's cleanup
         self._device_manager.cleanup()
 
+    def cleanup(self):
+        """Same as disconnect() - matches SmartInstagramPoster for the parallel worker."""
+        self.disconnect()
+
+    @metrics.timed('geelark_dump_ui_seconds', platform='tiktok')
     def dump_ui(self):
         """Dump UI elements using Appium."""
         if not self.appium_driver:
@@ -613,11 +626,12 @@ RESPONSE (JSON only):
 {{"action": "<action>", "element_index": <num or null>, "text_to_type": "<text or null>", "reason": "<brief explanation>", "confidence": <0.0-1.0>}}"""
 
         try:
-            response = self.anthropic.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=500,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            with metrics.timer('geelark_ai_call_seconds', caller='tiktok_navigation'):
+                response = self.anthropic.messages.create(
+                    model="claude-sonnet-4-20250514",
+                    max_tokens=500,
+                    messages=[{"role": "user", "content": prompt}]
+                )
             content = response.content[0].text.strip()
 
             # Clean JSON if wrapped in markdown
@@ -640,15 +654,21 @@ RESPONSE (JSON only):
             ai_fallback: If True (default), AI rescues when rules fail
         """
         # Initialize flow logger
-        flow_logger = FlowLogger(self.phone_name, log_dir="tiktok_flow_analysis")
+        flow_logger = FlowLogger(self.phone_name, log_dir="tiktok_flow_analysis", enabled=Config.FLOW_LOGGING)
 
-        # Initialize error debugger with screenshots at every step
+        # Initialize error debugger (step screenshots sampled per Config.STEP_SCREENSHOT_MODE)
+        if getattr(self, '_debugger', None):
+            self._debugger.close()
         self._debugger = ErrorDebugger(
             account=self.phone_name,
             job_id=f"tiktok_{int(time.time())}",
-            output_dir="tiktok_error_logs"
+            output_dir="tiktok_error_logs",
+            step_log=Config.FLOW_LOGGING  # Without flow logs the black box is the step log
         )
-        print(f"[DEBUG] Screenshots will be saved to: {self._debugger.session_dir}")
+        print(f"[DEBUG] Screenshots will be saved to: {self._debugger.session_dir} "
+              f"(step screenshots: {self._debugger.screenshot_mode})")
+        black_box = BlackBoxRecorder(account=self.phone_name, job_id=self._debugger.job_id,
+                                     output_dir=os.path.join(Config.BLACK_BOX_DIR, "tiktok"))
 
         # Get TikTok version for ID drift debugging
         self._tiktok_version = self.get_tiktok_version()
@@ -705,10 +725,13 @@ RESPONSE (JSON only):
             print(f"\n--- Step {step + 1} ---")
 
             # Dump UI
+            step_start = time.time()
             elements, raw_xml = self.dump_ui()
+            dump_seconds = time.time() - step_start
             if not elements:
                 print("  No UI elements found, waiting...")
-                # Screenshot even when no elements found
+                black_box.record(step + 1, [], timings={'dump_ui': dump_seconds}, note="no UI elements")
+                # Log the step even when no elements found
                 self._debugger.log_step(
                     step_name=f"step_{step+1}_no_elements",
                     success=False,
@@ -724,6 +747,10 @@ RESPONSE (JSON only):
                 print(f"  [ERROR DETECTED] {error_type}: {error_msg}")
                 self.last_error_type = error_type
                 self.last_error_message = f"{error_type}: {error_msg}"
+                black_box.record(step + 1, elements, timings={'dump_ui': dump_seconds},
+                                 note=self.last_error_message)
+                black_box.flush(error_type, context={"error_message": error_msg,
+                                                     "tiktok_version": self._tiktok_version})
 
                 # CAPTURE ERROR WITH SCREENSHOT
                 error_file = self._debugger.capture_error(
@@ -764,6 +791,8 @@ RESPONSE (JSON only):
 
             # Navigation: Hybrid (rule-based + AI fallback) or AI-only
             ai_called = False
+            screen_name, confidence = None, None
+            nav_start_step = time.time()
             try:
                 if self._hybrid_navigator is not None:
                     # HYBRID/RULES-ONLY MODE: Rule-based detection
@@ -779,6 +808,7 @@ RESPONSE (JSON only):
                     nav_result = self._hybrid_navigator.navigate(elements)
                     action = nav_result.action
                     ai_called = nav_result.used_ai
+                    screen_name, confidence = nav_result.screen_type.name, nav_result.action_confidence
 
                     # Log whether rule-based or AI was used
                     if nav_result.used_ai:
@@ -786,7 +816,7 @@ RESPONSE (JSON only):
                     else:
                         print(f"  [RULE] {nav_result.screen_type.name} -> {action['action']} (conf={nav_result.action_confidence:.2f})")
 
-                    # SCREENSHOT AT EVERY STEP - critical for debugging
+                    # Step timeline (screenshot sampled in the background)
                     self._debugger.log_step(
                         step_name=f"step_{step+1}_{nav_result.screen_type.name}",
                         success=True,
@@ -828,23 +858,33 @@ RESPONSE (JSON only):
 
             except Exception as e:
                 print(f"  Analysis error: {e}")
+                black_box.record(step + 1, elements, timings={'dump_ui': dump_seconds},
+                                 note=f"analysis_error: {e}")
                 flow_logger.log_error("analysis_error", str(e), elements)
                 time.sleep(2)
                 continue
 
             print(f"  Action: {action['action']} - {action.get('reason', '')}")
 
+            step_state = {
+                'video_uploaded': self.video_uploaded,
+                'video_selected': self.video_selected,
+                'caption_entered': self.caption_entered,
+            }
+            box_entry = black_box.record(
+                step + 1, elements, screen_type=screen_name, confidence=confidence,
+                used_ai=ai_called, action=action, state=step_state,
+                timings={'dump_ui': dump_seconds, 'navigate': time.time() - nav_start_step},
+                driver=self.appium_driver
+            )
+
             # Log the step for pattern analysis
             flow_logger.log_step(
                 elements=elements,
                 action=action,
                 ai_called=ai_called,
                 ai_tokens=0,
-                state={
-                    'video_uploaded': self.video_uploaded,
-                    'video_selected': self.video_selected,
-                    'caption_entered': self.caption_entered,
-                },
+                state=step_state,
                 result="pending"
             )
 
@@ -880,6 +920,7 @@ RESPONSE (JSON only):
                     print(f"  AI calls: {stats['ai_calls']} ({stats['ai_percentage']:.1f}%)")
                 else:
                     print(f"\n[SUCCESS] Post completed in {step + 1} steps (AI-only mode)")
+                black_box.clear()
                 flow_logger.log_success()
                 flow_logger.close()
                 return True
@@ -890,11 +931,13 @@ RESPONSE (JSON only):
                 print(f"\n[ERROR] {error_reason}")
                 self.last_error_type = action.get('error_type', 'posting_error')
                 self.last_error_message = error_reason
+                black_box.flush(self.last_error_type, context={"error_message": error_reason})
                 flow_logger.log_failure(f"error: {error_reason}")
                 flow_logger.close()
                 return False
 
             # Execute standard actions
+            action_start = time.time()
             try:
                 if action_name == 'tap':
                     elem_idx = action.get('element_index')
@@ -963,9 +1006,12 @@ RESPONSE (JSON only):
                     print("  [ERROR] UiAutomator2 crashed!")
                     self.last_error_type = "uiautomator2_crash"
                     self.last_error_message = str(e)
+                    black_box.flush("uiautomator2_crash", elements, context={"error_message": str(e)})
                     flow_logger.close()
                     return False
 
+            box_entry['timings']['action'] = time.time() - action_start
+
             # NOTE: Idle actions disabled during posting flow - too risky without screen awareness
             # self._maybe_idle_action()
 
@@ -990,6 +1036,8 @@ RESPONSE (JSON only):
             }
         )
         print(f"  [DEBUG] Final state captured to: {self._debugger.session_dir}")
+        black_box.flush("max_steps", context={"max_steps": max_steps,
+                                              "tiktok_version": self._tiktok_version})
 
         flow_logger.log_failure("max_steps_reached")
         flow_logger.close()
@@ -0,0 +1,304 @@
+"""
+Video Preflight - validate campaign videos when jobs are seeded.
+
+SmartInstagramPoster.validate_video used to be the first check a video got,
+run with ffprobe on the worker after a phone had already been booted for it.
+Preflight moves that to seeding time:
+
+- Every candidate video is probed once in a process pool: an MP4 atom scan
+  (is there a moov atom, and does it come before mdat = faststart) plus
+  ffprobe for duration and codecs.
+- Results are cached in VIDEO_PREFLIGHT_CACHE keyed by absolute path and
+  reused while the file's size and mtime are unchanged, so re-seeding only
+  probes new or changed files.
+- Invalid videos get no job. validate_video reads the same cache, so a
+  preflighted video is not probed again at post time.
+- With VIDEO_FASTSTART_REMUX, videos whose moov atom sits after the media
+  data are remuxed in place (stream copy, +faststart) so uploads and in-app
+  processing can start reading metadata immediately.
+
+Without ffprobe only the atom scan runs (probed=False); without ffmpeg no
+remux happens.
+
+Usage:
+    probes = preflight_videos(video_paths)
+    valid = [path for path in video_paths if probes[path].valid]
+
+    probe = cached_probe("videos/clip.mp4")   # None if not (or no longer) cached
+"""
+import json
+import logging
+import os
+import struct
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 30
+REMUX_TIMEOUT = 300
+
+
+@dataclass
+class VideoProbe:
+    """Preflight result for one video file."""
+    path: str
+    size: int
+    mtime: float
+    valid: bool = False
+    error: str = ""
+    duration: float = 0.0
+    video_codec: str = ""
+    audio_codec: str = ""
+    moov_offset: int = -1     # Byte offset of the moov atom (-1 = missing)
+    faststart: bool = False   # moov comes before mdat
+    probed: bool = False      # ffprobe ran (False = atom scan only)
+    remuxed: bool = False     # Rewritten to faststart by preflight
+
+    def matches(self, size: int, mtime: float) -> bool:
+        """True if the cached result still describes the file on disk."""
+        return self.size == size and self.mtime == mtime
+
+
+def read_top_level_atoms(path: str) -> List[Tuple[str, int]]:
+    """(type, offset) of the top-level MP4 boxes, stopping at the first damaged header."""
+    atoms = []
+    with open(path, 'rb') as f:
+        total = os.fstat(f.fileno()).st_size
+        offset = 0
+        while offset + 8 <= total:
+            f.seek(offset)
+            box_size, box_type = struct.unpack('>I4s', f.read(8))
+            if box_size == 1:
+                extended = f.read(8)
+                if len(extended) < 8:
+                    break
+                box_size = struct.unpack('>Q', extended)[0]
+            elif box_size == 0:
+                box_size = total - offset  # Box runs to the end of the file
+            if box_size < 8:
+                break
+            atoms.append((box_type.decode('latin-1'), offset))
+            offset += box_size
+    return atoms
+
+
+def probe_video(path: str) -> VideoProbe:
+    """Atom scan + ffprobe of one file (never raises)."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return VideoProbe(path=path, size=-1, mtime=0.0, error=f"File not found: {path}")
+    probe = VideoProbe(path=path, size=stat.st_size, mtime=stat.st_mtime)
+
+    if stat.st_size == 0:
+        probe.error = "Video file is empty"
+        return probe
+
+    try:
+        offsets = {}
+        for name, offset in read_top_level_atoms(path):
+            offsets.setdefault(name, offset)
+    except OSError as e:
+        probe.error = f"Unreadable video: {e}"
+        return probe
+    if 'moov' not in offsets:
+        probe.error = "Video corrupted: missing moov atom (metadata)"
+        return probe
+    probe.moov_offset = offsets['moov']
+    probe.faststart = 'mdat' not in offsets or offsets['moov'] < offsets['mdat']
+
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries',
+             'format=duration:stream=codec_type,codec_name', '-of', 'json', path],
+            capture_output=True,
+            text=True,
+            timeout=PROBE_TIMEOUT
+        )
+    except FileNotFoundError:
+        # ffprobe not installed - the atom scan is all we can check
+        probe.valid = True
+        return probe
+    except subprocess.TimeoutExpired:
+        probe.error = "Video validation timed out"
+        return probe
+
+    probe.probed = True
+    if result.returncode != 0:
+        error_msg = result.stderr.strip()
+        if 'Invalid data' in error_msg:
+            probe.error = "Video corrupted: invalid data"
+        else:
+            probe.error = f"Video error: {error_msg[:100]}"
+        return probe
+
+    try:
+        info = json.loads(result.stdout or '{}')
+        probe.duration = float(info.get('format', {}).get('duration') or 0)
+    except ValueError:
+        probe.error = "Unreadable ffprobe output"
+        return probe
+
+    for stream in info.get('streams', []):
+        if stream.get('codec_type') == 'video' and not probe.video_codec:
+            probe.video_codec = stream.get('codec_name', '')
+        elif stream.get('codec_type') == 'audio' and not probe.audio_codec:
+            probe.audio_codec = stream.get('codec_name', '')
+
+    if not probe.video_codec:
+        probe.error = "No video stream"
+    elif probe.duration <= 0:
+        probe.error = "Video has no duration metadata"
+    else:
+        probe.valid = True
+    return probe
+
+
+def remux_faststart(path: str) -> bool:
+    """Rewrite a video in place with its moov atom up front (stream copy). False if ffmpeg failed."""
+    tmp_path = f"{path}.faststart.tmp"
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-v', 'error', '-y', '-i', path, '-map', '0', '-c', 'copy',
+             '-movflags', '+faststart', '-f', 'mp4', tmp_path],
+            capture_output=True,
+            text=True,
+            timeout=REMUX_TIMEOUT
+        )
+        if result.returncode != 0 or not os.path.exists(tmp_path):
+            return False
+        os.replace(tmp_path, path)
+        return True
+    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+        return False
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _preflight_one(path: str, remux: bool) -> VideoProbe:
+    """Probe one video and optionally remux it to faststart (runs in a pool process)."""
+    probe = probe_video(path)
+    if remux and probe.valid and probe.probed and not probe.faststart:
+        if remux_faststart(path):
+            probe = probe_video(path)
+            probe.remuxed = True
+    return probe
+
+
+class VideoProbeCache:
+    """JSON-backed probe results keyed by absolute path."""
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.VIDEO_PREFLIGHT_CACHE
+
+    def load(self) -> Dict[str, VideoProbe]:
+        """Read all records (empty if the file is missing or unreadable)."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {key: VideoProbe(**rec) for key, rec in data.items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def save(self, records: Dict[str, VideoProbe]) -> None:
+        """Write all records atomically, dropping files that no longer exist."""
+        records = {key: rec for key, rec in records.items() if os.path.exists(key)}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({key: asdict(rec) for key, rec in records.items()}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, video_path: str) -> Optional[VideoProbe]:
+        """Cached result for a file, or None if it is unknown or changed since."""
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        probe = self.load().get(os.path.abspath(video_path))
+        if probe is None or not probe.matches(stat.st_size, stat.st_mtime):
+            return None
+        return probe
+
+
+def cached_probe(video_path: str) -> Optional[VideoProbe]:
+    """Preflight result for a video if it is cached and the file is unchanged."""
+    return VideoProbeCache().get(video_path)
+
+
+def preflight_videos(
+    video_paths: Iterable[str],
+    cache_file: str = None,
+    workers: int = None,
+    remux: bool = None
+) -> Dict[str, VideoProbe]:
+    """
+    Probe videos in a process pool, reusing cached results for unchanged files.
+
+    Args:
+        video_paths: Local video files
+        cache_file: Probe cache (default: Config.VIDEO_PREFLIGHT_CACHE)
+        workers: Probe processes (default: Config.VIDEO_PREFLIGHT_WORKERS)
+        remux: Remux non-faststart videos in place (default: Config.VIDEO_FASTSTART_REMUX)
+
+    Returns:
+        video path (as given) -> VideoProbe
+    """
+    workers = workers or Config.VIDEO_PREFLIGHT_WORKERS
+    remux = Config.VIDEO_FASTSTART_REMUX if remux is None else remux
+    cache = VideoProbeCache(cache_file)
+    records = cache.load()
+
+    results: Dict[str, VideoProbe] = {}
+    to_probe = []
+    cached_count = 0
+    for path in dict.fromkeys(video_paths):
+        key = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            results[path] = VideoProbe(path=path, size=-1, mtime=0.0, error=f"File not found: {path}")
+            continue
+        cached = records.get(key)
+        reusable = (
+            cached is not None and cached.matches(stat.st_size, stat.st_mtime)
+            and (cached.probed or not cached.valid)  # Atom-scan-only passes are redone (ffprobe may exist now)
+            and not (remux and cached.valid and not cached.faststart)
+        )
+        if reusable:
+            results[path] = cached
+            cached_count += 1
+        else:
+            to_probe.append(path)
+
+    if to_probe:
+        if workers > 1 and len(to_probe) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(to_probe))) as executor:
+                probes = list(executor.map(_preflight_one, to_probe, repeat(remux),
+                                           chunksize=max(1, len(to_probe) // (workers * 4))))
+        else:
+            probes = [_preflight_one(path, remux) for path in to_probe]
+        for path, probe in zip(to_probe, probes):
+            results[path] = probe
+            if probe.size >= 0:
+                records[os.path.abspath(path)] = probe
+        try:
+            cache.save(records)
+        except OSError as e:
+            logger.warning(f"Could not write video preflight cache {cache.path}: {e}")
+
+    invalid = sum(1 for probe in results.values() if not probe.valid)
+    remuxed = sum(1 for path in to_probe if results[path].remuxed)
+    logger.info(f"Video preflight: {len(results)} videos ({cached_count} cached, "
+                f"{len(to_probe)} probed), {invalid} invalid, {remuxed} remuxed to faststart")
+    if to_probe and not any(results[path].probed for path in to_probe):
+        logger.warning("ffprobe not found - preflight only checked the MP4 atoms")
+    return results
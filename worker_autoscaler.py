@@ -0,0 +1,184 @@
+"""
+Worker Autoscaler - grow or shrink the worker pool while a run is in progress.
+
+The orchestrator used to start a fixed number of workers. The autoscaler is
+consulted from monitor_workers() and returns a target worker count:
+
+- Grow (one worker per cooldown) while the backlog of pending + retrying jobs
+  is deeper than jobs_per_worker per active worker.
+- Shrink (one worker per cooldown) when the recent infrastructure error rate
+  is high - ADB, Appium, connection, glogin and phone-start failures as
+  classified by ProgressTracker._classify_error - since more workers only
+  add load to a degraded Geelark side.
+- Shrink when host CPU or memory is above its limit; never grow while it is.
+- Always stay within [min_workers, max_workers].
+
+Host load comes from psutil when installed, otherwise from the load average
+and /proc/meminfo (unavailable values simply don't block scaling).
+
+Usage:
+    autoscaler = WorkerAutoscaler(AutoscalePolicy(min_workers=2, max_workers=8))
+    decision = autoscaler.decide(active=3, stats=tracker.get_stats(),
+                                 outcomes=tracker.get_recent_outcomes(15))
+    if decision.delta > 0: ...start a worker...
+"""
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from config import Config
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+
+# Error types (from ProgressTracker.ERROR_CATEGORIES['infrastructure']) that
+# point at the phone/ADB/Appium side rather than at navigation.
+INFRA_ERROR_TYPES = frozenset({
+    'adb_timeout', 'appium_crash', 'connection_dropped', 'glogin_expired', 'phone_error',
+})
+
+
+def host_load() -> Tuple[Optional[float], Optional[float]]:
+    """
+    Current host (cpu_percent, memory_percent); None where unavailable.
+    """
+    if HAS_PSUTIL:
+        return psutil.cpu_percent(interval=None), psutil.virtual_memory().percent
+
+    cpu = None
+    if hasattr(os, 'getloadavg'):
+        try:
+            cpu = min(100.0, os.getloadavg()[0] / (os.cpu_count() or 1) * 100)
+        except OSError:
+            pass
+
+    memory = None
+    try:
+        info = {}
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                info[key] = int(value.split()[0])
+        memory = 100.0 * (1 - info['MemAvailable'] / info['MemTotal'])
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        pass
+
+    return cpu, memory
+
+
+@dataclass
+class AutoscalePolicy:
+    """Bounds and thresholds for the autoscaler."""
+    min_workers: int = Config.AUTOSCALE_MIN_WORKERS
+    max_workers: int = Config.MAX_WORKERS
+    jobs_per_worker: int = Config.AUTOSCALE_JOBS_PER_WORKER        # Backlog per worker before growing
+    infra_error_rate: float = Config.AUTOSCALE_INFRA_ERROR_RATE    # Shrink at/above this rate
+    min_samples: int = Config.AUTOSCALE_MIN_SAMPLES                # Attempts needed to trust the rate
+    error_window_minutes: float = Config.AUTOSCALE_ERROR_WINDOW_MINUTES
+    cpu_limit: float = Config.AUTOSCALE_CPU_PERCENT
+    memory_limit: float = Config.AUTOSCALE_MEMORY_PERCENT
+    cooldown_seconds: float = Config.AUTOSCALE_COOLDOWN_SECONDS    # Min time between changes
+
+    def __post_init__(self):
+        if self.min_workers < 1:
+            raise ValueError(f"min_workers must be >= 1, got {self.min_workers}")
+        if self.max_workers < self.min_workers:
+            raise ValueError(f"max_workers ({self.max_workers}) must be >= min_workers ({self.min_workers})")
+        if self.max_workers > Config.MAX_WORKERS:
+            raise ValueError(f"max_workers must be <= {Config.MAX_WORKERS}, got {self.max_workers}")
+        if self.jobs_per_worker < 1:
+            raise ValueError(f"jobs_per_worker must be >= 1, got {self.jobs_per_worker}")
+
+
+@dataclass
+class ScaleDecision:
+    """Autoscaler output for one evaluation."""
+    current: int
+    target: int
+    reason: str
+
+    @property
+    def delta(self) -> int:
+        return self.target - self.current
+
+
+class WorkerAutoscaler:
+    """Turns queue depth, infra error rate and host load into a worker count."""
+
+    def __init__(self, policy: AutoscalePolicy = None):
+        self.policy = policy or AutoscalePolicy()
+        self.last_change = 0.0
+
+    @staticmethod
+    def infra_error_rate(outcomes: Dict[str, Any]) -> Tuple[float, int]:
+        """(rate, samples) of infrastructure failures among recent attempts."""
+        total = outcomes.get('total', 0)
+        if total == 0:
+            return 0.0, 0
+        infra = sum(count for error_type, count in outcomes.get('by_type', {}).items()
+                    if error_type in INFRA_ERROR_TYPES)
+        return infra / total, total
+
+    def decide(
+        self,
+        active: int,
+        stats: Dict[str, int],
+        outcomes: Dict[str, Any],
+        cpu: Optional[float] = None,
+        memory: Optional[float] = None,
+        now: float = None,
+    ) -> ScaleDecision:
+        """
+        Decide the target worker count (changes by at most one worker per call).
+
+        Args:
+            active: Workers currently running (not counting ones being drained)
+            stats: Queue counts from get_stats()
+            outcomes: Recent attempt outcomes from get_recent_outcomes()
+            cpu, memory: Host load percentages (None = unknown)
+            now: Current time.time() (for the cooldown)
+        """
+        policy = self.policy
+        now = now if now is not None else time.time()
+        backlog = stats.get('pending', 0) + stats.get('retrying', 0)
+        rate, samples = self.infra_error_rate(outcomes)
+        degraded = samples >= policy.min_samples and rate >= policy.infra_error_rate
+        overloaded = ((cpu is not None and cpu >= policy.cpu_limit) or
+                      (memory is not None and memory >= policy.memory_limit))
+
+        def hold(reason: str) -> ScaleDecision:
+            return ScaleDecision(active, active, reason)
+
+        def change(target: int, reason: str) -> ScaleDecision:
+            if now - self.last_change < policy.cooldown_seconds:
+                return hold(f"cooldown ({reason})")
+            self.last_change = now
+            return ScaleDecision(active, target, reason)
+
+        # Below the floor with work left (e.g. a worker crashed) - refill right away
+        if active < policy.min_workers and backlog > 0:
+            self.last_change = now
+            return ScaleDecision(active, active + 1, f"below min_workers ({policy.min_workers})")
+
+        if degraded and active > policy.min_workers:
+            return change(active - 1, f"infra error rate {rate:.0%} over last {samples} attempts")
+        if overloaded and active > policy.min_workers:
+            return change(active - 1, f"host overloaded (cpu={cpu}, mem={memory})")
+        if active > policy.max_workers:
+            return change(active - 1, f"above max_workers ({policy.max_workers})")
+
+        wanted = min(policy.max_workers, math.ceil(backlog / policy.jobs_per_worker))
+        if wanted > active:
+            if degraded:
+                return hold(f"backlog {backlog} but infra error rate {rate:.0%}")
+            if overloaded:
+                return hold(f"backlog {backlog} but host overloaded")
+            return change(active + 1, f"backlog {backlog} > {policy.jobs_per_worker}/worker")
+
+        return hold("steady")